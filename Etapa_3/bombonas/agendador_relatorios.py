@@ -0,0 +1,76 @@
+"""
+Agendador de relatórios do Sistema de Gerenciamento de Bombonas (sem interface gráfica)
+
+Uso:
+    python agendador_relatorios.py                 # roda continuamente, nos horários configurados
+    python agendador_relatorios.py --agora         # executa todas as tarefas uma vez e termina
+    python agendador_relatorios.py --agora --forcar  # idem, mesmo sem alteração nos dados
+
+As tarefas ficam em data/agendamentos.json (ver relatorios.agendador.carregar_configuracao)
+e o log em data/agendador.log.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from relatorios.agendador import ARQUIVO_CONFIGURACAO, ARQUIVO_ESTADO, Agendador
+
+# Arquivo de log do agendador
+ARQUIVO_LOG = "data/agendador.log"
+
+
+def configurar_log(arquivo_log: str) -> None:
+    """ Log no terminal e no arquivo. """
+
+    pasta = os.path.dirname(arquivo_log)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[logging.StreamHandler(), logging.FileHandler(arquivo_log, encoding='utf-8')]
+    )
+
+
+def main():
+    """ Função principal do agendador. """
+
+    parser = argparse.ArgumentParser(description="Gera os relatórios agendados sem abrir a interface.")
+    parser.add_argument('--config', default=ARQUIVO_CONFIGURACAO, help="arquivo JSON com as tarefas")
+    parser.add_argument('--estado', default=ARQUIVO_ESTADO, help="arquivo com o estado das gerações")
+    parser.add_argument('--log', default=ARQUIVO_LOG, help="arquivo de log")
+    parser.add_argument('--agora', action='store_true', help="executa todas as tarefas uma vez e termina")
+    parser.add_argument('--forcar', action='store_true', help="gera mesmo sem alteração nos dados")
+    argumentos = parser.parse_args()
+
+    configurar_log(argumentos.log)
+
+    try:
+        agendador = Agendador(argumentos.config, argumentos.estado)
+    except (OSError, ValueError) as e:
+        logging.error("Não foi possível carregar a configuração '%s': %s", argumentos.config, e)
+        return 1
+
+    if argumentos.agora:
+        resultados = agendador.executar_todas(forcar=argumentos.forcar)
+        return 1 if any(resultado['situacao'] == 'erro' for resultado in resultados) else 0
+
+    # Encerra com Ctrl+C ou SIGTERM, depois de terminar as tarefas em execução
+    parar = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: parar.set())
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, lambda *_: parar.set())
+
+    agendador.executar(parar)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark da gravação do relatório CSV de bombonas (writerow por linha x EscritorCSV)
+
+Monta bombonas sintéticas em memória e mede a gravação do relatório:
+  - anterior: csv.writer com uma lista e um writerow por linha (implementação
+    substituída pelo EscritorCSV);
+  - EscritorCSV: linhas em tuplas gravadas em lotes, com buffer de 1 MB;
+  - EscritorCSV gzip: o mesmo, compactado ('.csv.gz').
+Confere também que o CSV gerado é idêntico byte a byte ao da implementação anterior.
+
+Uso (a partir da pasta do projeto):
+    python benchmarks/benchmark_escritor_csv.py [quantidade de bombonas] [repetições]
+"""
+
+import csv
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.bombona_controller import BombonaController  # noqa: E402
+from factory.bombona_factory import BombonaFactory  # noqa: E402
+from models.bombona import Bombona  # noqa: E402
+from models.responsavel import Responsavel  # noqa: E402
+from relatorios.escritor_csv import EscritorCSV  # noqa: E402
+
+CABECALHO = ['Código', 'Volume (L)', 'Tipo Resíduo', 'Responsável', 'CPF', 'Setor']
+TIPOS = BombonaFactory.TIPOS_RESIDUOS_VALIDOS
+SETORES = ["FÍSICA", "QUÍMICA", "BIOLOGIA", "LABORATÓRIO"]
+
+
+def gerar_bombonas(quantidade: int, responsaveis: int = 5_000) -> list:
+    """ Bombonas sintéticas (a cada 50, uma sem responsável, que sai como 'N/A'). """
+
+    pessoas = [
+        Responsavel(f"{10_000_000_000 + n:011d}", f"Responsável {n}", "35999990000", SETORES[n % len(SETORES)])
+        for n in range(responsaveis)
+    ]
+    return [
+        Bombona(f"B{n // 26_000 % 26 + 65:c}{n // 1_000 % 26 + 65:c}-{n % 1000:03d}", float(10 + n % 190),
+                TIPOS[n % len(TIPOS)], None if n % 50 == 0 else pessoas[n % responsaveis])
+        for n in range(quantidade)
+    ]
+
+
+def gravar_anterior(bombonas: list, arquivo: str) -> None:
+    """ Implementação anterior: uma lista e um writerow por linha. """
+
+    with open(arquivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CABECALHO)
+        for bombona in bombonas:
+            responsavel = bombona.get_responsavel()
+            writer.writerow([
+                bombona.get_codigo(),
+                bombona.get_volume(),
+                bombona.get_tipo_residuo(),
+                responsavel.get_nome() if responsavel else 'N/A',
+                responsavel.get_cpf() if responsavel else 'N/A',
+                responsavel.get_setor() if responsavel else 'N/A'
+            ])
+
+
+def gravar_escritor(bombonas: list, arquivo: str) -> None:
+    """ Implementação atual (BombonaController._gerar_csv sem os filtros). """
+
+    with EscritorCSV(arquivo) as escritor:
+        escritor.escrever_linha(CABECALHO)
+        escritor.escrever_linhas(BombonaController._linhas_csv(bombonas))
+
+
+def medir(gravar, bombonas: list, arquivo: str, repeticoes: int) -> float:
+    """ Melhor tempo (s) de uma gravação completa. """
+
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        gravar(bombonas, arquivo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> int:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    bombonas = gerar_bombonas(quantidade)
+    print(f"{quantidade} bombonas, melhor de {repeticoes}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.path.join(pasta, "anterior.csv")
+        atual = os.path.join(pasta, "atual.csv")
+        compactado = os.path.join(pasta, "atual.csv.gz")
+
+        resultados = [
+            ("writerow por linha", medir(gravar_anterior, bombonas, anterior, repeticoes), anterior),
+            ("EscritorCSV", medir(gravar_escritor, bombonas, atual, repeticoes), atual),
+            ("EscritorCSV gzip", medir(gravar_escritor, bombonas, compactado, repeticoes), compactado),
+        ]
+
+        for nome, tempo, arquivo in resultados:
+            print(f"{nome:20s} {tempo:7.2f} s  ({quantidade / tempo / 1000:5.0f} mil linhas/s, "
+                  f"{os.path.getsize(arquivo) / 1e6:6.1f} MB)")
+
+        with open(anterior, 'rb') as a, open(atual, 'rb') as b, gzip.open(compactado, 'rb') as c:
+            conteudo = a.read()
+            identicos = conteudo == b.read() == c.read()
+
+    print("saída idêntica à anterior:", "sim" if identicos else "NÃO")
+    return 0 if identicos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark da busca incremental (IndiceBusca.buscar) da listagem de bombonas
+
+Monta o índice com bombonas sintéticas (código, tipo de resíduo, nome, CPF e
+setor do responsável, como na tela de listagem) e mede o tempo de cada
+consulta digitada, inclusive as de 1 e 2 caracteres, que são as que
+encontram mais registros.
+
+Uso (a partir da pasta do projeto):
+    python benchmarks/benchmark_indice_busca.py [quantidade de bombonas] [repetições]
+
+Termina com código 1 se alguma consulta passar de LIMITE_MS.
+"""
+
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dao.indice_busca import IndiceBusca  # noqa: E402
+from factory.bombona_factory import BombonaFactory  # noqa: E402
+
+# Consultas medidas (o tempo de cada uma deve ficar abaixo de um quadro de 60 Hz)
+CONSULTAS = ["f", "fa", "fab", "fab0", "fab001", "1", "12", "q", "ana", "ana co", "quimico fis", "xyz"]
+LIMITE_MS = 16.0
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fabio", "Gilmar", "Helena", "Isael", "Julia"]
+SOBRENOMES = ["Costa", "Lima", "Souza", "Filho", "Aparecido", "Ferreira", "Santos", "Oliveira"]
+SETORES = ["FÍSICA", "QUÍMICA", "BIOLOGIA", "LABORATÓRIO", "FARMÁCIA", "ENGENHARIA"]
+
+
+def gerar_registros(quantidade: int, responsaveis: int = 10_000) -> list:
+    """
+    Pares (código, campos) de bombonas sintéticas com 'responsaveis' responsáveis
+    diferentes. Todos os códigos começam com F e todos os CPFs com 1 (pior caso:
+    'f' e '1' correspondem a dezenas de milhares de termos distintos).
+    """
+
+    aleatorio = random.Random(42)
+    pessoas = [
+        (f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)}", f"{aleatorio.randrange(10**10, 2 * 10**10)}",
+         aleatorio.choice(SETORES))
+        for _ in range(responsaveis)
+    ]
+    tipos = BombonaFactory.TIPOS_RESIDUOS_VALIDOS
+
+    registros = []
+    for i in range(quantidade):
+        bloco = i // 1000
+        codigo = f"F{chr(65 + bloco // 26 % 26)}{chr(65 + bloco % 26)}-{i % 1000:03d}"
+        nome, cpf, setor = pessoas[i % responsaveis]
+        registros.append((codigo, (codigo, tipos[i % len(tipos)], nome, cpf, setor)))
+    return registros
+
+
+def main() -> int:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    registros = gerar_registros(quantidade)
+    inicio = time.perf_counter()
+    indice = IndiceBusca(registros)
+    print(f"{len(indice)} bombonas indexadas em {(time.perf_counter() - inicio) * 1000:.0f} ms, "
+          f"melhor de {repeticoes} (consultas repetidas sem cache entre elas)")
+
+    pior = 0.0
+    for consulta in CONSULTAS:
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            # Uma alteração qualquer descarta os resultados guardados, como após uma edição na tela
+            chave, campos = registros[0]
+            indice.atualizar(chave, campos[:1] + ("BIOLÓGICO",) + campos[2:])
+            indice.atualizar(chave, campos)
+
+            inicio = time.perf_counter()
+            encontradas = indice.buscar(consulta)
+            melhor = min(melhor, time.perf_counter() - inicio)
+        pior = max(pior, melhor)
+        print(f"{consulta!r:15} {len(encontradas):7d} resultado(s) {melhor * 1000:8.2f} ms")
+
+    print(f"pior consulta: {pior * 1000:.2f} ms ({'dentro' if pior * 1000 < LIMITE_MS else 'acima'} "
+          f"do limite de {LIMITE_MS:.0f} ms)")
+
+    # Alterações de uma linha (edição, exclusão e novo cadastro), como as feitas pela tela
+    alteracoes = registros[1:1001]
+    inicio = time.perf_counter()
+    for chave, campos in alteracoes:
+        indice.atualizar(chave, campos[:2] + ("Outro Nome", "19999999999", "OUTRO"))
+    for chave, campos in alteracoes:
+        indice.remover(chave)
+        indice.adicionar(chave, campos)
+    por_alteracao = (time.perf_counter() - inicio) / (2 * len(alteracoes))
+    print(f"alteração de uma linha no índice: {por_alteracao * 1000:.3f} ms")
+
+    return 0 if pior * 1000 < LIMITE_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Benchmark da carga a frio do cadastro de bombonas (CSV x snapshot binário)
+
+Gera um CSV sintético numa pasta temporária e mede, para um DAO novo a cada
+repetição, o tempo de _ler_registros():
+  - CSV: sem snapshot (lê e converte o CSV e grava o snapshot);
+  - snapshot + hash: o CSV inteiro é conferido por hash a cada carga
+    (comportamento anterior, forçado com MARGEM_MTIME_NS enorme);
+  - snapshot: tamanho e mtime do CSV bastam (CSV gravado há mais tempo que a margem).
+
+Uso (a partir da pasta do projeto):
+    python benchmarks/benchmark_snapshot.py [quantidade de linhas] [repetições]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dao import snapshot_binario  # noqa: E402
+from dao.bombona_dao import BombonaDAO  # noqa: E402
+from factory.bombona_factory import BombonaFactory  # noqa: E402
+
+TIPOS = BombonaFactory.TIPOS_RESIDUOS_VALIDOS
+
+
+def gerar_csv(arquivo: str, quantidade: int) -> None:
+    """ Grava 'quantidade' bombonas sintéticas (códigos AAA-000 em diante) e recua o mtime em uma hora. """
+
+    with open(arquivo, 'w', newline='', encoding='utf-8') as saida:
+        writer = csv.writer(saida)
+        writer.writerow(['codigo', 'volume', 'tipo_residuo', 'cpf_responsavel'])
+        for i in range(quantidade):
+            letras = (chr(65 + i // 26_000 % 26) + chr(65 + i // 1_000 % 26) + chr(65 + i // 1_000_000 % 26))
+            writer.writerow([f"{letras}-{i % 1000:03d}", float(10 + i % 190), TIPOS[i % len(TIPOS)],
+                             f"{10_000_000_000 + i % 500:011d}"])
+
+    antigo = time.time_ns() - 3_600 * 10**9
+    os.utime(arquivo, ns=(antigo, antigo))
+
+
+def medir(arquivo: str, repeticoes: int, remover_snapshot: bool = False) -> float:
+    """ Melhor tempo (s) de _ler_registros() em um DAO recém-criado. """
+
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        if remover_snapshot and os.path.exists(f"{arquivo}.snap"):
+            os.remove(f"{arquivo}.snap")
+        dao = BombonaDAO(arquivo)
+        inicio = time.perf_counter()
+        dao._ler_registros()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "bombonas.csv")
+        gerar_csv(arquivo, quantidade)
+        print(f"{quantidade} linhas, {os.path.getsize(arquivo) / 1e6:.1f} MB, melhor de {repeticoes}")
+
+        tempo_csv = medir(arquivo, repeticoes, remover_snapshot=True)
+
+        margem = snapshot_binario.MARGEM_MTIME_NS
+        snapshot_binario.MARGEM_MTIME_NS = 10**20
+        tempo_hash = medir(arquivo, repeticoes)
+        snapshot_binario.MARGEM_MTIME_NS = margem
+
+        tempo_stat = medir(arquivo, repeticoes)
+
+    print(f"CSV (sem snapshot):  {tempo_csv * 1000:8.1f} ms")
+    print(f"snapshot + hash:     {tempo_hash * 1000:8.1f} ms")
+    print(f"snapshot (stat):     {tempo_stat * 1000:8.1f} ms  ({tempo_hash / tempo_stat:.2f}x mais rápido que com hash)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,6 @@ Contém a lógica de negócio do sistema.
 
 from .bombona_controller import BombonaController
 from .responsavel_controller import ResponsavelController
+from .busca_controller import BuscaController
 
-__all__ = ['BombonaController', 'ResponsavelController']
\ No newline at end of file
+__all__ = ['BombonaController', 'ResponsavelController', 'BuscaController']
\ No newline at end of file
@@ -2,20 +2,65 @@
 Controller para gerenciamento de Bombonas
 """
 
-import csv
 import os
-import unicodedata
+import weakref
+from collections import Counter
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+from controllers.cache_consultas import cache_compartilhado
+from dao import eventos
+from dao.registro_alteracoes import registro_compartilhado
+from dao.indice_busca import IndiceBusca
 from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
 from dao.interfaces.responsavel_dao_interface import ResponsavelDAOInterface
+from dao.planejador_filtros import PlanejadorFiltros
+from dao.selecao_dao import criar_bombona_dao
+from factory.alocador_codigos import AlocadorCodigos
 from factory.bombona_factory import BombonaFactory
 from models.bombona import Bombona
+from relatorios.cache_relatorios import CacheRelatorios
+from relatorios.escritor_csv import EscritorCSV, compressao_do_arquivo
+from relatorios.escritor_xlsx import TAMANHO_LOTE, EscritorXLSX
+from relatorios.etiquetas import FolhaEtiquetas
+from relatorios.exportador_colunar import FORMATOS_COLUNARES, ExportadorColunar
+from relatorios.motor_pdf import ModeloTabela, MotorPDF
+from relatorios.publicador_html import PublicadorHTML
+from relatorios.relatorio_alteracoes import FORMATOS_ALTERACOES, gerar_relatorio_alteracoes
 
-try:
-    from fpdf import FPDF
-except ImportError:
-    FPDF = None  # Para tratar caso não esteja instalado
+# Colunas da tabela do relatório PDF: (título, largura em mm, alinhamento)
+TABELA_PDF = ModeloTabela([
+    ('Código', 30, 'C'),
+    ('Volume (L)', 25, 'C'),
+    ('Tipo Resíduo', 35, 'C'),
+    ('Responsável', 60, 'L'),
+    ('Setor', 40, 'L'),
+])
+
+# Colunas dos relatórios Parquet / Arrow: (nome, tipo)
+COLUNAS_COLUNARES = [
+    ('codigo', 'texto'),
+    ('volume_litros', 'decimal'),
+    ('tipo_residuo', 'categoria'),
+    ('responsavel', 'texto'),
+    ('cpf', 'texto'),
+    ('setor', 'categoria'),
+]
+
+# Planilhas do relatório XLSX: (título, largura em caracteres)
+COLUNAS_XLSX_BOMBONAS = [
+    ('Código', 14), ('Volume (L)', 12), ('Tipo Resíduo', 16), ('Responsável', 32), ('CPF', 14), ('Setor', 18)
+]
+COLUNAS_XLSX_RESPONSAVEIS = [
+    ('Nome', 32), ('CPF', 14), ('Telefone', 14), ('Setor', 18), ('Qtd_Bombonas', 14)
+]
+COLUNAS_XLSX_RESUMO = [('Item', 32), ('Quantidade', 14), ('Volume total (L)', 18)]
+
+# Etiquetas por código: até esta quantidade, cada bombona é buscada pelo código; acima, um intervalo por prefixo
+MAX_CODIGOS_AVULSOS = 50
+
+# Colunas do relatório HTML e as que entram no índice de busca
+COLUNAS_HTML = ['Código', 'Volume (L)', 'Tipo Resíduo', 'Responsável', 'CPF', 'Setor']
+COLUNAS_INDICE_HTML = ['Tipo Resíduo', 'Setor', 'Responsável']
 
 
 class BombonaController:
@@ -25,27 +70,231 @@ class BombonaController:
     Utiliza as interfaces dos DAOs para garantir baixo acoplamento.
     """
 
-    def __init__(self):
+    def __init__(self, bombona_dao: BombonaDAOInterface = None):
         """
         Inicializa o controller com suas próprias dependências.
         O controller é autônomo e trabalha apenas com interfaces.
+        Opcionalmente recebe outra implementação do DAO de bombonas
+        (ex.: BombonaDAORegistroFixo); por padrão usa o armazenamento
+        configurado em BOMBONAS_ARMAZENAMENTO (dao.selecao_dao).
         """
 
         # Import dinâmico das implementações (mantém baixo acoplamento)
-        from dao.bombona_dao import BombonaDAO
         from dao.responsavel_dao import ResponsavelDAO
         
         # Atribui às interfaces (polimorfismo)
-        self._bombona_dao: BombonaDAOInterface = BombonaDAO()
+        self._bombona_dao: BombonaDAOInterface = bombona_dao or criar_bombona_dao()
         self._responsavel_dao: ResponsavelDAOInterface = ResponsavelDAO()
         self._bombona_factory = BombonaFactory()
 
+        # Alocador de códigos livres (montado sob demanda, mantido em dia pelas alterações
+        # publicadas pelos DAOs e refeito apenas quando outro processo altera os dados)
+        self._alocador = None
+        self._versao_alocador = None
+        self._inscrever_alteracoes()
+
+        # Índice da busca incremental das telas de listagem (montado por indexar_busca)
+        self._indice_busca = None
+
+        # Cópias dos relatórios já gerados (por formato, filtros e versão dos dados)
+        self._cache_relatorios = CacheRelatorios()
+
+        # Planejador dos filtros do relatório (montado sob demanda e refeito quando os dados mudam)
+        self._planejador = None
+        self._versao_planejador = None
+
+    def _inscrever_alteracoes(self) -> None:
+        """
+        Inscreve o controller nas alterações publicadas pelos DAOs. A inscrição
+        guarda apenas uma referência fraca (as telas criam controllers novos a
+        cada abertura) e é cancelada quando o controller deixa de existir.
+        """
+
+        metodo = weakref.WeakMethod(self._registrar_alteracao)
+
+        def repassar(alteracao: eventos.Alteracao) -> None:
+            registrar = metodo()
+            if registrar is None:
+                eventos.cancelar_inscricao(repassar)
+            else:
+                registrar(alteracao)
+
+        eventos.inscrever(repassar)
+
+    def _registrar_alteracao(self, alteracao: eventos.Alteracao) -> None:
+        """
+        Aplica ao alocador os códigos incluídos e removidos por uma gravação,
+        se ele estiver na versão anterior a ela (caso contrário, será remontado).
+        """
+
+        if (alteracao.entidade != eventos.BOMBONAS or self._alocador is None
+                or alteracao.versao_anterior != self._versao_alocador):
+            return
+
+        for registro in alteracao.incluidos:
+            self._alocador.marcar_usado(registro[0])
+        for codigo in alteracao.removidos:
+            self._alocador.liberar(codigo)
+        self._versao_alocador = alteracao.versao_nova
+
+    def _obter_alocador(self) -> AlocadorCodigos:
+        """ Retorna o alocador de códigos, remontando-o se as bombonas foram alteradas por outro processo. """
+
+        versao = self._bombona_dao.versao_dados()
+        if self._alocador is None or versao != self._versao_alocador:
+            self._alocador = AlocadorCodigos(self._bombona_dao.listar_codigos())
+            self._versao_alocador = versao
+        return self._alocador
+
+    def _consultar_cache(self, metodo: str, argumentos: tuple, calcular, *entidades):
+        """
+        Retorna o resultado da consulta pelo cache compartilhado dos controllers.
+        O resultado é refeito quando alguma das entidades lidas é alterada.
+        """
+
+        versoes = {
+            eventos.BOMBONAS: self._bombona_dao.versao_dados,
+            eventos.RESPONSAVEIS: self._responsavel_dao.versao_dados
+        }
+        chave = (type(self._bombona_dao).__name__, metodo, argumentos)
+        dependencias = {entidade: versoes[entidade]() for entidade in entidades}
+        return cache_compartilhado.consultar(chave, calcular, dependencias)
+
+    def versao_dados(self) -> tuple:
+        """ Versão dos dados de bombonas e responsáveis (muda a cada gravação, inclusive por outro processo). """
+
+        return (self._bombona_dao.versao_dados(), self._responsavel_dao.versao_dados())
+
+    def metricas_cache(self) -> dict:
+        """ Acertos, falhas e ocupação do cache de consultas dos controllers. """
+
+        return cache_compartilhado.metricas()
+
+    def _obter_planejador(self) -> PlanejadorFiltros:
+        """ Retorna o planejador de filtros, remontando-o se bombonas ou responsáveis foram alterados. """
+
+        versao = (self._bombona_dao.versao_dados(), self._responsavel_dao.versao_dados())
+        if self._planejador is None or versao != self._versao_planejador:
+            self._planejador = PlanejadorFiltros(self.listar_bombonas())
+            self._versao_planejador = versao
+        return self._planejador
+
+    def sugerir_codigo(self, prefixo: str) -> str:
+        """ Sugere o próximo código livre (LLL-111) para o prefixo informado, sem reservá-lo. """
+
+        try:
+            return self._obter_alocador().proximo_livre(prefixo)
+        except Exception as e:
+            print(f"Erro ao sugerir código: {e}")
+            raise
+
+    def sugerir_codigos(self, prefixo: str, quantidade: int) -> List[str]:
+        """ Sugere os próximos 'quantidade' códigos livres do prefixo, sem reservá-los. """
+
+        try:
+            return self._obter_alocador().proximos_livres(prefixo, quantidade, reservar=False)
+        except Exception as e:
+            print(f"Erro ao sugerir códigos: {e}")
+            raise
+
+    def cadastrar_bombonas_em_lote(self, prefixo: str, quantidade: int, volume: float,
+                                   tipo_residuo: str, cpf: str) -> List[str]:
+        """
+        Cadastra 'quantidade' bombonas iguais com os próximos códigos livres do
+        prefixo, em uma única escrita. Retorna os códigos atribuídos.
+        """
+
+        try:
+            # Factory valida os dados próprios das bombonas
+            volume = self._bombona_factory.validar_volume(volume)
+            tipo_residuo = self._bombona_factory.validar_e_formatar_tipo_residuo(tipo_residuo)
+
+            # Controller valida e busca responsável
+            cpf_formatado = self._normalizar_cpf(cpf)
+            responsavel = self._responsavel_dao.buscar_por_cpf(cpf_formatado)
+            if not responsavel:
+                raise ValueError(f"Responsável com CPF {cpf} não encontrado")
+
+            alocador = self._obter_alocador()
+            codigos = alocador.proximos_livres(prefixo, quantidade)
+
+            bombonas = []
+            for codigo in codigos:
+                bombona = self._bombona_factory.criar_bombona(codigo, volume, tipo_residuo)
+                bombona.set_responsavel(responsavel)
+                bombonas.append(bombona)
+
+            try:
+                self._bombona_dao.salvar_em_lote(bombonas)
+            except Exception:
+                # Os códigos reservados não foram gravados: devolve-os ao alocador
+                for codigo in codigos:
+                    alocador.liberar(codigo)
+                raise
+
+            if self._indice_busca is not None:
+                for bombona in bombonas:
+                    self._indice_busca.adicionar(bombona.get_codigo(), self._campos_busca(bombona))
+
+            return codigos
+
+        except Exception as e:
+            print(f"Erro ao cadastrar bombonas em lote: {e}")
+            raise
+
+    @staticmethod
+    def _campos_busca(bombona: Bombona) -> tuple:
+        """ Campos de uma bombona usados na busca incremental (código, tipo, nome, CPF e setor). """
+
+        responsavel = bombona.get_responsavel()
+        if not responsavel:
+            return (bombona.get_codigo(), bombona.get_tipo_residuo(), '', '', '')
+        return (
+            bombona.get_codigo(),
+            bombona.get_tipo_residuo(),
+            responsavel.get_nome(),
+            responsavel.get_cpf(),
+            responsavel.get_setor()
+        )
+
+    def indexar_busca(self, bombonas: List[Bombona]) -> None:
+        """ Monta o índice da busca incremental com as bombonas exibidas na listagem. """
+
+        self._indice_busca = IndiceBusca((b.get_codigo(), self._campos_busca(b)) for b in bombonas)
+
+    def buscar_incremental(self, texto: str) -> List[str]:
+        """
+        Retorna, na ordem da listagem, os códigos das bombonas indexadas cujo código,
+        tipo, responsável, CPF ou setor começam com as palavras digitadas.
+        """
+
+        if self._indice_busca is None:
+            self.indexar_busca(self.listar_bombonas())
+        return self._indice_busca.buscar(texto)
+
+    def _atualizar_indice_busca(self, codigos: List[str], tipo_residuo: str = None, responsavel=None) -> None:
+        """ Atualiza no índice da busca apenas as bombonas alteradas por uma operação em lote. """
+
+        if self._indice_busca is None:
+            return
+
+        for codigo in codigos:
+            campos = self._indice_busca.campos(codigo)
+            if campos is None:
+                continue
+
+            codigo, tipo_atual, nome, cpf, setor = campos
+            if responsavel is not None:
+                nome, cpf, setor = responsavel.get_nome(), responsavel.get_cpf(), responsavel.get_setor()
+            self._indice_busca.atualizar(codigo, (codigo, tipo_residuo or tipo_atual, nome, cpf, setor))
+
     def cadastrar_bombona(self, codigo: str, volume: float, tipo_residuo: str, cpf: str) -> bool:
         """ Cadastra uma nova bombona com responsável vinculado. """
 
         try:
-            # Verifica se o código já existe ANTES de processar
-            if self._bombona_dao.existe_codigo(codigo):
+            # Verifica se o código já existe ANTES de processar (no formato gravado, LLL-111)
+            codigo_formatado = self._bombona_factory.validar_e_formatar_codigo(codigo)
+            if self._bombona_dao.existe_codigo(codigo_formatado):
                 raise ValueError(f"Já existe uma bombona com o código {codigo}")
 
             # Factory cria bombona sem responsável (validação dos dados próprios)
@@ -63,6 +312,9 @@ class BombonaController:
             # Salva a bombona com responsável vinculado
             self._bombona_dao.salvar(bombona_temp)
 
+            if self._indice_busca is not None:
+                self._indice_busca.adicionar(bombona_temp.get_codigo(), self._campos_busca(bombona_temp))
+
             return True
 
         except Exception as e:
@@ -73,7 +325,8 @@ class BombonaController:
         """ Lista todas as bombonas cadastradas com as referências aos responsáveis resolvidas. """
 
         try:
-            return self._bombona_dao.listar_todas()
+            return self._consultar_cache('listar_bombonas', (), self._bombona_dao.listar_todas,
+                                         eventos.BOMBONAS, eventos.RESPONSAVEIS)
         except Exception as e:
             print(f"Erro ao listar bombonas: {e}")
             return []
@@ -87,6 +340,9 @@ class BombonaController:
                 raise ValueError(f"Bombona com código {codigo} não encontrada")
 
             self._bombona_dao.remover(bombona)
+
+            if self._indice_busca is not None:
+                self._indice_busca.remover(bombona.get_codigo())
             return True
 
         except Exception as e:
@@ -118,42 +374,257 @@ class BombonaController:
             # Atualiza a bombona
             self._bombona_dao.atualizar(bombona_temp)
 
+            if self._indice_busca is not None:
+                self._indice_busca.atualizar(bombona_temp.get_codigo(), self._campos_busca(bombona_temp))
+
             return True
 
         except Exception as e:
             print(f"Erro ao editar bombona: {e}")
             raise
 
+    def editar_bombonas_em_lote(self, codigos: List[str], novo_volume: float = None,
+                                novo_tipo_residuo: str = None, cpf_responsavel: str = None) -> int:
+        """
+        Aplica a mesma alteração (volume, tipo de resíduo e/ou responsável) a várias
+        bombonas em uma única operação. Campos não informados são mantidos.
+        Retorna a quantidade de bombonas alteradas.
+        """
+
+        try:
+            if not codigos:
+                raise ValueError("Nenhuma bombona informada")
+
+            if novo_volume is None and novo_tipo_residuo is None and cpf_responsavel is None:
+                raise ValueError("Informe ao menos um campo para alterar")
+
+            # Factory valida os dados próprios da bombona
+            codigos = [self._bombona_factory.validar_e_formatar_codigo(c) for c in codigos]
+            if novo_volume is not None:
+                novo_volume = self._bombona_factory.validar_volume(novo_volume)
+            if novo_tipo_residuo is not None:
+                novo_tipo_residuo = self._bombona_factory.validar_e_formatar_tipo_residuo(novo_tipo_residuo)
+
+            # Controller valida e busca responsável
+            responsavel = None
+            if cpf_responsavel is not None:
+                cpf_formatado = self._normalizar_cpf(cpf_responsavel)
+                responsavel = self._responsavel_dao.buscar_por_cpf(cpf_formatado)
+                if not responsavel:
+                    raise ValueError(f"Responsável com CPF {cpf_responsavel} não encontrado")
+
+            atualizadas = self._bombona_dao.atualizar_em_lote(
+                codigos, novo_volume, novo_tipo_residuo, responsavel
+            )
+            self._atualizar_indice_busca(atualizadas, novo_tipo_residuo, responsavel)
+            return len(atualizadas)
+
+        except Exception as e:
+            print(f"Erro ao editar bombonas em lote: {e}")
+            raise
+
+    def remover_bombonas_em_lote(self, codigos: List[str]) -> int:
+        """ Remove várias bombonas em uma única operação. Retorna a quantidade removida. """
+
+        try:
+            if not codigos:
+                raise ValueError("Nenhuma bombona informada")
+
+            codigos = [self._bombona_factory.validar_e_formatar_codigo(c) for c in codigos]
+            removidas = self._bombona_dao.remover_em_lote(codigos)
+
+            if self._indice_busca is not None:
+                for codigo in removidas:
+                    self._indice_busca.remover(codigo)
+            return len(removidas)
+
+        except Exception as e:
+            print(f"Erro ao remover bombonas em lote: {e}")
+            raise
+
+    def transferir_bombonas(self, cpf_origem: str, cpf_destino: str, codigos: List[str] = None) -> int:
+        """
+        Transfere bombonas de um responsável para outro em uma única operação.
+        Se 'codigos' não for informado, transfere todas as bombonas do responsável de origem.
+        Retorna a quantidade de bombonas transferidas.
+        """
+
+        try:
+            cpf_origem_formatado = self._normalizar_cpf(cpf_origem)
+            cpf_destino_formatado = self._normalizar_cpf(cpf_destino)
+
+            if cpf_origem_formatado == cpf_destino_formatado:
+                raise ValueError("Responsável de origem e de destino devem ser diferentes")
+
+            responsavel_destino = self._responsavel_dao.buscar_por_cpf(cpf_destino_formatado)
+            if not responsavel_destino:
+                raise ValueError(f"Responsável com CPF {cpf_destino} não encontrado")
+
+            # Normaliza os códigos informados no padrão LLL-111
+            if codigos is not None:
+                codigos = [self._bombona_factory.validar_e_formatar_codigo(c) for c in codigos]
+
+            transferidas = self._bombona_dao.transferir_bombonas(
+                cpf_origem_formatado, responsavel_destino, codigos
+            )
+            self._atualizar_indice_busca(transferidas, responsavel=responsavel_destino)
+            return len(transferidas)
+
+        except Exception as e:
+            print(f"Erro ao transferir bombonas: {e}")
+            raise
+
+    def buscar_bombona(self, codigo: str) -> Optional[Bombona]:
+        """ Busca uma bombona pelo código (consulta pontual no índice de códigos). """
+
+        try:
+            codigo = self._bombona_factory.validar_e_formatar_codigo(codigo)
+            return self._bombona_dao.buscar_por_codigo(codigo)
+        except Exception as e:
+            print(f"Erro ao buscar bombona: {e}")
+            return None
+
     def buscar_bombonas_por_cpf_responsavel(self, cpf: str) -> List[Bombona]:
         """ Busca bombonas por CPF do responsável com as referências resolvidas. """
 
         try:
             cpf_formatado = self._normalizar_cpf(cpf)
-            return self._bombona_dao.buscar_por_responsavel(cpf_formatado)
+            return self._consultar_cache(
+                'buscar_bombonas_por_cpf_responsavel', (cpf_formatado,),
+                lambda: self._bombona_dao.buscar_por_responsavel(cpf_formatado),
+                eventos.BOMBONAS, eventos.RESPONSAVEIS
+            )
         except Exception as e:
             print(f"Erro ao buscar bombonas por responsável: {e}")
             return []
 
-    def gerar_relatorio(self, bombonas_filtradas: List[Bombona] = None, arquivo: str = None, filtros_ativos: list = None, formato: str = "csv") -> str:
-        """ Gera relatório das bombonas em formato especificado. """
+    def buscar_bombonas_por_prefixo(self, prefixo: str) -> List[Bombona]:
+        """
+        Busca as bombonas cujo código começa com o prefixo informado (ex.: 'FIS', 'FIS-1').
+        O prefixo pode ser digitado sem hífen e em qualquer case.
+        """
+
+        try:
+            prefixo = (prefixo or '').strip().upper().replace('-', '')
+            if not prefixo:
+                return self.listar_bombonas()
+
+            # Reinsere o hífen do padrão LLL-111 após as 3 letras
+            if len(prefixo) > 3:
+                prefixo = f"{prefixo[:3]}-{prefixo[3:]}"
+
+            return self._bombona_dao.buscar_por_prefixo(prefixo)
+        except Exception as e:
+            print(f"Erro ao buscar bombonas por prefixo: {e}")
+            return []
+
+    def buscar_bombonas_por_intervalo(self, codigo_inicial: str, codigo_final: str) -> List[Bombona]:
+        """ Busca as bombonas com código entre os códigos informados (inclusive), ex.: FIS-100 a FIS-199. """
+
+        try:
+            codigo_inicial = self._bombona_factory.validar_e_formatar_codigo(codigo_inicial)
+            codigo_final = self._bombona_factory.validar_e_formatar_codigo(codigo_final)
+
+            if codigo_inicial > codigo_final:
+                codigo_inicial, codigo_final = codigo_final, codigo_inicial
+
+            return self._bombona_dao.buscar_intervalo(codigo_inicial, codigo_final)
+        except Exception as e:
+            print(f"Erro ao buscar bombonas por intervalo: {e}")
+            return []
+
+    def gerar_relatorio(self, bombonas_filtradas: List[Bombona] = None, arquivo: str = None, filtros_ativos: list = None,
+                        formato: str = "csv", filtros: dict = None, progresso=None,
+                        desde: datetime = None, ate: datetime = None) -> str:
+        """
+        Gera relatório das bombonas em formato especificado ('csv', 'pdf',
+        'xlsx', 'html', 'parquet' ou 'arrow'; os dois últimos precisam do pyarrow).
+        O XLSX traz as planilhas de bombonas, de responsáveis e de resumo.
+        O HTML é um índice com uma pasta de páginas ao lado (ver _gerar_html).
+
+        Sem 'bombonas_filtradas', o próprio controller consulta as bombonas (todas,
+        ou as que atendem 'filtros', com os parâmetros de filtrar_bombonas) e o
+        arquivo gerado fica guardado no cache de relatórios: um pedido igual, sem
+        alteração nos dados, é atendido com uma cópia do arquivo já gerado.
+
+        'progresso', se informado, é chamado com (linhas gravadas, total) durante a
+        geração do PDF, do XLSX, do HTML e dos formatos colunares.
+
+        Com 'desde' (e opcionalmente 'ate'), gera o relatório de alterações:
+        bombonas incluídas, alteradas e removidas no período, lidos do registro
+        de alterações (só 'csv' ou 'pdf').
+        """
 
         try:
-            # Se não passou bombonas, usa todas
+            formato = formato.lower()
+
+            if desde is not None:
+                if formato not in FORMATOS_ALTERACOES:
+                    raise ValueError("O relatório de alterações é gerado em 'csv' ou 'pdf'")
+                return self._gerar_relatorio_alteracoes(arquivo, formato, desde, ate, progresso)
+
+            if formato not in ("csv", "pdf", "xlsx", "html") and formato not in FORMATOS_COLUNARES:
+                raise ValueError("Formatos suportados: 'csv', 'pdf', 'xlsx', 'html', 'parquet' ou 'arrow'")
+            if formato != "csv" and not arquivo:
+                raise ValueError(f"Caminho do arquivo é obrigatório para {formato.upper()}")
+
+            # CSV compactado (.csv.gz) é guardado no cache separado do CSV simples
+            compressao = compressao_do_arquivo(arquivo) if formato == "csv" else None
+            formato_cache = f"{formato}.{compressao}" if compressao else formato
+
+            chave_cache = None
             if bombonas_filtradas is None:
-                bombonas_filtradas = self.listar_bombonas()
+                # O HTML reaproveita as próprias páginas (não passa pelo cache de arquivos)
+                if arquivo and formato != "html":
+                    chave_cache = self._chave_relatorio(formato_cache, filtros, filtros_ativos)
+                    if self._cache_relatorios.obter(chave_cache, formato_cache, arquivo):
+                        return arquivo
+                # O XLSX lê os registros direto do DAO (ver _gerar_xlsx), sem passar pelo cache de consultas
+                if formato != "xlsx":
+                    bombonas_filtradas = self.filtrar_bombonas(**filtros) if filtros else self.listar_bombonas()
             
-            if formato.lower() == "csv":
-                return self._gerar_csv(bombonas_filtradas, arquivo, filtros_ativos)
-            elif formato.lower() == "pdf":
-                if not arquivo:
-                    raise ValueError("Caminho do arquivo é obrigatório para PDF")
-                return self._gerar_pdf(bombonas_filtradas, arquivo, filtros_ativos)
+            if formato == "csv":
+                arquivo_gerado = self._gerar_csv(bombonas_filtradas, arquivo, filtros_ativos)
+            elif formato == "pdf":
+                arquivo_gerado = self._gerar_pdf(bombonas_filtradas, arquivo, filtros_ativos, progresso)
+            elif formato == "xlsx":
+                arquivo_gerado = self._gerar_xlsx(bombonas_filtradas, arquivo, filtros_ativos, filtros, progresso)
+            elif formato == "html":
+                arquivo_gerado = self._gerar_html(bombonas_filtradas, arquivo, filtros_ativos, progresso)
             else:
-                raise ValueError("Formatos suportados: 'csv' ou 'pdf'")
+                arquivo_gerado = self._gerar_colunar(bombonas_filtradas, arquivo, formato, progresso)
+
+            if chave_cache:
+                self._cache_relatorios.guardar(chave_cache, formato_cache, arquivo_gerado)
+            return arquivo_gerado
 
         except Exception as e:
             print(f"Erro ao gerar relatório: {e}")
             raise
+
+    def _gerar_relatorio_alteracoes(self, arquivo: str, formato: str, desde: datetime, ate: datetime = None,
+                                    progresso=None) -> str:
+        """ Relatório das bombonas alteradas no período (só lê as alterações do período). """
+
+        if not arquivo:
+            arquivo = f"data/relatorio_alteracoes_bombonas.{formato}"
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        alteracoes = registro_compartilhado.resumir(eventos.BOMBONAS, desde, ate)
+        return gerar_relatorio_alteracoes(eventos.BOMBONAS, alteracoes, arquivo, formato, desde, ate, progresso)
+
+    def _chave_relatorio(self, formato: str, filtros: dict = None, filtros_ativos: list = None) -> str:
+        """ Chave do relatório no cache: formato, filtros e versão dos dados de bombonas e responsáveis. """
+
+        versoes = (
+            type(self._bombona_dao).__name__,
+            self._bombona_dao.versao_dados(),
+            self._responsavel_dao.versao_dados()
+        )
+        filtros = tuple(sorted((filtros or {}).items()))
+        return self._cache_relatorios.chave('bombonas', formato, (filtros, tuple(filtros_ativos or ())), versoes)
     
     def _gerar_csv(self, bombonas: List[Bombona], arquivo: str = None, filtros_ativos: list = None) -> str:
         """ Gera relatório CSV das bombonas. """
@@ -166,117 +637,319 @@ class BombonaController:
         # Cria diretório se necessário
         os.makedirs(os.path.dirname(arquivo), exist_ok=True)
         
-        with open(arquivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
+        # Arquivo terminado em .gz (ou .zst) é gravado compactado
+        with EscritorCSV(arquivo) as escritor:
             # Cabeçalho com filtros se houver
             if filtros_ativos:
-                writer.writerow([f'# Filtros aplicados: {"; ".join(filtros_ativos)}'])
-                writer.writerow([f'# Total de bombonas encontradas: {len(bombonas)}'])
-                writer.writerow([])  # Linha vazia
+                escritor.escrever_linha([f'# Filtros aplicados: {"; ".join(filtros_ativos)}'])
+                escritor.escrever_linha([f'# Total de bombonas encontradas: {len(bombonas)}'])
+                escritor.escrever_linha([])  # Linha vazia
             
             # Cabeçalho da tabela
-            writer.writerow(['Código', 'Volume (L)', 'Tipo Resíduo', 'Responsável', 'CPF', 'Setor'])
+            escritor.escrever_linha(['Código', 'Volume (L)', 'Tipo Resíduo', 'Responsável', 'CPF', 'Setor'])
             
-            # Dados
-            for bombona in bombonas:
-                responsavel = bombona.get_responsavel()
-                writer.writerow([
-                    bombona.get_codigo(),
-                    bombona.get_volume(),
-                    bombona.get_tipo_residuo(),
-                    responsavel.get_nome() if responsavel else 'N/A',
-                    responsavel.get_cpf() if responsavel else 'N/A',
-                    responsavel.get_setor() if responsavel else 'N/A'
-                ])
+            # Dados (gravados em lotes)
+            escritor.escrever_linhas(self._linhas_csv(bombonas))
         
         return arquivo
+
+    def _gerar_xlsx(self, bombonas: Optional[List[Bombona]], arquivo: str, filtros_ativos: list = None,
+                    filtros: dict = None, progresso=None) -> str:
+        """
+        Gera o relatório XLSX em fluxo: planilha das bombonas, planilha dos
+        responsáveis (do setor / CPF filtrados, com a quantidade de bombonas do
+        relatório) e planilha de resumo. Os totais do resumo são somados
+        enquanto as bombonas são gravadas, sem guardar as linhas.
+
+        Sem 'bombonas', os registros são lidos um a um do DAO (iterar_registros)
+        e os filtros são aplicados na leitura, sem montar a lista de bombonas.
+        """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        filtros = filtros or {}
+        setor_filtro = filtros.get('setor') or None
+        cpf_filtro = self._normalizar_cpf(filtros['cpf']) if filtros.get('cpf') else None
+
+        responsaveis_por_cpf = {r.get_cpf(): r for r in self._responsavel_dao.listar_todos()}
+        responsaveis = [
+            responsavel for responsavel in responsaveis_por_cpf.values()
+            if (not setor_filtro or responsavel.get_setor() == setor_filtro)
+            and (not cpf_filtro or responsavel.get_cpf() == cpf_filtro)
+        ]
+
+        if bombonas is None:
+            registros = self._registros_xlsx(responsaveis_por_cpf, setor_filtro, cpf_filtro,
+                                             filtros.get('tipo_residuo') or None,
+                                             filtros.get('volume_min'), filtros.get('volume_max'))
+            total = len(self._bombona_dao.listar_codigos())
+        else:
+            registros = ((b.get_codigo(), b.get_volume(), b.get_tipo_residuo(), b.get_responsavel())
+                         for b in bombonas)
+            total = len(bombonas)
+
+        por_tipo = {}   # Tipo de resíduo -> [quantidade, volume]
+        por_setor = {}  # Setor -> [quantidade, volume]
+        contagem = Counter()  # CPF -> quantidade
+
+        def linhas_bombonas():
+            # O progresso conta os registros lidos (com filtros, nem todos viram linha)
+            for lidos, (codigo, volume, tipo, responsavel) in enumerate(registros, 1):
+                if progresso and lidos % TAMANHO_LOTE == 0:
+                    progresso(lidos, total)
+
+                if codigo is None:
+                    continue
+                setor = responsavel.get_setor() if responsavel else 'N/A'
+
+                totais = por_tipo.setdefault(tipo, [0, 0.0])
+                totais[0] += 1
+                totais[1] += volume
+                totais = por_setor.setdefault(setor, [0, 0.0])
+                totais[0] += 1
+                totais[1] += volume
+
+                if responsavel:
+                    contagem[responsavel.get_cpf()] += 1
+                    yield (codigo, volume, tipo, responsavel.get_nome(), responsavel.get_cpf(), setor)
+                else:
+                    yield (codigo, volume, tipo, 'N/A', 'N/A', 'N/A')
+
+        with EscritorXLSX(arquivo) as planilhas:
+            planilhas.nova_planilha('Bombonas', COLUNAS_XLSX_BOMBONAS)
+            quantidade_bombonas = planilhas.escrever_linhas(linhas_bombonas())
+            if progresso:
+                progresso(total, total)
+
+            planilhas.nova_planilha('Responsáveis', COLUNAS_XLSX_RESPONSAVEIS)
+            planilhas.escrever_linhas(
+                (resp.get_nome(), resp.get_cpf(), resp.get_telefone(), resp.get_setor(), contagem.get(resp.get_cpf(), 0))
+                for resp in responsaveis
+            )
+
+            planilhas.nova_planilha('Resumo', COLUNAS_XLSX_RESUMO, cabecalho=False)
+            planilhas.escrever_linha(['Relatório de Bombonas'], negrito=True)
+            planilhas.escrever_linha([f'Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}'])
+            for filtro in filtros_ativos or ():
+                planilhas.escrever_linha([f'Filtro: {filtro}'])
+
+            for titulo, totais in (('Tipo de resíduo', por_tipo), ('Setor', por_setor)):
+                planilhas.escrever_linha([])
+                planilhas.escrever_linha([titulo, 'Quantidade', 'Volume total (L)'], negrito=True)
+                for nome, (quantidade, volume) in sorted(totais.items()):
+                    planilhas.escrever_linha([nome, quantidade, round(volume, 2)])
+
+            planilhas.escrever_linha([])
+            volume_total = sum(volume for _, volume in por_tipo.values())
+            planilhas.escrever_linha(['Total de bombonas', quantidade_bombonas, round(volume_total, 2)], negrito=True)
+            planilhas.escrever_linha(['Total de responsáveis', len(responsaveis)], negrito=True)
+
+        return arquivo
+
+    def _registros_xlsx(self, responsaveis_por_cpf: dict, setor: str = None, cpf: str = None,
+                        tipo_residuo: str = None, volume_min: float = None, volume_max: float = None):
+        """
+        Registros do DAO como (codigo, volume, tipo_residuo, responsavel), com os
+        mesmos critérios de filtrar_bombonas. Registros que não atendem aos
+        filtros saem como (None, ...) para que o progresso conte a leitura.
+        """
+
+        descartado = (None, None, None, None)
+        minimo = float('-inf') if volume_min is None else volume_min
+        maximo = float('inf') if volume_max is None else volume_max
+
+        for codigo, volume, tipo, cpf_responsavel in self._bombona_dao.iterar_registros():
+            responsavel = responsaveis_por_cpf.get(cpf_responsavel)
+            if not responsavel:
+                print(f"ERRO: Responsável {cpf_responsavel} não encontrado para bombona {codigo}")
+                yield descartado
+            elif ((setor and responsavel.get_setor() != setor) or (cpf and cpf_responsavel != cpf)
+                  or (tipo_residuo and tipo != tipo_residuo) or not minimo <= volume <= maximo):
+                yield descartado
+            else:
+                yield codigo, volume, tipo, responsavel
+
+    def _gerar_html(self, bombonas: List[Bombona], arquivo: str, filtros_ativos: list = None,
+                    progresso=None) -> str:
+        """
+        Gera o relatório HTML paginado: 'arquivo' é o índice e as páginas ficam
+        na pasta '<nome>_arquivos'. Páginas sem alteração desde a última geração
+        no mesmo lugar não são regravadas.
+        """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        informacoes = [f'Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}']
+        informacoes.extend(f'Filtro: {filtro}' for filtro in filtros_ativos or ())
+
+        publicador = PublicadorHTML(arquivo, 'Relatório de Bombonas', COLUNAS_HTML, COLUNAS_INDICE_HTML,
+                                    informacoes=informacoes)
+        return publicador.publicar(self._linhas_csv(bombonas), progresso, len(bombonas))
+
+    def _gerar_colunar(self, bombonas: List[Bombona], arquivo: str, formato: str, progresso=None) -> str:
+        """ Gera relatório das bombonas em Parquet ou Arrow IPC, em lotes. """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        with ExportadorColunar(arquivo, COLUNAS_COLUNARES, formato) as exportador:
+            exportador.escrever_linhas(self._linhas_colunares(bombonas), progresso, len(bombonas))
+
+        return arquivo
+
+    @staticmethod
+    def _linhas_colunares(bombonas: List[Bombona]):
+        """ Valores das linhas dos formatos colunares (sem responsável, as colunas ficam nulas). """
+
+        for bombona in bombonas:
+            responsavel = bombona.get_responsavel()
+            if responsavel:
+                yield (bombona.get_codigo(), float(bombona.get_volume()), bombona.get_tipo_residuo(),
+                       responsavel.get_nome(), responsavel.get_cpf(), responsavel.get_setor())
+            else:
+                yield (bombona.get_codigo(), float(bombona.get_volume()), bombona.get_tipo_residuo(),
+                       None, None, None)
+
+    @staticmethod
+    def _linhas_csv(bombonas: List[Bombona]):
+        """ Valores das linhas do CSV, gerados sob demanda. """
+
+        for bombona in bombonas:
+            responsavel = bombona.get_responsavel()
+            if responsavel:
+                yield (bombona.get_codigo(), bombona.get_volume(), bombona.get_tipo_residuo(),
+                       responsavel.get_nome(), responsavel.get_cpf(), responsavel.get_setor())
+            else:
+                yield (bombona.get_codigo(), bombona.get_volume(), bombona.get_tipo_residuo(),
+                       'N/A', 'N/A', 'N/A')
     
-    def _gerar_pdf(self, bombonas: List[Bombona], arquivo: str, filtros_ativos: list = None) -> str:
-        """ Gera relatório PDF das bombonas. """
+    @staticmethod
+    def _linhas_pdf(bombonas: List[Bombona]):
+        """ Valores das linhas da tabela do PDF, gerados sob demanda. """
 
-        if FPDF is None:
-            raise ImportError("Biblioteca FPDF não encontrada. Instale com: pip install fpdf2")
-        
-        def sanitizar_texto(texto):
-            if not texto:
-                return texto
-            nfd = unicodedata.normalize('NFD', texto)
-            return nfd.encode('ascii', 'ignore').decode('ascii')
-        
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 16)
-        
-        # Título
-        titulo = "RELATORIO DE BOMBONAS FILTRADAS" if filtros_ativos else "RELATORIO COMPLETO DE BOMBONAS"
-        pdf.cell(0, 10, titulo, ln=True, align='C')
-        pdf.ln(5)
-        
-        # Filtros (se houver)
-        if filtros_ativos:
-            pdf.set_font('Arial', 'B', 12)
-            pdf.cell(0, 8, "Filtros aplicados:", ln=True)
-            pdf.set_font('Arial', '', 10)
-            for filtro in filtros_ativos:
-                filtro_limpo = sanitizar_texto(filtro)
-                pdf.cell(0, 6, f"  - {filtro_limpo}", ln=True)
-            pdf.ln(5)
-        
-        # Total
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 8, f"Total de bombonas: {len(bombonas)}", ln=True)
-        pdf.ln(5)
-        
-        # Cabeçalho da tabela
-        pdf.set_font('Arial', 'B', 10)
-        pdf.cell(30, 8, 'Codigo', 1, 0, 'C')
-        pdf.cell(25, 8, 'Volume (L)', 1, 0, 'C')
-        pdf.cell(35, 8, 'Tipo Residuo', 1, 0, 'C')
-        pdf.cell(60, 8, 'Responsavel', 1, 0, 'C')
-        pdf.cell(40, 8, 'Setor', 1, 1, 'C')
-        
-        # Dados
-        pdf.set_font('Arial', '', 9)
         for bombona in bombonas:
             resp = bombona.get_responsavel()
+            yield (
+                bombona.get_codigo(),
+                f"{bombona.get_volume():.1f}",
+                bombona.get_tipo_residuo(),
+                resp.get_nome() if resp else 'N/A',
+                resp.get_setor() if resp else 'N/A'
+            )
+
+    def _gerar_pdf(self, bombonas: List[Bombona], arquivo: str, filtros_ativos: list = None, progresso=None) -> str:
+        """ Gera relatório PDF das bombonas, gravando cada página assim que fica pronta. """
+
+        with MotorPDF(arquivo, progresso) as pdf:
+            # Título
+            titulo = "RELATÓRIO DE BOMBONAS FILTRADAS" if filtros_ativos else "RELATÓRIO COMPLETO DE BOMBONAS"
+            pdf.texto(titulo, 'B', 16, 10, 'C')
+            pdf.espaco(5)
             
-            # Sanitizar textos
-            codigo_limpo = sanitizar_texto(bombona.get_codigo())
-            tipo_limpo = sanitizar_texto(bombona.get_tipo_residuo())
-            nome_resp = sanitizar_texto(resp.get_nome()) if resp else 'N/A'
-            setor_resp = sanitizar_texto(resp.get_setor()) if resp else 'N/A'
+            # Filtros (se houver)
+            if filtros_ativos:
+                pdf.texto("Filtros aplicados:", 'B', 12, 8)
+                for filtro in filtros_ativos:
+                    pdf.texto(f"  - {filtro}", '', 10, 6)
+                pdf.espaco(5)
             
-            # Truncar se necessário
-            nome_resp = (nome_resp[:25] + "...") if len(nome_resp) > 25 else nome_resp
-            setor_resp = (setor_resp[:18] + "...") if len(setor_resp) > 18 else setor_resp
+            # Total
+            pdf.texto(f"Total de bombonas: {len(bombonas)}", 'B', 12, 8)
+            pdf.espaco(5)
             
-            pdf.cell(30, 6, codigo_limpo, 1, 0, 'C')
-            pdf.cell(25, 6, f"{bombona.get_volume():.1f}", 1, 0, 'C')
-            pdf.cell(35, 6, tipo_limpo, 1, 0, 'C')
-            pdf.cell(60, 6, nome_resp, 1, 0, 'L')
-            pdf.cell(40, 6, setor_resp, 1, 1, 'L')
+            # Tabela (cabeçalho repetido a cada página)
+            pdf.tabela(TABELA_PDF, self._linhas_pdf(bombonas), len(bombonas))
             
-            # Nova página se necessário
-            if pdf.get_y() > 250:
-                pdf.add_page()
-                pdf.set_font('Arial', 'B', 10)
-                pdf.cell(30, 8, 'Codigo', 1, 0, 'C')
-                pdf.cell(25, 8, 'Volume (L)', 1, 0, 'C')
-                pdf.cell(35, 8, 'Tipo Residuo', 1, 0, 'C')
-                pdf.cell(60, 8, 'Responsavel', 1, 0, 'C')
-                pdf.cell(40, 8, 'Setor', 1, 1, 'C')
-                pdf.set_font('Arial', '', 9)
-        
-        # Rodapé
-        pdf.ln(10)
-        pdf.set_font('Arial', 'I', 8)
-        data_geracao = datetime.now().strftime("%d/%m/%Y as %H:%M:%S")
-        pdf.cell(0, 6, f"Relatorio gerado em {data_geracao}", ln=True, align='L')
+            # Rodapé
+            pdf.espaco(10)
+            data_geracao = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
+            pdf.texto(f"Relatório gerado em {data_geracao}", 'I', 8, 6)
         
-        pdf.output(arquivo)
         return arquivo
 
+    def gerar_etiquetas(self, codigos: List[str] = None, filtros: dict = None, arquivo: str = None,
+                        progresso=None) -> str:
+        """
+        Gera o PDF das etiquetas (código, tipo, volume, responsável e código de
+        barras Code128) para impressão em folha A4 de 24 etiquetas.
+
+        Com 'codigos', imprime essas bombonas na ordem informada; senão, as que
+        atendem 'filtros' (parâmetros de filtrar_bombonas) ou todas.
+        'progresso', se informado, é chamado com (etiquetas gravadas, total).
+        """
+
+        try:
+            if codigos is not None:
+                codigos = [self._bombona_factory.validar_e_formatar_codigo(codigo) for codigo in codigos]
+                por_codigo = self._buscar_por_codigos(codigos)
+                nao_encontrados = [codigo for codigo in codigos if codigo not in por_codigo]
+                if nao_encontrados:
+                    raise ValueError(f"Bombona(s) não encontrada(s): {', '.join(nao_encontrados[:10])}")
+                bombonas = [por_codigo[codigo] for codigo in codigos]
+            elif filtros:
+                bombonas = self.filtrar_bombonas(**filtros)
+            else:
+                bombonas = self.listar_bombonas()
+
+            if not bombonas:
+                raise ValueError("Nenhuma bombona para gerar etiquetas")
+
+            if not arquivo:
+                arquivo = "data/etiquetas_bombonas.pdf"
+            pasta = os.path.dirname(arquivo)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+
+            with FolhaEtiquetas(arquivo, progresso) as folha:
+                folha.escrever_etiquetas(self._linhas_etiquetas(bombonas), len(bombonas))
+            return arquivo
+
+        except Exception as e:
+            print(f"Erro ao gerar etiquetas: {e}")
+            raise
+
+    def _buscar_por_codigos(self, codigos: List[str]) -> dict:
+        """
+        Bombonas dos códigos informados (código -> bombona), lidas pelo índice de
+        códigos: uma a uma quando são poucas e, acima de MAX_CODIGOS_AVULSOS, um
+        intervalo por prefixo (cada responsável é lido uma vez por intervalo).
+        """
+
+        codigos = sorted(set(codigos))
+        if len(codigos) <= MAX_CODIGOS_AVULSOS:
+            bombonas = (self._bombona_dao.buscar_por_codigo(codigo) for codigo in codigos)
+            return {bombona.get_codigo(): bombona for bombona in bombonas if bombona}
+
+        por_prefixo = {}
+        for codigo in codigos:
+            por_prefixo.setdefault(codigo.split('-', 1)[0], []).append(codigo)
+
+        por_codigo = {}
+        for do_prefixo in por_prefixo.values():
+            pedidos = set(do_prefixo)
+            for bombona in self._bombona_dao.buscar_intervalo(do_prefixo[0], do_prefixo[-1]):
+                if bombona.get_codigo() in pedidos:
+                    por_codigo[bombona.get_codigo()] = bombona
+        return por_codigo
+
+    @staticmethod
+    def _linhas_etiquetas(bombonas: List[Bombona]):
+        """ Valores das etiquetas: (código, tipo de resíduo, volume, responsável). """
+
+        for bombona in bombonas:
+            resp = bombona.get_responsavel()
+            yield (
+                bombona.get_codigo(),
+                bombona.get_tipo_residuo(),
+                f"{bombona.get_volume():g} L",
+                f"{resp.get_nome()} - {resp.get_setor()}" if resp else 'Sem responsável'
+            )
+
     def _normalizar_cpf(self, cpf: str) -> str:
         """ Valida e formata o CPF removendo caracteres não numéricos. """
 
@@ -295,21 +968,58 @@ class BombonaController:
     def get_tipos_residuos_validos(self) -> List[str]:
         """ Retorna os tipos de resíduos válidos. """
 
-        return self._bombona_factory.get_tipos_residuos_validos()
+        return self._consultar_cache('get_tipos_residuos_validos', (),
+                                     self._bombona_factory.get_tipos_residuos_validos)
 
-    def filtrar_bombonas_por_setor(self, setor: str) -> List[Bombona]:
-        """ Filtra bombonas por setor do responsável. """
+    @staticmethod
+    def _filtros(setor: str = None, cpf: str = None, tipo_residuo: str = None,
+                 volume_min: float = None, volume_max: float = None) -> dict:
+        """ Monta os filtros do planejador (filtros vazios ou None não são aplicados). """
+
+        return {
+            'setor': setor or None,
+            'cpf': cpf or None,
+            'tipo_residuo': tipo_residuo or None,
+            'volume_min': volume_min,
+            'volume_max': volume_max
+        }
+
+    def filtrar_bombonas(self, setor: str = None, cpf: str = None, tipo_residuo: str = None,
+                         volume_min: float = None, volume_max: float = None) -> List[Bombona]:
+        """
+        Filtra bombonas combinando setor, CPF do responsável, tipo de resíduo e
+        faixa de volume. A ordem de avaliação é escolhida pelo planejador a partir
+        da quantidade de bombonas de cada valor (ver explicar_filtros).
+        """
 
         try:
-            bombonas = self.listar_bombonas()
-            bombonas_filtradas = []
+            if cpf:
+                cpf = self._normalizar_cpf(cpf)
+            filtros = self._filtros(setor, cpf, tipo_residuo, volume_min, volume_max)
+            return self._consultar_cache(
+                'filtrar_bombonas', tuple(filtros.values()),
+                lambda: self._obter_planejador().filtrar(**filtros),
+                eventos.BOMBONAS, eventos.RESPONSAVEIS
+            )
+
+        except Exception as e:
+            print(f"Erro ao filtrar bombonas: {e}")
+            return []
 
-            for bombona in bombonas:
-                responsavel = bombona.get_responsavel()
-                if responsavel and responsavel.get_setor() == setor:
-                    bombonas_filtradas.append(bombona)
+    def explicar_filtros(self, setor: str = None, cpf: str = None, tipo_residuo: str = None,
+                         volume_min: float = None, volume_max: float = None) -> str:
+        """ Descreve o plano que filtrar_bombonas usaria para os filtros, com as estimativas de linhas. """
 
-            return bombonas_filtradas
+        if cpf:
+            cpf = self._normalizar_cpf(cpf)
+        filtros = self._filtros(setor, cpf, tipo_residuo, volume_min, volume_max)
+        return self._obter_planejador().explicar(**filtros)
+
+    def filtrar_bombonas_por_setor(self, setor: str) -> List[Bombona]:
+        """ Filtra bombonas por setor do responsável. """
+
+        try:
+            return self.filtrar_bombonas(setor=setor)
 
         except Exception as e:
             print(f"Erro ao filtrar bombonas por setor: {e}")
@@ -319,16 +1029,8 @@ class BombonaController:
         """ Filtra bombonas por tipo de resíduo. """
 
         try:
-            bombonas = self.listar_bombonas()
-            bombonas_filtradas = []
-
-            for bombona in bombonas:
-                if bombona.get_tipo_residuo() == tipo_residuo:
-                    bombonas_filtradas.append(bombona)
-
-            return bombonas_filtradas
+            return self.filtrar_bombonas(tipo_residuo=tipo_residuo)
 
         except Exception as e:
             print(f"Erro ao filtrar bombonas por tipo: {e}")
             return []
-        
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Controller da busca global (bombonas e responsáveis)
+"""
+
+import weakref
+from typing import List, Union
+from dao import eventos
+from dao.indice_texto import IndiceTexto, chave_documento
+from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
+from dao.interfaces.responsavel_dao_interface import ResponsavelDAOInterface
+from dao.selecao_dao import criar_bombona_dao
+from models.bombona import Bombona
+from models.responsavel import Responsavel
+
+
+class BuscaController:
+    """
+    Controller da busca global: procura um texto qualquer (trecho de telefone,
+    palavra do setor, código...) em todos os campos de bombonas e responsáveis.
+
+    O índice de texto fica gravado em disco e é atualizado a cada gravação dos
+    DAOs deste processo (via dao.eventos); se os dados forem alterados por fora,
+    ele é reconstruído na próxima busca.
+    """
+
+    def __init__(self, bombona_dao: BombonaDAOInterface = None, arquivo_indice: str = "data/busca.idx"):
+        """
+        Inicializa o controller com suas próprias dependências.
+        Opcionalmente recebe outra implementação do DAO de bombonas; por padrão
+        usa o armazenamento configurado em BOMBONAS_ARMAZENAMENTO (dao.selecao_dao).
+        """
+
+        # Import dinâmico das implementações (mantém baixo acoplamento)
+        from dao.responsavel_dao import ResponsavelDAO
+
+        self._bombona_dao: BombonaDAOInterface = bombona_dao or criar_bombona_dao()
+        self._responsavel_dao: ResponsavelDAOInterface = ResponsavelDAO()
+
+        self._indice = IndiceTexto(arquivo_indice)
+        self._inscrever_alteracoes()
+
+    def _inscrever_alteracoes(self) -> None:
+        """
+        Inscreve o índice nas alterações publicadas pelos DAOs. Como no
+        BombonaController, a inscrição guarda apenas uma referência fraca e é
+        cancelada quando o controller (e o seu índice) deixa de existir; assim,
+        controllers descartados não continuam gravando no diário do índice.
+        """
+
+        metodo = weakref.WeakMethod(self._indice.registrar_alteracao)
+
+        def repassar(alteracao: eventos.Alteracao) -> None:
+            registrar = metodo()
+            if registrar is None:
+                eventos.cancelar_inscricao(repassar)
+            else:
+                registrar(alteracao)
+
+        eventos.inscrever(repassar)
+
+    def _versoes_atuais(self) -> dict:
+        """ Versão atual dos dados de cada entidade. """
+
+        return {
+            eventos.BOMBONAS: self._bombona_dao.versao_dados(),
+            eventos.RESPONSAVEIS: self._responsavel_dao.versao_dados()
+        }
+
+    def _obter_indice(self) -> IndiceTexto:
+        """ Retorna o índice em dia com os dados: o da memória, o gravado em disco ou um reconstruído. """
+
+        versoes = self._versoes_atuais()
+        if self._indice.versoes == versoes:
+            return self._indice
+
+        if self._indice.carregar() and self._indice.versoes == versoes:
+            return self._indice
+
+        self._reconstruir_indice(versoes)
+        return self._indice
+
+    def _reconstruir_indice(self, versoes: dict) -> None:
+        """ Monta o índice a partir de todos os registros e o grava em disco. """
+
+        documentos = []
+        for r in self._responsavel_dao.listar_todos():
+            documentos.append((
+                chave_documento(eventos.RESPONSAVEIS, r.get_cpf()),
+                (r.get_cpf(), r.get_nome(), r.get_telefone(), r.get_setor())
+            ))
+        for b in self._bombona_dao.listar_todas():
+            cpf = b.get_responsavel().get_cpf() if b.get_responsavel() else ''
+            documentos.append((
+                chave_documento(eventos.BOMBONAS, b.get_codigo()),
+                (b.get_codigo(), b.get_volume(), b.get_tipo_residuo(), cpf)
+            ))
+
+        self._indice.reconstruir(versoes, documentos)
+        self._indice.salvar()
+
+    def buscar(self, texto: str, limite: int = 20) -> List[Union[Bombona, Responsavel]]:
+        """
+        Busca o texto em todos os campos de bombonas e responsáveis.
+        Retorna até 'limite' bombonas e responsáveis, do mais ao menos relevante.
+        """
+
+        try:
+            indice = self._obter_indice()
+            resultados = []
+            for chave, _ in indice.buscar(texto, limite):
+                entidade = chave.split(':', 1)[0]
+                registro = indice.registro(chave)
+                if entidade == eventos.RESPONSAVEIS:
+                    resultados.append(Responsavel(*registro))
+                else:
+                    codigo, volume, tipo_residuo, cpf = registro
+                    dados_responsavel = indice.registro(chave_documento(eventos.RESPONSAVEIS, cpf))
+                    responsavel = Responsavel(*dados_responsavel) if dados_responsavel else None
+                    resultados.append(Bombona(codigo, volume, tipo_residuo, responsavel))
+            return resultados
+        except Exception as e:
+            print(f"Erro na busca global: {e}")
+            return []
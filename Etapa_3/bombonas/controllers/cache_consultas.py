@@ -0,0 +1,131 @@
+"""
+Cache dos resultados das consultas dos controllers
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+from dao import eventos
+
+# Quantidade máxima de resultados guardados (os menos usados recentemente são descartados)
+TAMANHO_MAXIMO = 128
+
+
+class CacheConsultas:
+    """
+    Cache LRU de resultados de consultas, compartilhado pelos controllers.
+
+    Cada resultado é guardado com suas dependências: as entidades lidas
+    ('bombonas', 'responsaveis') e a versão dos dados de cada uma no momento
+    da consulta. Uma gravação de um DAO (avisada por dao.eventos) descarta na
+    hora os resultados que dependem da entidade alterada; a versão guardada
+    cobre alterações feitas por fora deste processo.
+    """
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_MAXIMO):
+        """ Cria o cache vazio. """
+
+        self.tamanho_maximo = tamanho_maximo
+        # Chave -> (resultado, dependências), do menos ao mais usado recentemente
+        self._itens = OrderedDict()
+        # Entidade -> chaves dos resultados que dependem dela
+        self._por_entidade: Dict[str, set] = {}
+        self._trava = threading.Lock()
+
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        self.descartes = 0
+
+    def consultar(self, chave: Hashable, calcular: Callable, dependencias: Dict[str, tuple] = None):
+        """
+        Retorna o resultado guardado para a chave ou o calcula e guarda.
+        'dependencias' relaciona cada entidade lida à versão atual dos seus dados.
+        Listas e dicionários são devolvidos como cópia profunda, com objetos de
+        modelo novos a cada chamada (quem chama pode alterá-los à vontade sem
+        mudar o que está guardado).
+        Erros de 'calcular' não são guardados.
+        """
+
+        dependencias = dependencias or {}
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and item[1] == dependencias:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._copia(item[0])
+            self.falhas += 1
+
+        resultado = calcular()
+
+        with self._trava:
+            self._remover(chave)
+            self._itens[chave] = (resultado, dependencias)
+            for entidade in dependencias:
+                self._por_entidade.setdefault(entidade, set()).add(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._remover(next(iter(self._itens)))
+                self.descartes += 1
+
+        return self._copia(resultado)
+
+    @staticmethod
+    def _copia(resultado):
+        """ Cópia profunda de listas e dicionários; outros valores são devolvidos como estão. """
+
+        if isinstance(resultado, (list, dict)):
+            return copy.deepcopy(resultado)
+        return resultado
+
+    def _remover(self, chave: Hashable) -> None:
+        """ Remove um resultado e suas referências (com a trava adquirida). """
+
+        item = self._itens.pop(chave, None)
+        if item is None:
+            return
+        for entidade in item[1]:
+            chaves = self._por_entidade.get(entidade)
+            if chaves is not None:
+                chaves.discard(chave)
+
+    def invalidar(self, entidade: str) -> None:
+        """ Descarta os resultados que dependem da entidade. """
+
+        with self._trava:
+            for chave in list(self._por_entidade.pop(entidade, ())):
+                self._remover(chave)
+                self.invalidacoes += 1
+
+    def registrar_alteracao(self, alteracao: eventos.Alteracao) -> None:
+        """ Descarta os resultados afetados por uma gravação de DAO. """
+
+        self.invalidar(alteracao.entidade)
+
+    def limpar(self) -> None:
+        """ Descarta todos os resultados (as métricas são mantidas). """
+
+        with self._trava:
+            self._itens.clear()
+            self._por_entidade.clear()
+
+    def metricas(self) -> dict:
+        """ Acertos, falhas, invalidações, descartes por tamanho e ocupação do cache. """
+
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+                'invalidacoes': self.invalidacoes,
+                'descartes': self.descartes,
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo
+            }
+
+
+# Cache usado por todos os controllers (as telas criam controllers novos a cada abertura)
+cache_compartilhado = CacheConsultas()
+eventos.inscrever(cache_compartilhado.registrar_alteracao)
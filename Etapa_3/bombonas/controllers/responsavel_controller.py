@@ -1,20 +1,53 @@
 """
 Controller para gerenciamento de Responsáveis
 """
-import unicodedata
-import csv
 import os
+from collections import Counter
 from datetime import datetime
 from typing import List, Optional
+from controllers.cache_consultas import cache_compartilhado
+from dao import eventos
+from dao.registro_alteracoes import registro_compartilhado
+from dao.indice_busca import IndiceBusca
+from dao.indice_trigramas import IndiceTrigramas
 from dao.interfaces.responsavel_dao_interface import ResponsavelDAOInterface
 from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
+from dao.selecao_dao import criar_bombona_dao
 from factory.responsavel_factory import ResponsavelFactory
 from models.responsavel import Responsavel
+from relatorios.cache_relatorios import CacheRelatorios
+from relatorios.escritor_csv import EscritorCSV, compressao_do_arquivo
+from relatorios.escritor_xlsx import EscritorXLSX
+from relatorios.exportador_colunar import FORMATOS_COLUNARES, ExportadorColunar
+from relatorios.motor_pdf import ModeloTabela, MotorPDF
+from relatorios.publicador_html import PublicadorHTML
+from relatorios.relatorio_alteracoes import FORMATOS_ALTERACOES, gerar_relatorio_alteracoes
 
-try: # Teste para garantir que o FPDF está instalado
-    from fpdf import FPDF
-except ImportError:
-    FPDF = None
+# Colunas da tabela do relatório PDF: (título, largura em mm, alinhamento)
+TABELA_PDF = ModeloTabela([
+    ('Nome', 50, 'L'),
+    ('CPF', 35, 'C'),
+    ('Telefone', 35, 'C'),
+    ('Setor', 35, 'L'),
+    ('Bombonas', 25, 'C'),
+])
+
+# Colunas dos relatórios Parquet / Arrow: (nome, tipo)
+COLUNAS_COLUNARES = [
+    ('nome', 'texto'),
+    ('cpf', 'texto'),
+    ('telefone', 'texto'),
+    ('setor', 'categoria'),
+    ('qtd_bombonas', 'inteiro'),
+]
+
+# Planilhas do relatório XLSX: (título, largura em caracteres)
+COLUNAS_XLSX = [('Nome', 32), ('CPF', 14), ('Telefone', 14), ('Setor', 18), ('Qtd_Bombonas', 14)]
+COLUNAS_XLSX_RESUMO = [('Setor', 32), ('Responsáveis', 14), ('Bombonas', 14)]
+
+# Colunas do relatório HTML e as que entram no índice de busca
+COLUNAS_HTML = ['Nome', 'CPF', 'Telefone', 'Setor', 'Qtd_Bombonas']
+COLUNAS_INDICE_HTML = ['Setor']
 
 class ResponsavelController:
     """
@@ -23,21 +56,125 @@ class ResponsavelController:
     Utiliza as interfaces dos DAOs para garantir baixo acoplamento.
     """
 
-    def __init__(self):
+    def __init__(self, bombona_dao: BombonaDAOInterface = None):
         """
         Inicializa o controller com suas próprias dependências.
         O controller é autônomo e trabalha apenas com interfaces.
+        Opcionalmente recebe outra implementação do DAO de bombonas
+        (ex.: BombonaDAORegistroFixo); por padrão usa o armazenamento
+        configurado em BOMBONAS_ARMAZENAMENTO (dao.selecao_dao).
         """
 
         # Import dinâmico das implementações (mantém baixo acoplamento)
         from dao.responsavel_dao import ResponsavelDAO
-        from dao.bombona_dao import BombonaDAO
         
         # Atribui às interfaces (polimorfismo)
         self._responsavel_dao: ResponsavelDAOInterface = ResponsavelDAO()
-        self._bombona_dao: BombonaDAOInterface = BombonaDAO()
+        self._bombona_dao: BombonaDAOInterface = bombona_dao or criar_bombona_dao()
         self._responsavel_factory = ResponsavelFactory()
+
+        # Cópias dos relatórios já gerados (por formato e versão dos dados)
+        self._cache_relatorios = CacheRelatorios()
+
+        # Índice da busca incremental da tela de listagem (montado por indexar_busca)
+        self._indice_busca = None
+
+        # Índice de trigramas dos nomes (montado sob demanda e refeito quando os dados mudam)
+        self._indice_nomes = None
+        self._responsaveis_por_cpf = {}
+        self._versao_indice_nomes = None
+
+    def _consultar_cache(self, metodo: str, argumentos: tuple, calcular, *entidades):
+        """
+        Retorna o resultado da consulta pelo cache compartilhado dos controllers.
+        O resultado é refeito quando alguma das entidades lidas é alterada.
+        """
+
+        versoes = {
+            eventos.BOMBONAS: self._bombona_dao.versao_dados,
+            eventos.RESPONSAVEIS: self._responsavel_dao.versao_dados
+        }
+        chave = (type(self).__name__, metodo, argumentos)
+        dependencias = {entidade: versoes[entidade]() for entidade in entidades}
+        return cache_compartilhado.consultar(chave, calcular, dependencias)
+
+    def metricas_cache(self) -> dict:
+        """ Acertos, falhas e ocupação do cache de consultas dos controllers. """
+
+        return cache_compartilhado.metricas()
+
+    @staticmethod
+    def _campos_busca(responsavel: Responsavel) -> tuple:
+        """ Campos de um responsável usados na busca incremental (nome, CPF e setor). """
+
+        return (responsavel.get_nome(), responsavel.get_cpf(), responsavel.get_setor())
+
+    def indexar_busca(self, responsaveis: List[Responsavel]) -> None:
+        """ Monta o índice da busca incremental com os responsáveis exibidos na listagem. """
+
+        self._indice_busca = IndiceBusca((r.get_cpf(), self._campos_busca(r)) for r in responsaveis)
+
+    def buscar_incremental(self, texto: str) -> List[str]:
+        """
+        Retorna, na ordem da listagem, os CPFs dos responsáveis indexados cujo nome,
+        CPF ou setor começam com as palavras digitadas.
+        """
+
+        if self._indice_busca is None:
+            self.indexar_busca(self.listar_responsaveis())
+        return self._indice_busca.buscar(texto)
     
+    def _obter_indice_nomes(self) -> IndiceTrigramas:
+        """ Retorna o índice de trigramas dos nomes, remontando-o se os responsáveis foram alterados. """
+
+        versao = self._responsavel_dao.versao_dados()
+        if self._indice_nomes is None or versao != self._versao_indice_nomes:
+            responsaveis = self._responsavel_dao.listar_todos()
+            self._responsaveis_por_cpf = {r.get_cpf(): r for r in responsaveis}
+            self._indice_nomes = IndiceTrigramas((r.get_cpf(), r.get_nome()) for r in responsaveis)
+            self._versao_indice_nomes = versao
+        return self._indice_nomes
+
+    def buscar_responsaveis_por_nome(self, texto: str, limite: int = 10) -> List[Responsavel]:
+        """
+        Busca aproximada de responsáveis pelo nome, sem diferenciar acentos e
+        maiúsculas ('joao silva' encontra 'João da Silva') e tolerando erros de
+        digitação. Retorna até 'limite' responsáveis, do mais ao menos parecido.
+        """
+
+        try:
+            indice = self._obter_indice_nomes()
+            return [self._responsaveis_por_cpf[cpf] for cpf, _ in indice.buscar(texto, limite)]
+        except Exception as e:
+            print(f"Erro ao buscar responsáveis por nome: {e}")
+            return []
+
+    def sugerir_responsaveis(self, texto: str, limite: int = 10) -> List[Responsavel]:
+        """
+        Sugestões para o campo de escolha de responsável enquanto o usuário digita.
+        Texto só com dígitos (e pontuação de CPF) é buscado como prefixo do CPF
+        pelo índice de CPFs; qualquer outro texto é buscado pelo nome.
+        """
+
+        texto = texto.strip()
+        digitos = ''.join(c for c in texto if c.isdigit())
+        if digitos and all(c.isdigit() or c in '.-' for c in texto):
+            try:
+                return self._responsavel_dao.buscar_por_prefixo_cpf(digitos, limite)
+            except Exception as e:
+                print(f"Erro ao buscar responsáveis por CPF: {e}")
+                return []
+        return self.buscar_responsaveis_por_nome(texto, limite)
+
+    def possui_responsaveis(self) -> bool:
+        """ Verifica se há algum responsável cadastrado (sem carregar os responsáveis). """
+
+        try:
+            return bool(self._responsavel_dao.listar_cpfs())
+        except Exception as e:
+            print(f"Erro ao verificar responsáveis: {e}")
+            return False
+
     def cadastrar_responsavel(self, cpf: str, nome: str, telefone: str, setor: str) -> bool:
         """ Cadastra um novo responsável. """
 
@@ -52,6 +189,9 @@ class ResponsavelController:
             
             # Salva o responsável
             self._responsavel_dao.salvar(responsavel)
+
+            if self._indice_busca is not None:
+                self._indice_busca.adicionar(responsavel.get_cpf(), self._campos_busca(responsavel))
             
             return True
             
@@ -63,10 +203,23 @@ class ResponsavelController:
         """ Lista todos os responsáveis cadastrados. """
 
         try:
-            return self._responsavel_dao.listar_todos()
+            return self._consultar_cache('listar_responsaveis', (), self._responsavel_dao.listar_todos,
+                                         eventos.RESPONSAVEIS)
         except Exception as e:
             print(f"Erro ao listar responsáveis: {e}")
             return []
+
+    def listar_opcoes_responsaveis(self) -> dict:
+        """ Opções dos filtros por responsável: "Nome - CPF" -> CPF, na ordem do cadastro. """
+
+        def calcular():
+            return {f"{r.get_nome()} - {r.get_cpf()}": r.get_cpf() for r in self._responsavel_dao.listar_todos()}
+
+        try:
+            return self._consultar_cache('listar_opcoes_responsaveis', (), calcular, eventos.RESPONSAVEIS)
+        except Exception as e:
+            print(f"Erro ao listar responsáveis: {e}")
+            return {}
     
     def buscar_responsavel(self, cpf: str) -> Optional[Responsavel]:
         """ Busca um responsável pelo CPF. """
@@ -103,6 +256,9 @@ class ResponsavelController:
             
             # Remove o responsável
             self._responsavel_dao.remover(responsavel)
+
+            if self._indice_busca is not None:
+                self._indice_busca.remover(responsavel.get_cpf())
             return True
             
         except Exception as e:
@@ -127,6 +283,9 @@ class ResponsavelController:
             
             # Atualiza o responsável
             self._responsavel_dao.atualizar(novo_responsavel)
+
+            if self._indice_busca is not None:
+                self._indice_busca.atualizar(novo_responsavel.get_cpf(), self._campos_busca(novo_responsavel))
             
             return True
             
@@ -146,14 +305,11 @@ class ResponsavelController:
     def obter_setores_disponiveis(self) -> List[str]:
         """ Retorna lista de setores únicos dos responsáveis cadastrados. """
 
+        def calcular():
+            return sorted({r.get_setor() for r in self._responsavel_dao.listar_todos()})
+
         try:
-            responsaveis = self.listar_responsaveis()
-            setores = set()
-            
-            for responsavel in responsaveis:
-                setores.add(responsavel.get_setor())
-            
-            return sorted(list(setores))
+            return self._consultar_cache('obter_setores_disponiveis', (), calcular, eventos.RESPONSAVEIS)
             
         except Exception as e:
             print(f"Erro ao obter setores: {e}")
@@ -162,42 +318,107 @@ class ResponsavelController:
     def filtrar_responsaveis_por_setor(self, setor: str) -> List[Responsavel]:
         """ Filtra responsáveis por setor. """
 
+        def calcular():
+            return [r for r in self._responsavel_dao.listar_todos() if r.get_setor() == setor]
+
         try:
-            responsaveis = self.listar_responsaveis()
-            responsaveis_filtrados = []
-            
-            for responsavel in responsaveis:
-                if responsavel.get_setor() == setor:
-                    responsaveis_filtrados.append(responsavel)
-            
-            return responsaveis_filtrados
+            return self._consultar_cache('filtrar_responsaveis_por_setor', (setor,), calcular,
+                                         eventos.RESPONSAVEIS)
             
         except Exception as e:
             print(f"Erro ao filtrar responsáveis por setor: {e}")
             return []
         
-    def gerar_relatorio(self, responsaveis: List[Responsavel] = None, arquivo: str = None, formato: str = "csv") -> str:
-        """ Gera relatório dos responsáveis em formato especificado. """
+    def gerar_relatorio(self, responsaveis: List[Responsavel] = None, arquivo: str = None, formato: str = "csv",
+                        progresso=None, contagem_bombonas: dict = None,
+                        desde: datetime = None, ate: datetime = None) -> str:
+        """
+        Gera relatório dos responsáveis em formato especificado ('csv', 'pdf',
+        'xlsx', 'html', 'parquet' ou 'arrow'; os dois últimos precisam do pyarrow).
+        O XLSX traz a planilha dos responsáveis e uma de resumo por setor.
+
+        Sem 'responsaveis', o relatório completo fica guardado no cache de
+        relatórios: um pedido igual, sem alteração nos dados (de responsáveis e
+        de bombonas, por causa da contagem), é atendido com uma cópia do arquivo.
+
+        'progresso', se informado, é chamado com (linhas gravadas, total) durante a
+        geração do PDF, do XLSX, do HTML e dos formatos colunares.
+        'contagem_bombonas' (CPF -> quantidade) evita reler as bombonas quando já foram carregadas.
+
+        Com 'desde' (e opcionalmente 'ate'), gera o relatório de alterações:
+        responsáveis incluídos, alterados e removidos no período, lidos do registro
+        de alterações (só 'csv' ou 'pdf').
+        """
 
         try:
-            # Se não passou responsáveis, usa todos
+            formato = formato.lower()
+
+            if desde is not None:
+                if formato not in FORMATOS_ALTERACOES:
+                    raise ValueError("O relatório de alterações é gerado em 'csv' ou 'pdf'")
+                return self._gerar_relatorio_alteracoes(arquivo, formato, desde, ate, progresso)
+
+            if formato not in ("csv", "pdf", "xlsx", "html") and formato not in FORMATOS_COLUNARES:
+                raise ValueError("Formatos suportados: 'csv', 'pdf', 'xlsx', 'html', 'parquet' ou 'arrow'")
+            if formato != "csv" and not arquivo:
+                raise ValueError(f"Caminho do arquivo é obrigatório para {formato.upper()}")
+
+            # CSV compactado (.csv.gz) é guardado no cache separado do CSV simples
+            compressao = compressao_do_arquivo(arquivo) if formato == "csv" else None
+            formato_cache = f"{formato}.{compressao}" if compressao else formato
+
+            chave_cache = None
             if responsaveis is None:
+                # O HTML reaproveita as próprias páginas (não passa pelo cache de arquivos)
+                if arquivo and formato != "html":
+                    chave_cache = self._chave_relatorio(formato_cache)
+                    if self._cache_relatorios.obter(chave_cache, formato_cache, arquivo):
+                        return arquivo
                 responsaveis = self.listar_responsaveis()
 
-            if formato.lower() == "csv":
-                return self._gerar_csv(responsaveis, arquivo)
-            elif formato.lower() == "pdf":
-                if not arquivo:
-                    raise ValueError("Caminho do arquivo é obrigatório para PDF")
-                return self._gerar_pdf(responsaveis, arquivo)
+            if formato == "csv":
+                arquivo_gerado = self._gerar_csv(responsaveis, arquivo, contagem_bombonas)
+            elif formato == "pdf":
+                arquivo_gerado = self._gerar_pdf(responsaveis, arquivo, progresso, contagem_bombonas)
+            elif formato == "xlsx":
+                arquivo_gerado = self._gerar_xlsx(responsaveis, arquivo, progresso, contagem_bombonas)
+            elif formato == "html":
+                arquivo_gerado = self._gerar_html(responsaveis, arquivo, progresso, contagem_bombonas)
             else:
-                raise ValueError("Formatos suportados: 'csv' ou 'pdf'")
+                arquivo_gerado = self._gerar_colunar(responsaveis, arquivo, formato, progresso, contagem_bombonas)
+
+            if chave_cache:
+                self._cache_relatorios.guardar(chave_cache, formato_cache, arquivo_gerado)
+            return arquivo_gerado
 
         except Exception as e:
             print(f"Erro ao gerar relatório: {e}")
             raise
+
+    def _gerar_relatorio_alteracoes(self, arquivo: str, formato: str, desde: datetime, ate: datetime = None,
+                                    progresso=None) -> str:
+        """ Relatório dos responsáveis alterados no período (só lê as alterações do período). """
+
+        if not arquivo:
+            arquivo = f"data/relatorio_alteracoes_responsaveis.{formato}"
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        alteracoes = registro_compartilhado.resumir(eventos.RESPONSAVEIS, desde, ate)
+        return gerar_relatorio_alteracoes(eventos.RESPONSAVEIS, alteracoes, arquivo, formato, desde, ate, progresso)
+
+    def _chave_relatorio(self, formato: str) -> str:
+        """ Chave do relatório completo no cache: formato e versão dos dados de responsáveis e bombonas. """
+
+        versoes = (
+            type(self._bombona_dao).__name__,
+            self._bombona_dao.versao_dados(),
+            self._responsavel_dao.versao_dados()
+        )
+        return self._cache_relatorios.chave('responsaveis', formato, (), versoes)
     
-    def _gerar_csv(self, responsaveis: List[Responsavel], arquivo: str = None) -> str:
+    def _gerar_csv(self, responsaveis: List[Responsavel], arquivo: str = None, contagem: dict = None) -> str:
         """ Gera relatório CSV de responsáveis. """
 
         # Define arquivo se não especificado
@@ -207,103 +428,156 @@ class ResponsavelController:
         # Cria diretório se necessário
         os.makedirs(os.path.dirname(arquivo), exist_ok=True)
 
-        with open(arquivo, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Nome', 'CPF', 'Telefone', 'Setor', 'Qtd_Bombonas'])
-            
+        if contagem is None:
+            contagem = self._contar_bombonas_por_responsavel()
+
+        # Arquivo terminado em .gz (ou .zst) é gravado compactado
+        with EscritorCSV(arquivo) as escritor:
+            escritor.escrever_linha(['Nome', 'CPF', 'Telefone', 'Setor', 'Qtd_Bombonas'])
+            escritor.escrever_linhas(
+                (resp.get_nome(), resp.get_cpf(), resp.get_telefone(), resp.get_setor(), contagem.get(resp.get_cpf(), 0))
+                for resp in responsaveis
+            )
+
+        return arquivo
+
+    def _gerar_xlsx(self, responsaveis: List[Responsavel], arquivo: str, progresso=None,
+                    contagem: dict = None) -> str:
+        """
+        Gera o relatório XLSX dos responsáveis informados: planilha dos
+        responsáveis (com a quantidade de bombonas) e planilha de resumo por
+        setor, somado enquanto as linhas são gravadas.
+        """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        if contagem is None:
+            contagem = self._contar_bombonas_por_responsavel()
+
+        por_setor = {}  # Setor -> [responsáveis, bombonas]
+
+        def linhas_responsaveis():
             for resp in responsaveis:
-                bombonas = self._bombona_dao.buscar_por_responsavel(resp.get_cpf())
-                writer.writerow([
-                    resp.get_nome(),
-                    resp.get_cpf(),
-                    resp.get_telefone(),
-                    resp.get_setor(),
-                    len(bombonas)
-                ])
+                quantidade = contagem.get(resp.get_cpf(), 0)
+                totais = por_setor.setdefault(resp.get_setor(), [0, 0])
+                totais[0] += 1
+                totais[1] += quantidade
+                yield resp.get_nome(), resp.get_cpf(), resp.get_telefone(), resp.get_setor(), quantidade
+
+        with EscritorXLSX(arquivo) as planilhas:
+            planilhas.nova_planilha('Responsáveis', COLUNAS_XLSX)
+            planilhas.escrever_linhas(linhas_responsaveis(), progresso, len(responsaveis))
+
+            planilhas.nova_planilha('Resumo', COLUNAS_XLSX_RESUMO, cabecalho=False)
+            planilhas.escrever_linha(['Relatório de Responsáveis'], negrito=True)
+            planilhas.escrever_linha([f'Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}'])
+            planilhas.escrever_linha([])
+            planilhas.escrever_linha(['Setor', 'Responsáveis', 'Bombonas'], negrito=True)
+            for setor, (quantidade, bombonas) in sorted(por_setor.items()):
+                planilhas.escrever_linha([setor, quantidade, bombonas])
+
+            planilhas.escrever_linha([])
+            planilhas.escrever_linha(['Total', len(responsaveis), sum(b for _, b in por_setor.values())],
+                                     negrito=True)
+
+        return arquivo
+
+    def _gerar_html(self, responsaveis: List[Responsavel], arquivo: str, progresso=None,
+                    contagem: dict = None) -> str:
+        """ Gera o relatório HTML paginado de responsáveis (índice + pasta '<nome>_arquivos'). """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        if contagem is None:
+            contagem = self._contar_bombonas_por_responsavel()
+
+        publicador = PublicadorHTML(
+            arquivo, 'Relatório de Responsáveis', COLUNAS_HTML, COLUNAS_INDICE_HTML,
+            informacoes=[f'Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}']
+        )
+        return publicador.publicar(
+            ((resp.get_nome(), resp.get_cpf(), resp.get_telefone(), resp.get_setor(), contagem.get(resp.get_cpf(), 0))
+             for resp in responsaveis),
+            progresso, len(responsaveis)
+        )
+
+    def _gerar_colunar(self, responsaveis: List[Responsavel], arquivo: str, formato: str, progresso=None,
+                       contagem: dict = None) -> str:
+        """ Gera relatório de responsáveis em Parquet ou Arrow IPC, em lotes. """
+
+        pasta = os.path.dirname(arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        if contagem is None:
+            contagem = self._contar_bombonas_por_responsavel()
+
+        with ExportadorColunar(arquivo, COLUNAS_COLUNARES, formato) as exportador:
+            exportador.escrever_linhas(
+                ((resp.get_nome(), resp.get_cpf(), resp.get_telefone(), resp.get_setor(), contagem.get(resp.get_cpf(), 0))
+                 for resp in responsaveis),
+                progresso, len(responsaveis)
+            )
 
         return arquivo
     
-    def _gerar_pdf(self, responsaveis: List[Responsavel], arquivo: str) -> str:
-        """ Gera relatório PDF de responsáveis. """
+    @staticmethod
+    def _formatar_cpf(cpf: str) -> str:
+        """ CPF no formato 123.456.789-10. """
 
-        if FPDF is None:
-            raise ImportError("Biblioteca FPDF não encontrada. Instale com: pip install fpdf2")
-        
-        def sanitizar_texto(texto):
-            if not texto:
-                return texto
-            nfd = unicodedata.normalize('NFD', texto)
-            return nfd.encode('ascii', 'ignore').decode('ascii')
-        
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 16)
-        
-        # Título
-        pdf.cell(0, 10, "RELATORIO COMPLETO DE RESPONSAVEIS", ln=True, align='C')
-        pdf.ln(5)
-        
-        # Total
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 8, f"Total de responsaveis: {len(responsaveis)}", ln=True)
-        pdf.ln(5)
-        
-        # Cabeçalho da tabela
-        pdf.set_font('Arial', 'B', 10)
-        pdf.cell(50, 8, 'Nome', 1, 0, 'C')
-        pdf.cell(35, 8, 'CPF', 1, 0, 'C')
-        pdf.cell(35, 8, 'Telefone', 1, 0, 'C')
-        pdf.cell(35, 8, 'Setor', 1, 0, 'C')
-        pdf.cell(25, 8, 'Bombonas', 1, 1, 'C')
-        
-        # Dados
-        pdf.set_font('Arial', '', 9)
+        return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+    @staticmethod
+    def _formatar_telefone(telefone: str) -> str:
+        """ Telefone no formato (11) 9 1234-5678 ou (11) 1234-5678. """
+
+        if len(telefone) == 11:
+            return f"({telefone[:2]}) {telefone[2]} {telefone[3:7]}-{telefone[7:]}"
+        elif len(telefone) == 10:
+            return f"({telefone[:2]}) {telefone[2:6]}-{telefone[6:]}"
+        return telefone
+
+    def _contar_bombonas_por_responsavel(self) -> Counter:
+        """ Quantidade de bombonas de cada CPF, numa única leitura das bombonas. """
+
+        return Counter(cpf for _, _, _, cpf in self._bombona_dao.iterar_registros())
+
+    def _linhas_pdf(self, responsaveis: List[Responsavel], contagem: dict = None):
+        """ Valores das linhas da tabela do PDF, gerados sob demanda. """
+
+        if contagem is None:
+            contagem = self._contar_bombonas_por_responsavel()
         for resp in responsaveis:
-            bombonas = self._bombona_dao.buscar_por_responsavel(resp.get_cpf())
-            
-            # Sanitizar textos
-            nome_limpo = sanitizar_texto(resp.get_nome())
-            setor_limpo = sanitizar_texto(resp.get_setor())
-            
-            # Truncar se necessário
-            nome_limpo = (nome_limpo[:22] + "...") if len(nome_limpo) > 22 else nome_limpo
-            setor_limpo = (setor_limpo[:15] + "...") if len(setor_limpo) > 15 else setor_limpo
-            
-            # Formatar CPF e telefone
-            cpf = resp.get_cpf()
-            cpf_formatado = f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+            yield (
+                resp.get_nome(),
+                self._formatar_cpf(resp.get_cpf()),
+                self._formatar_telefone(resp.get_telefone()),
+                resp.get_setor(),
+                str(contagem.get(resp.get_cpf(), 0))
+            )
+
+    def _gerar_pdf(self, responsaveis: List[Responsavel], arquivo: str, progresso=None, contagem: dict = None) -> str:
+        """ Gera relatório PDF de responsáveis, gravando cada página assim que fica pronta. """
+
+        with MotorPDF(arquivo, progresso) as pdf:
+            # Título
+            pdf.texto("RELATÓRIO COMPLETO DE RESPONSÁVEIS", 'B', 16, 10, 'C')
+            pdf.espaco(5)
             
-            telefone = resp.get_telefone()
-            if len(telefone) == 11:
-                tel_formatado = f"({telefone[:2]}) {telefone[2]} {telefone[3:7]}-{telefone[7:]}"
-            elif len(telefone) == 10:
-                tel_formatado = f"({telefone[:2]}) {telefone[2:6]}-{telefone[6:]}"
-            else:
-                tel_formatado = telefone
+            # Total
+            pdf.texto(f"Total de responsáveis: {len(responsaveis)}", 'B', 12, 8)
+            pdf.espaco(5)
             
-            pdf.cell(50, 6, nome_limpo, 1, 0, 'L')
-            pdf.cell(35, 6, cpf_formatado, 1, 0, 'C')
-            pdf.cell(35, 6, tel_formatado, 1, 0, 'C')
-            pdf.cell(35, 6, setor_limpo, 1, 0, 'L')
-            pdf.cell(25, 6, str(len(bombonas)), 1, 1, 'C')
+            # Tabela (cabeçalho repetido a cada página)
+            pdf.tabela(TABELA_PDF, self._linhas_pdf(responsaveis, contagem), len(responsaveis))
             
-            # Nova página se necessário
-            if pdf.get_y() > 250:
-                pdf.add_page()
-                pdf.set_font('Arial', 'B', 10)
-                pdf.cell(50, 8, 'Nome', 1, 0, 'C')
-                pdf.cell(35, 8, 'CPF', 1, 0, 'C')
-                pdf.cell(35, 8, 'Telefone', 1, 0, 'C')
-                pdf.cell(35, 8, 'Setor', 1, 0, 'C')
-                pdf.cell(25, 8, 'Bombonas', 1, 1, 'C')
-                pdf.set_font('Arial', '', 9)
-        
-        # Rodapé
-        pdf.ln(10)
-        pdf.set_font('Arial', 'I', 8)
-        data_geracao = datetime.now().strftime("%d/%m/%Y as %H:%M:%S")
-        pdf.cell(0, 6, f"Relatorio gerado em {data_geracao}", ln=True, align='L')
+            # Rodapé
+            pdf.espaco(10)
+            data_geracao = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
+            pdf.texto(f"Relatório gerado em {data_geracao}", 'I', 8, 6)
         
-        pdf.output(arquivo)
         return arquivo
-    
\ No newline at end of file
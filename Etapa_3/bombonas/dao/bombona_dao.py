@@ -4,8 +4,11 @@ Implementação do DAO para Bombona usando arquivo CSV
 
 import csv
 import os
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from dao import eventos
 from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
+from dao.indice_offsets import IndiceOffsets
+from dao.snapshot_binario import SnapshotBinario
 from models.bombona import Bombona
 
 
@@ -18,6 +21,8 @@ class BombonaDAO(BombonaDAOInterface):
         """ Inicializa o DAO da Bombona. """
 
         self.arquivo_csv = arquivo_csv
+        self._snapshot = SnapshotBinario(arquivo_csv)
+        self._indice_codigos = IndiceOffsets(arquivo_csv)
         self._criar_arquivo_se_nao_existir()
     
     def _criar_arquivo_se_nao_existir(self) -> None:
@@ -32,65 +37,116 @@ class BombonaDAO(BombonaDAOInterface):
                 writer = csv.writer(arquivo)
                 writer.writerow(['codigo', 'volume', 'tipo_residuo', 'cpf_responsavel'])
     
+    def _ler_registros(self) -> List[tuple]:
+        """
+        Lê os registros (codigo, volume, tipo_residuo, cpf_responsavel) do arquivo.
+        Usa o snapshot binário quando ele está atualizado e, caso contrário,
+        lê o CSV e regrava o snapshot.
+        """
+
+        registros = self._snapshot.carregar()
+        if registros is not None:
+            return registros
+        
+        registros = []
+        with open(self.arquivo_csv, 'r', encoding='utf-8') as arquivo:
+            reader = csv.DictReader(arquivo)
+            for linha in reader:
+                if linha['codigo']:
+                    registros.append((
+                        linha['codigo'],
+                        float(linha['volume']),
+                        linha['tipo_residuo'],
+                        linha['cpf_responsavel']
+                    ))
+        
+        self._snapshot.salvar(registros)
+        return registros
+    
     def _carregar_bombonas(self) -> List[Bombona]:
         # Importação temporária de ResponsavelDAO para resolver a referência de CPFs no .csv
         from dao.responsavel_dao import ResponsavelDAO
         responsavel_dao = ResponsavelDAO()
         
+        # Carrega os responsáveis uma única vez (evita reler o CSV a cada bombona)
+        responsaveis = {r.get_cpf(): r for r in responsavel_dao.listar_todos()}
+        
         bombonas = []
         
         try:
-            with open(self.arquivo_csv, 'r', encoding='utf-8') as arquivo:
-                reader = csv.DictReader(arquivo)
-                for linha in reader:
-                    if linha['codigo']:
-                        # Como cadastro sempre vincula responsável, 
-                        # CPF sempre existirá e será válido
-                        responsavel = responsavel_dao.buscar_por_cpf(linha['cpf_responsavel'])
-                        
-                        # Se responsável não existir, é erro de dados
-                        if not responsavel:
-                            print(f"ERRO: Responsável {linha['cpf_responsavel']} não encontrado para bombona {linha['codigo']}")
-                            continue  # Pula esta bombona
-                        
-                        bombona = Bombona(
-                            codigo=linha['codigo'],
-                            volume=float(linha['volume']),
-                            tipo_residuo=linha['tipo_residuo'],
-                            responsavel=responsavel  # Sempre terá responsável
-                        )
-                        bombonas.append(bombona)
+            for codigo, volume, tipo_residuo, cpf_responsavel in self._ler_registros():
+                # Como cadastro sempre vincula responsável, 
+                # CPF sempre existirá e será válido
+                responsavel = responsaveis.get(cpf_responsavel)
+                
+                # Se responsável não existir, é erro de dados
+                if not responsavel:
+                    print(f"ERRO: Responsável {cpf_responsavel} não encontrado para bombona {codigo}")
+                    continue  # Pula esta bombona
+                
+                bombona = Bombona(
+                    codigo=codigo,
+                    volume=volume,
+                    tipo_residuo=tipo_residuo,
+                    responsavel=responsavel  # Sempre terá responsável
+                )
+                bombonas.append(bombona)
         except Exception as e:
             print(f"Erro ao carregar bombonas: {e}")
             return []
         
         return bombonas
     
-    def _salvar_bombonas(self, bombonas: List[Bombona]) -> None:
-        """ Salva todas as bombonas no arquivo CSV. """
+    @staticmethod
+    def _registro(bombona: Bombona) -> tuple:
+        """ Converte uma bombona no registro gravado (codigo, volume, tipo_residuo, cpf_responsavel). """
+
+        # Extrai o CPF do responsável
+        cpf_responsavel = ''
+        if bombona.get_responsavel():
+            cpf_responsavel = bombona.get_responsavel().get_cpf()
+        elif hasattr(bombona, '_cpf_responsavel'):
+            cpf_responsavel = bombona._cpf_responsavel
+        
+        return (
+            bombona.get_codigo(),
+            bombona.get_volume(),
+            bombona.get_tipo_residuo(),
+            cpf_responsavel
+        )
+    
+    def _salvar_bombonas(self, bombonas: List[Bombona], incluidas: List[Bombona] = (),
+                         atualizadas: List[Bombona] = (), removidos: List[str] = ()) -> None:
+        """
+        Salva todas as bombonas no arquivo CSV, atualiza o snapshot binário e o
+        filtro de códigos e publica as bombonas incluídas, atualizadas e removidas
+        nesta escrita.
+        """
 
+        registros = [self._registro(bombona) for bombona in bombonas]
+        
+        assinatura_anterior = self._indice_codigos.assinatura()
+        
         try:
             with open(self.arquivo_csv, 'w', newline='', encoding='utf-8') as arquivo:
                 writer = csv.writer(arquivo)
                 writer.writerow(['codigo', 'volume', 'tipo_residuo', 'cpf_responsavel'])
-                
-                for bombona in bombonas:
-                    # Extrai o CPF do responsável
-                    cpf_responsavel = ''
-                    if bombona.get_responsavel():
-                        cpf_responsavel = bombona.get_responsavel().get_cpf()
-                    elif hasattr(bombona, '_cpf_responsavel'):
-                        cpf_responsavel = bombona._cpf_responsavel
-                    
-                    writer.writerow([
-                        bombona.get_codigo(),
-                        bombona.get_volume(),
-                        bombona.get_tipo_residuo(),
-                        cpf_responsavel
-                    ])
+                writer.writerows(registros)
         except Exception as e:
             print(f"Erro ao salvar bombonas: {e}")
             raise
+        
+        self._snapshot.salvar(registros)
+        self._indice_codigos.registrar_escrita(assinatura_anterior, [b.get_codigo() for b in incluidas])
+        
+        eventos.publicar(
+            eventos.BOMBONAS,
+            assinatura_anterior,
+            self._indice_codigos.assinatura(),
+            incluidos=(self._registro(b) for b in incluidas),
+            atualizados=(self._registro(b) for b in atualizadas),
+            removidos=removidos
+        )
     
     def salvar(self, bombona: Bombona) -> None:
         """ Salva uma bombona no repositório. """
@@ -105,22 +161,95 @@ class BombonaDAO(BombonaDAOInterface):
         
         # Adiciona a nova bombona e salva
         bombonas_existentes.append(bombona)
-        self._salvar_bombonas(bombonas_existentes)
-    
+        self._salvar_bombonas(bombonas_existentes, incluidas=[bombona])
+
+    def salvar_em_lote(self, bombonas: List[Bombona]) -> None:
+        """ Salva várias bombonas novas com uma única leitura e uma única escrita do arquivo. """
+
+        bombonas_existentes = self._carregar_bombonas()
+        codigos_existentes = {b.get_codigo() for b in bombonas_existentes}
+
+        codigos_novos = [b.get_codigo() for b in bombonas]
+        if len(set(codigos_novos)) != len(codigos_novos):
+            raise ValueError("Há códigos repetidos entre as bombonas informadas")
+
+        repetidos = [c for c in codigos_novos if c in codigos_existentes]
+        if repetidos:
+            raise ValueError(f"Já existem bombonas com os códigos: {', '.join(repetidos)}")
+
+        if not bombonas:
+            return
+
+        self._salvar_bombonas(bombonas_existentes + list(bombonas), incluidas=bombonas)
+
     def listar_todas(self) -> List[Bombona]:
         """ Lista todas as bombonas. """
 
         return self._carregar_bombonas()
-    
+
+    def iterar_registros(self) -> Iterator[tuple]:
+        """ Percorre os registros lendo o CSV linha a linha (sem snapshot nem lista em memória). """
+
+        with open(self.arquivo_csv, 'r', newline='', encoding='utf-8') as arquivo:
+            reader = csv.reader(arquivo)
+            next(reader, None)  # cabeçalho
+            for linha in reader:
+                if linha and linha[0]:
+                    yield linha[0], float(linha[1]), linha[2], linha[3]
+
+    def listar_codigos(self) -> List[str]:
+        """ Lista os códigos de todas as bombonas, em ordem crescente (via índice de códigos). """
+
+        return self._indice_codigos.chaves()
+
     def buscar_por_codigo(self, codigo: str) -> Optional[Bombona]:
-        """ Busca uma bombona pelo código. """
+        """ Busca uma bombona pelo código lendo apenas a sua linha (via índice de códigos). """
+
+        linha = self._indice_codigos.buscar(codigo)
+        if not linha:
+            return None
+        
+        from dao.responsavel_dao import ResponsavelDAO
+        codigo, volume, tipo_residuo, cpf_responsavel = linha
+        
+        responsavel = ResponsavelDAO().buscar_por_cpf(cpf_responsavel)
+        if not responsavel:
+            print(f"ERRO: Responsável {cpf_responsavel} não encontrado para bombona {codigo}")
+            return None
+        
+        return Bombona(codigo, float(volume), tipo_residuo, responsavel)
+
+    def _montar_de_linhas(self, linhas: List[List[str]]) -> List[Bombona]:
+        """ Cria as bombonas de linhas lidas pelo índice, buscando cada responsável uma única vez. """
+
+        from dao.responsavel_dao import ResponsavelDAO
+        responsavel_dao = ResponsavelDAO()
+        responsaveis = {}
+
+        bombonas = []
+        for codigo, volume, tipo_residuo, cpf_responsavel in linhas:
+            if cpf_responsavel not in responsaveis:
+                responsaveis[cpf_responsavel] = responsavel_dao.buscar_por_cpf(cpf_responsavel)
+
+            responsavel = responsaveis[cpf_responsavel]
+            if not responsavel:
+                print(f"ERRO: Responsável {cpf_responsavel} não encontrado para bombona {codigo}")
+                continue
+
+            bombonas.append(Bombona(codigo, float(volume), tipo_residuo, responsavel))
+
+        return bombonas
+
+    def buscar_por_prefixo(self, prefixo: str) -> List[Bombona]:
+        """ Busca as bombonas cujo código começa com o prefixo, lendo apenas as linhas encontradas no índice. """
+
+        return self._montar_de_linhas(self._indice_codigos.buscar_prefixo(prefixo))
+
+    def buscar_intervalo(self, codigo_inicial: str, codigo_final: str) -> List[Bombona]:
+        """ Busca as bombonas com código no intervalo (inclusive), lendo apenas as linhas encontradas no índice. """
+
+        return self._montar_de_linhas(self._indice_codigos.buscar_intervalo(codigo_inicial, codigo_final))
 
-        bombonas = self._carregar_bombonas()
-        for bombona in bombonas:
-            if bombona.get_codigo() == codigo:
-                return bombona
-        return None
-    
     def buscar_por_responsavel(self, cpf: str) -> List[Bombona]:
         """ Busca bombonas por CPF do responsável. """
 
@@ -145,7 +274,8 @@ class BombonaDAO(BombonaDAOInterface):
 
         bombonas = self._carregar_bombonas()
         bombonas_filtradas = [b for b in bombonas if b.get_codigo() != bombona.get_codigo()]
-        self._salvar_bombonas(bombonas_filtradas)
+        removidos = [bombona.get_codigo()] if len(bombonas_filtradas) < len(bombonas) else []
+        self._salvar_bombonas(bombonas_filtradas, removidos=removidos)
     
     def atualizar(self, bombona: Bombona) -> None:
         """ Atualiza os dados de uma bombona. """
@@ -154,11 +284,97 @@ class BombonaDAO(BombonaDAOInterface):
         for i, b in enumerate(bombonas):
             if b.get_codigo() == bombona.get_codigo():
                 bombonas[i] = bombona
-                self._salvar_bombonas(bombonas)
+                self._salvar_bombonas(bombonas, atualizadas=[bombona])
                 return
         raise ValueError(f"Bombona com código {bombona.get_codigo()} não encontrada")
     
+    def transferir_bombonas(self, cpf_origem: str, responsavel_destino, codigos: List[str] = None) -> List[str]:
+        """
+        Transfere bombonas de um responsável para outro com uma única leitura
+        e uma única escrita do arquivo. Se 'codigos' não for informado, todas as
+        bombonas do responsável de origem são transferidas.
+        """
+
+        bombonas = self._carregar_bombonas()
+        
+        # Bombonas atualmente vinculadas ao responsável de origem
+        do_responsavel = {
+            b.get_codigo(): b for b in bombonas
+            if b.get_responsavel() and b.get_responsavel().get_cpf() == cpf_origem
+        }
+        
+        if codigos is None:
+            codigos = list(do_responsavel.keys())
+        else:
+            nao_encontradas = [c for c in codigos if c not in do_responsavel]
+            if nao_encontradas:
+                raise ValueError(f"Bombonas não pertencem ao responsável {cpf_origem}: "
+                                 f"{', '.join(nao_encontradas)}")
+        
+        if not codigos:
+            return []
+        
+        for codigo in codigos:
+            do_responsavel[codigo].set_responsavel(responsavel_destino)
+        
+        self._salvar_bombonas(bombonas, atualizadas=[do_responsavel[c] for c in codigos])
+        return list(codigos)
+    
+    def atualizar_em_lote(self, codigos: List[str], volume: float = None,
+                          tipo_residuo: str = None, responsavel=None) -> List[str]:
+        """
+        Aplica a mesma alteração a várias bombonas com uma única leitura e uma
+        única escrita do arquivo. Campos não informados (None) são mantidos.
+        """
+
+        bombonas = self._carregar_bombonas()
+        por_codigo = {b.get_codigo(): b for b in bombonas}
+        
+        nao_encontradas = [c for c in codigos if c not in por_codigo]
+        if nao_encontradas:
+            raise ValueError(f"Bombonas não encontradas: {', '.join(nao_encontradas)}")
+        
+        if not codigos:
+            return []
+        
+        for codigo in codigos:
+            bombona = por_codigo[codigo]
+            if volume is not None:
+                bombona.set_volume(volume)
+            if tipo_residuo is not None:
+                bombona.set_tipo_residuo(tipo_residuo)
+            if responsavel is not None:
+                bombona.set_responsavel(responsavel)
+        
+        self._salvar_bombonas(bombonas, atualizadas=[por_codigo[c] for c in codigos])
+        return list(codigos)
+    
+    def remover_em_lote(self, codigos: List[str]) -> List[str]:
+        """ Remove várias bombonas com uma única leitura e uma única escrita do arquivo. """
+
+        bombonas = self._carregar_bombonas()
+        existentes = {b.get_codigo() for b in bombonas}
+        
+        nao_encontradas = [c for c in codigos if c not in existentes]
+        if nao_encontradas:
+            raise ValueError(f"Bombonas não encontradas: {', '.join(nao_encontradas)}")
+        
+        if not codigos:
+            return []
+        
+        remover = set(codigos)
+        self._salvar_bombonas([b for b in bombonas if b.get_codigo() not in remover], removidos=codigos)
+        return list(codigos)
+    
     def existe_codigo(self, codigo: str) -> bool:
-        """ Verifica se existe uma bombona com o código informado. """
+        """
+        Verifica se existe uma bombona com o código informado.
+        Códigos novos (caso mais comum) são descartados pelo filtro de Bloom sem acessar o arquivo.
+        """
         
-        return self.buscar_por_codigo(codigo) is not None
+        return self._indice_codigos.contem(codigo)
+
+    def versao_dados(self) -> tuple:
+        """ Retorna a versão dos dados: (tamanho, mtime) do arquivo CSV. """
+
+        return self._indice_codigos.assinatura()
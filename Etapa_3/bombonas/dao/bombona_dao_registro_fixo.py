@@ -0,0 +1,479 @@
+"""
+Implementação do DAO para Bombona usando arquivo de registros de tamanho fixo
+"""
+
+import csv
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional
+from dao import eventos
+from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
+from models.bombona import Bombona
+
+# Layout do registro (em bytes):
+#   situação (1) | código (7) | volume (9) | tipo de resíduo (16) | CPF (11) | '\n' (1)
+TAM_CODIGO = 7          # LLL-111
+TAM_VOLUME = 9          # até 10000.00
+TAM_TIPO = 16           # tipo de resíduo em UTF-8, completado com espaços
+TAM_CPF = 11            # apenas dígitos
+TAM_REGISTRO = 1 + TAM_CODIGO + TAM_VOLUME + TAM_TIPO + TAM_CPF + 1
+
+REGISTRO_ATIVO = b'A'
+REGISTRO_LIVRE = b'L'
+
+# Registros lidos por vez na leitura sequencial (cerca de 180 KB por bloco)
+REGISTROS_POR_BLOCO = 4096
+
+
+class BombonaDAORegistroFixo(BombonaDAOInterface):
+    """
+    Implementação opcional do DAO para Bombona usando um arquivo de registros de
+    tamanho fixo. Um diretório em memória (código -> posição do registro) permite
+    que atualizações e remoções sejam feitas no próprio registro, com um único
+    seek + write, sem reescrever o arquivo inteiro.
+
+    Registros removidos são apenas marcados como livres e reaproveitados pelos
+    próximos cadastros; a função compactar() elimina os espaços livres.
+    """
+
+    def __init__(self, arquivo: str = "data/bombonas.dat"):
+        """ Inicializa o DAO e monta o diretório de registros. """
+
+        self.arquivo = arquivo
+        self._diretorio: Dict[str, int] = {}
+        self._livres: List[int] = []
+        self._codigos_ordenados: Optional[List[str]] = None
+        self._assinatura = None
+        self._criar_arquivo_se_nao_existir()
+        self._indexar()
+
+    def _criar_arquivo_se_nao_existir(self) -> None:
+        """ Cria o arquivo de registros se ele não existir. """
+
+        if not os.path.exists(self.arquivo):
+            # Cria o diretório se não existir
+            os.makedirs(os.path.dirname(self.arquivo) or '.', exist_ok=True)
+            open(self.arquivo, 'wb').close()
+
+    def _assinatura_arquivo(self) -> tuple:
+        """ Retorna (tamanho, mtime) do arquivo para detectar alterações externas. """
+
+        info = os.stat(self.arquivo)
+        return (info.st_size, info.st_mtime_ns)
+
+    def _indexar(self) -> None:
+        """ Percorre o arquivo montando o diretório de códigos e a lista de registros livres. """
+
+        self._diretorio = {}
+        self._livres = []
+        self._codigos_ordenados = None
+
+        with open(self.arquivo, 'rb') as arquivo:
+            slot = 0
+            while True:
+                registro = arquivo.read(TAM_REGISTRO)
+                if len(registro) < TAM_REGISTRO:
+                    break
+                if registro[:1] == REGISTRO_ATIVO:
+                    self._diretorio[registro[1:1 + TAM_CODIGO].decode('ascii')] = slot
+                else:
+                    self._livres.append(slot)
+                slot += 1
+
+        # Reaproveita primeiro os registros livres do início do arquivo
+        self._livres.reverse()
+        self._assinatura = self._assinatura_arquivo()
+
+    def _garantir_diretorio_atualizado(self) -> None:
+        """ Remonta o diretório se o arquivo foi alterado por outro processo. """
+
+        if self._assinatura_arquivo() != self._assinatura:
+            self._indexar()
+
+    @staticmethod
+    def _codificar(codigo: str, volume: float, tipo_residuo: str, cpf: str) -> bytes:
+        """ Converte os campos de uma bombona em um registro de tamanho fixo. """
+
+        campo_codigo = codigo.encode('ascii')
+        campo_volume = f"{volume:>{TAM_VOLUME}.2f}".encode('ascii')
+        campo_tipo = tipo_residuo.encode('utf-8')
+        campo_cpf = cpf.encode('ascii')
+
+        if len(campo_codigo) != TAM_CODIGO:
+            raise ValueError(f"Código {codigo} fora do padrão LLL-111")
+        if len(campo_volume) != TAM_VOLUME:
+            raise ValueError(f"Volume {volume} não cabe no registro")
+        if len(campo_tipo) > TAM_TIPO:
+            raise ValueError(f"Tipo de resíduo {tipo_residuo} não cabe no registro")
+        if len(campo_cpf) != TAM_CPF:
+            raise ValueError(f"CPF {cpf} deve conter exatamente 11 dígitos")
+
+        return (REGISTRO_ATIVO + campo_codigo + campo_volume
+                + campo_tipo.ljust(TAM_TIPO, b' ') + campo_cpf + b'\n')
+
+    @staticmethod
+    def _decodificar(registro: bytes) -> tuple:
+        """ Converte um registro em (codigo, volume, tipo_residuo, cpf). """
+
+        inicio_volume = 1 + TAM_CODIGO
+        inicio_tipo = inicio_volume + TAM_VOLUME
+        inicio_cpf = inicio_tipo + TAM_TIPO
+
+        return (
+            registro[1:inicio_volume].decode('ascii'),
+            float(registro[inicio_volume:inicio_tipo]),
+            registro[inicio_tipo:inicio_cpf].decode('utf-8').rstrip(' '),
+            registro[inicio_cpf:inicio_cpf + TAM_CPF].decode('ascii')
+        )
+
+    @classmethod
+    def _codificar_bombona(cls, bombona: Bombona) -> bytes:
+        """ Converte uma bombona em registro. """
+
+        responsavel = bombona.get_responsavel()
+        cpf = responsavel.get_cpf() if responsavel else getattr(bombona, '_cpf_responsavel', '')
+        return cls._codificar(bombona.get_codigo(), bombona.get_volume(), bombona.get_tipo_residuo(), cpf)
+
+    def _escrever_registros(self, registros: Dict[int, bytes], novos: bool = False) -> None:
+        """
+        Grava registros nas posições informadas (um seek + write por registro) e
+        publica as bombonas gravadas como incluídas (novos) ou atualizadas.
+        """
+
+        assinatura_anterior = self._assinatura
+        with open(self.arquivo, 'r+b') as arquivo:
+            for slot in sorted(registros):
+                arquivo.seek(slot * TAM_REGISTRO)
+                arquivo.write(registros[slot])
+        self._assinatura = self._assinatura_arquivo()
+
+        gravados = (self._decodificar(registro) for registro in registros.values())
+        eventos.publicar(
+            eventos.BOMBONAS,
+            assinatura_anterior,
+            self._assinatura,
+            incluidos=gravados if novos else (),
+            atualizados=() if novos else gravados
+        )
+
+    def _ler_registros(self, slots: List[int]) -> Dict[int, tuple]:
+        """ Lê e decodifica os registros das posições informadas. """
+
+        registros = {}
+        with open(self.arquivo, 'rb') as arquivo:
+            for slot in sorted(slots):
+                arquivo.seek(slot * TAM_REGISTRO)
+                registros[slot] = self._decodificar(arquivo.read(TAM_REGISTRO))
+        return registros
+
+    def _ler_ativos(self) -> List[tuple]:
+        """ Lê sequencialmente todos os registros ativos. """
+
+        return list(self.iterar_registros())
+
+    def _montar_bombonas(self, registros: List[tuple]) -> List[Bombona]:
+        """ Cria as bombonas resolvendo os responsáveis com uma única leitura. """
+
+        # Importação temporária de ResponsavelDAO para resolver a referência de CPFs
+        from dao.responsavel_dao import ResponsavelDAO
+        responsaveis = {r.get_cpf(): r for r in ResponsavelDAO().listar_todos()}
+
+        bombonas = []
+        for codigo, volume, tipo_residuo, cpf in registros:
+            responsavel = responsaveis.get(cpf)
+            if not responsavel:
+                print(f"ERRO: Responsável {cpf} não encontrado para bombona {codigo}")
+                continue
+            bombonas.append(Bombona(codigo, volume, tipo_residuo, responsavel))
+        return bombonas
+
+    def salvar(self, bombona: Bombona) -> None:
+        """ Salva uma bombona, reaproveitando um registro livre quando houver. """
+
+        self._garantir_diretorio_atualizado()
+
+        if bombona.get_codigo() in self._diretorio:
+            raise ValueError(f"Já existe uma bombona com o código {bombona.get_codigo()}")
+
+        registro = self._codificar_bombona(bombona)
+        slot = self._livres.pop() if self._livres else self._assinatura[0] // TAM_REGISTRO
+
+        self._escrever_registros({slot: registro}, novos=True)
+        self._diretorio[bombona.get_codigo()] = slot
+        self._codigos_ordenados = None
+
+    def salvar_em_lote(self, bombonas: List[Bombona]) -> None:
+        """ Salva várias bombonas novas, reaproveitando registros livres e anexando os demais. """
+
+        self._garantir_diretorio_atualizado()
+
+        codigos_novos = [b.get_codigo() for b in bombonas]
+        if len(set(codigos_novos)) != len(codigos_novos):
+            raise ValueError("Há códigos repetidos entre as bombonas informadas")
+
+        repetidos = [c for c in codigos_novos if c in self._diretorio]
+        if repetidos:
+            raise ValueError(f"Já existem bombonas com os códigos: {', '.join(repetidos)}")
+
+        # Codifica tudo antes de gravar para não deixar o lote pela metade
+        codificados = [self._codificar_bombona(b) for b in bombonas]
+
+        registros = {}
+        proximo_slot = self._assinatura[0] // TAM_REGISTRO
+        for codigo, registro in zip(codigos_novos, codificados):
+            if self._livres:
+                slot = self._livres.pop()
+            else:
+                slot, proximo_slot = proximo_slot, proximo_slot + 1
+            registros[slot] = registro
+            self._diretorio[codigo] = slot
+        self._codigos_ordenados = None
+
+        try:
+            self._escrever_registros(registros, novos=True)
+        except OSError:
+            # Diretório e registros livres já foram alterados: remonta a partir do arquivo
+            self._indexar()
+            raise
+
+    def listar_todas(self) -> List[Bombona]:
+        """ Lista todas as bombonas. """
+
+        return self._montar_bombonas(self._ler_ativos())
+
+    def iterar_registros(self) -> Iterator[tuple]:
+        """ Percorre os registros ativos lendo o arquivo em blocos de registros inteiros. """
+
+        with open(self.arquivo, 'rb') as arquivo:
+            while True:
+                bloco = arquivo.read(TAM_REGISTRO * REGISTROS_POR_BLOCO)
+                for inicio in range(0, len(bloco) - TAM_REGISTRO + 1, TAM_REGISTRO):
+                    registro = bloco[inicio:inicio + TAM_REGISTRO]
+                    if registro[:1] == REGISTRO_ATIVO:
+                        yield self._decodificar(registro)
+                if len(bloco) < TAM_REGISTRO * REGISTROS_POR_BLOCO:
+                    break
+
+    def listar_codigos(self) -> List[str]:
+        """ Lista os códigos de todas as bombonas, em ordem crescente (consulta apenas o diretório). """
+
+        return list(self._obter_codigos_ordenados())
+
+    def buscar_por_codigo(self, codigo: str) -> Optional[Bombona]:
+        """ Busca uma bombona pelo código lendo apenas o seu registro. """
+
+        self._garantir_diretorio_atualizado()
+
+        slot = self._diretorio.get(codigo)
+        if slot is None:
+            return None
+
+        from dao.responsavel_dao import ResponsavelDAO
+        codigo, volume, tipo_residuo, cpf = self._ler_registros([slot])[slot]
+        responsavel = ResponsavelDAO().buscar_por_cpf(cpf)
+        if not responsavel:
+            print(f"ERRO: Responsável {cpf} não encontrado para bombona {codigo}")
+            return None
+        return Bombona(codigo, volume, tipo_residuo, responsavel)
+
+    def _obter_codigos_ordenados(self) -> List[str]:
+        """ Retorna os códigos do diretório em ordem crescente (ordenados apenas após alterações). """
+
+        self._garantir_diretorio_atualizado()
+        if self._codigos_ordenados is None:
+            self._codigos_ordenados = sorted(self._diretorio)
+        return self._codigos_ordenados
+
+    def _buscar_faixa(self, inicio: int, fim: int) -> List[Bombona]:
+        """ Lê os registros das posições [inicio, fim) da lista ordenada de códigos. """
+
+        codigos = self._obter_codigos_ordenados()[inicio:fim]
+        lidos = self._ler_registros([self._diretorio[c] for c in codigos])
+        return self._montar_bombonas([lidos[self._diretorio[c]] for c in codigos])
+
+    def buscar_por_prefixo(self, prefixo: str) -> List[Bombona]:
+        """ Busca as bombonas cujo código começa com o prefixo (busca binária nos códigos ordenados). """
+
+        codigos = self._obter_codigos_ordenados()
+        return self._buscar_faixa(
+            bisect_left(codigos, prefixo),
+            bisect_right(codigos, prefixo + chr(0x10FFFF))
+        )
+
+    def buscar_intervalo(self, codigo_inicial: str, codigo_final: str) -> List[Bombona]:
+        """ Busca as bombonas com código no intervalo, inclusive (busca binária nos códigos ordenados). """
+
+        codigos = self._obter_codigos_ordenados()
+        return self._buscar_faixa(bisect_left(codigos, codigo_inicial), bisect_right(codigos, codigo_final))
+
+    def buscar_por_responsavel(self, cpf: str) -> List[Bombona]:
+        """ Busca bombonas por CPF do responsável. """
+
+        return self._montar_bombonas([r for r in self._ler_ativos() if r[3] == cpf])
+
+    def remover(self, bombona: Bombona) -> None:
+        """ Remove uma bombona marcando o seu registro como livre. """
+
+        self.remover_em_lote([bombona.get_codigo()])
+
+    def atualizar(self, bombona: Bombona) -> None:
+        """ Atualiza os dados de uma bombona regravando apenas o seu registro. """
+
+        self._garantir_diretorio_atualizado()
+
+        slot = self._diretorio.get(bombona.get_codigo())
+        if slot is None:
+            raise ValueError(f"Bombona com código {bombona.get_codigo()} não encontrada")
+
+        self._escrever_registros({slot: self._codificar_bombona(bombona)})
+
+    def transferir_bombonas(self, cpf_origem: str, responsavel_destino, codigos: List[str] = None) -> List[str]:
+        """ Transfere bombonas de um responsável para outro regravando apenas os registros afetados. """
+
+        self._garantir_diretorio_atualizado()
+
+        do_responsavel = {r[0]: r for r in self._ler_ativos() if r[3] == cpf_origem}
+
+        if codigos is None:
+            codigos = list(do_responsavel.keys())
+        else:
+            nao_encontradas = [c for c in codigos if c not in do_responsavel]
+            if nao_encontradas:
+                raise ValueError(f"Bombonas não pertencem ao responsável {cpf_origem}: "
+                                 f"{', '.join(nao_encontradas)}")
+
+        cpf_destino = responsavel_destino.get_cpf()
+        registros = {}
+        for codigo in codigos:
+            _, volume, tipo_residuo, _ = do_responsavel[codigo]
+            registros[self._diretorio[codigo]] = self._codificar(codigo, volume, tipo_residuo, cpf_destino)
+
+        self._escrever_registros(registros)
+        return list(codigos)
+
+    def atualizar_em_lote(self, codigos: List[str], volume: float = None,
+                          tipo_residuo: str = None, responsavel=None) -> List[str]:
+        """ Aplica a mesma alteração a várias bombonas regravando apenas os registros afetados. """
+
+        self._garantir_diretorio_atualizado()
+
+        nao_encontradas = [c for c in codigos if c not in self._diretorio]
+        if nao_encontradas:
+            raise ValueError(f"Bombonas não encontradas: {', '.join(nao_encontradas)}")
+
+        atuais = self._ler_registros([self._diretorio[c] for c in codigos])
+        registros = {}
+        for codigo in codigos:
+            slot = self._diretorio[codigo]
+            _, volume_atual, tipo_atual, cpf_atual = atuais[slot]
+            registros[slot] = self._codificar(
+                codigo,
+                volume if volume is not None else volume_atual,
+                tipo_residuo if tipo_residuo is not None else tipo_atual,
+                responsavel.get_cpf() if responsavel is not None else cpf_atual
+            )
+
+        self._escrever_registros(registros)
+        return list(codigos)
+
+    def remover_em_lote(self, codigos: List[str]) -> List[str]:
+        """ Remove várias bombonas marcando os seus registros como livres. """
+
+        self._garantir_diretorio_atualizado()
+
+        # Código repetido é removido uma única vez (como no DAO CSV)
+        codigos = list(dict.fromkeys(codigos))
+        nao_encontradas = [c for c in codigos if c not in self._diretorio]
+        if nao_encontradas:
+            raise ValueError(f"Bombonas não encontradas: {', '.join(nao_encontradas)}")
+        if not codigos:
+            return []
+
+        # Basta regravar o byte de situação de cada registro
+        assinatura_anterior = self._assinatura
+        with open(self.arquivo, 'r+b') as arquivo:
+            for codigo in codigos:
+                slot = self._diretorio.pop(codigo)
+                arquivo.seek(slot * TAM_REGISTRO)
+                arquivo.write(REGISTRO_LIVRE)
+                self._livres.append(slot)
+        self._codigos_ordenados = None
+        self._assinatura = self._assinatura_arquivo()
+
+        eventos.publicar(eventos.BOMBONAS, assinatura_anterior, self._assinatura, removidos=codigos)
+
+        return codigos
+
+    def existe_codigo(self, codigo: str) -> bool:
+        """ Verifica se existe uma bombona com o código informado (consulta apenas o diretório). """
+
+        self._garantir_diretorio_atualizado()
+        return codigo in self._diretorio
+
+    def versao_dados(self) -> tuple:
+        """ Retorna a versão dos dados: (tamanho, mtime) do arquivo de registros. """
+
+        return self._assinatura_arquivo()
+
+
+def compactar(arquivo: str = "data/bombonas.dat") -> int:
+    """
+    Reescreve o arquivo de registros sem os registros livres.
+    Deve ser executado com o sistema parado. Retorna a quantidade de registros mantidos.
+    """
+
+    with open(arquivo, 'rb') as origem:
+        conteudo = origem.read()
+
+    ativos = [
+        conteudo[inicio:inicio + TAM_REGISTRO]
+        for inicio in range(0, len(conteudo) - TAM_REGISTRO + 1, TAM_REGISTRO)
+        if conteudo[inicio:inicio + 1] == REGISTRO_ATIVO
+    ]
+
+    arquivo_temp = f"{arquivo}.tmp"
+    with open(arquivo_temp, 'wb') as destino:
+        destino.write(b''.join(ativos))
+    os.replace(arquivo_temp, arquivo)
+
+    return len(ativos)
+
+
+def importar_csv(arquivo_csv: str = "data/bombonas.csv", arquivo: str = "data/bombonas.dat") -> int:
+    """ Converte o arquivo CSV de bombonas para o formato de registros fixos. Retorna a quantidade importada. """
+
+    registros = []
+    with open(arquivo_csv, 'r', encoding='utf-8') as origem:
+        for linha in csv.DictReader(origem):
+            if linha['codigo']:
+                registros.append(BombonaDAORegistroFixo._codificar(
+                    linha['codigo'],
+                    float(linha['volume']),
+                    linha['tipo_residuo'],
+                    linha['cpf_responsavel']
+                ))
+
+    arquivo_temp = f"{arquivo}.tmp"
+    with open(arquivo_temp, 'wb') as destino:
+        destino.write(b''.join(registros))
+    os.replace(arquivo_temp, arquivo)
+
+    return len(registros)
+
+
+if __name__ == "__main__":
+    # Ferramenta offline:
+    #   python -m dao.bombona_dao_registro_fixo compactar [arquivo.dat]
+    #   python -m dao.bombona_dao_registro_fixo importar [arquivo.csv] [arquivo.dat]
+    if len(sys.argv) < 2 or sys.argv[1] not in ("compactar", "importar"):
+        print("Uso: python -m dao.bombona_dao_registro_fixo compactar [arquivo.dat]")
+        print("     python -m dao.bombona_dao_registro_fixo importar [arquivo.csv] [arquivo.dat]")
+        sys.exit(1)
+
+    if sys.argv[1] == "compactar":
+        total = compactar(*sys.argv[2:3])
+        print(f"Arquivo compactado: {total} registro(s) ativo(s)")
+    else:
+        total = importar_csv(*sys.argv[2:4])
+        print(f"{total} bombona(s) importada(s)")
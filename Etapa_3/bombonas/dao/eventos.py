@@ -0,0 +1,60 @@
+"""
+Notificação das alterações gravadas pelos DAOs
+"""
+
+from typing import Callable, List, NamedTuple, Tuple
+
+# Entidades que publicam alterações
+BOMBONAS = "bombonas"
+RESPONSAVEIS = "responsaveis"
+
+
+class Alteracao(NamedTuple):
+    """
+    Alteração gravada por um DAO. Os registros estão no formato do arquivo
+    (bombona: codigo, volume, tipo_residuo, cpf_responsavel; responsável:
+    cpf, nome, telefone, setor) e a chave é sempre o primeiro campo.
+    """
+
+    entidade: str
+    incluidos: Tuple[tuple, ...]
+    atualizados: Tuple[tuple, ...]
+    removidos: Tuple[str, ...]
+    versao_anterior: tuple
+    versao_nova: tuple
+
+
+_inscritos: List[Callable[[Alteracao], None]] = []
+
+
+def inscrever(funcao: Callable[[Alteracao], None]) -> None:
+    """ Passa a chamar a função a cada alteração gravada. """
+
+    if funcao not in _inscritos:
+        _inscritos.append(funcao)
+
+
+def cancelar_inscricao(funcao: Callable[[Alteracao], None]) -> None:
+    """ Deixa de chamar a função. """
+
+    if funcao in _inscritos:
+        _inscritos.remove(funcao)
+
+
+def publicar(entidade: str, versao_anterior: tuple, versao_nova: tuple,
+             incluidos=(), atualizados=(), removidos=()) -> None:
+    """
+    Informa uma alteração a todos os inscritos. Falhas de um inscrito não
+    desfazem a gravação (que já ocorreu) nem impedem os demais de serem avisados.
+    """
+
+    if not _inscritos:
+        return
+
+    alteracao = Alteracao(entidade, tuple(incluidos), tuple(atualizados), tuple(removidos),
+                          versao_anterior, versao_nova)
+    for funcao in list(_inscritos):
+        try:
+            funcao(alteracao)
+        except Exception as e:
+            print(f"Aviso: falha ao processar alteração de {entidade}: {e}")
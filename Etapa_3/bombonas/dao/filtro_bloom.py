@@ -0,0 +1,83 @@
+"""
+Filtro de Bloom para testes rápidos de existência de chaves
+"""
+
+import zlib
+from typing import Iterable
+
+# Semente do segundo hash (double hashing: h1 + i * h2)
+_SEMENTE_H2 = 0x5BD1E995
+
+
+class FiltroBloom:
+    """
+    Conjunto probabilístico compacto de chaves.
+    pode_conter() nunca erra uma chave adicionada (sem falsos negativos);
+    com 10 bits por chave a taxa de falsos positivos fica em torno de 2%.
+    Os hashes são determinísticos (CRC32), permitindo gravar o filtro em disco.
+    """
+
+    BITS_POR_CHAVE = 10
+    NUM_HASHES = 4
+
+    def __init__(self, capacidade: int, bits: bytearray = None, quantidade: int = 0):
+        """ Cria um filtro dimensionado para 'capacidade' chaves. """
+
+        self.capacidade = max(capacidade, 1024)
+        self._tamanho = self.capacidade * self.BITS_POR_CHAVE
+        self._bits = bits if bits is not None else bytearray((self._tamanho + 7) // 8)
+        self.quantidade = quantidade
+
+    @classmethod
+    def de_chaves(cls, chaves: Iterable[str], folga: float = 1.5) -> 'FiltroBloom':
+        """ Cria um filtro com as chaves informadas, reservando espaço para novas inclusões. """
+
+        chaves = list(chaves)
+        filtro = cls(int(len(chaves) * folga))
+        for chave in chaves:
+            filtro.adicionar(chave)
+        return filtro
+
+    def _posicoes(self, chave: str):
+        """ Gera as posições dos bits da chave. """
+
+        dados = chave.encode('utf-8')
+        h1 = zlib.crc32(dados)
+        h2 = zlib.crc32(dados, _SEMENTE_H2) | 1
+        tamanho = self._tamanho
+        for i in range(self.NUM_HASHES):
+            yield (h1 + i * h2) % tamanho
+
+    def adicionar(self, chave: str) -> None:
+        """ Adiciona uma chave ao filtro. """
+
+        bits = self._bits
+        for posicao in self._posicoes(chave):
+            bits[posicao >> 3] |= 1 << (posicao & 7)
+        self.quantidade += 1
+
+    def pode_conter(self, chave: str) -> bool:
+        """ Retorna False se a chave certamente não existe; True se ela provavelmente existe. """
+
+        bits = self._bits
+        for posicao in self._posicoes(chave):
+            if not bits[posicao >> 3] & (1 << (posicao & 7)):
+                return False
+        return True
+
+    def saturado(self) -> bool:
+        """ Indica se o filtro recebeu mais chaves do que a capacidade prevista. """
+
+        return self.quantidade > self.capacidade
+
+    def para_tupla(self) -> tuple:
+        """ Serializa o filtro em uma tupla (para gravação com marshal). """
+
+        return (self.capacidade, self.quantidade, bytes(self._bits))
+
+    @classmethod
+    def de_tupla(cls, dados: tuple) -> 'FiltroBloom':
+        """ Reconstrói um filtro serializado por para_tupla(). """
+
+        capacidade, quantidade, bits = dados
+        return cls(capacidade, bytearray(bits), quantidade)
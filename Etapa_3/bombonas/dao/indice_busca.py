@@ -0,0 +1,330 @@
+"""
+Índice em memória para busca incremental (digitação) por prefixos de palavras
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import deque
+from itertools import compress, repeat
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Maior caractere Unicode (limite superior das buscas por prefixo)
+_MAIOR_CARACTERE = chr(0x10FFFF)
+
+# Prefixos de até este tamanho que abrangem muitos termos ou muitos registros
+# ganham uma máscara de posições montada junto com o índice
+TAM_MAXIMO_PREFIXO_MASCARA = 2
+
+# "Muitos termos": a partir desta quantidade de termos distintos (ex.: 'f', '1');
+# "muitos registros": ao menos 1/FRACAO_REGISTROS_MASCARA da listagem
+MIN_TERMOS_MASCARA = 64
+FRACAO_REGISTROS_MASCARA = 8
+
+# Conversões entre os dígitos binários de uma máscara e os seletores do itertools.compress
+_SELETORES = bytes.maketrans(b'01', b'\x00\x01')
+_DIGITOS = bytes.maketrans(b'\x00\x01', b'01')
+
+# Pontuação e símbolos (tudo que não é letra, dígito ou espaço)
+_PONTUACAO = re.compile(r'[^\w\s]+')
+
+
+def normalizar_texto(texto: str) -> str:
+    """ Remove acentos e converte para minúsculas ('João' -> 'joao'). """
+
+    nfd = unicodedata.normalize('NFD', str(texto))
+    if nfd.isascii():
+        return nfd.lower()
+    return ''.join(c for c in nfd if not unicodedata.combining(c)).lower()
+
+
+def extrair_termos(texto: str) -> List[str]:
+    """
+    Divide o texto em termos normalizados. Pontuação dentro de uma palavra é
+    descartada, de modo que 'FIS-001' vira 'fis001' e '123.456.789-00' vira
+    '12345678900' (o usuário pode digitar com ou sem a pontuação).
+    """
+
+    return _PONTUACAO.sub('', normalizar_texto(texto).replace('_', '')).split()
+
+
+class IndiceBusca:
+    """
+    Índice invertido de termos para filtrar listagens enquanto o usuário digita.
+
+    Cada registro (identificado por uma chave, ex.: código ou CPF) é indexado
+    pelos termos de seus campos. Os termos distintos ficam em uma lista ordenada,
+    de modo que todos os termos que começam com o que foi digitado são encontrados
+    por busca binária (equivalente a percorrer uma trie). Uma consulta com várias
+    palavras retorna os registros que têm todas elas como prefixo de algum termo.
+
+    Prefixos de 1 e 2 caracteres (ex.: 'f', '1') abrangem milhares de termos
+    distintos (códigos e CPFs são únicos) e boa parte da listagem: para eles o
+    índice guarda uma máscara de bits das posições da listagem, de modo que o
+    resultado sai já na ordem da listagem, sem unir nem ordenar conjuntos.
+
+    Inclusões, alterações e remoções atualizam apenas os termos (e os bits) do
+    registro afetado.
+    """
+
+    def __init__(self, registros: Iterable[Tuple[Hashable, Iterable[str]]] = ()):
+        """ Cria o índice a partir de pares (chave, campos). """
+
+        # Chave -> campos originais (na ordem de inclusão, que é a ordem da listagem)
+        self._campos: Dict[Hashable, tuple] = {}
+        # Chave -> posição de inclusão (ordena resultados pequenos sem percorrer a listagem)
+        self._posicoes: Dict[Hashable, int] = {}
+        # Posição -> chave (None nas posições de registros removidos ou movidos para o final)
+        self._chaves_por_posicao: List[Optional[Hashable]] = []
+        # Termo -> chaves dos registros que o contêm
+        self._postings: Dict[str, Set[Hashable]] = {}
+        # Termos distintos em ordem crescente
+        self._termos: List[str] = []
+        # Conjuntos de chaves por prefixo já consultados (esvaziado a cada alteração)
+        self._cache_prefixos: Dict[str, Set[Hashable]] = {}
+        # Prefixo curto -> máscara das posições (bit ligado = registro com algum termo com o prefixo)
+        self._mascaras: Dict[str, int] = {}
+
+        # Campos repetidos (tipo, setor, nomes) são normalizados uma única vez
+        termos_por_campo: Dict[str, List[str]] = {}
+
+        for chave, campos in registros:
+            campos = tuple(campos)
+            self._campos[chave] = campos
+            self._posicoes[chave] = len(self._chaves_por_posicao)
+            self._chaves_por_posicao.append(chave)
+
+            for campo in campos:
+                if not campo:
+                    continue
+                termos = termos_por_campo.get(campo)
+                if termos is None:
+                    termos = termos_por_campo[campo] = extrair_termos(campo)
+                for termo in termos:
+                    postings = self._postings.get(termo)
+                    if postings is None:
+                        postings = self._postings[termo] = set()
+                    postings.add(chave)
+
+        self._termos = sorted(self._postings)
+        self._montar_mascaras()
+
+    def __len__(self) -> int:
+        return len(self._campos)
+
+    @staticmethod
+    def _termos_dos_campos(campos: tuple) -> Set[str]:
+        """ Retorna os termos distintos de todos os campos de um registro. """
+
+        termos = set()
+        for campo in campos:
+            if campo:
+                termos.update(extrair_termos(campo))
+        return termos
+
+    def campos(self, chave: Hashable) -> Optional[tuple]:
+        """ Retorna os campos indexados de um registro, ou None se ele não estiver no índice. """
+
+        return self._campos.get(chave)
+
+    def adicionar(self, chave: Hashable, campos: Iterable[str]) -> None:
+        """ Inclui um registro no final da listagem (um registro já existente é movido para o final). """
+
+        if chave in self._campos:
+            self.remover(chave)
+
+        campos = tuple(campos)
+        termos = self._termos_dos_campos(campos)
+        posicao = len(self._chaves_por_posicao)
+        self._campos[chave] = campos
+        self._posicoes[chave] = posicao
+        self._chaves_por_posicao.append(chave)
+        for termo in termos:
+            postings = self._postings.get(termo)
+            if postings is None:
+                postings = self._postings[termo] = set()
+                insort(self._termos, termo)
+            postings.add(chave)
+
+        self._alternar_bits(posicao, (), termos)
+        self._cache_prefixos.clear()
+
+    def atualizar(self, chave: Hashable, campos: Iterable[str]) -> None:
+        """ Atualiza os campos de um registro mantendo a sua posição na listagem. """
+
+        campos = tuple(campos)
+        antigos = self._campos.get(chave)
+        if antigos is None:
+            self.adicionar(chave, campos)
+            return
+
+        termos_antigos = self._termos_dos_campos(antigos)
+        termos_novos = self._termos_dos_campos(campos)
+
+        for termo in termos_antigos - termos_novos:
+            self._remover_posting(termo, chave)
+
+        for termo in termos_novos - termos_antigos:
+            postings = self._postings.get(termo)
+            if postings is None:
+                postings = self._postings[termo] = set()
+                insort(self._termos, termo)
+            postings.add(chave)
+
+        self._campos[chave] = campos
+        self._alternar_bits(self._posicoes[chave], termos_antigos, termos_novos)
+        self._cache_prefixos.clear()
+
+    def remover(self, chave: Hashable) -> None:
+        """ Remove um registro do índice (se existir). """
+
+        campos = self._campos.pop(chave, None)
+        if campos is None:
+            return
+        posicao = self._posicoes.pop(chave)
+        self._chaves_por_posicao[posicao] = None
+
+        termos = self._termos_dos_campos(campos)
+        for termo in termos:
+            self._remover_posting(termo, chave)
+
+        self._alternar_bits(posicao, termos, ())
+        self._cache_prefixos.clear()
+
+        # Muitas posições vagas: renumera a listagem e remonta as máscaras
+        if len(self._chaves_por_posicao) > 2 * len(self._campos) + 1024:
+            self._chaves_por_posicao = list(self._campos)
+            self._posicoes = {chave: posicao for posicao, chave in enumerate(self._chaves_por_posicao)}
+            self._montar_mascaras()
+
+    def _montar_mascaras(self) -> None:
+        """
+        Monta as máscaras dos prefixos de até TAM_MAXIMO_PREFIXO_MASCARA caracteres
+        que abrangem ao menos MIN_TERMOS_MASCARA termos ou
+        1/FRACAO_REGISTROS_MASCARA dos registros.
+        """
+
+        self._mascaras = {}
+        termos, postings, posicoes = self._termos, self._postings, self._posicoes
+        minimo_registros = max(1, len(self._campos) // FRACAO_REGISTROS_MASCARA)
+
+        for tamanho in range(1, TAM_MAXIMO_PREFIXO_MASCARA + 1):
+            inicio = 0
+            while inicio < len(termos):
+                prefixo = termos[inicio][:tamanho]
+                if len(prefixo) < tamanho:
+                    inicio += 1
+                    continue
+
+                fim = bisect_left(termos, prefixo + _MAIOR_CARACTERE, inicio)
+                conjuntos = [postings[termo] for termo in termos[inicio:fim]]
+                if fim - inicio >= MIN_TERMOS_MASCARA or sum(map(len, conjuntos)) >= minimo_registros:
+                    chaves = set().union(*conjuntos)
+                    if len(chaves) > 1:
+                        posicoes_prefixo = itemgetter(*chaves)(posicoes)
+                    else:
+                        posicoes_prefixo = [posicoes[chave] for chave in chaves]
+
+                    # Liga um seletor por posição (sem laço em Python) e lê os seletores como dígitos binários
+                    seletores = bytearray(len(self._chaves_por_posicao))
+                    deque(map(seletores.__setitem__, posicoes_prefixo, repeat(1)), maxlen=0)
+                    self._mascaras[prefixo] = int(seletores.translate(_DIGITOS)[::-1], 2)
+                inicio = fim
+
+    def _alternar_bits(self, posicao: int, termos_antigos: Iterable[str], termos_novos: Iterable[str]) -> None:
+        """ Atualiza o bit da posição nas máscaras dos prefixos que o registro ganhou ou perdeu. """
+
+        if not self._mascaras:
+            return
+
+        antigos = {termo[:tamanho] for termo in termos_antigos
+                   for tamanho in range(1, TAM_MAXIMO_PREFIXO_MASCARA + 1)}
+        novos = {termo[:tamanho] for termo in termos_novos
+                 for tamanho in range(1, TAM_MAXIMO_PREFIXO_MASCARA + 1)}
+
+        bit = 1 << posicao
+        for prefixo in antigos ^ novos:
+            mascara = self._mascaras.get(prefixo)
+            if mascara is not None:
+                self._mascaras[prefixo] = mascara | bit if prefixo in novos else mascara & ~bit
+
+    def _remover_posting(self, termo: str, chave: Hashable) -> None:
+        """ Remove a chave da lista do termo, descartando o termo se ela ficar vazia. """
+
+        postings = self._postings.get(termo)
+        if postings is None:
+            return
+
+        postings.discard(chave)
+        if not postings:
+            del self._postings[termo]
+            posicao = bisect_left(self._termos, termo)
+            del self._termos[posicao]
+
+    def _chaves_com_prefixo(self, prefixo: str) -> Set[Hashable]:
+        """ Retorna as chaves dos registros com algum termo que começa com o prefixo. """
+
+        chaves = self._cache_prefixos.get(prefixo)
+        if chaves is not None:
+            return chaves
+
+        inicio = bisect_left(self._termos, prefixo)
+        fim = bisect_left(self._termos, prefixo + _MAIOR_CARACTERE, inicio)
+
+        postings = self._postings
+        if fim - inicio == 1:
+            # Um único termo: usa o próprio conjunto (somente leitura) sem copiá-lo
+            chaves = postings[self._termos[inicio]]
+        else:
+            chaves = set().union(*[postings[termo] for termo in self._termos[inicio:fim]])
+
+        self._cache_prefixos[prefixo] = chaves
+        return chaves
+
+    def buscar(self, consulta: str) -> List[Hashable]:
+        """
+        Retorna, na ordem da listagem, as chaves dos registros que contêm todas as
+        palavras da consulta como prefixo de algum termo. Consulta vazia retorna tudo.
+        """
+
+        termos = extrair_termos(consulta)
+        if not termos:
+            return list(self._campos)
+
+        # Palavras curtas e amplas são respondidas pelas máscaras (combinadas bit a bit)
+        mascara = None
+        conjuntos = []
+        for termo in set(termos):
+            mascara_termo = self._mascaras.get(termo)
+            if mascara_termo is None:
+                conjuntos.append(self._chaves_com_prefixo(termo))
+            else:
+                mascara = mascara_termo if mascara is None else mascara & mascara_termo
+
+        if mascara is not None:
+            # Dígitos da máscara do bit menos para o mais significativo: um seletor por posição
+            seletores = bin(mascara)[:1:-1].encode('ascii').translate(_SELETORES)
+            if not conjuntos:
+                return list(compress(self._chaves_por_posicao, seletores))
+            conjuntos.append(set(compress(self._chaves_por_posicao, seletores)))
+
+        # Começa pelo conjunto mais restrito para intersectar menos elementos
+        conjuntos.sort(key=len)
+        encontradas = conjuntos[0]
+        for conjunto in conjuntos[1:]:
+            if not encontradas:
+                break
+            encontradas = encontradas & conjunto
+
+        if not encontradas:
+            return []
+
+        if len(encontradas) == len(self._campos):
+            return list(self._campos)
+
+        # Muitos resultados: percorrer a listagem é mais barato que ordenar
+        if len(encontradas) * 8 > len(self._campos):
+            return [chave for chave in self._campos if chave in encontradas]
+
+        return sorted(encontradas, key=self._posicoes.__getitem__)
@@ -0,0 +1,280 @@
+"""
+Índice ordenado chave -> posição das linhas de um arquivo CSV
+"""
+
+import csv
+import hashlib
+import marshal
+import mmap
+import os
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional
+from dao.filtro_bloom import FiltroBloom
+
+# Versão do formato do arquivo de índice (incrementar ao mudar a estrutura gravada)
+VERSAO_FORMATO = 3
+
+# Amostra do CSV conferida ao carregar os arquivos auxiliares: quantidade de
+# blocos (início, fim e pontos igualmente espaçados) e tamanho de cada bloco
+BLOCOS_VERIFICACAO = 8
+TAM_BLOCO_VERIFICACAO = 8192
+
+# Maior caractere Unicode (limite superior das buscas por prefixo)
+_MAIOR_CARACTERE = chr(0x10FFFF)
+
+# Primeiro campo de cada linha (chaves como código e CPF nunca contêm vírgulas ou aspas)
+_PRIMEIRO_CAMPO = re.compile(rb'^([^,\r\n]*),', re.MULTILINE)
+
+
+def verificacao_conteudo(arquivo_csv: str) -> bytes:
+    """
+    Hash do tamanho e de uma amostra do conteúdo do CSV (início, fim e blocos
+    intermediários igualmente espaçados). Lê no máximo
+    BLOCOS_VERIFICACAO * TAM_BLOCO_VERIFICACAO bytes, qualquer que seja o
+    tamanho do arquivo; arquivos menores que isso são lidos inteiros.
+    """
+
+    verificacao = hashlib.blake2b(digest_size=16)
+    with open(arquivo_csv, 'rb') as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        verificacao.update(tamanho.to_bytes(8, 'little'))
+
+        if tamanho <= BLOCOS_VERIFICACAO * TAM_BLOCO_VERIFICACAO:
+            verificacao.update(arquivo.read())
+        else:
+            ultimo = tamanho - TAM_BLOCO_VERIFICACAO
+            for bloco in range(BLOCOS_VERIFICACAO):
+                arquivo.seek(bloco * ultimo // (BLOCOS_VERIFICACAO - 1))
+                verificacao.update(arquivo.read(TAM_BLOCO_VERIFICACAO))
+
+    return verificacao.digest()
+
+
+class IndiceOffsets:
+    """
+    Índice da primeira coluna de um arquivo CSV: mantém as chaves ordenadas
+    e a posição (em bytes) da linha de cada uma, permitindo busca binária.
+
+    O índice é gravado em um arquivo auxiliar (.idx) junto com o tamanho, a
+    data de modificação e a verificação de uma amostra do conteúdo do CSV
+    (verificacao_conteudo) e é reconstruído sempre que algum deles muda; a
+    amostra pega cópias e restaurações que mantêm tamanho e mtime. As linhas
+    são lidas por mapeamento em memória (mmap), de modo que uma busca pontual
+    interpreta apenas a linha encontrada e vários processos compartilham o
+    cache de páginas do sistema operacional.
+
+    Um filtro de Bloom das chaves (.bloom), validado da mesma forma que o
+    índice, responde as consultas de existência negativas sem carregar o
+    índice nem ler o CSV inteiro.
+    """
+
+    def __init__(self, arquivo_csv: str):
+        """ Inicializa o índice associado ao arquivo CSV informado. """
+
+        self.arquivo_csv = arquivo_csv
+        self.arquivo_indice = f"{arquivo_csv}.idx"
+        self.arquivo_filtro = f"{arquivo_csv}.bloom"
+        self._assinatura = None
+        self._chaves: List[str] = []
+        self._offsets: List[int] = []
+        self._filtro: Optional[FiltroBloom] = None
+        self._assinatura_filtro = None
+
+    def _assinatura_csv(self) -> tuple:
+        """ Retorna (tamanho, mtime) do CSV. """
+
+        info = os.stat(self.arquivo_csv)
+        return (info.st_size, info.st_mtime_ns)
+
+    def assinatura(self) -> tuple:
+        """ Retorna a assinatura (tamanho, mtime) atual do CSV. """
+
+        return self._assinatura_csv()
+
+    def _garantir_atualizado(self) -> None:
+        """ Carrega ou reconstrói o índice se o CSV mudou desde a última consulta. """
+
+        assinatura = self._assinatura_csv()
+        if assinatura == self._assinatura:
+            return
+
+        if not self._carregar_arquivo_indice(assinatura):
+            self._reconstruir(assinatura)
+
+    def _carregar_arquivo_indice(self, assinatura: tuple) -> bool:
+        """ Carrega o índice gravado em disco se ele corresponder ao CSV atual. """
+
+        try:
+            with open(self.arquivo_indice, 'rb') as arquivo:
+                versao, tamanho, mtime, verificacao, chaves, offsets = marshal.loads(arquivo.read())
+            if versao != VERSAO_FORMATO or (tamanho, mtime) != assinatura:
+                return False
+            if verificacao != verificacao_conteudo(self.arquivo_csv):
+                return False
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+
+        self._chaves, self._offsets, self._assinatura = chaves, offsets, assinatura
+        return True
+
+    def _reconstruir(self, assinatura: tuple) -> None:
+        """ Percorre o CSV mapeado em memória e monta o índice ordenado. """
+
+        pares = []
+        if assinatura[0] > 0:
+            with open(self.arquivo_csv, 'rb') as arquivo:
+                with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                    encontrados = _PRIMEIRO_CAMPO.finditer(mapa)
+                    next(encontrados, None)  # Pula o cabeçalho
+                    for encontrado in encontrados:
+                        chave = encontrado.group(1).decode('utf-8').strip()
+                        if chave:
+                            pares.append((chave, encontrado.start()))
+
+        pares.sort()
+        self._chaves = [chave for chave, _ in pares]
+        self._offsets = [offset for _, offset in pares]
+        self._assinatura = assinatura
+
+        arquivo_temp = f"{self.arquivo_indice}.tmp"
+        try:
+            verificacao = verificacao_conteudo(self.arquivo_csv)
+            with open(arquivo_temp, 'wb') as arquivo:
+                arquivo.write(marshal.dumps(
+                    (VERSAO_FORMATO, *assinatura, verificacao, self._chaves, self._offsets)
+                ))
+            os.replace(arquivo_temp, self.arquivo_indice)
+        except OSError as e:
+            # O índice em memória continua válido mesmo sem o arquivo auxiliar
+            print(f"Aviso: não foi possível gravar o índice {self.arquivo_indice}: {e}")
+
+    def _ler_linhas(self, offsets: List[int]) -> List[List[str]]:
+        """ Lê e interpreta apenas as linhas que começam nas posições informadas. """
+
+        if not offsets:
+            return []
+
+        linhas = []
+        with open(self.arquivo_csv, 'rb') as arquivo:
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                for offset in offsets:
+                    fim = mapa.find(b'\n', offset)
+                    if fim == -1:
+                        fim = len(mapa)
+                    linhas.append(mapa[offset:fim].decode('utf-8').rstrip('\r'))
+
+        return list(csv.reader(linhas))
+
+    def buscar(self, chave: str) -> Optional[List[str]]:
+        """ Retorna os campos da linha com a chave informada, ou None se não existir. """
+
+        self._garantir_atualizado()
+
+        posicao = bisect_left(self._chaves, chave)
+        if posicao == len(self._chaves) or self._chaves[posicao] != chave:
+            return None
+
+        return self._ler_linhas([self._offsets[posicao]])[0]
+
+    def buscar_intervalo(self, inicio: str, fim: str, limite: int = None) -> List[List[str]]:
+        """
+        Retorna, em ordem de chave, as linhas com chave entre 'inicio' e 'fim' (inclusive).
+        Com 'limite', lê apenas as primeiras linhas do intervalo.
+        """
+
+        self._garantir_atualizado()
+
+        primeiro = bisect_left(self._chaves, inicio)
+        ultimo = bisect_right(self._chaves, fim)
+        if limite is not None:
+            ultimo = min(ultimo, primeiro + limite)
+        return self._ler_linhas(self._offsets[primeiro:ultimo])
+
+    def buscar_prefixo(self, prefixo: str, limite: int = None) -> List[List[str]]:
+        """ Retorna, em ordem de chave, as linhas cuja chave começa com o prefixo informado. """
+
+        # Todas as chaves com o prefixo ficam entre o prefixo e o prefixo seguido do maior caractere
+        return self.buscar_intervalo(prefixo, prefixo + _MAIOR_CARACTERE, limite)
+
+    def chaves(self) -> List[str]:
+        """ Retorna as chaves do CSV em ordem crescente. """
+
+        self._garantir_atualizado()
+        return list(self._chaves)
+
+    def contem(self, chave: str) -> bool:
+        """
+        Verifica se a chave existe sem ler a linha correspondente.
+        Negativas do filtro de Bloom são respondidas sem consultar o índice.
+        """
+
+        if not self._filtro_atual().pode_conter(chave):
+            return False
+
+        self._garantir_atualizado()
+
+        posicao = bisect_left(self._chaves, chave)
+        return posicao < len(self._chaves) and self._chaves[posicao] == chave
+
+    def _filtro_atual(self) -> FiltroBloom:
+        """ Retorna o filtro de Bloom do CSV atual, carregando-o ou reconstruindo-o se necessário. """
+
+        assinatura = self._assinatura_csv()
+        if self._filtro is not None and assinatura == self._assinatura_filtro:
+            return self._filtro
+
+        try:
+            with open(self.arquivo_filtro, 'rb') as arquivo:
+                versao, tamanho, mtime, verificacao, dados = marshal.loads(arquivo.read())
+            if (versao == VERSAO_FORMATO and (tamanho, mtime) == assinatura
+                    and verificacao == verificacao_conteudo(self.arquivo_csv)):
+                self._filtro, self._assinatura_filtro = FiltroBloom.de_tupla(dados), assinatura
+                return self._filtro
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        self._garantir_atualizado()
+        self._filtro = FiltroBloom.de_chaves(self._chaves)
+        self._assinatura_filtro = assinatura
+        self._gravar_filtro()
+        return self._filtro
+
+    def _gravar_filtro(self) -> None:
+        """ Grava o filtro de Bloom no arquivo auxiliar. """
+
+        arquivo_temp = f"{self.arquivo_filtro}.tmp"
+        try:
+            verificacao = verificacao_conteudo(self.arquivo_csv)
+            with open(arquivo_temp, 'wb') as arquivo:
+                arquivo.write(marshal.dumps(
+                    (VERSAO_FORMATO, *self._assinatura_filtro, verificacao, self._filtro.para_tupla())
+                ))
+            os.replace(arquivo_temp, self.arquivo_filtro)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o filtro {self.arquivo_filtro}: {e}")
+
+    def registrar_escrita(self, assinatura_anterior: tuple, novas_chaves: Iterable[str] = ()) -> None:
+        """
+        Informa ao índice que o próprio processo reescreveu o CSV.
+        O filtro de Bloom é atualizado de forma incremental com as novas chaves
+        (chaves removidas permanecem, gerando no máximo falsos positivos); o
+        índice de posições é reconstruído na próxima consulta que precisar dele.
+        """
+
+        # Mesmo que tamanho e mtime não mudem (mtime de baixa resolução), as posições já não valem
+        self._assinatura = None
+
+        if self._filtro is None or self._assinatura_filtro != assinatura_anterior:
+            return
+
+        for chave in novas_chaves:
+            self._filtro.adicionar(chave)
+
+        if self._filtro.saturado():
+            # Filtro cheio demais: será reconstruído na próxima consulta
+            self._filtro, self._assinatura_filtro = None, None
+            return
+
+        self._assinatura_filtro = self._assinatura_csv()
+        self._gravar_filtro()
@@ -0,0 +1,351 @@
+"""
+Índice invertido de texto completo sobre todos os campos de bombonas e responsáveis
+"""
+
+import marshal
+import os
+from bisect import bisect_left, bisect_right, insort
+from heapq import nlargest
+from itertools import accumulate
+from math import log
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from dao.eventos import Alteracao
+from dao.indice_busca import extrair_termos
+
+# Versão do formato do arquivo do índice (incrementar ao mudar a estrutura gravada)
+VERSAO_FORMATO = 1
+
+# Pesos de uma correspondência: termo igual, termo que começa com o digitado, trecho de um termo
+PESO_EXATO = 3.0
+PESO_PREFIXO = 2.0
+PESO_TRECHO = 1.0
+
+# Tamanho mínimo de uma palavra da consulta para ser procurada como trecho de um termo
+MIN_TRECHO = 3
+
+# Quantidade de alterações no diário que leva o índice a ser regravado por inteiro
+MAX_ENTRADAS_DIARIO = 200
+
+# Maior caractere Unicode (limite superior das buscas por prefixo)
+_MAIOR_CARACTERE = chr(0x10FFFF)
+
+# Cada termo aponta para um documento (str) ou, se for compartilhado, para um conjunto deles;
+# como a maioria dos termos (códigos, CPFs, telefones) é única, isso economiza muita memória
+Postings = Union[str, Set[str]]
+
+
+def chave_documento(entidade: str, chave: str) -> str:
+    """ Chave de um registro no índice: entidade e chave do registro ("bombonas:FIS-001"). """
+
+    return f"{entidade}:{chave}"
+
+
+def termos_registro(registro: tuple, _memoria: dict = None) -> Set[str]:
+    """
+    Termos normalizados de todos os campos de um registro (volumes sem o '.0').
+    Com '_memoria', os termos de cada valor já visto são reaproveitados.
+    """
+
+    termos = set()
+    for campo in registro:
+        if isinstance(campo, float):
+            campo = f"{campo:g}"
+        if _memoria is None:
+            termos.update(extrair_termos(str(campo)))
+            continue
+        termos_campo = _memoria.get(campo)
+        if termos_campo is None:
+            termos_campo = _memoria[campo] = extrair_termos(str(campo))
+        termos.update(termos_campo)
+    return termos
+
+
+def _documentos(postings: Postings) -> Iterable[str]:
+    """ Documentos de uma entrada do índice. """
+
+    return (postings,) if isinstance(postings, str) else postings
+
+
+def _tamanho(postings: Postings) -> int:
+    return 1 if isinstance(postings, str) else len(postings)
+
+
+def _contem(postings: Postings, chave: str) -> bool:
+    return postings == chave if isinstance(postings, str) else chave in postings
+
+
+class IndiceTexto:
+    """
+    Índice invertido termo -> registros sobre todos os campos de bombonas e
+    responsáveis, com resultados ordenados por relevância.
+
+    Cada palavra da consulta precisa aparecer no registro como termo inteiro,
+    como início de um termo ou, com 3 ou mais caracteres, como trecho em
+    qualquer posição ('9876-54' encontra o telefone 35998765432). Termos raros
+    valem mais que termos comuns (IDF). Os trechos são procurados com str.find
+    sobre os termos ordenados concatenados, sem índice adicional.
+
+    O índice é gravado em disco junto com a versão dos dados de cada entidade.
+    As alterações feitas depois disso são acrescentadas a um diário (.log),
+    reaplicado na carga, e o índice é regravado por inteiro de tempos em tempos.
+    """
+
+    def __init__(self, arquivo: Optional[str] = None):
+        """ Cria um índice vazio, opcionalmente associado a um arquivo em disco. """
+
+        self.arquivo = arquivo
+        self.arquivo_diario = f"{arquivo}.log" if arquivo else None
+        self.versoes: Dict[str, tuple] = {}
+        self._registros: Dict[str, tuple] = {}
+        self._termos: Dict[str, Postings] = {}
+        self._termos_ordenados: List[str] = []
+        self._entradas_diario = 0
+
+        # Termos ordenados concatenados (busca de trechos), refeitos quando os termos mudam
+        self._texto_termos: Optional[str] = None
+        self._inicios_termos: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def registro(self, chave: str) -> Optional[tuple]:
+        """ Retorna o registro indexado com a chave informada. """
+
+        return self._registros.get(chave)
+
+    def adicionar(self, chave: str, registro: tuple) -> None:
+        """ Inclui (ou substitui) um registro. """
+
+        if chave in self._registros:
+            self.remover(chave)
+
+        self._registros[chave] = registro
+        for termo in termos_registro(registro):
+            atual = self._termos.get(termo)
+            if atual is None:
+                self._termos[termo] = chave
+                insort(self._termos_ordenados, termo)
+                self._texto_termos = None
+            elif isinstance(atual, set):
+                atual.add(chave)
+            elif atual != chave:
+                self._termos[termo] = {atual, chave}
+
+    def remover(self, chave: str) -> None:
+        """ Remove um registro do índice (se existir). """
+
+        registro = self._registros.pop(chave, None)
+        if registro is None:
+            return
+
+        for termo in termos_registro(registro):
+            atual = self._termos.get(termo)
+            if isinstance(atual, set):
+                atual.discard(chave)
+                if len(atual) == 1:
+                    self._termos[termo] = next(iter(atual))
+            elif atual == chave:
+                del self._termos[termo]
+                del self._termos_ordenados[bisect_left(self._termos_ordenados, termo)]
+                self._texto_termos = None
+
+    def reconstruir(self, versoes: Dict[str, tuple], documentos: Iterable[Tuple[str, tuple]]) -> None:
+        """ Substitui todo o conteúdo do índice pelos documentos (chave, registro) informados. """
+
+        memoria = {}
+        agrupados: Dict[str, List[str]] = {}
+        registros = {}
+        for chave, registro in documentos:
+            registros[chave] = registro
+            for termo in termos_registro(registro, memoria):
+                lista = agrupados.get(termo)
+                if lista is None:
+                    agrupados[termo] = [chave]
+                else:
+                    lista.append(chave)
+
+        self.versoes = dict(versoes)
+        self._registros = registros
+        self._termos = {
+            termo: chaves[0] if len(chaves) == 1 else set(chaves)
+            for termo, chaves in agrupados.items()
+        }
+        self._termos_ordenados = sorted(self._termos)
+        self._texto_termos = None
+
+    def aplicar(self, alteracao: Alteracao) -> bool:
+        """
+        Aplica uma alteração publicada por um DAO se o índice estiver na versão
+        anterior a ela. Retorna False (sem alterar nada) caso contrário.
+        """
+
+        if self.versoes.get(alteracao.entidade) != alteracao.versao_anterior:
+            return False
+
+        for chave in alteracao.removidos:
+            self.remover(chave_documento(alteracao.entidade, chave))
+        for registro in alteracao.incluidos + alteracao.atualizados:
+            self.adicionar(chave_documento(alteracao.entidade, registro[0]), registro)
+
+        self.versoes[alteracao.entidade] = alteracao.versao_nova
+        return True
+
+    def _termos_com_trecho(self, trecho: str) -> Iterable[str]:
+        """ Termos indexados que contêm o trecho informado (em qualquer posição). """
+
+        if self._texto_termos is None:
+            self._texto_termos = '\n'.join(self._termos_ordenados)
+            self._inicios_termos = list(accumulate((len(t) + 1 for t in self._termos_ordenados), initial=0))
+
+        texto, inicios = self._texto_termos, self._inicios_termos
+        posicao = texto.find(trecho)
+        while posicao != -1:
+            i = bisect_right(inicios, posicao) - 1
+            yield self._termos_ordenados[i]
+            # Continua a partir do termo seguinte (cada termo é informado uma única vez)
+            posicao = texto.find(trecho, inicios[i + 1])
+
+    def _listas(self, termo: str) -> List[Tuple[Postings, float]]:
+        """ Listas de documentos de cada termo indexado que corresponde ao termo da consulta, com o seu peso. """
+
+        # Termos iguais ou começando com o termo ficam contíguos na lista ordenada
+        inicio = bisect_left(self._termos_ordenados, termo)
+        fim = bisect_left(self._termos_ordenados, termo + _MAIOR_CARACTERE, inicio)
+        listas = [
+            (self._termos[t], PESO_EXATO if t == termo else PESO_PREFIXO)
+            for t in self._termos_ordenados[inicio:fim]
+        ]
+
+        if len(termo) >= MIN_TRECHO:
+            listas.extend(
+                (self._termos[t], PESO_TRECHO)
+                for t in self._termos_com_trecho(termo) if not t.startswith(termo)
+            )
+        return listas
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Tuple[str, float]]:
+        """
+        Retorna até 'limite' pares (chave, pontuação) dos registros que contêm
+        todas as palavras da consulta, do mais ao menos relevante.
+        """
+
+        consultas = []
+        for termo in dict.fromkeys(extrair_termos(consulta)):
+            listas = self._listas(termo)
+            tamanho = sum(_tamanho(postings) for postings, _ in listas)
+            if not tamanho:
+                return []
+            consultas.append((tamanho, listas))
+
+        if not consultas:
+            return []
+
+        # Começa pela palavra mais rara; as demais só precisam ser conferidas nos documentos restantes
+        consultas.sort(key=lambda c: c[0])
+        total = len(self._registros)
+        pontos = None
+        for tamanho, listas in consultas:
+            idf = log(1 + total / tamanho)
+
+            if pontos is None or tamanho <= len(pontos) * len(listas):
+                pesos = {}
+                for postings, peso in listas:
+                    for chave in _documentos(postings):
+                        if pesos.get(chave, 0.0) < peso:
+                            pesos[chave] = peso
+                if pontos is None:
+                    pontos = {chave: peso * idf for chave, peso in pesos.items()}
+                else:
+                    pontos = {chave: valor + pesos[chave] * idf
+                              for chave, valor in pontos.items() if chave in pesos}
+            else:
+                novos = {}
+                for chave, valor in pontos.items():
+                    peso = max((p for postings, p in listas if _contem(postings, chave)), default=0.0)
+                    if peso:
+                        novos[chave] = valor + peso * idf
+                pontos = novos
+
+            if not pontos:
+                return []
+
+        return nlargest(limite, pontos.items(), key=lambda item: item[1])
+
+    def carregar(self) -> bool:
+        """
+        Carrega o índice gravado em disco e reaplica o diário de alterações.
+        Retorna False se não houver índice válido gravado.
+        """
+
+        try:
+            with open(self.arquivo, 'rb') as arquivo:
+                versao, versoes, registros, termos_ordenados, postings = marshal.loads(arquivo.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+
+        if versao != VERSAO_FORMATO:
+            return False
+
+        # Em disco as listas compartilhadas são tuplas (gravar conjuntos com marshal é bem mais lento)
+        self.versoes, self._registros, self._termos_ordenados = versoes, registros, termos_ordenados
+        self._termos = {
+            termo: chaves if isinstance(chaves, str) else set(chaves)
+            for termo, chaves in zip(termos_ordenados, postings)
+        }
+        self._texto_termos = None
+
+        # Entradas que não continuam a versão atual (ex.: de um índice já regravado) são ignoradas
+        self._entradas_diario = 0
+        try:
+            with open(self.arquivo_diario, 'rb') as diario:
+                while True:
+                    self.aplicar(Alteracao(*marshal.load(diario)))
+                    self._entradas_diario += 1
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        if self._entradas_diario >= MAX_ENTRADAS_DIARIO:
+            self.salvar()
+        return True
+
+    def salvar(self) -> None:
+        """ Grava o índice inteiro em disco e esvazia o diário. """
+
+        arquivo_temp = f"{self.arquivo}.tmp"
+        try:
+            with open(arquivo_temp, 'wb') as arquivo:
+                arquivo.write(marshal.dumps((
+                    VERSAO_FORMATO, self.versoes, self._registros, self._termos_ordenados,
+                    [
+                        chaves if isinstance(chaves, str) else tuple(chaves)
+                        for chaves in map(self._termos.__getitem__, self._termos_ordenados)
+                    ]
+                )))
+            os.replace(arquivo_temp, self.arquivo)
+            if os.path.exists(self.arquivo_diario):
+                os.remove(self.arquivo_diario)
+            self._entradas_diario = 0
+        except OSError as e:
+            # O índice em memória continua válido; na próxima carga ele será reconstruído
+            print(f"Aviso: não foi possível gravar o índice {self.arquivo}: {e}")
+
+    def registrar_alteracao(self, alteracao: Alteracao) -> None:
+        """
+        Recebe uma alteração publicada por um DAO: aplica-a ao índice em memória
+        (se ele estiver na versão anterior) e a acrescenta ao diário em disco.
+        """
+
+        aplicada = self.aplicar(alteracao)
+        if self.arquivo is None:
+            return
+
+        if aplicada and self._entradas_diario + 1 >= MAX_ENTRADAS_DIARIO:
+            self.salvar()
+            return
+
+        try:
+            with open(self.arquivo_diario, 'ab') as diario:
+                marshal.dump(tuple(alteracao), diario)
+            self._entradas_diario += 1
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o diário {self.arquivo_diario}: {e}")
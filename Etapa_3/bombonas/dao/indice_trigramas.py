@@ -0,0 +1,102 @@
+"""
+Índice de trigramas para busca aproximada (tolerante a acentos e erros de digitação)
+"""
+
+import heapq
+from collections import Counter
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+from dao.indice_busca import extrair_termos
+
+
+def extrair_trigramas(texto: str) -> FrozenSet[str]:
+    """
+    Retorna os trigramas do texto normalizado (sem acentos, minúsculas).
+    Cada palavra recebe dois espaços antes e um depois, de modo que o início
+    das palavras pesa mais: 'João' -> {'  j', ' jo', 'joa', 'oao', 'ao '}.
+    """
+
+    trigramas = set()
+    for palavra in extrair_termos(texto):
+        palavra = f"  {palavra} "
+        for i in range(len(palavra) - 2):
+            trigramas.add(palavra[i:i + 3])
+    return frozenset(trigramas)
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido trigrama -> chaves para busca aproximada de textos curtos (nomes).
+
+    A similaridade de um registro é a fração dos trigramas da consulta que ele
+    contém: digitar apenas parte do nome ('joao silv') ainda dá similaridade alta
+    para 'João da Silva Pereira', e um erro de digitação custa poucos trigramas.
+    Empates são desfeitos pela semelhança do texto inteiro (Jaccard), que favorece
+    os nomes mais próximos do tamanho do que foi digitado.
+    """
+
+    def __init__(self, registros: Iterable[Tuple[Hashable, str]] = ()):
+        """ Cria o índice a partir de pares (chave, texto). """
+
+        self._trigramas: Dict[Hashable, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+
+        for chave, texto in registros:
+            self.adicionar(chave, texto)
+
+    def __len__(self) -> int:
+        return len(self._trigramas)
+
+    def adicionar(self, chave: Hashable, texto: str) -> None:
+        """ Inclui (ou substitui) o texto de um registro. """
+
+        if chave in self._trigramas:
+            self.remover(chave)
+
+        trigramas = extrair_trigramas(texto)
+        self._trigramas[chave] = trigramas
+        for trigrama in trigramas:
+            postings = self._postings.get(trigrama)
+            if postings is None:
+                postings = self._postings[trigrama] = set()
+            postings.add(chave)
+
+    def remover(self, chave: Hashable) -> None:
+        """ Remove um registro do índice (se existir). """
+
+        for trigrama in self._trigramas.pop(chave, ()):
+            postings = self._postings[trigrama]
+            postings.discard(chave)
+            if not postings:
+                del self._postings[trigrama]
+
+    def buscar(self, consulta: str, limite: int = 10,
+               similaridade_minima: float = 0.5) -> List[Tuple[Hashable, float]]:
+        """
+        Retorna até 'limite' pares (chave, similaridade) em ordem decrescente de
+        similaridade (de 0 a 1), ignorando os registros abaixo da similaridade mínima.
+        """
+
+        trigramas_consulta = extrair_trigramas(consulta)
+        if not trigramas_consulta:
+            return []
+
+        # Conta quantos trigramas da consulta cada registro possui
+        comuns = Counter()
+        for trigrama in trigramas_consulta:
+            postings = self._postings.get(trigrama)
+            if postings:
+                comuns.update(postings)
+
+        total = len(trigramas_consulta)
+        minimo = similaridade_minima * total
+        candidatos = (
+            (
+                comum / total,
+                comum / (total + len(self._trigramas[chave]) - comum),
+                chave
+            )
+            for chave, comum in comuns.items() if comum >= minimo
+        )
+
+        melhores = heapq.nlargest(limite, candidatos, key=lambda c: (c[0], c[1]))
+        return [(chave, similaridade) for similaridade, _, chave in melhores]
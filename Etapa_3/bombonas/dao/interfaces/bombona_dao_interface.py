@@ -3,7 +3,7 @@ Interface para o DAO de Bombona
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from models.bombona import Bombona
 
 
@@ -29,11 +29,32 @@ class BombonaDAOInterface(ABC):
 
         pass
     
+    @abstractmethod
+    def salvar_em_lote(self, bombonas: List[Bombona]) -> None:
+        """ Salva várias bombonas novas no repositório de dados em uma única operação. """
+
+        pass
+
     @abstractmethod
     def listar_todas(self) -> List[Bombona]:
         """ Lista todas as bombonas do repositório. """
 
         pass
+
+    @abstractmethod
+    def iterar_registros(self) -> Iterator[tuple]:
+        """
+        Percorre os registros (codigo, volume, tipo_residuo, cpf_responsavel) um a um,
+        sem montar as bombonas nem carregar o arquivo inteiro em memória.
+        """
+
+        pass
+
+    @abstractmethod
+    def listar_codigos(self) -> List[str]:
+        """ Lista os códigos de todas as bombonas, em ordem crescente. """
+
+        pass
     
     @abstractmethod
     def buscar_por_codigo(self, codigo: str) -> Optional[Bombona]:
@@ -41,6 +62,18 @@ class BombonaDAOInterface(ABC):
 
         pass
     
+    @abstractmethod
+    def buscar_por_prefixo(self, prefixo: str) -> List[Bombona]:
+        """ Busca as bombonas cujo código começa com o prefixo informado, em ordem de código. """
+
+        pass
+
+    @abstractmethod
+    def buscar_intervalo(self, codigo_inicial: str, codigo_final: str) -> List[Bombona]:
+        """ Busca as bombonas com código entre os códigos informados (inclusive), em ordem de código. """
+
+        pass
+
     @abstractmethod
     def buscar_por_responsavel(self, cpf: str) -> List[Bombona]:
         """ Busca todas as bombonas de um responsável específico. """
@@ -59,8 +92,33 @@ class BombonaDAOInterface(ABC):
 
         pass
     
+    @abstractmethod
+    def transferir_bombonas(self, cpf_origem: str, responsavel_destino, codigos: List[str] = None) -> List[str]:
+        """ Transfere bombonas de um responsável para outro, retornando os códigos transferidos. """
+
+        pass
+    
+    @abstractmethod
+    def atualizar_em_lote(self, codigos: List[str], volume: float = None,
+                          tipo_residuo: str = None, responsavel=None) -> List[str]:
+        """ Aplica a mesma alteração a várias bombonas, retornando os códigos atualizados. """
+
+        pass
+    
+    @abstractmethod
+    def remover_em_lote(self, codigos: List[str]) -> List[str]:
+        """ Remove várias bombonas, retornando os códigos removidos. """
+
+        pass
+    
     @abstractmethod
     def existe_codigo(self, codigo: str) -> bool:
         """ Verifica se existe uma bombona com o código informado. """
-        
+
+        pass
+
+    @abstractmethod
+    def versao_dados(self) -> tuple:
+        """ Retorna um identificador que muda sempre que os dados armazenados mudam. """
+
         pass
\ No newline at end of file
@@ -40,6 +40,18 @@ class ResponsavelDAOInterface(ABC):
 
         pass
     
+    @abstractmethod
+    def buscar_por_prefixo_cpf(self, prefixo: str, limite: int = None) -> List[Responsavel]:
+        """ Busca os responsáveis cujo CPF começa com o prefixo informado, em ordem de CPF. """
+
+        pass
+
+    @abstractmethod
+    def listar_cpfs(self) -> List[str]:
+        """ Lista os CPFs de todos os responsáveis, em ordem crescente. """
+
+        pass
+
     @abstractmethod
     def remover(self, responsavel: Responsavel) -> None:
         """ Remove um responsável do repositório. """
@@ -55,5 +67,11 @@ class ResponsavelDAOInterface(ABC):
     @abstractmethod
     def existe_cpf(self, cpf: str) -> bool:
         """ Verifica se existe um responsável com o CPF informado. """
-        
+
+        pass
+
+    @abstractmethod
+    def versao_dados(self) -> tuple:
+        """ Retorna um identificador que muda sempre que os dados armazenados mudam. """
+
         pass
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Planejador das consultas com filtros combinados (setor, responsável, tipo e volume)
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from models.bombona import Bombona
+
+# Campos com índice de valores (valor -> posições das bombonas)
+CAMPOS_INDEXADOS = ('setor', 'cpf', 'tipo_residuo')
+
+
+class Predicado(NamedTuple):
+    """ Condição de um filtro com a quantidade de bombonas que a atendem. """
+
+    descricao: str
+    linhas: int
+    posicoes: Callable[[], List[int]]
+    testar: Callable[[int], bool]
+
+
+class Passo(NamedTuple):
+    """
+    Etapa de um plano. Operações: 'indice' (lê a lista de posições de um valor),
+    'intersecao' (cruza os candidatos com a lista de outro valor), 'verificacao'
+    (testa a condição em cada candidato) e 'varredura' (testa todas as bombonas).
+    """
+
+    operacao: str
+    predicado: Optional[Predicado]
+    custo: int
+    estimativa: int
+
+
+class PlanejadorFiltros:
+    """
+    Índices e estatísticas das bombonas para avaliar filtros combinados na
+    ordem mais barata.
+
+    Para cada setor, CPF e tipo de resíduo é guardada a lista de posições das
+    bombonas com aquele valor (cujo tamanho é a cardinalidade usada nas
+    estimativas); os volumes ficam ordenados para responder faixas por busca
+    binária. O plano parte da condição mais seletiva, cruza ou verifica as
+    demais conforme o que for mais barato e só varre todas as bombonas quando
+    isso custa menos que usar os índices.
+    """
+
+    def __init__(self, bombonas: Iterable[Bombona]):
+        """ Monta os índices a partir das bombonas (na ordem da listagem). """
+
+        self._bombonas: List[Bombona] = list(bombonas)
+        self._indices: Dict[str, Dict[str, List[int]]] = {campo: {} for campo in CAMPOS_INDEXADOS}
+        self._valores: Dict[str, List[str]] = {campo: [] for campo in CAMPOS_INDEXADOS}
+
+        for posicao, bombona in enumerate(self._bombonas):
+            responsavel = bombona.get_responsavel()
+            valores = {
+                'setor': responsavel.get_setor() if responsavel else '',
+                'cpf': responsavel.get_cpf() if responsavel else '',
+                'tipo_residuo': bombona.get_tipo_residuo()
+            }
+            for campo, valor in valores.items():
+                self._indices[campo].setdefault(valor, []).append(posicao)
+                self._valores[campo].append(valor)
+
+        # Volumes em ordem crescente e as posições correspondentes
+        self._ordem_volume = sorted(range(len(self._bombonas)), key=lambda p: self._bombonas[p].get_volume())
+        self._volumes = [self._bombonas[p].get_volume() for p in self._ordem_volume]
+
+    def total(self) -> int:
+        """ Quantidade de bombonas indexadas. """
+
+        return len(self._bombonas)
+
+    def estatisticas(self, campo: str) -> Dict[str, int]:
+        """ Quantidade de bombonas por valor do campo ('setor', 'cpf' ou 'tipo_residuo'). """
+
+        return {valor: len(posicoes) for valor, posicoes in self._indices[campo].items()}
+
+    def _predicado_valor(self, campo: str, valor: str) -> Predicado:
+        """ Condição campo == valor, respondida pelo índice do campo. """
+
+        posicoes = self._indices[campo].get(valor, [])
+        valores = self._valores[campo]
+        return Predicado(f"{campo} = {valor}", len(posicoes), lambda: posicoes,
+                         lambda p: valores[p] == valor)
+
+    def _predicado_volume(self, volume_min: float = None, volume_max: float = None) -> Predicado:
+        """ Condição volume_min <= volume <= volume_max, respondida pelos volumes ordenados. """
+
+        inicio = 0 if volume_min is None else bisect_left(self._volumes, volume_min)
+        fim = len(self._volumes) if volume_max is None else bisect_right(self._volumes, volume_max)
+        fim = max(inicio, fim)
+
+        minimo = float('-inf') if volume_min is None else volume_min
+        maximo = float('inf') if volume_max is None else volume_max
+        descricao = f"volume entre {'-' if volume_min is None else volume_min} e {'-' if volume_max is None else volume_max}"
+        return Predicado(descricao, fim - inicio, lambda: self._ordem_volume[inicio:fim],
+                         lambda p: minimo <= self._bombonas[p].get_volume() <= maximo)
+
+    def _predicados(self, setor: str = None, cpf: str = None, tipo_residuo: str = None,
+                    volume_min: float = None, volume_max: float = None) -> List[Predicado]:
+        """ Condições dos filtros informados (None = filtro não aplicado). """
+
+        predicados = []
+        for campo, valor in (('setor', setor), ('cpf', cpf), ('tipo_residuo', tipo_residuo)):
+            if valor is not None:
+                predicados.append(self._predicado_valor(campo, valor))
+        if volume_min is not None or volume_max is not None:
+            predicados.append(self._predicado_volume(volume_min, volume_max))
+        return predicados
+
+    def planejar(self, **filtros) -> List[Passo]:
+        """
+        Monta o plano dos filtros (setor, cpf, tipo_residuo, volume_min, volume_max).
+
+        O custo de cada passo é a quantidade de posições lidas ou testadas; a
+        estimativa de candidatos após cada passo supõe filtros independentes.
+        """
+
+        total = self.total()
+        predicados = sorted(self._predicados(**filtros), key=lambda p: p.linhas)
+        if not predicados:
+            return [Passo('varredura', None, total, total)]
+
+        # Plano com índices: parte da condição mais seletiva
+        primeiro = predicados[0]
+        estimativa = primeiro.linhas
+        plano = [Passo('indice', primeiro, primeiro.linhas, estimativa)]
+        for predicado in predicados[1:]:
+            proxima = estimativa * predicado.linhas / total if total else 0
+            proxima = max(1, round(proxima)) if proxima > 0 else 0
+            if predicado.linhas < estimativa:
+                plano.append(Passo('intersecao', predicado, predicado.linhas, proxima))
+            else:
+                plano.append(Passo('verificacao', predicado, estimativa, proxima))
+            estimativa = proxima
+
+        # Varredura: testa todas as condições em cada bombona
+        if sum(passo.custo for passo in plano) >= total:
+            return [Passo('varredura', predicado, total, plano[-1].estimativa) for predicado in predicados]
+        return plano
+
+    def executar(self, plano: List[Passo]) -> List[Bombona]:
+        """ Executa o plano e retorna as bombonas encontradas, na ordem da listagem. """
+
+        if plano[0].operacao == 'varredura':
+            testes = [passo.predicado.testar for passo in plano if passo.predicado]
+            return [b for p, b in enumerate(self._bombonas) if all(testar(p) for testar in testes)]
+
+        candidatos = set(plano[0].predicado.posicoes())
+        for passo in plano[1:]:
+            if not candidatos:
+                break
+            if passo.operacao == 'intersecao':
+                candidatos.intersection_update(passo.predicado.posicoes())
+            else:
+                testar = passo.predicado.testar
+                candidatos = {p for p in candidatos if testar(p)}
+
+        return [self._bombonas[p] for p in sorted(candidatos)]
+
+    def filtrar(self, **filtros) -> List[Bombona]:
+        """ Retorna as bombonas que atendem a todos os filtros, na ordem da listagem. """
+
+        return self.executar(self.planejar(**filtros))
+
+    def explicar(self, **filtros) -> str:
+        """ Descreve o plano escolhido para os filtros, com as estimativas de linhas. """
+
+        plano = self.planejar(**filtros)
+        linhas = [f"Plano de filtragem ({self.total()} bombonas):"]
+
+        if plano[0].operacao == 'varredura':
+            condicoes = ", ".join(f"{p.predicado.descricao} (~{p.predicado.linhas})" for p in plano if p.predicado)
+            linhas.append(f"  1. varredura de {self.total()} bombonas" + (f" testando {condicoes}" if condicoes else ""))
+            linhas.append(f"  resultado estimado: ~{plano[-1].estimativa} bombonas")
+            return "\n".join(linhas)
+
+        for numero, passo in enumerate(plano, 1):
+            predicado = passo.predicado
+            if passo.operacao == 'indice':
+                acao = f"índice {predicado.descricao}: {predicado.linhas} posições"
+            elif passo.operacao == 'intersecao':
+                acao = f"interseção com índice {predicado.descricao} ({predicado.linhas} posições)"
+            else:
+                acao = f"verificação de {predicado.descricao} nos candidatos (~{predicado.linhas} no índice)"
+            linhas.append(f"  {numero}. {acao} -> ~{passo.estimativa} candidatos (custo {passo.custo})")
+
+        linhas.append(f"  custo total: {sum(p.custo for p in plano)} (varredura: {self.total()})")
+        return "\n".join(linhas)
@@ -0,0 +1,171 @@
+"""
+Registro das alterações gravadas pelos DAOs (inclusões, atualizações e remoções, com data e hora)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from dao import eventos
+
+# Arquivo do registro (só recebe linhas no fim)
+ARQUIVO_REGISTRO = "data/alteracoes.log"
+
+# Operações registradas
+INCLUSAO = "inclusao"
+ATUALIZACAO = "atualizacao"
+REMOCAO = "remocao"
+
+# Data e hora no início de cada linha: tamanho fixo, de modo que a ordem do texto é a ordem cronológica
+FORMATO_MOMENTO = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+class Entrada(NamedTuple):
+    """
+    Alteração de um registro. 'registro' está no formato do arquivo do DAO
+    (ver eventos.Alteracao); nas remoções só a chave é conhecida.
+    """
+
+    momento: datetime
+    entidade: str
+    operacao: str
+    chave: str
+    registro: Optional[tuple]
+
+
+class RegistroAlteracoes:
+    """
+    Guarda num arquivo, em ordem cronológica, cada inclusão, atualização e
+    remoção publicada pelos DAOs (dao.eventos), uma por linha, começando pela
+    data e hora.
+
+    Como as linhas estão ordenadas, a leitura das alterações a partir de uma
+    data localiza a primeira linha por busca binária no arquivo e lê só dali
+    em diante: o custo depende da quantidade de alterações no período, não do
+    tamanho do registro nem da quantidade de bombonas.
+    """
+
+    def __init__(self, arquivo: str = ARQUIVO_REGISTRO):
+        """ Usa o arquivo informado (criado na primeira alteração). """
+
+        self.arquivo = arquivo
+        self._trava = threading.Lock()
+        self._ultimo_momento = datetime.min
+
+    def registrar_alteracao(self, alteracao: eventos.Alteracao) -> None:
+        """ Acrescenta ao arquivo as inclusões, atualizações e remoções de uma gravação de DAO. """
+
+        operacoes = (
+            [(INCLUSAO, registro[0], registro) for registro in alteracao.incluidos]
+            + [(ATUALIZACAO, registro[0], registro) for registro in alteracao.atualizados]
+            + [(REMOCAO, chave, None) for chave in alteracao.removidos]
+        )
+        if not operacoes:
+            return
+
+        with self._trava:
+            # Mantém a ordem do arquivo mesmo se o relógio do sistema voltar
+            momento = max(datetime.now(), self._ultimo_momento)
+            self._ultimo_momento = momento
+            texto_momento = momento.strftime(FORMATO_MOMENTO)
+
+            linhas = ''.join(
+                f"{texto_momento}\t{json.dumps([alteracao.entidade, operacao, chave, registro], ensure_ascii=False)}\n"
+                for operacao, chave, registro in operacoes
+            )
+            pasta = os.path.dirname(self.arquivo)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            # Uma única escrita no fim do arquivo por gravação
+            with open(self.arquivo, 'a', encoding='utf-8') as f:
+                f.write(linhas)
+
+    @staticmethod
+    def _linha_em(arquivo, posicao: int):
+        """ Primeira linha completa que começa em 'posicao' ou depois: (início, linha). """
+
+        if posicao == 0:
+            arquivo.seek(0)
+        else:
+            arquivo.seek(posicao - 1)
+            arquivo.readline()
+        inicio = arquivo.tell()
+        return inicio, arquivo.readline()
+
+    def _posicao_inicial(self, arquivo, tamanho: int, desde: datetime) -> int:
+        """ Início da primeira linha com data e hora >= 'desde' (busca binária nas posições do arquivo). """
+
+        chave = desde.strftime(FORMATO_MOMENTO).encode('ascii')
+        inicio, fim = 0, tamanho
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            _, linha = self._linha_em(arquivo, meio)
+            if not linha or linha[:len(chave)] >= chave:
+                fim = meio
+            else:
+                inicio = meio + 1
+        return self._linha_em(arquivo, inicio)[0]
+
+    def entradas(self, desde: datetime = None, ate: datetime = None, entidade: str = None) -> Iterator[Entrada]:
+        """ Alterações registradas no período (de 'desde' inclusive até 'ate' exclusive), em ordem. """
+
+        try:
+            arquivo = open(self.arquivo, 'rb')
+        except FileNotFoundError:
+            return
+
+        with arquivo:
+            tamanho = os.fstat(arquivo.fileno()).st_size
+            arquivo.seek(self._posicao_inicial(arquivo, tamanho, desde) if desde else 0)
+            limite = ate.strftime(FORMATO_MOMENTO).encode('ascii') if ate else None
+
+            for linha in arquivo:
+                texto_momento, _, dados = linha.partition(b'\t')
+                if limite is not None and texto_momento >= limite:
+                    break
+                try:
+                    entidade_linha, operacao, chave, registro = json.loads(dados)
+                    momento = datetime.fromisoformat(texto_momento.decode('ascii'))  # FORMATO_MOMENTO é ISO 8601
+                except ValueError:
+                    continue  # Linha incompleta (gravação interrompida)
+                if entidade is None or entidade_linha == entidade:
+                    yield Entrada(momento, entidade_linha, operacao, chave,
+                                  tuple(registro) if registro is not None else None)
+
+    def resumir(self, entidade: str, desde: datetime, ate: datetime = None) -> List[Entrada]:
+        """
+        Efeito líquido das alterações de uma entidade no período, uma entrada por
+        chave (a da última alteração, com o último registro conhecido):
+        incluído e removido no período não aparece; incluído e depois alterado
+        conta como inclusão; existente antes e removido conta como remoção.
+        """
+
+        por_chave: Dict[str, list] = {}  # Chave -> [primeira operação, última entrada, último registro]
+        for entrada in self.entradas(desde, ate, entidade):
+            item = por_chave.get(entrada.chave)
+            if item is None:
+                por_chave[entrada.chave] = [entrada.operacao, entrada, entrada.registro]
+            else:
+                item[1] = entrada
+                if entrada.registro is not None:
+                    item[2] = entrada.registro
+
+        resumo = []
+        for primeira, ultima, registro in por_chave.values():
+            if ultima.operacao == REMOCAO:
+                if primeira == INCLUSAO:
+                    continue
+                operacao = REMOCAO
+            else:
+                operacao = INCLUSAO if primeira == INCLUSAO else ATUALIZACAO
+            resumo.append(Entrada(ultima.momento, entidade, operacao, ultima.chave, registro))
+
+        resumo.sort(key=lambda entrada: entrada.momento)
+        return resumo
+
+
+# Registro usado pelos controllers (inscrito nas alterações publicadas pelos DAOs)
+registro_compartilhado = RegistroAlteracoes()
+eventos.inscrever(registro_compartilhado.registrar_alteracao)
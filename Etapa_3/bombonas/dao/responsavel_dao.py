@@ -5,7 +5,10 @@ Implementação do DAO para Responsável usando arquivo CSV
 import csv
 import os
 from typing import List, Optional
+from dao import eventos
 from dao.interfaces.responsavel_dao_interface import ResponsavelDAOInterface
+from dao.indice_offsets import IndiceOffsets
+from dao.snapshot_binario import SnapshotBinario
 from models.responsavel import Responsavel
 
 
@@ -18,6 +21,8 @@ class ResponsavelDAO(ResponsavelDAOInterface):
         """ Inicializa o DAO do Responsável. """
 
         self.arquivo_csv = arquivo_csv
+        self._snapshot = SnapshotBinario(arquivo_csv)
+        self._indice_cpfs = IndiceOffsets(arquivo_csv)
         self._criar_arquivo_se_nao_existir()
     
     def _criar_arquivo_se_nao_existir(self) -> None:
@@ -32,23 +37,46 @@ class ResponsavelDAO(ResponsavelDAOInterface):
                 writer = csv.writer(arquivo)
                 writer.writerow(['cpf', 'nome', 'telefone', 'setor'])
     
+    def _ler_registros(self) -> List[tuple]:
+        """
+        Lê os registros (cpf, nome, telefone, setor) do arquivo.
+        Usa o snapshot binário quando ele está atualizado e, caso contrário,
+        lê o CSV e regrava o snapshot.
+        """
+
+        registros = self._snapshot.carregar()
+        if registros is not None:
+            return registros
+        
+        registros = []
+        with open(self.arquivo_csv, 'r', encoding='utf-8') as arquivo:
+            reader = csv.DictReader(arquivo)
+            for linha in reader:
+                if linha['cpf'] and linha['cpf'].strip():  # Pula linhas vazias
+                    registros.append((
+                        linha['cpf'].strip(),
+                        linha['nome'].strip(),
+                        linha['telefone'].strip(),
+                        linha['setor'].strip()
+                    ))
+        
+        self._snapshot.salvar(registros)
+        return registros
+    
     def _carregar_responsaveis(self) -> List[Responsavel]:
         """ Carrega os responsáveis do arquivo CSV. """
 
         responsaveis = []
         
         try:
-            with open(self.arquivo_csv, 'r', encoding='utf-8') as arquivo:
-                reader = csv.DictReader(arquivo)
-                for linha in reader:
-                    if linha['cpf'] and linha['cpf'].strip():  # Pula linhas vazias
-                        responsavel = Responsavel(
-                            cpf=linha['cpf'].strip(),
-                            nome=linha['nome'].strip(),
-                            telefone=linha['telefone'].strip(),
-                            setor=linha['setor'].strip()
-                        )
-                        responsaveis.append(responsavel)
+            for cpf, nome, telefone, setor in self._ler_registros():
+                responsavel = Responsavel(
+                    cpf=cpf,
+                    nome=nome,
+                    telefone=telefone,
+                    setor=setor
+                )
+                responsaveis.append(responsavel)
         except FileNotFoundError:
             responsaveis = []
         except Exception as e:
@@ -57,24 +85,44 @@ class ResponsavelDAO(ResponsavelDAOInterface):
         
         return responsaveis
     
-    def _salvar_responsaveis(self, responsaveis: List[Responsavel]) -> None:
-        """ Salva todos os responsáveis no arquivo CSV. """
+    @staticmethod
+    def _registro(responsavel: Responsavel) -> tuple:
+        """ Converte um responsável no registro gravado (cpf, nome, telefone, setor). """
+
+        return (responsavel.get_cpf(), responsavel.get_nome(), responsavel.get_telefone(), responsavel.get_setor())
+    
+    def _salvar_responsaveis(self, responsaveis: List[Responsavel], incluidos: List[Responsavel] = (),
+                             atualizados: List[Responsavel] = (), removidos: List[str] = ()) -> None:
+        """
+        Salva todos os responsáveis no arquivo CSV, atualiza o snapshot binário e
+        o filtro de CPFs e publica os responsáveis incluídos, atualizados e
+        removidos nesta escrita.
+        """
 
+        registros = [self._registro(r) for r in responsaveis]
+        
+        assinatura_anterior = self._indice_cpfs.assinatura()
+        
         try:
             with open(self.arquivo_csv, 'w', newline='', encoding='utf-8') as arquivo:
                 writer = csv.writer(arquivo)
                 writer.writerow(['cpf', 'nome', 'telefone', 'setor'])
-                
-                for responsavel in responsaveis:
-                    writer.writerow([
-                        responsavel.get_cpf(),
-                        responsavel.get_nome(),
-                        responsavel.get_telefone(),
-                        responsavel.get_setor()
-                    ])
+                writer.writerows(registros)
         except Exception as e:
             print(f"Erro ao salvar responsáveis: {e}")
             raise
+        
+        self._snapshot.salvar(registros)
+        self._indice_cpfs.registrar_escrita(assinatura_anterior, [r.get_cpf() for r in incluidos])
+        
+        eventos.publicar(
+            eventos.RESPONSAVEIS,
+            assinatura_anterior,
+            self._indice_cpfs.assinatura(),
+            incluidos=(self._registro(r) for r in incluidos),
+            atualizados=(self._registro(r) for r in atualizados),
+            removidos=removidos
+        )
     
     def salvar(self, responsavel: Responsavel) -> None:
         """ Salva um responsável no repositório. """
@@ -89,7 +137,7 @@ class ResponsavelDAO(ResponsavelDAOInterface):
         
         # Adiciona o novo responsável e salva
         responsaveis_existentes.append(responsavel)
-        self._salvar_responsaveis(responsaveis_existentes)
+        self._salvar_responsaveis(responsaveis_existentes, incluidos=[responsavel])
     
     def listar_todos(self) -> List[Responsavel]:
         """ Lista todos os responsáveis. """
@@ -97,20 +145,36 @@ class ResponsavelDAO(ResponsavelDAOInterface):
         return self._carregar_responsaveis()
     
     def buscar_por_cpf(self, cpf: str) -> Optional[Responsavel]:
-        """ Busca um responsável pelo CPF. """
+        """ Busca um responsável pelo CPF lendo apenas a sua linha (via índice de CPFs). """
+
+        linha = self._indice_cpfs.buscar(cpf)
+        if not linha:
+            return None
+        
+        cpf, nome, telefone, setor = (campo.strip() for campo in linha)
+        return Responsavel(cpf=cpf, nome=nome, telefone=telefone, setor=setor)
+
+    def buscar_por_prefixo_cpf(self, prefixo: str, limite: int = None) -> List[Responsavel]:
+        """ Busca os responsáveis cujo CPF começa com o prefixo, lendo apenas as linhas encontradas. """
+
+        responsaveis = []
+        for linha in self._indice_cpfs.buscar_prefixo(prefixo, limite):
+            cpf, nome, telefone, setor = (campo.strip() for campo in linha)
+            responsaveis.append(Responsavel(cpf=cpf, nome=nome, telefone=telefone, setor=setor))
+        return responsaveis
+
+    def listar_cpfs(self) -> List[str]:
+        """ Lista os CPFs cadastrados em ordem crescente, sem carregar os responsáveis. """
+
+        return self._indice_cpfs.chaves()
 
-        responsaveis = self._carregar_responsaveis()
-        for responsavel in responsaveis:
-            if responsavel.get_cpf() == cpf:
-                return responsavel
-        return None
-    
     def remover(self, responsavel: Responsavel) -> None:
         """ Remove um responsável do repositório. """
 
         responsaveis = self._carregar_responsaveis()
         responsaveis_filtrados = [r for r in responsaveis if r.get_cpf() != responsavel.get_cpf()]
-        self._salvar_responsaveis(responsaveis_filtrados)
+        removidos = [responsavel.get_cpf()] if len(responsaveis_filtrados) < len(responsaveis) else []
+        self._salvar_responsaveis(responsaveis_filtrados, removidos=removidos)
     
     def atualizar(self, responsavel: Responsavel) -> None:
         """ Atualiza os dados de um responsável. """
@@ -119,11 +183,19 @@ class ResponsavelDAO(ResponsavelDAOInterface):
         for i, r in enumerate(responsaveis):
             if r.get_cpf() == responsavel.get_cpf():
                 responsaveis[i] = responsavel
-                self._salvar_responsaveis(responsaveis)
+                self._salvar_responsaveis(responsaveis, atualizados=[responsavel])
                 return
         raise ValueError(f"Responsável com CPF {responsavel.get_cpf()} não encontrado")
     
     def existe_cpf(self, cpf: str) -> bool:
-        """ Verifica se existe um responsável com o CPF informado. """
+        """
+        Verifica se existe um responsável com o CPF informado.
+        CPFs novos (caso mais comum) são descartados pelo filtro de Bloom sem acessar o arquivo.
+        """
         
-        return self.buscar_por_cpf(cpf) is not None
\ No newline at end of file
+        return self._indice_cpfs.contem(cpf)
+
+    def versao_dados(self) -> tuple:
+        """ Retorna a versão dos dados: (tamanho, mtime) do arquivo CSV. """
+
+        return self._indice_cpfs.assinatura()
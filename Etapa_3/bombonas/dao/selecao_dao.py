@@ -0,0 +1,38 @@
+"""
+Escolha da implementação do DAO de bombonas usada pelo sistema
+"""
+
+import os
+
+from dao.interfaces.bombona_dao_interface import BombonaDAOInterface
+
+# Variável de ambiente que escolhe o armazenamento das bombonas
+VARIAVEL_ARMAZENAMENTO = "BOMBONAS_ARMAZENAMENTO"
+
+# Armazenamentos aceitos (o primeiro é o padrão)
+ARMAZENAMENTOS = ('csv', 'registro_fixo')
+
+
+def armazenamento_configurado() -> str:
+    """ Retorna o armazenamento escolhido em BOMBONAS_ARMAZENAMENTO ('csv' se não informado). """
+
+    armazenamento = os.environ.get(VARIAVEL_ARMAZENAMENTO, '').strip().lower() or ARMAZENAMENTOS[0]
+    if armazenamento not in ARMAZENAMENTOS:
+        print(f"ERRO: {VARIAVEL_ARMAZENAMENTO}={armazenamento} inválido")
+        raise ValueError(f"Armazenamento '{armazenamento}' inválido. Use: {', '.join(ARMAZENAMENTOS)}")
+    return armazenamento
+
+
+def criar_bombona_dao() -> BombonaDAOInterface:
+    """
+    Cria o DAO de bombonas do armazenamento configurado: 'csv' (data/bombonas.csv)
+    ou 'registro_fixo' (data/bombonas.dat, ver dao.bombona_dao_registro_fixo).
+    """
+
+    # Import dinâmico das implementações (mantém baixo acoplamento)
+    if armazenamento_configurado() == 'registro_fixo':
+        from dao.bombona_dao_registro_fixo import BombonaDAORegistroFixo
+        return BombonaDAORegistroFixo()
+
+    from dao.bombona_dao import BombonaDAO
+    return BombonaDAO()
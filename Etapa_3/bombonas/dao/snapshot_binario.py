@@ -0,0 +1,99 @@
+"""
+Snapshot binário dos arquivos CSV para carregamento rápido
+"""
+
+import hashlib
+import marshal
+import os
+import time
+from typing import List, Optional
+
+# Versão do formato do snapshot (incrementar ao mudar a estrutura gravada)
+VERSAO_FORMATO = 2
+
+# Intervalo (ns) em que o mtime do CSV não distingue duas escritas seguidas:
+# cobre a granularidade dos sistemas de arquivos mais grosseiros (FAT: 2 s)
+MARGEM_MTIME_NS = 2_000_000_000
+
+
+class SnapshotBinario:
+    """
+    Mantém uma cópia binária (marshal) dos registros de um arquivo CSV.
+    O snapshot guarda o tamanho, a data de modificação e o hash do CSV de onde
+    veio, além do instante em que foi gravado; se qualquer um deles não
+    conferir, é considerado desatualizado e o DAO volta a ler o CSV.
+
+    Tamanho e mtime bastam quando o CSV foi modificado bem antes do snapshot
+    ser gravado. O hash só é conferido quando a diferença fica dentro de
+    MARGEM_MTIME_NS (uma nova escrita poderia manter o mesmo mtime); depois que
+    a margem passa, o snapshot é regravado como confirmado e as próximas
+    cargas voltam a usar apenas o stat.
+    """
+
+    def __init__(self, arquivo_csv: str):
+        """ Inicializa o snapshot associado ao arquivo CSV informado. """
+
+        self.arquivo_csv = arquivo_csv
+        self.arquivo_snapshot = f"{arquivo_csv}.snap"
+
+    def _chave_csv(self, conferir_hash: bool = True) -> Optional[tuple]:
+        """ Retorna (tamanho, mtime, hash) do CSV atual, ou None se ele não existir. """
+
+        try:
+            info = os.stat(self.arquivo_csv)
+        except OSError:
+            return None
+
+        if not conferir_hash:
+            return (info.st_size, info.st_mtime_ns, None)
+
+        with open(self.arquivo_csv, 'rb') as arquivo:
+            digest = hashlib.blake2b(arquivo.read(), digest_size=16).digest()
+
+        return (info.st_size, info.st_mtime_ns, digest)
+
+    def carregar(self) -> Optional[List[tuple]]:
+        """ Retorna os registros do snapshot, ou None se ele não existir ou estiver desatualizado. """
+
+        try:
+            with open(self.arquivo_snapshot, 'rb') as arquivo:
+                # marshal.loads sobre o conteúdo inteiro é bem mais rápido que marshal.load(arquivo)
+                versao, tamanho, mtime, digest, gravado_em, registros = marshal.loads(arquivo.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if versao != VERSAO_FORMATO:
+            return None
+
+        # Tamanho e mtime (apenas stat) decidem quase sempre
+        chave = self._chave_csv(conferir_hash=False)
+        if chave is None or chave[:2] != (tamanho, mtime):
+            return None
+
+        # CSV gravado pouco antes do snapshot: o mtime é ambíguo e só o hash decide
+        if gravado_em - mtime < MARGEM_MTIME_NS:
+            if self._chave_csv()[2] != digest:
+                return None
+            if time.time_ns() - mtime >= MARGEM_MTIME_NS:
+                self._gravar((tamanho, mtime, digest), registros)
+
+        return registros
+
+    def salvar(self, registros: List[tuple]) -> None:
+        """ Grava o snapshot dos registros correspondentes ao conteúdo atual do CSV. """
+
+        chave = self._chave_csv()
+        if chave is not None:
+            self._gravar(chave, registros)
+
+    def _gravar(self, chave: tuple, registros: List[tuple]) -> None:
+        """ Grava o snapshot com a chave (tamanho, mtime, hash) do CSV e o instante atual. """
+
+        arquivo_temp = f"{self.arquivo_snapshot}.tmp"
+        try:
+            with open(arquivo_temp, 'wb') as arquivo:
+                arquivo.write(marshal.dumps((VERSAO_FORMATO, *chave, time.time_ns(), registros)))
+            os.replace(arquivo_temp, self.arquivo_snapshot)
+        except OSError as e:
+            # O snapshot é apenas uma otimização; o CSV continua sendo a fonte dos dados
+            print(f"Aviso: não foi possível gravar o snapshot {self.arquivo_snapshot}: {e}")
@@ -0,0 +1,128 @@
+"""
+Alocador de códigos livres no espaço de códigos LLL-111 das bombonas
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Cada prefixo de 3 letras possui 1000 códigos (000 a 999)
+CODIGOS_POR_PREFIXO = 1000
+
+# Códigos que ocupam uma posição do mapa de bits (outros formatos não conflitam com os sugeridos)
+_FORMATO_CODIGO = re.compile(r'[A-Z]{3}-[0-9]{3}')
+
+
+class AlocadorCodigos:
+    """
+    Mantém um mapa de bits dos códigos usados de cada prefixo (125 bytes por
+    prefixo) e um cursor com o menor número possivelmente livre, de modo que
+    obter o próximo código livre custa O(1) amortizado.
+    """
+
+    def __init__(self, codigos_usados: Iterable[str] = ()):
+        """ Inicializa o alocador marcando os códigos já usados. """
+
+        self._mapas: Dict[str, bytearray] = {}
+        self._cursores: Dict[str, int] = {}
+
+        for codigo in codigos_usados:
+            self.marcar_usado(codigo)
+
+    @staticmethod
+    def _validar_prefixo(prefixo: str) -> str:
+        """ Valida e formata o prefixo (3 letras). """
+
+        if not prefixo or not isinstance(prefixo, str):
+            raise ValueError("Prefixo do código não pode ser vazio")
+
+        prefixo = prefixo.strip().upper()
+        if len(prefixo) != 3 or not prefixo.isalpha():
+            raise ValueError("Prefixo do código deve ter exatamente 3 letras")
+
+        return prefixo
+
+    def _mapa(self, prefixo: str) -> bytearray:
+        """ Retorna (criando se necessário) o mapa de bits do prefixo. """
+
+        mapa = self._mapas.get(prefixo)
+        if mapa is None:
+            mapa = self._mapas[prefixo] = bytearray(CODIGOS_POR_PREFIXO // 8)
+            self._cursores[prefixo] = 0
+        return mapa
+
+    @staticmethod
+    def _posicao(codigo: str) -> Optional[Tuple[str, int]]:
+        """ (prefixo, número) de um código LLL-111; None para códigos em outro formato. """
+
+        if not isinstance(codigo, str) or not _FORMATO_CODIGO.fullmatch(codigo):
+            return None
+        return codigo[:3], int(codigo[4:])
+
+    def marcar_usado(self, codigo: str) -> None:
+        """ Marca um código no formato LLL-111 como usado (códigos em outro formato são ignorados). """
+
+        posicao = self._posicao(codigo)
+        if posicao is None:
+            return
+        prefixo, numero = posicao
+        self._mapa(prefixo)[numero >> 3] |= 1 << (numero & 7)
+
+    def liberar(self, codigo: str) -> None:
+        """ Marca um código como livre novamente. """
+
+        posicao = self._posicao(codigo)
+        if posicao is None:
+            return
+        prefixo, numero = posicao
+        self._mapa(prefixo)[numero >> 3] &= ~(1 << (numero & 7)) & 0xFF
+        self._cursores[prefixo] = min(self._cursores[prefixo], numero)
+
+    def _buscar_livre(self, prefixo: str, inicio: int) -> int:
+        """ Retorna o menor número livre a partir de 'inicio', ou -1 se o prefixo estiver cheio. """
+
+        mapa = self._mapa(prefixo)
+        numero = inicio
+        while numero < CODIGOS_POR_PREFIXO:
+            byte = mapa[numero >> 3]
+            if byte == 0xFF:
+                # Byte inteiro ocupado: salta para o próximo
+                numero = (numero | 7) + 1
+                continue
+            if not byte & (1 << (numero & 7)):
+                return numero
+            numero += 1
+        return -1
+
+    def proximo_livre(self, prefixo: str) -> str:
+        """ Retorna (sem reservar) o próximo código livre do prefixo. """
+
+        return self.proximos_livres(prefixo, 1, reservar=False)[0]
+
+    def proximos_livres(self, prefixo: str, quantidade: int, reservar: bool = True) -> List[str]:
+        """
+        Retorna os próximos 'quantidade' códigos livres do prefixo, em ordem crescente.
+        Com 'reservar', os códigos são marcados como usados.
+        """
+
+        prefixo = self._validar_prefixo(prefixo)
+        if quantidade < 1:
+            raise ValueError("Quantidade de códigos deve ser maior que zero")
+
+        cursor = self._cursores.get(prefixo, 0)
+        codigos = []
+        numero = cursor
+        while len(codigos) < quantidade:
+            numero = self._buscar_livre(prefixo, numero)
+            if numero < 0:
+                raise ValueError(f"Não há {quantidade} código(s) livre(s) com o prefixo {prefixo}")
+            codigos.append(f"{prefixo}-{numero:03d}")
+            numero += 1
+
+        # Tudo antes do primeiro código encontrado está ocupado
+        self._cursores[prefixo] = int(codigos[0][4:])
+
+        if reservar:
+            for codigo in codigos:
+                self.marcar_usado(codigo)
+
+        return codigos
@@ -22,15 +22,15 @@ class BombonaFactory:
         """ Cria uma nova instância de Bombona com validação dos dados próprios. """
 
         # Valida e formata apenas os dados da bombona
-        codigo_formatado = cls._validar_e_formatar_codigo(codigo)
-        volume_validado = cls._validar_volume(volume)
-        tipo_residuo_formatado = cls._validar_e_formatar_tipo_residuo(tipo_residuo)
+        codigo_formatado = cls.validar_e_formatar_codigo(codigo)
+        volume_validado = cls.validar_volume(volume)
+        tipo_residuo_formatado = cls.validar_e_formatar_tipo_residuo(tipo_residuo)
         
         # Cria e retorna a bombona SEM responsável (será definido pelo Controller)
         return Bombona(codigo_formatado, volume_validado, tipo_residuo_formatado, responsavel=None)
     
     @classmethod
-    def _validar_e_formatar_codigo(cls, codigo: str) -> str:
+    def validar_e_formatar_codigo(cls, codigo: str) -> str:
         """
         Valida e formata o código da bombona no formato 'LLL-111' (3 letras + 3 números).
         O usuário pode digitar sem o hífen e em qualquer case.
@@ -63,7 +63,7 @@ class BombonaFactory:
         return codigo_formatado
     
     @classmethod
-    def _validar_volume(cls, volume: float) -> float:
+    def validar_volume(cls, volume: float) -> float:
         """ Valida o volume da bombona. """
 
         if not isinstance(volume, (int, float)):
@@ -82,7 +82,7 @@ class BombonaFactory:
         return round(float(volume), 2)
     
     @classmethod
-    def _validar_e_formatar_tipo_residuo(cls, tipo_residuo: str) -> str:
+    def validar_e_formatar_tipo_residuo(cls, tipo_residuo: str) -> str:
         """ Valida e formata o tipo de resíduo. """
 
         if not tipo_residuo or not isinstance(tipo_residuo, str):
@@ -11,6 +11,12 @@ import os
 # Adiciona o diretório raiz ao path para imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Espera após a última tecla antes de executar a busca global (ms)
+ATRASO_BUSCA_MS = 200
+
+# Quantidade máxima de resultados exibidos na busca global
+LIMITE_RESULTADOS_BUSCA = 20
+
 class SistemaBombonas:
     """
     Classe principal que inicializa e coordena o sistema.
@@ -20,6 +26,8 @@ class SistemaBombonas:
         """Inicializa o sistema."""
         self.root = None
         self.janela_login = None
+        self.busca_controller = None
+        self._busca_agendada = None
 
     def _iniciar_sistema_principal(self):
         """Inicia o sistema principal após login bem-sucedido."""
@@ -35,7 +43,7 @@ class SistemaBombonas:
         """Cria a interface gráfica principal."""
         self.root = tk.Tk()
         self.root.title("Sistema de Gerenciamento de Bombonas")
-        self.root.geometry("600x700")
+        self.root.geometry("600x860")
         self.root.resizable(True, True)
 
         # Centraliza a janela
@@ -62,7 +70,7 @@ class SistemaBombonas:
 
         # Dimensões da janela
         largura_janela = 600
-        altura_janela = 700
+        altura_janela = 860
 
         # Calcula posição X (centro horizontal)
         x = (largura_tela - largura_janela) // 2
@@ -114,7 +122,10 @@ class SistemaBombonas:
             text="Sistema de Gerenciamento de Bombonas",
             style='Title.TLabel'
         )
-        titulo.pack(pady=(0, 30))
+        titulo.pack(pady=(0, 20))
+
+        # Busca global (qualquer campo de bombonas e responsáveis)
+        self._criar_busca_global(main_frame)
 
         # Subtítulo
         subtitulo = ttk.Label(
@@ -183,6 +194,61 @@ class SistemaBombonas:
             width=20
         ).pack(pady=(30, 0))
 
+    def _criar_busca_global(self, parent):
+        """Cria a caixa de busca global com a tabela de resultados."""
+        from controllers.busca_controller import BuscaController
+        self.busca_controller = BuscaController()
+
+        busca_frame = ttk.LabelFrame(
+            parent,
+            text="Busca global (código, nome, CPF, telefone, setor...)",
+            padding="10"
+        )
+        busca_frame.pack(fill=tk.X, pady=(0, 20))
+
+        self.var_busca_global = tk.StringVar()
+        ttk.Entry(busca_frame, textvariable=self.var_busca_global).pack(fill=tk.X)
+        self.var_busca_global.trace_add('write', lambda *_: self._agendar_busca_global())
+
+        colunas = ('Tipo', 'Identificação', 'Detalhes')
+        self.tree_busca = ttk.Treeview(busca_frame, columns=colunas, show='headings', height=6)
+        self.tree_busca.heading('Tipo', text='Tipo')
+        self.tree_busca.heading('Identificação', text='Identificação')
+        self.tree_busca.heading('Detalhes', text='Detalhes')
+        self.tree_busca.column('Tipo', width=90)
+        self.tree_busca.column('Identificação', width=160)
+        self.tree_busca.column('Detalhes', width=280)
+        self.tree_busca.pack(fill=tk.X, pady=(10, 0))
+
+    def _agendar_busca_global(self):
+        """Agenda a busca global para depois de uma pausa na digitação (debounce)."""
+        if self._busca_agendada is not None:
+            self.root.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.root.after(ATRASO_BUSCA_MS, self._executar_busca_global)
+
+    def _executar_busca_global(self):
+        """Exibe os resultados da busca global, do mais ao menos relevante."""
+        from models.bombona import Bombona
+
+        self._busca_agendada = None
+        self.tree_busca.delete(*self.tree_busca.get_children())
+
+        texto = self.var_busca_global.get().strip()
+        if not texto:
+            return
+
+        for resultado in self.busca_controller.buscar(texto, LIMITE_RESULTADOS_BUSCA):
+            if isinstance(resultado, Bombona):
+                responsavel = resultado.get_responsavel()
+                detalhes = (f"{resultado.get_volume():.1f} L - {resultado.get_tipo_residuo()} - "
+                            f"{responsavel.get_nome() if responsavel else 'N/A'}")
+                valores = ('Bombona', resultado.get_codigo(), detalhes)
+            else:
+                detalhes = (f"CPF: {resultado.get_cpf()} - Tel.: {resultado.get_telefone()} - "
+                            f"{resultado.get_setor()}")
+                valores = ('Responsável', resultado.get_nome(), detalhes)
+            self.tree_busca.insert('', tk.END, values=valores)
+
     def _abrir_cadastro_responsavel(self):
         """Abre a tela de cadastro de responsável."""
         try:
@@ -0,0 +1,22 @@
+"""
+Módulo de relatórios.
+Contém o apoio à geração dos arquivos de relatório (motor de PDF, escritores de
+CSV e XLSX, exportação Parquet/Arrow, HTML paginado, relatório de alterações,
+folhas de etiquetas, cache dos arquivos gerados e pacote com vários relatórios).
+"""
+
+from .cache_relatorios import CacheRelatorios
+from .escritor_csv import EscritorCSV
+from .escritor_xlsx import EscritorXLSX
+from .etiquetas import FolhaEtiquetas
+from .exportador_colunar import ExportadorColunar
+from .motor_pdf import ModeloTabela, MotorPDF
+from .pacote_relatorios import PacoteRelatorios
+from .publicador_html import PublicadorHTML
+from .relatorio_alteracoes import gerar_relatorio_alteracoes
+
+__all__ = [
+    'CacheRelatorios', 'EscritorCSV', 'EscritorXLSX', 'ExportadorColunar',
+    'FolhaEtiquetas', 'ModeloTabela', 'MotorPDF', 'PacoteRelatorios', 'PublicadorHTML',
+    'gerar_relatorio_alteracoes'
+]
@@ -0,0 +1,440 @@
+"""
+Agendador de relatórios sem interface gráfica (gera os relatórios nos horários configurados)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+# Configuração dos agendamentos e estado das execuções (versão dos dados usada por tarefa)
+ARQUIVO_CONFIGURACAO = "data/agendamentos.json"
+ARQUIVO_ESTADO = "data/agendador_estado.json"
+
+# Tarefas executadas ao mesmo tempo, se a configuração não informar
+PROCESSOS_PADRAO = 2
+
+# Espera máxima (s) entre duas verificações do arquivo de configuração
+INTERVALO_CONFIGURACAO = 60
+
+# Relatórios e formatos que podem ser agendados
+RELATORIOS = ('bombonas', 'responsaveis')
+FORMATOS = ('csv', 'pdf', 'xlsx', 'html', 'parquet', 'arrow')
+
+# Filtros aceitos nas tarefas de bombonas (os mesmos de BombonaController.filtrar_bombonas)
+FILTROS = ('setor', 'cpf', 'tipo_residuo', 'volume_min', 'volume_max')
+
+# Campos da agenda (como no cron): minuto, hora, dia do mês, mês, dia da semana (0 = domingo)
+CAMPOS_AGENDA = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+# Atalhos de agenda
+APELIDOS_AGENDA = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+logger = logging.getLogger(__name__)
+
+
+class Agenda:
+    """
+    Agenda no formato do cron ('minuto hora dia mês dia_da_semana'), com '*',
+    listas (1,15), intervalos (1-5), passos (*/15, 0-30/10) e os atalhos
+    @hourly, @daily, @weekly e @monthly. Como no cron, quando dia do mês e dia
+    da semana são restritos, basta um dos dois corresponder.
+    """
+
+    def __init__(self, expressao: str):
+        """ Interpreta a expressão; ValueError se for inválida. """
+
+        self.expressao = expressao
+        campos = APELIDOS_AGENDA.get(expressao.strip(), expressao).split()
+        if len(campos) != 5:
+            raise ValueError(f"Agenda inválida (esperados 5 campos): '{expressao}'")
+
+        self.minutos, self.horas, self.dias, self.meses, self.dias_semana = (
+            self._campo(texto, minimo, maximo) for texto, (minimo, maximo) in zip(campos, CAMPOS_AGENDA)
+        )
+        # Domingo também pode ser escrito como 7
+        if 7 in self.dias_semana:
+            self.dias_semana = (self.dias_semana - {7}) | {0}
+        # Como no cron, um campo que começa com '*' (inclusive '*/2') não restringe o dia
+        self._dia_restrito = not campos[2].startswith('*')
+        self._dia_semana_restrito = not campos[4].startswith('*')
+
+    @staticmethod
+    def _campo(texto: str, minimo: int, maximo: int) -> frozenset:
+        """ Valores permitidos por um campo da agenda. """
+
+        # O dia da semana aceita 7 (domingo)
+        limite = 7 if (minimo, maximo) == (0, 6) else maximo
+        valores = set()
+        for parte in texto.split(','):
+            faixa, _, passo = parte.partition('/')
+            try:
+                if faixa == '*':
+                    inicio, fim = minimo, maximo
+                elif '-' in faixa:
+                    inicio, fim = (int(valor) for valor in faixa.split('-', 1))
+                else:
+                    inicio = fim = int(faixa)
+                    if passo:
+                        fim = maximo
+                passo = int(passo) if passo else 1
+            except ValueError:
+                raise ValueError(f"Campo de agenda inválido: '{texto}'") from None
+            if not (minimo <= inicio <= fim <= limite) or passo < 1:
+                raise ValueError(f"Campo de agenda fora do intervalo {minimo}-{maximo}: '{texto}'")
+            valores.update(range(inicio, fim + 1, passo))
+        return frozenset(valores)
+
+    def _dia_corresponde(self, momento: datetime) -> bool:
+        """ Dia do mês / dia da semana (com a regra do cron para os dois restritos). """
+
+        no_dia = momento.day in self.dias
+        no_dia_semana = (momento.isoweekday() % 7) in self.dias_semana
+        if self._dia_restrito and self._dia_semana_restrito:
+            return no_dia or no_dia_semana
+        return no_dia and no_dia_semana
+
+    def corresponde(self, momento: datetime) -> bool:
+        """ Indica se a tarefa deve rodar no minuto informado. """
+
+        return (momento.minute in self.minutos and momento.hour in self.horas
+                and momento.month in self.meses and self._dia_corresponde(momento))
+
+    def proxima(self, depois: datetime) -> Optional[datetime]:
+        """ Próximo minuto da agenda após 'depois' (None se não houver nos próximos anos). """
+
+        momento = depois.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = momento + timedelta(days=366 * 5)
+        while momento < limite:
+            # Pula meses, dias e horas inteiros que não correspondem
+            if momento.month not in self.meses:
+                ano, mes = divmod(momento.year * 12 + momento.month, 12)
+                momento = datetime(ano, mes + 1, 1)
+            elif not self._dia_corresponde(momento):
+                momento = momento.replace(hour=0, minute=0) + timedelta(days=1)
+            elif momento.hour not in self.horas:
+                momento = momento.replace(minute=0) + timedelta(hours=1)
+            elif momento.minute not in self.minutos:
+                momento += timedelta(minutes=1)
+            else:
+                return momento
+        return None
+
+
+class Tarefa(NamedTuple):
+    """ Relatório agendado. """
+
+    nome: str
+    relatorio: str  # 'bombonas' ou 'responsaveis'
+    formato: str
+    arquivo: str
+    agenda: Agenda
+    filtros: dict
+
+    def assinatura(self) -> str:
+        """ Identifica a definição da tarefa (uma tarefa alterada é gerada de novo). """
+
+        descricao = json.dumps([self.relatorio, self.formato, self.arquivo, sorted(self.filtros.items())])
+        return hashlib.blake2b(descricao.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def carregar_configuracao(caminho: str = ARQUIVO_CONFIGURACAO):
+    """
+    Lê a configuração dos agendamentos. Retorna (tarefas, processos).
+
+    Formato (JSON):
+        {
+          "processos": 2,
+          "tarefas": [
+            {"nome": "bombonas_quimicas", "relatorio": "bombonas", "formato": "pdf",
+             "filtros": {"tipo_residuo": "QUÍMICO"},
+             "arquivo": "relatorios/bombonas_quimicas.pdf", "agenda": "0 2 * * *"}
+          ]
+        }
+    """
+
+    with open(caminho, encoding='utf-8') as f:
+        configuracao = json.load(f)
+
+    tarefas = []
+    for item in configuracao.get('tarefas', []):
+        nome = item.get('nome')
+        try:
+            if not nome:
+                raise ValueError("toda tarefa precisa de um nome")
+            if any(tarefa.nome == nome for tarefa in tarefas):
+                raise ValueError("nome repetido")
+            relatorio = item.get('relatorio', 'bombonas')
+            if relatorio not in RELATORIOS:
+                raise ValueError(f"relatório deve ser um de {', '.join(RELATORIOS)}")
+            formato = item.get('formato', 'csv').lower()
+            if formato not in FORMATOS:
+                raise ValueError(f"formato deve ser um de {', '.join(FORMATOS)}")
+            if not item.get('arquivo'):
+                raise ValueError("caminho do arquivo não informado")
+            filtros = {chave: valor for chave, valor in (item.get('filtros') or {}).items() if valor not in (None, '')}
+            desconhecidos = set(filtros) - set(FILTROS)
+            if desconhecidos:
+                raise ValueError(f"filtros desconhecidos: {', '.join(sorted(desconhecidos))}")
+            if filtros and relatorio != 'bombonas':
+                raise ValueError("filtros só se aplicam ao relatório de bombonas")
+            agenda = Agenda(item.get('agenda', ''))
+        except ValueError as e:
+            raise ValueError(f"Tarefa '{nome or '?'}' inválida: {e}") from e
+
+        tarefas.append(Tarefa(nome, relatorio, formato, item['arquivo'], agenda, filtros))
+
+    return tarefas, int(configuracao.get('processos', PROCESSOS_PADRAO))
+
+
+def descrever_filtros(filtros: dict) -> List[str]:
+    """ Filtros no mesmo texto usado pela tela de relatórios (cabeçalho dos relatórios). """
+
+    descricoes = []
+    if filtros.get('setor'):
+        descricoes.append(f"Setor: {filtros['setor']}")
+    if filtros.get('cpf'):
+        descricoes.append(f"Responsável: {filtros['cpf']}")
+    if filtros.get('tipo_residuo'):
+        descricoes.append(f"Tipo: {filtros['tipo_residuo']}")
+    volume_min, volume_max = filtros.get('volume_min'), filtros.get('volume_max')
+    if volume_min is not None and volume_max is not None:
+        descricoes.append(f"Volume: {volume_min} a {volume_max} L")
+    elif volume_min is not None:
+        descricoes.append(f"Volume: a partir de {volume_min} L")
+    elif volume_max is not None:
+        descricoes.append(f"Volume: até {volume_max} L")
+    return descricoes
+
+
+class Agendador:
+    """
+    Executa as tarefas da configuração nos horários da agenda, num conjunto de
+    threads, usando os controllers de sempre (sem Tkinter).
+
+    Antes de gerar, compara a versão dos dados de bombonas e responsáveis com
+    a da última geração bem-sucedida da tarefa (guardada em ARQUIVO_ESTADO):
+    sem alteração nos dados, na definição da tarefa e com o arquivo ainda no
+    lugar, a tarefa é ignorada. Cada execução registra no log a duração e a
+    quantidade de linhas do relatório.
+
+    A configuração é relida quando o arquivo muda (a quantidade de processos
+    só vale ao reiniciar); uma tarefa ainda em execução não é iniciada de novo.
+    """
+
+    def __init__(self, arquivo_configuracao: str = ARQUIVO_CONFIGURACAO, arquivo_estado: str = ARQUIVO_ESTADO,
+                 bombona_controller=None, responsavel_controller=None):
+        """ Carrega a configuração e prepara os controllers (compartilhados pelas threads). """
+
+        if bombona_controller is None:
+            from controllers.bombona_controller import BombonaController
+            bombona_controller = BombonaController()
+        if responsavel_controller is None:
+            from controllers.responsavel_controller import ResponsavelController
+            responsavel_controller = ResponsavelController()
+
+        self._bombona_controller = bombona_controller
+        self._responsavel_controller = responsavel_controller
+        self.arquivo_configuracao = arquivo_configuracao
+        self.arquivo_estado = arquivo_estado
+
+        self._trava = threading.Lock()
+        self._em_execucao = set()
+        self._estado = self._ler_estado()
+
+        self._versao_configuracao = None
+        self.tarefas: List[Tarefa] = []
+        self.processos = PROCESSOS_PADRAO
+        self.recarregar_configuracao()
+
+    def recarregar_configuracao(self) -> bool:
+        """ Relê a configuração se o arquivo mudou. Retorna True se foi relida. """
+
+        try:
+            info = os.stat(self.arquivo_configuracao)
+        except OSError as e:
+            if self._versao_configuracao is None:
+                raise
+            logger.warning("Configuração inacessível, mantendo a anterior: %s", e)
+            return False
+
+        versao = (info.st_size, info.st_mtime_ns)
+        if versao == self._versao_configuracao:
+            return False
+
+        try:
+            tarefas, processos = carregar_configuracao(self.arquivo_configuracao)
+        except (OSError, ValueError) as e:
+            if self._versao_configuracao is None:
+                raise
+            logger.error("Configuração inválida, mantendo a anterior: %s", e)
+            self._versao_configuracao = versao
+            return False
+
+        self.tarefas, self.processos = tarefas, max(1, processos)
+        self._versao_configuracao = versao
+        logger.info("Configuração carregada: %d tarefa(s), %d em paralelo", len(tarefas), self.processos)
+        return True
+
+    def _ler_estado(self) -> Dict[str, dict]:
+        """ Estado das últimas gerações (vazio se não houver). """
+
+        try:
+            with open(self.arquivo_estado, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_estado(self) -> None:
+        """ Grava o estado das gerações (com a trava adquirida). """
+
+        pasta = os.path.dirname(self.arquivo_estado)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        temporario = f"{self.arquivo_estado}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self._estado, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.arquivo_estado)
+
+    def _versao_dados(self) -> list:
+        """ Versão dos dados lidos pelos relatórios, no formato guardado em JSON. """
+
+        return json.loads(json.dumps(self._bombona_controller.versao_dados()))
+
+    def executar_tarefa(self, tarefa: Tarefa, forcar: bool = False) -> dict:
+        """
+        Gera o relatório da tarefa (ou a ignora se nada mudou desde a última
+        geração, a menos que 'forcar'). Retorna o resultado também registrado no log.
+        """
+
+        with self._trava:
+            if tarefa.nome in self._em_execucao:
+                logger.warning("Tarefa '%s' ainda em execução; execução ignorada", tarefa.nome)
+                return {'tarefa': tarefa.nome, 'situacao': 'em_execucao'}
+            self._em_execucao.add(tarefa.nome)
+
+        try:
+            versao = self._versao_dados()
+            anterior = self._estado.get(tarefa.nome, {})
+            if (not forcar and anterior.get('versao') == versao
+                    and anterior.get('assinatura') == tarefa.assinatura() and os.path.exists(tarefa.arquivo)):
+                logger.info("Tarefa '%s' ignorada: dados sem alteração desde %s",
+                            tarefa.nome, anterior.get('gerado_em'))
+                return {'tarefa': tarefa.nome, 'situacao': 'ignorada'}
+
+            inicio = time.perf_counter()
+            linhas = self._gerar(tarefa)
+            duracao = time.perf_counter() - inicio
+
+            with self._trava:
+                self._estado[tarefa.nome] = {
+                    'versao': versao,
+                    'assinatura': tarefa.assinatura(),
+                    'gerado_em': datetime.now().isoformat(timespec='seconds'),
+                    'duracao': round(duracao, 3),
+                    'linhas': linhas
+                }
+                self._gravar_estado()
+
+            logger.info("Tarefa '%s' gerada em %.2f s: %d linha(s) -> %s",
+                        tarefa.nome, duracao, linhas, tarefa.arquivo)
+            return {'tarefa': tarefa.nome, 'situacao': 'gerada', 'duracao': duracao, 'linhas': linhas}
+
+        except Exception as e:
+            logger.exception("Tarefa '%s' falhou: %s", tarefa.nome, e)
+            return {'tarefa': tarefa.nome, 'situacao': 'erro', 'erro': str(e)}
+
+        finally:
+            with self._trava:
+                self._em_execucao.discard(tarefa.nome)
+
+    def _gerar(self, tarefa: Tarefa) -> int:
+        """ Gera o relatório com os controllers. Retorna a quantidade de linhas. """
+
+        pasta = os.path.dirname(tarefa.arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        if tarefa.relatorio == 'bombonas':
+            controller = self._bombona_controller
+            # A mesma consulta feita pelo relatório (atendida pelo cache de consultas)
+            if tarefa.filtros:
+                linhas = len(controller.filtrar_bombonas(**tarefa.filtros))
+            else:
+                linhas = len(controller.listar_bombonas())
+            controller.gerar_relatorio(
+                arquivo=tarefa.arquivo, formato=tarefa.formato,
+                filtros=tarefa.filtros or None, filtros_ativos=descrever_filtros(tarefa.filtros) or None
+            )
+        else:
+            linhas = len(self._responsavel_controller.listar_responsaveis())
+            self._responsavel_controller.gerar_relatorio(arquivo=tarefa.arquivo, formato=tarefa.formato)
+        return linhas
+
+    def executar_pendentes(self, momento: datetime, executor: ThreadPoolExecutor) -> list:
+        """ Envia ao executor as tarefas cuja agenda corresponde ao minuto informado. """
+
+        return [executor.submit(self.executar_tarefa, tarefa)
+                for tarefa in self.tarefas if tarefa.agenda.corresponde(momento)]
+
+    def executar_todas(self, forcar: bool = False) -> list:
+        """ Executa todas as tarefas uma vez, agora (ex.: chamado por um cron do sistema). """
+
+        with ThreadPoolExecutor(self.processos) as executor:
+            futuros = [executor.submit(self.executar_tarefa, tarefa, forcar) for tarefa in self.tarefas]
+            return [futuro.result() for futuro in futuros]
+
+    def proxima_execucao(self, depois: datetime) -> Optional[datetime]:
+        """ Primeiro minuto após 'depois' em que alguma tarefa está agendada (None se nenhuma). """
+
+        momentos = (tarefa.agenda.proxima(depois) for tarefa in self.tarefas)
+        return min((momento for momento in momentos if momento), default=None)
+
+    def executar(self, parar: threading.Event = None) -> None:
+        """
+        Laço principal: dorme até o próximo minuto agendado (ver Agenda.proxima),
+        inicia as tarefas desse minuto e repete, até 'parar' ser sinalizado. A
+        configuração é verificada pelo menos a cada INTERVALO_CONFIGURACAO segundos.
+        """
+
+        parar = parar or threading.Event()
+        logger.info("Agendador iniciado")
+        with ThreadPoolExecutor(self.processos) as executor:
+            # Último minuto já tratado e o próximo com tarefas agendadas
+            ultimo = datetime.now().replace(second=0, microsecond=0)
+            proximo = self.proxima_execucao(ultimo)
+            while True:
+                espera = INTERVALO_CONFIGURACAO
+                if proximo is not None:
+                    espera = min(espera, (proximo - datetime.now()).total_seconds())
+                if parar.wait(max(0.0, espera)):
+                    break
+
+                if self.recarregar_configuracao():
+                    proximo = self.proxima_execucao(ultimo)
+
+                agora = datetime.now()
+                if proximo is None or proximo > agora:
+                    continue
+
+                minuto_atual = agora.replace(second=0, microsecond=0)
+                if proximo < minuto_atual:
+                    # O computador ficou suspenso: os minutos perdidos não são recuperados
+                    logger.warning("Agendador atrasado desde %s; retomando no minuto atual",
+                                   proximo.strftime('%d/%m/%Y %H:%M'))
+                    ultimo = minuto_atual - timedelta(minutes=1)
+                else:
+                    self.executar_pendentes(proximo, executor)
+                    ultimo = proximo
+                proximo = self.proxima_execucao(ultimo)
+            logger.info("Agendador encerrando; aguardando tarefas em execução")
@@ -0,0 +1,103 @@
+"""
+Cache em disco dos arquivos de relatório gerados
+"""
+
+import hashlib
+import os
+import shutil
+from typing import Optional
+
+# Versão do layout dos relatórios (incrementar ao mudar o conteúdo gerado)
+VERSAO_RELATORIOS = 2
+
+# Espaço máximo ocupado pelo diretório do cache
+TAMANHO_MAXIMO_BYTES = 200 * 1024 * 1024
+
+
+class CacheRelatorios:
+    """
+    Guarda cópias dos relatórios gerados, identificadas pelo formato, pelos
+    filtros e pela versão dos dados de bombonas e responsáveis. Um pedido
+    repetido sem alteração nos dados é atendido copiando o arquivo guardado,
+    sem consultar os dados nem gerar o relatório de novo.
+
+    O diretório tem tamanho limitado: ao passar do limite, os relatórios usados
+    há mais tempo (data de modificação, renovada a cada uso) são apagados.
+    """
+
+    def __init__(self, diretorio: str = "data/cache_relatorios",
+                 tamanho_maximo_bytes: int = TAMANHO_MAXIMO_BYTES):
+        """ Inicializa o cache no diretório informado. """
+
+        self.diretorio = diretorio
+        self.tamanho_maximo_bytes = tamanho_maximo_bytes
+
+    @staticmethod
+    def chave(entidade: str, formato: str, filtros, versoes) -> str:
+        """
+        Identificador do relatório: muda quando muda o formato, qualquer filtro,
+        a versão dos dados ou a versão do layout dos relatórios.
+        """
+
+        descricao = repr((VERSAO_RELATORIOS, entidade, formato.lower(), filtros, versoes))
+        return hashlib.blake2b(descricao.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _caminho(self, chave: str, formato: str) -> str:
+        """ Caminho do arquivo guardado para a chave. """
+
+        return os.path.join(self.diretorio, f"{chave}.{formato.lower()}")
+
+    def obter(self, chave: str, formato: str, destino: str) -> Optional[str]:
+        """ Copia o relatório guardado para o destino; retorna o destino, ou None se não houver. """
+
+        caminho = self._caminho(chave, formato)
+        try:
+            shutil.copyfile(caminho, destino)
+            os.utime(caminho)  # Marca como usado recentemente
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Aviso: não foi possível usar o relatório em cache: {e}")
+            return None
+        return destino
+
+    def guardar(self, chave: str, formato: str, arquivo: str) -> None:
+        """ Guarda uma cópia do relatório gerado e apaga os mais antigos se passar do limite. """
+
+        caminho = self._caminho(chave, formato)
+        arquivo_temp = f"{caminho}.tmp"
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            shutil.copyfile(arquivo, arquivo_temp)
+            os.replace(arquivo_temp, caminho)
+        except OSError as e:
+            # O cache é apenas uma otimização; o relatório já foi gerado
+            print(f"Aviso: não foi possível guardar o relatório em cache: {e}")
+            return
+
+        self._liberar_espaco()
+
+    def _liberar_espaco(self) -> None:
+        """ Apaga os relatórios usados há mais tempo até o diretório caber no limite. """
+
+        arquivos = []
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and not entrada.name.endswith('.tmp'):
+                    info = entrada.stat()
+                    arquivos.append((info.st_mtime_ns, info.st_size, entrada.path))
+
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.tamanho_maximo_bytes:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+
+    def limpar(self) -> None:
+        """ Apaga todos os relatórios guardados. """
+
+        shutil.rmtree(self.diretorio, ignore_errors=True)
@@ -0,0 +1,115 @@
+"""
+Gravação rápida de relatórios CSV (em lotes, com buffer grande e compressão opcional)
+"""
+
+import csv
+import gzip
+import io
+import os
+from itertools import islice
+from typing import Iterable, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Compressão zstd só fica disponível se a biblioteca estiver instalada
+
+# Tamanho do buffer de escrita
+TAMANHO_BUFFER = 1024 * 1024
+
+# Linhas convertidas e gravadas de cada vez
+TAMANHO_LOTE = 10_000
+
+# Extensão do arquivo -> compressão
+EXTENSOES_COMPRESSAO = {'.gz': 'gzip', '.zst': 'zstd'}
+
+
+def compressao_do_arquivo(arquivo: str) -> Optional[str]:
+    """ Compressão indicada pela extensão do arquivo ('relatorio.csv.gz' -> 'gzip'), ou None. """
+
+    return EXTENSOES_COMPRESSAO.get(os.path.splitext(arquivo or '')[1].lower())
+
+
+class EscritorCSV:
+    """
+    Escreve relatórios CSV em lotes: as linhas (tuplas já extraídas) são
+    gravadas com writerows, com um buffer grande, e podem passar por
+    compressão gzip ou zstd. A compressão é deduzida da extensão do arquivo
+    ('.csv.gz', '.csv.zst') quando não é informada.
+
+    Uso:
+        with EscritorCSV("relatorio.csv.gz") as escritor:
+            escritor.escrever_linha(['Código', 'Volume'])
+            escritor.escrever_linhas(linhas)
+    """
+
+    def __init__(self, arquivo: str, compressao: str = None, tamanho_buffer: int = TAMANHO_BUFFER):
+        """ Abre o arquivo para escrita ('compressao': None, 'gzip' ou 'zstd'). """
+
+        self.arquivo = arquivo
+        self.compressao = compressao or compressao_do_arquivo(arquivo)
+
+        if self.compressao is None:
+            binario = open(arquivo, 'wb', buffering=tamanho_buffer)
+            self._camadas = []
+        else:
+            bruto = open(arquivo, 'wb')
+            try:
+                compactado = self._abrir_compressao(bruto)
+            except Exception:
+                bruto.close()
+                raise
+            binario = io.BufferedWriter(compactado, tamanho_buffer)
+            self._camadas = [compactado, bruto]
+
+        self._texto = io.TextIOWrapper(binario, encoding='utf-8', newline='', write_through=False)
+        self._writer = csv.writer(self._texto)
+        self.linhas_gravadas = 0
+
+    def _abrir_compressao(self, bruto):
+        """ Camada de compressão sobre o arquivo aberto. """
+
+        if self.compressao == 'gzip':
+            # Nível 6: bem mais rápido que o padrão (9) e quase do mesmo tamanho
+            return gzip.GzipFile(fileobj=bruto, mode='wb', compresslevel=6, mtime=0)
+        if self.compressao == 'zstd':
+            if zstandard is None:
+                raise ImportError("Biblioteca zstandard não encontrada. Instale com: pip install zstandard")
+            return zstandard.ZstdCompressor().stream_writer(bruto)
+        raise ValueError("Compressões suportadas: 'gzip' ou 'zstd'")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        self.fechar()
+        return False
+
+    def escrever_linha(self, linha: Sequence) -> None:
+        """ Escreve uma linha avulsa (cabeçalho, comentários); não entra na contagem de linhas. """
+
+        self._writer.writerow(linha)
+
+    def escrever_linhas(self, linhas: Iterable[Sequence], tamanho_lote: int = TAMANHO_LOTE) -> int:
+        """ Escreve as linhas (pode ser um gerador) em lotes. Retorna a quantidade gravada. """
+
+        linhas = iter(linhas)
+        quantidade = 0
+        while True:
+            lote = list(islice(linhas, tamanho_lote))
+            if not lote:
+                break
+            self._writer.writerows(lote)
+            quantidade += len(lote)
+        self.linhas_gravadas += quantidade
+        return quantidade
+
+    def fechar(self) -> None:
+        """ Descarrega os buffers, finaliza a compressão e fecha o arquivo. """
+
+        if self._texto.closed:
+            return
+        self._texto.close()  # Fecha também o buffer e a camada de compressão
+        for camada in self._camadas:
+            if not camada.closed:
+                camada.close()
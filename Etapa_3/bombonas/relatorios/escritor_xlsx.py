@@ -0,0 +1,324 @@
+"""
+Gravação de planilhas XLSX em fluxo (sem dependências externas)
+"""
+
+import re
+import zipfile
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+# Linhas por planilha permitidas pelo Excel (ao passar, continua numa planilha nova)
+LIMITE_LINHAS_PLANILHA = 1_048_576
+
+# Linhas convertidas em XML e gravadas de cada vez
+TAMANHO_LOTE = 10_000
+
+# Quantidade máxima de textos já convertidos em XML guardados (valores repetidos não são reconvertidos)
+MAX_TEXTOS_PREPARADOS = 100_000
+
+# Compressão das partes do arquivo (1 = mais rápida; o XML das planilhas comprime bem mesmo assim)
+NIVEL_COMPRESSAO = 1
+
+# Caracteres que o XML não aceita (controles, exceto tabulação e quebras de linha)
+_CARACTERES_INVALIDOS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Caracteres que não podem aparecer no nome de uma planilha
+_CARACTERES_NOME_PLANILHA = re.compile(r'[\[\]:*?/\\]')
+
+_CABECALHO_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_PLANILHA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_RELACOES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PACOTE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Estilos: 0 = normal, 1 = negrito (cabeçalhos)
+_ESTILOS = (
+    _CABECALHO_XML +
+    f'<styleSheet xmlns="{_NS_PLANILHA}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _letra_coluna(indice: int) -> str:
+    """ Letra da coluna (0 -> 'A', 26 -> 'AA'). """
+
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _texto_xml(valor) -> str:
+    """ Texto da célula pronto para o XML (sem caracteres inválidos, com escapes). """
+
+    return escape(_CARACTERES_INVALIDOS.sub('', str(valor)))
+
+
+class EscritorXLSX:
+    """
+    Escreve uma pasta de trabalho XLSX em fluxo: cada planilha é gravada
+    direto no zip, linha a linha, e só a planilha atual fica aberta. Textos
+    são gravados inline, de modo que a memória usada não cresce com a
+    quantidade de linhas.
+
+    As planilhas são escritas uma depois da outra (nova_planilha fecha a
+    anterior). Uma planilha que passa do limite de linhas do Excel continua
+    automaticamente numa planilha nova ('Bombonas (2)'), com o cabeçalho repetido.
+
+    Uso:
+        with EscritorXLSX("relatorio.xlsx") as pasta:
+            pasta.nova_planilha("Bombonas", [('Código', 12), ('Volume (L)', 10)])
+            pasta.escrever_linhas(linhas)
+    """
+
+    def __init__(self, arquivo: str, nivel_compressao: int = NIVEL_COMPRESSAO):
+        """ Abre o arquivo para escrita. """
+
+        self.arquivo = arquivo
+        self._zip = zipfile.ZipFile(arquivo, 'w', zipfile.ZIP_DEFLATED, compresslevel=nivel_compressao)
+        self._nomes: List[str] = []
+        self._parte = None  # Planilha aberta no zip
+        self._colunas: List[Tuple[str, float]] = []
+        self._cabecalho = True
+        self._letras: List[str] = []
+        self._textos = {}  # Texto -> texto já convertido em XML
+        self._nome_base = ''
+        self._continuacao = 1
+        self._linha = 0  # Última linha gravada na planilha atual
+        self.linhas_gravadas = 0  # Linhas de dados (sem cabeçalhos) em todas as planilhas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        self.fechar()
+        return False
+
+    def _nome_planilha(self, nome: str) -> str:
+        """ Nome válido (até 31 caracteres, sem caracteres proibidos) e único na pasta. """
+
+        nome = _CARACTERES_NOME_PLANILHA.sub('_', nome).strip() or 'Planilha'
+        nome = nome[:31]
+        base, numero = nome, 2
+        while nome.lower() in (existente.lower() for existente in self._nomes):
+            sufixo = f" ({numero})"
+            nome = base[:31 - len(sufixo)] + sufixo
+            numero += 1
+        return nome
+
+    def nova_planilha(self, nome: str, colunas: Sequence[Tuple[str, float]] = (),
+                      cabecalho: bool = True) -> None:
+        """
+        Fecha a planilha atual e abre outra. 'colunas' são pares (título, largura
+        em caracteres); com 'cabecalho', os títulos formam a primeira linha (em negrito).
+        """
+
+        self._fechar_planilha()
+        self._nome_base = nome
+        self._continuacao = 1
+        self._colunas = list(colunas)
+        self._cabecalho = cabecalho
+        self._abrir_planilha(nome)
+
+    def _abrir_planilha(self, nome: str) -> None:
+        """ Abre a parte da planilha no zip e grava o início do XML. """
+
+        nome = self._nome_planilha(nome)
+        self._nomes.append(nome)
+        self._parte = self._zip.open(f"xl/worksheets/sheet{len(self._nomes)}.xml", 'w')
+        self._linha = 0
+        self._letras = [_letra_coluna(i) for i in range(len(self._colunas))]
+
+        partes = [_CABECALHO_XML, f'<worksheet xmlns="{_NS_PLANILHA}" xmlns:r="{_NS_RELACOES}">']
+        if self._cabecalho and self._colunas:
+            # Cabeçalho fixo ao rolar a planilha
+            partes.append('<sheetViews><sheetView workbookViewId="0">'
+                          '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                          '</sheetView></sheetViews>')
+        if self._colunas:
+            partes.append('<cols>')
+            for i, (_, largura) in enumerate(self._colunas, start=1):
+                partes.append(f'<col min="{i}" max="{i}" width="{largura}" customWidth="1"/>')
+            partes.append('</cols>')
+        partes.append('<sheetData>')
+        self._parte.write(''.join(partes).encode('utf-8'))
+
+        if self._cabecalho and self._colunas:
+            self._gravar([self._xml_linha([titulo for titulo, _ in self._colunas], estilo=1)])
+
+    def _fechar_planilha(self) -> None:
+        """ Grava o fim do XML e fecha a parte da planilha atual. """
+
+        if self._parte is None:
+            return
+        self._parte.write(b'</sheetData></worksheet>')
+        self._parte.close()
+        self._parte = None
+
+    def _xml_linha(self, valores: Sequence, estilo: int = 0) -> str:
+        """ XML da próxima linha da planilha atual. """
+
+        self._linha += 1
+        numero = self._linha
+        letras = self._letras
+        if len(valores) > len(letras):
+            letras.extend(_letra_coluna(i) for i in range(len(letras), len(valores)))
+        atributo_estilo = f' s="{estilo}"' if estilo else ''
+        textos = self._textos
+
+        # Textos vão inline (sem tabela de textos compartilhados); vazios e None não geram célula
+        celulas = []
+        for letra, valor in zip(letras, valores):
+            tipo = type(valor)
+            if tipo is str:
+                if not valor:
+                    continue
+                texto = textos.get(valor)
+                if texto is None:
+                    if len(textos) >= MAX_TEXTOS_PREPARADOS:
+                        textos.clear()
+                    texto = textos[valor] = _texto_xml(valor)
+                celulas.append(f'<c r="{letra}{numero}"{atributo_estilo} t="inlineStr">'
+                               f'<is><t xml:space="preserve">{texto}</t></is></c>')
+            elif tipo is float or tipo is int:
+                celulas.append(f'<c r="{letra}{numero}"{atributo_estilo}><v>{valor!r}</v></c>')
+            elif valor is None:
+                continue
+            elif tipo is bool:
+                celulas.append(f'<c r="{letra}{numero}"{atributo_estilo} t="b"><v>{int(valor)}</v></c>')
+            else:
+                celulas.append(f'<c r="{letra}{numero}"{atributo_estilo} t="inlineStr">'
+                               f'<is><t xml:space="preserve">{_texto_xml(valor)}</t></is></c>')
+        return f'<row r="{numero}">{"".join(celulas)}</row>'
+
+    def _gravar(self, linhas_xml: List[str]) -> None:
+        """ Grava as linhas já convertidas em XML. """
+
+        self._parte.write(''.join(linhas_xml).encode('utf-8'))
+
+    def _continuar_se_cheia(self) -> None:
+        """ Abre a continuação da planilha quando a atual atinge o limite do Excel. """
+
+        if self._linha >= LIMITE_LINHAS_PLANILHA:
+            self._fechar_planilha()
+            self._continuacao += 1
+            self._abrir_planilha(f"{self._nome_base} ({self._continuacao})")
+
+    def escrever_linha(self, valores: Sequence, negrito: bool = False) -> None:
+        """ Escreve uma linha avulsa (títulos, totais); não entra na contagem de linhas. """
+
+        if self._parte is None:
+            raise ValueError("Nenhuma planilha aberta: chame nova_planilha antes")
+        self._continuar_se_cheia()
+        self._gravar([self._xml_linha(valores, 1 if negrito else 0)])
+
+    def escrever_linhas(self, linhas: Iterable[Sequence], progresso=None, total: int = 0,
+                        tamanho_lote: int = TAMANHO_LOTE) -> int:
+        """
+        Escreve as linhas de dados (pode ser um gerador) em lotes. Retorna a quantidade gravada.
+        'progresso', se informado, é chamado com (linhas gravadas, total) a cada lote.
+        """
+
+        if self._parte is None:
+            raise ValueError("Nenhuma planilha aberta: chame nova_planilha antes")
+
+        linhas = iter(linhas)
+        quantidade = 0
+        while True:
+            self._continuar_se_cheia()
+            # O lote não passa do limite de linhas da planilha atual
+            lote = list(islice(linhas, min(tamanho_lote, LIMITE_LINHAS_PLANILHA - self._linha)))
+            if not lote:
+                break
+            self._gravar([self._xml_linha(valores) for valores in lote])
+            quantidade += len(lote)
+            self.linhas_gravadas += len(lote)
+            if progresso:
+                progresso(self.linhas_gravadas, total)
+        return quantidade
+
+    def fechar(self) -> None:
+        """ Fecha a última planilha e grava as partes fixas da pasta de trabalho. """
+
+        if self._zip is None:
+            return
+        try:
+            if not self._nomes:
+                self.nova_planilha('Planilha')
+            self._fechar_planilha()
+            self._gravar_partes_fixas()
+        finally:
+            self._zip.close()
+            self._zip = None
+
+    def _gravar_partes_fixas(self) -> None:
+        """ Tipos de conteúdo, relações, pasta de trabalho, estilos e propriedades. """
+
+        quantidade = len(self._nomes)
+        planilhas = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, quantidade + 1)
+        )
+        self._zip.writestr('[Content_Types].xml', (
+            _CABECALHO_XML +
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/docProps/core.xml" '
+            'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+            f'{planilhas}</Types>'
+        ))
+        self._zip.writestr('_rels/.rels', (
+            _CABECALHO_XML +
+            f'<Relationships xmlns="{_NS_PACOTE}">'
+            f'<Relationship Id="rId1" Type="{_NS_RELACOES}/officeDocument" Target="xl/workbook.xml"/>'
+            '<Relationship Id="rId2" '
+            'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+            'Target="docProps/core.xml"/>'
+            '</Relationships>'
+        ))
+        self._zip.writestr('docProps/core.xml', (
+            _CABECALHO_XML +
+            '<cp:coreProperties '
+            'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            f'<dcterms:created xsi:type="dcterms:W3CDTF">{datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")}'
+            '</dcterms:created></cp:coreProperties>'
+        ))
+        folhas = ''.join(
+            f'<sheet name="{escape(nome, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, nome in enumerate(self._nomes, start=1)
+        )
+        self._zip.writestr('xl/workbook.xml', (
+            _CABECALHO_XML +
+            f'<workbook xmlns="{_NS_PLANILHA}" xmlns:r="{_NS_RELACOES}"><sheets>{folhas}</sheets></workbook>'
+        ))
+        relacoes = ''.join(
+            f'<Relationship Id="rId{i}" Type="{_NS_RELACOES}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, quantidade + 1)
+        )
+        self._zip.writestr('xl/_rels/workbook.xml.rels', (
+            _CABECALHO_XML +
+            f'<Relationships xmlns="{_NS_PACOTE}">{relacoes}'
+            f'<Relationship Id="rId{quantidade + 1}" Type="{_NS_RELACOES}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        self._zip.writestr('xl/styles.xml', _ESTILOS)
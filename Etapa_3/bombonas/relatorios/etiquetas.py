@@ -0,0 +1,261 @@
+"""
+Folhas de etiquetas das bombonas em PDF, com código de barras Code128 (sem dependências externas)
+"""
+
+import multiprocessing
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from relatorios.motor_pdf import ALTURA_PAGINA, LARGURA_PAGINA, PONTOS_POR_MM, EscritorPDF, _literal, _y, ajustar_texto
+
+# Folha A4 de 24 etiquetas (3 x 8) de 70 x 37 mm, sem margem lateral
+COLUNAS_FOLHA = 3
+LINHAS_FOLHA = 8
+LARGURA_ETIQUETA = 70.0
+ALTURA_ETIQUETA = 37.0
+ETIQUETAS_POR_PAGINA = COLUNAS_FOLHA * LINHAS_FOLHA
+
+# Canto da primeira etiqueta (folha centralizada na página)
+MARGEM_ESQUERDA_FOLHA = (LARGURA_PAGINA - COLUNAS_FOLHA * LARGURA_ETIQUETA) / 2
+MARGEM_SUPERIOR_FOLHA = (ALTURA_PAGINA - LINHAS_FOLHA * ALTURA_ETIQUETA) / 2
+
+# Área livre em volta do conteúdo da etiqueta (mm)
+MARGEM_ETIQUETA = 5.0
+
+# Código de barras: altura e largura máxima do módulo (barra mais fina), em mm
+ALTURA_BARRAS = 12.0
+LARGURA_MAXIMA_MODULO = 0.5
+
+# Quantidade máxima de códigos de barras (e de textos) preparados guardados
+MAX_ITENS_PREPARADOS = 100_000
+
+# Trabalhos a partir desta quantidade de etiquetas são desenhados em vários processos
+LIMITE_ETIQUETAS_PARALELO = 2_000
+
+# Páginas desenhadas por tarefa enviada a um processo
+PAGINAS_POR_TAREFA = 25
+
+# Code128: larguras de barra/espaço de cada símbolo (0 a 105; 106 = parada)
+_PADROES_CODE128 = (
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312", "132212", "221213",
+    "221312", "231212", "112232", "122132", "122231", "113222", "123122", "123221", "223211", "221132",
+    "221231", "213212", "223112", "312131", "311222", "321122", "321221", "312212", "322112", "322211",
+    "212123", "212321", "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121", "313121", "211331",
+    "231131", "213113", "213311", "213131", "311123", "311321", "331121", "312113", "312311", "332111",
+    "314111", "221411", "431111", "111224", "111422", "121124", "121421", "141122", "141221", "112214",
+    "112412", "122114", "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112", "421211", "212141",
+    "214121", "412121", "111143", "111341", "131141", "114113", "114311", "411113", "411311", "113141",
+    "114131", "311141", "411131", "211412", "211214", "211232", "2331112",
+)
+_INICIO_B = 104
+_PARADA = 106
+
+
+def code128(texto: str) -> List[int]:
+    """
+    Larguras (em módulos) das barras e espaços alternados do texto em Code128
+    (conjunto B: caracteres ASCII imprimíveis), com início, verificação e parada.
+    """
+
+    simbolos = [_INICIO_B]
+    for caractere in texto:
+        valor = ord(caractere) - 32
+        if not 0 <= valor <= 94:
+            raise ValueError(f"Caractere '{caractere}' não pode ser representado no código de barras")
+        simbolos.append(valor)
+    simbolos.append((_INICIO_B + sum(posicao * valor for posicao, valor in enumerate(simbolos[1:], 1))) % 103)
+    simbolos.append(_PARADA)
+
+    return [int(largura) for simbolo in simbolos for largura in _PADROES_CODE128[simbolo]]
+
+
+class ModeloEtiqueta:
+    """
+    Desenho das etiquetas: código em destaque, tipo de resíduo e volume,
+    responsável e código de barras. O código de barras de cada código é
+    desenhado uma única vez (retângulos na origem) e reposicionado em cada
+    etiqueta; os textos que se repetem (tipos, responsáveis) também ficam
+    preparados.
+    """
+
+    def __init__(self):
+        """ Cria o modelo com as medidas da folha padrão. """
+
+        self._barras_preparadas = {}
+        self._textos_preparados = {}
+
+    def _barras(self, codigo: str) -> str:
+        """ Operadores do código de barras do código, centralizado na largura útil e com a base na origem. """
+
+        barras = self._barras_preparadas.get(codigo)
+        if barras is None:
+            if len(self._barras_preparadas) >= MAX_ITENS_PREPARADOS:
+                self._barras_preparadas.clear()
+
+            larguras = code128(codigo)
+            largura_util = LARGURA_ETIQUETA - 2 * MARGEM_ETIQUETA
+            modulo = min(LARGURA_MAXIMA_MODULO, largura_util / sum(larguras)) * PONTOS_POR_MM
+            x = (MARGEM_ETIQUETA * PONTOS_POR_MM + (largura_util * PONTOS_POR_MM - modulo * sum(larguras)) / 2)
+            altura = ALTURA_BARRAS * PONTOS_POR_MM
+
+            partes = []
+            for posicao, largura in enumerate(larguras):
+                if posicao % 2 == 0:  # Posições pares são barras; ímpares, espaços
+                    partes.append(f"{x:.3f} 0 {largura * modulo:.3f} {altura:.2f} re")
+                x += largura * modulo
+            barras = self._barras_preparadas[codigo] = ' '.join(partes) + ' f\n'
+        return barras
+
+    def _texto(self, valor, estilo: str, tamanho: float) -> str:
+        """ Texto codificado e cortado na largura útil, pronto para o operador Tj. """
+
+        chave = (valor, estilo, tamanho)
+        texto = self._textos_preparados.get(chave)
+        if texto is None:
+            if len(self._textos_preparados) >= MAX_ITENS_PREPARADOS:
+                self._textos_preparados.clear()
+            dados = ajustar_texto(valor, estilo, tamanho, LARGURA_ETIQUETA - 2 * MARGEM_ETIQUETA)
+            texto = self._textos_preparados[chave] = _literal(dados)
+        return texto
+
+    def etiqueta(self, valores: Sequence, x_mm: float, y_mm: float) -> str:
+        """
+        Operadores de uma etiqueta com o canto superior esquerdo em (x, y) (mm a
+        partir do topo da página). 'valores': (código, tipo de resíduo, volume, responsável).
+        """
+
+        codigo, tipo_residuo, volume, responsavel = valores
+        x = (x_mm + MARGEM_ETIQUETA) * PONTOS_POR_MM
+        residuo = self._texto(f"{tipo_residuo} - {volume}", '', 9)
+        return (
+            f"BT /F2 16 Tf 1 0 0 1 {x:.2f} {_y(y_mm + 10):.2f} Tm {self._texto(codigo, 'B', 16)} Tj "
+            f"/F1 9 Tf 1 0 0 1 {x:.2f} {_y(y_mm + 15):.2f} Tm {residuo} Tj "
+            f"1 0 0 1 {x:.2f} {_y(y_mm + 19.5):.2f} Tm {self._texto(responsavel, '', 9)} Tj ET\n"
+            f"q 1 0 0 1 {x_mm * PONTOS_POR_MM:.2f} {_y(y_mm + ALTURA_ETIQUETA - MARGEM_ETIQUETA + 1.5):.2f} cm\n"
+            f"{self._barras(codigo)}Q\n"
+        )
+
+    def pagina(self, etiquetas: Sequence[Sequence]) -> bytes:
+        """ Conteúdo comprimido de uma página com até ETIQUETAS_POR_PAGINA etiquetas (por linha da folha). """
+
+        partes = []
+        for posicao, valores in enumerate(etiquetas):
+            linha, coluna = divmod(posicao, COLUNAS_FOLHA)
+            partes.append(self.etiqueta(valores, MARGEM_ESQUERDA_FOLHA + coluna * LARGURA_ETIQUETA,
+                                        MARGEM_SUPERIOR_FOLHA + linha * ALTURA_ETIQUETA))
+        return zlib.compress(''.join(partes).encode('latin-1'), 6)
+
+
+# Modelo de cada processo auxiliar, com seus códigos de barras e textos preparados
+_modelo_processo = None
+
+
+def desenhar_folhas(etiquetas: Sequence[Sequence]) -> List[bytes]:
+    """ Desenha as páginas das etiquetas e as devolve comprimidas. Executada nos processos auxiliares. """
+
+    global _modelo_processo
+    if _modelo_processo is None:
+        _modelo_processo = ModeloEtiqueta()
+
+    return [_modelo_processo.pagina(etiquetas[inicio:inicio + ETIQUETAS_POR_PAGINA])
+            for inicio in range(0, len(etiquetas), ETIQUETAS_POR_PAGINA)]
+
+
+class FolhaEtiquetas:
+    """
+    Grava as etiquetas em páginas A4 (folha de 3 x 8 etiquetas de 70 x 37 mm),
+    em fluxo: cada página é gravada assim que fica pronta.
+
+    Uso:
+        with FolhaEtiquetas("etiquetas.pdf", progresso) as folha:
+            folha.escrever_etiquetas(etiquetas, total)
+    """
+
+    def __init__(self, arquivo: str, progresso: Optional[Callable[[int, int], None]] = None,
+                 processos: int = None):
+        """
+        Cria o PDF no arquivo informado. 'progresso', se informado, é chamado
+        com (etiquetas gravadas, total). 'processos' limita os processos usados
+        nos trabalhos grandes (padrão: quantidade de núcleos; 1 desenha tudo
+        neste processo).
+        """
+
+        self._escritor = EscritorPDF(arquivo)
+        self._progresso = progresso
+        self._processos = processos or os.cpu_count() or 1
+        self._modelo = ModeloEtiqueta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        if tipo_erro is None:
+            self.fechar()
+        else:
+            self._escritor.descartar()
+        return False
+
+    def escrever_etiquetas(self, etiquetas: Iterable[Sequence], total: int = 0) -> int:
+        """
+        Grava as etiquetas (pode ser um gerador) de (código, tipo de resíduo,
+        volume, responsável). Com 'total' a partir de LIMITE_ETIQUETAS_PARALELO,
+        as páginas são desenhadas em paralelo. Retorna a quantidade de etiquetas.
+        """
+
+        etiquetas = iter(etiquetas)
+        if total >= LIMITE_ETIQUETAS_PARALELO and self._processos > 1:
+            return self._escrever_em_paralelo(etiquetas, total)
+
+        quantidade = 0
+        while True:
+            pagina = list(islice(etiquetas, ETIQUETAS_POR_PAGINA))
+            if not pagina:
+                break
+            self._escritor.adicionar_pagina_comprimida(self._modelo.pagina(pagina))
+            quantidade += len(pagina)
+            if self._progresso:
+                self._progresso(quantidade, total or quantidade)
+        return quantidade
+
+    def _escrever_em_paralelo(self, etiquetas: Iterable[Sequence], total: int) -> int:
+        """
+        Divide as etiquetas em blocos de páginas, desenha os blocos em processos
+        auxiliares e grava as páginas na ordem, com poucos blocos em andamento
+        ao mesmo tempo (a memória não cresce com o trabalho). Os processos são
+        iniciados com 'spawn', como em MotorPDF._desenhar_em_paralelo.
+        """
+
+        tamanho_bloco = ETIQUETAS_POR_PAGINA * PAGINAS_POR_TAREFA
+        feitas = 0
+        pendentes = deque()
+
+        with ProcessPoolExecutor(self._processos, mp_context=multiprocessing.get_context('spawn')) as executor:
+            while True:
+                bloco = list(islice(etiquetas, tamanho_bloco))
+                if bloco:
+                    pendentes.append((len(bloco), executor.submit(desenhar_folhas, bloco)))
+
+                # Grava os blocos prontos, na ordem, mantendo poucos em andamento
+                while pendentes and (not bloco or len(pendentes) > 2 * self._processos):
+                    quantidade, futuro = pendentes.popleft()
+                    for pagina in futuro.result():
+                        self._escritor.adicionar_pagina_comprimida(pagina)
+                    feitas += quantidade
+                    if self._progresso:
+                        self._progresso(feitas, total)
+
+                if not bloco:
+                    return feitas
+
+    def fechar(self) -> None:
+        """ Finaliza o arquivo (sem etiquetas, grava uma página em branco). """
+
+        if not self._escritor.quantidade_paginas():
+            self._escritor.adicionar_pagina(b"")
+        self._escritor.fechar()
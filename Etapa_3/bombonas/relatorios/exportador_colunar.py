@@ -0,0 +1,158 @@
+"""
+Exportação colunar dos relatórios (Parquet e Arrow IPC) para ferramentas de análise
+"""
+
+import os
+from itertools import islice
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None  # Formatos colunares só ficam disponíveis se a biblioteca estiver instalada
+
+# Formato -> extensão do arquivo
+FORMATOS_COLUNARES = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Linhas por lote gravado (record batch / grupo de linhas do Parquet)
+TAMANHO_LOTE = 128 * 1024
+
+# Tipos de coluna aceitos
+TIPOS_COLUNA = ('texto', 'categoria', 'decimal', 'inteiro')
+
+
+def _tipo_arrow(tipo: str):
+    """ Tipo Arrow da coluna ('categoria' é texto codificado em dicionário). """
+
+    if tipo == 'texto':
+        return pyarrow.string()
+    if tipo == 'categoria':
+        return pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    if tipo == 'decimal':
+        return pyarrow.float64()
+    if tipo == 'inteiro':
+        return pyarrow.int64()
+    raise ValueError(f"Tipos de coluna suportados: {', '.join(TIPOS_COLUNA)}")
+
+
+class _Dicionario(dict):
+    """ Valor -> índice no dicionário da coluna; valores novos entram no fim. """
+
+    def __init__(self):
+        super().__init__()
+        self.valores = []
+
+    def __missing__(self, valor):
+        indice = self[valor] = len(self.valores)
+        self.valores.append(valor)
+        return indice
+
+
+class ExportadorColunar:
+    """
+    Grava linhas (tuplas já extraídas, na ordem das colunas) em Parquet ou
+    Arrow IPC, em lotes: cada lote vira um record batch, de modo que a memória
+    usada não depende da quantidade de linhas.
+
+    Colunas 'categoria' (poucos valores repetidos, como tipo de resíduo e
+    setor) são codificadas em dicionário. O dicionário de cada coluna é único
+    no arquivo e só cresce (valores novos entram no fim), como exige o formato
+    de arquivo Arrow IPC; None vira nulo em qualquer coluna.
+
+    Uso:
+        colunas = [('codigo', 'texto'), ('volume', 'decimal'), ('setor', 'categoria')]
+        with ExportadorColunar("relatorio.parquet", colunas) as exportador:
+            exportador.escrever_linhas(linhas)
+    """
+
+    def __init__(self, arquivo: str, colunas: Sequence[Tuple[str, str]], formato: str = None,
+                 tamanho_lote: int = TAMANHO_LOTE):
+        """ Abre o arquivo ('formato': 'parquet' ou 'arrow'; se omitido, deduzido da extensão). """
+
+        if pyarrow is None:
+            raise ImportError("Biblioteca pyarrow não encontrada. Instale com: pip install pyarrow")
+
+        self.arquivo = arquivo
+        self.formato = (formato or formato_do_arquivo(arquivo) or '').lower()
+        if self.formato not in FORMATOS_COLUNARES:
+            raise ValueError("Formatos colunares suportados: 'parquet' ou 'arrow'")
+
+        self.tamanho_lote = tamanho_lote
+        self._tipos = [tipo for _, tipo in colunas]
+        self._dicionarios = {i: _Dicionario() for i, tipo in enumerate(self._tipos) if tipo == 'categoria'}
+        self.esquema = pyarrow.schema([(nome, _tipo_arrow(tipo)) for nome, tipo in colunas])
+        self.linhas_gravadas = 0
+
+        if self.formato == 'parquet':
+            self._escritor = pyarrow.parquet.ParquetWriter(arquivo, self.esquema, compression='snappy')
+        else:
+            # Dicionários que crescem entre lotes são gravados como deltas
+            opcoes = pyarrow.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._escritor = pyarrow.ipc.new_file(arquivo, self.esquema, options=opcoes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        self.fechar()
+        return False
+
+    def _coluna(self, indice: int, valores: tuple):
+        """ Array Arrow de uma coluna do lote. """
+
+        tipo = self.esquema.field(indice).type
+        dicionario = self._dicionarios.get(indice)
+        if dicionario is None:
+            return pyarrow.array(valores, type=tipo)
+
+        posicoes = [None if valor is None else dicionario[valor] for valor in valores]
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(posicoes, type=tipo.index_type),
+            pyarrow.array(dicionario.valores, type=tipo.value_type)
+        )
+
+    def escrever_linhas(self, linhas: Iterable[Sequence], progresso: Optional[Callable[[int, int], None]] = None,
+                        total: int = 0) -> int:
+        """
+        Grava as linhas (pode ser um gerador) em lotes. Retorna a quantidade gravada.
+        'progresso', se informado, é chamado com (linhas gravadas, total) a cada lote.
+        """
+
+        linhas = iter(linhas)
+        quantidade = 0
+        while True:
+            lote = list(islice(linhas, self.tamanho_lote))
+            if not lote:
+                break
+            colunas = zip(*lote)
+            lote_arrow = pyarrow.record_batch(
+                [self._coluna(i, valores) for i, valores in enumerate(colunas)], schema=self.esquema
+            )
+            if self.formato == 'parquet':
+                self._escritor.write_batch(lote_arrow, row_group_size=self.tamanho_lote)
+            else:
+                self._escritor.write_batch(lote_arrow)
+            quantidade += len(lote)
+            self.linhas_gravadas += len(lote)
+            if progresso:
+                progresso(self.linhas_gravadas, total)
+        return quantidade
+
+    def fechar(self) -> None:
+        """ Finaliza o arquivo (rodapé do Parquet / do Arrow IPC). """
+
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+
+
+def formato_do_arquivo(arquivo: str) -> Optional[str]:
+    """ Formato colunar indicado pela extensão do arquivo ('dados.parquet' -> 'parquet'), ou None. """
+
+    extensao = os.path.splitext(arquivo or '')[1].lower()
+    for formato, extensao_formato in FORMATOS_COLUNARES.items():
+        if extensao == extensao_formato:
+            return formato
+    return None
@@ -0,0 +1,536 @@
+"""
+Geração de relatórios PDF em fluxo (sem dependências externas)
+"""
+
+import multiprocessing
+import os
+import unicodedata
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Página A4 em milímetros e margens (as mesmas usadas antes com o FPDF)
+LARGURA_PAGINA = 210.0
+ALTURA_PAGINA = 297.0
+MARGEM = 10.0
+MARGEM_INFERIOR = 20.0
+MARGEM_CELULA = 1.0
+
+# Milímetros -> pontos (unidade do PDF)
+PONTOS_POR_MM = 72 / 25.4
+
+# Fontes padrão do PDF (não precisam ser embutidas): estilo -> (recurso, nome)
+FONTES = {
+    '': ('F1', 'Helvetica'),
+    'B': ('F2', 'Helvetica-Bold'),
+    'I': ('F3', 'Helvetica-Oblique'),
+}
+
+# Larguras (milésimos do tamanho da fonte) dos caracteres 32 a 126
+_LARGURAS_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_LARGURAS_HELVETICA_NEGRITO = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Quantidade máxima de textos preparados guardados por tabela
+MAX_TEXTOS_PREPARADOS = 100_000
+
+# Tabelas a partir desta quantidade de linhas são desenhadas em vários processos
+LIMITE_LINHAS_PARALELO = 20_000
+
+# Páginas desenhadas por tarefa enviada a um processo
+PAGINAS_POR_TAREFA = 50
+
+
+def _tabela_larguras(larguras_ascii: Sequence[int]) -> List[int]:
+    """
+    Larguras dos 256 códigos WinAnsi. Letras acentuadas usam a largura da letra
+    sem acento (como nas métricas da Helvetica); demais símbolos, a de um dígito.
+    """
+
+    tabela = [556] * 256
+    for codigo in range(256):
+        if 32 <= codigo <= 126:
+            tabela[codigo] = larguras_ascii[codigo - 32]
+        elif codigo >= 128:
+            caractere = bytes([codigo]).decode('cp1252', errors='ignore')
+            base = unicodedata.normalize('NFD', caractere)[:1]
+            if base and 32 <= ord(base) <= 126:
+                tabela[codigo] = larguras_ascii[ord(base) - 32]
+    return tabela
+
+
+LARGURAS = {
+    '': _tabela_larguras(_LARGURAS_HELVETICA),
+    'B': _tabela_larguras(_LARGURAS_HELVETICA_NEGRITO),
+    'I': _tabela_larguras(_LARGURAS_HELVETICA),
+}
+
+
+def codificar(texto) -> bytes:
+    """
+    Converte o texto para a codificação das fontes padrão (WinAnsi), que inclui
+    os acentos do português; outros caracteres perdem o acento ou viram '?'.
+    """
+
+    texto = str(texto).replace('\r', ' ').replace('\n', ' ')
+    try:
+        return texto.encode('cp1252')
+    except UnicodeEncodeError:
+        sem_acentos = ''.join(c for c in unicodedata.normalize('NFD', texto) if not unicodedata.combining(c))
+        return unicodedata.normalize('NFC', sem_acentos).encode('cp1252', errors='replace')
+
+
+def largura_texto(dados: bytes, estilo: str, tamanho: float) -> float:
+    """ Largura do texto codificado, em milímetros. """
+
+    larguras = LARGURAS[estilo]
+    return sum(larguras[b] for b in dados) * tamanho / 1000 / PONTOS_POR_MM
+
+
+def _literal(dados: bytes) -> str:
+    """ String literal do PDF, como str (bytes WinAnsi mapeados 1:1 em latin-1). """
+
+    dados = dados.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return f"({dados.decode('latin-1')})"
+
+
+def ajustar_texto(texto, estilo: str, tamanho: float, largura: float) -> bytes:
+    """ Codifica o texto e o corta com "..." se passar da largura (mm). """
+
+    dados = codificar(texto)
+    if largura_texto(dados, estilo, tamanho) <= largura:
+        return dados
+
+    reticencias = b'...'
+    disponivel = largura - largura_texto(reticencias, estilo, tamanho)
+    larguras = LARGURAS[estilo]
+    limite = disponivel * PONTOS_POR_MM * 1000 / tamanho
+    ocupado = 0
+    for i, b in enumerate(dados):
+        ocupado += larguras[b]
+        if ocupado > limite:
+            return dados[:i].rstrip() + reticencias
+    return dados
+
+
+def _y(y_mm: float) -> float:
+    """ Coordenada vertical do PDF (origem embaixo, em pontos) para y em mm a partir do topo. """
+
+    return (ALTURA_PAGINA - y_mm) * PONTOS_POR_MM
+
+
+class EscritorPDF:
+    """
+    Grava o arquivo PDF à medida que as páginas ficam prontas: cada página é
+    escrita (comprimida) assim que é recebida e só a tabela de posições dos
+    objetos fica em memória até o fechamento do arquivo.
+    """
+
+    # Objetos fixos: 1 catálogo, 2 árvore de páginas, 3-5 fontes, 6 recursos
+    _OBJ_CATALOGO = 1
+    _OBJ_PAGINAS = 2
+    _OBJ_RECURSOS = 6
+
+    def __init__(self, arquivo: str):
+        """ Abre o arquivo e grava o cabeçalho, as fontes e os recursos comuns às páginas. """
+
+        self.arquivo = arquivo
+        self._saida = open(arquivo, 'wb', buffering=1024 * 1024)
+        self._posicao = 0
+        self._posicoes = {}
+        self._paginas: List[int] = []
+        self._proximo_objeto = self._OBJ_RECURSOS + 1
+
+        self._escrever(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        recursos = []
+        for numero, (recurso, nome) in enumerate(FONTES.values(), 3):
+            self._objeto(numero, f"<< /Type /Font /Subtype /Type1 /BaseFont /{nome} "
+                                 f"/Encoding /WinAnsiEncoding >>".encode('ascii'))
+            recursos.append(f"/{recurso} {numero} 0 R")
+        self._objeto(self._OBJ_RECURSOS, f"<< /Font << {' '.join(recursos)} >> >>".encode('ascii'))
+
+    def _escrever(self, dados: bytes) -> None:
+        """ Grava os bytes e avança a posição atual. """
+
+        self._saida.write(dados)
+        self._posicao += len(dados)
+
+    def _objeto(self, numero: int, conteudo: bytes) -> None:
+        """ Grava um objeto numerado na posição atual. """
+
+        self._posicoes[numero] = self._posicao
+        self._escrever(b"%d 0 obj\n" % numero + conteudo + b"\nendobj\n")
+
+    def adicionar_pagina(self, conteudo: bytes) -> None:
+        """ Comprime e grava o conteúdo (operadores de desenho) de uma página. """
+
+        self.adicionar_pagina_comprimida(zlib.compress(conteudo, 6))
+
+    def adicionar_pagina_comprimida(self, conteudo: bytes) -> None:
+        """ Grava uma página cujo conteúdo já foi comprimido com zlib. """
+
+        obj_conteudo = self._proximo_objeto
+        obj_pagina = obj_conteudo + 1
+        self._proximo_objeto += 2
+
+        self._objeto(obj_conteudo, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(conteudo)
+                     + conteudo + b"\nendstream")
+        self._objeto(obj_pagina, (
+            f"<< /Type /Page /Parent {self._OBJ_PAGINAS} 0 R "
+            f"/MediaBox [0 0 {LARGURA_PAGINA * PONTOS_POR_MM:.2f} {ALTURA_PAGINA * PONTOS_POR_MM:.2f}] "
+            f"/Resources {self._OBJ_RECURSOS} 0 R /Contents {obj_conteudo} 0 R >>"
+        ).encode('ascii'))
+        self._paginas.append(obj_pagina)
+
+    def quantidade_paginas(self) -> int:
+        """ Quantidade de páginas gravadas até agora. """
+
+        return len(self._paginas)
+
+    def fechar(self) -> None:
+        """ Grava a árvore de páginas, o catálogo e a tabela de posições, e fecha o arquivo. """
+
+        filhos = ' '.join(f"{numero} 0 R" for numero in self._paginas)
+        self._objeto(self._OBJ_PAGINAS,
+                     f"<< /Type /Pages /Kids [{filhos}] /Count {len(self._paginas)} >>".encode('ascii'))
+        self._objeto(self._OBJ_CATALOGO, f"<< /Type /Catalog /Pages {self._OBJ_PAGINAS} 0 R >>".encode('ascii'))
+
+        total_objetos = self._proximo_objeto
+        inicio_xref = self._posicao
+        linhas = [b"xref\n0 %d\n" % total_objetos, b"0000000000 65535 f \n"]
+        for numero in range(1, total_objetos):
+            linhas.append(b"%010d 00000 n \n" % self._posicoes[numero])
+        self._escrever(b"".join(linhas))
+        self._escrever(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                       % (total_objetos, self._OBJ_CATALOGO, inicio_xref))
+        self._saida.close()
+
+    def descartar(self) -> None:
+        """ Fecha o arquivo sem finalizá-lo (usado em caso de erro). """
+
+        self._saida.close()
+
+
+class ModeloTabela:
+    """
+    Modelo reutilizável de tabela: colunas (título, largura em mm, alinhamento
+    'L', 'C' ou 'R'), cabeçalho já montado uma única vez e textos das células
+    preparados (codificados, cortados e posicionados) guardados por coluna,
+    já que tipos, setores e nomes se repetem muito entre as linhas.
+    """
+
+    def __init__(self, colunas: Sequence[Tuple[str, float, str]], altura_cabecalho: float = 8,
+                 altura_linha: float = 6, tamanho_cabecalho: float = 10, tamanho_linha: float = 9):
+        """ Cria o modelo com as colunas informadas. """
+
+        self.colunas = list(colunas)
+        self.altura_cabecalho = altura_cabecalho
+        self.altura_linha = altura_linha
+        self.tamanho_cabecalho = tamanho_cabecalho
+        self.tamanho_linha = tamanho_linha
+
+        # Posição horizontal (mm) de cada coluna
+        self._posicoes = []
+        x = MARGEM
+        for _, largura, _ in self.colunas:
+            self._posicoes.append(x)
+            x += largura
+
+        self._textos_preparados = [{} for _ in self.colunas]
+
+        # Linhas que cabem numa página que começa pelo cabeçalho
+        self.linhas_por_pagina = 0
+        y = MARGEM + altura_cabecalho
+        while y + altura_linha <= ALTURA_PAGINA - MARGEM_INFERIOR:
+            y += altura_linha
+            self.linhas_por_pagina += 1
+
+        # Bordas de uma linha: retângulos das células, com o topo da linha em {y}
+        self._bordas_linha = self._bordas(altura_linha)
+        self._cabecalho = self._montar_cabecalho()
+
+    def parametros(self) -> tuple:
+        """ Parâmetros que recriam o modelo (enviados aos processos que desenham páginas). """
+
+        return (tuple(self.colunas), self.altura_cabecalho, self.altura_linha,
+                self.tamanho_cabecalho, self.tamanho_linha)
+
+    def _bordas(self, altura: float) -> str:
+        """ Operadores dos retângulos das células (com '{y}' no lugar do topo da linha). """
+
+        altura_pt = altura * PONTOS_POR_MM
+        partes = []
+        for x, (_, largura, _) in zip(self._posicoes, self.colunas):
+            partes.append(f"{x * PONTOS_POR_MM:.2f} {{y}} {largura * PONTOS_POR_MM:.2f} {-altura_pt:.2f} re")
+        return ' '.join(partes) + ' S\n'
+
+    def _posicao_texto(self, coluna: int, dados: bytes, estilo: str, tamanho: float) -> float:
+        """ Posição horizontal (pontos) do texto na célula, conforme o alinhamento da coluna. """
+
+        _, largura, alinhamento = self.colunas[coluna]
+        x = self._posicoes[coluna]
+        if alinhamento == 'L':
+            return (x + MARGEM_CELULA) * PONTOS_POR_MM
+        sobra = largura - largura_texto(dados, estilo, tamanho)
+        if alinhamento == 'R':
+            return (x + sobra - MARGEM_CELULA) * PONTOS_POR_MM
+        return (x + sobra / 2) * PONTOS_POR_MM
+
+    def _montar_cabecalho(self) -> str:
+        """ Cabeçalho (títulos em negrito, centralizados) com o topo na origem; é deslocado a cada página. """
+
+        altura = self.altura_cabecalho
+        partes = ["0.2 w\n", self._bordas(altura).format(y='0'), "BT\n/F2 %g Tf\n" % self.tamanho_cabecalho]
+        base = -(altura / 2 + 0.3 * self.tamanho_cabecalho / PONTOS_POR_MM) * PONTOS_POR_MM
+        for coluna, (titulo, largura, _) in enumerate(self.colunas):
+            dados = ajustar_texto(titulo, 'B', self.tamanho_cabecalho, largura - 2 * MARGEM_CELULA)
+            x = self._posicoes[coluna] + (largura - largura_texto(dados, 'B', self.tamanho_cabecalho)) / 2
+            partes.append(f"1 0 0 1 {x * PONTOS_POR_MM:.2f} {base:.2f} Tm {_literal(dados)} Tj\n")
+        partes.append("ET\n")
+        return ''.join(partes)
+
+    def cabecalho(self, y_mm: float) -> str:
+        """ Operadores do cabeçalho com o topo em y (mm a partir do topo da página). """
+
+        return f"q 1 0 0 1 0 {_y(y_mm):.2f} cm\n{self._cabecalho}Q\n"
+
+    def _texto_celula(self, coluna: int, valor) -> Tuple[str, str]:
+        """ Texto preparado da célula: (início do operador com a posição x, restante com o texto). """
+
+        preparados = self._textos_preparados[coluna]
+        preparado = preparados.get(valor)
+        if preparado is None:
+            if len(preparados) >= MAX_TEXTOS_PREPARADOS:
+                preparados.clear()
+            _, largura, _ = self.colunas[coluna]
+            dados = ajustar_texto(valor, '', self.tamanho_linha, largura - 2 * MARGEM_CELULA)
+            x = self._posicao_texto(coluna, dados, '', self.tamanho_linha)
+            preparado = (f"1 0 0 1 {x:.2f} ", f" Tm {_literal(dados)} Tj\n")
+            preparados[valor] = preparado
+        return preparado
+
+    def linha(self, valores: Sequence, y_mm: float) -> str:
+        """ Operadores de uma linha da tabela com o topo em y (mm a partir do topo da página). """
+
+        topo = f"{_y(y_mm):.2f}"
+        base = f"{_y(y_mm + self.altura_linha / 2 + 0.3 * self.tamanho_linha / PONTOS_POR_MM):.2f}"
+        partes = [self._bordas_linha.format(y=topo), "BT\n/F1 %g Tf\n" % self.tamanho_linha]
+        for coluna, valor in enumerate(valores):
+            inicio, texto = self._texto_celula(coluna, valor)
+            partes.append(inicio + base + texto)
+        partes.append("ET\n")
+        return ''.join(partes)
+
+
+# Modelos recriados em cada processo auxiliar (parâmetros -> modelo), com seus textos preparados
+_modelos_processo = {}
+
+
+def desenhar_paginas(parametros: tuple, linhas: Sequence[Sequence]) -> List[bytes]:
+    """
+    Desenha páginas completas de uma tabela (cabeçalho no topo e linhas_por_pagina
+    linhas cada) e as devolve comprimidas. Executada nos processos auxiliares.
+    """
+
+    modelo = _modelos_processo.get(parametros)
+    if modelo is None:
+        colunas, *medidas = parametros
+        modelo = _modelos_processo[parametros] = ModeloTabela(colunas, *medidas)
+
+    paginas = []
+    por_pagina = modelo.linhas_por_pagina
+    for inicio in range(0, len(linhas), por_pagina):
+        partes = ["0.2 w\n", modelo.cabecalho(MARGEM)]
+        y = MARGEM + modelo.altura_cabecalho
+        for valores in linhas[inicio:inicio + por_pagina]:
+            partes.append(modelo.linha(valores, y))
+            y += modelo.altura_linha
+        paginas.append(zlib.compress(''.join(partes).encode('latin-1'), 6))
+    return paginas
+
+
+class MotorPDF:
+    """
+    Monta relatórios PDF em fluxo: o conteúdo vai sendo posicionado de cima
+    para baixo e cada página é gravada no arquivo assim que fica cheia, de modo
+    que a memória usada não cresce com a quantidade de linhas.
+
+    Uso:
+        with MotorPDF("relatorio.pdf", progresso) as pdf:
+            pdf.texto("TÍTULO", 'B', 16, 10, 'C')
+            pdf.tabela(modelo, linhas, total)
+    """
+
+    def __init__(self, arquivo: str, progresso: Optional[Callable[[int, int], None]] = None,
+                 processos: int = None):
+        """
+        Cria o relatório no arquivo informado. 'progresso', se informado, é
+        chamado com (linhas gravadas, total de linhas) durante as tabelas.
+        'processos' limita os processos usados nas tabelas grandes (padrão:
+        quantidade de núcleos; 1 desenha tudo neste processo).
+        """
+
+        self._escritor = EscritorPDF(arquivo)
+        self._progresso = progresso
+        self._processos = processos or os.cpu_count() or 1
+        self._partes: List[str] = []
+        self._y = MARGEM
+        self._limite_y = ALTURA_PAGINA - MARGEM_INFERIOR
+        self._nova_pagina()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        if tipo_erro is None:
+            self.fechar()
+        else:
+            self._escritor.descartar()
+        return False
+
+    def _nova_pagina(self) -> None:
+        """ Grava a página atual (se houver) e começa outra. """
+
+        if self._partes:
+            self._escritor.adicionar_pagina(''.join(self._partes).encode('latin-1'))
+        self._partes = ["0.2 w\n"]
+        self._y = MARGEM
+
+    def _garantir_espaco(self, altura: float) -> None:
+        """ Passa para a próxima página se a altura não couber na atual. """
+
+        if self._y + altura > self._limite_y and self._y > MARGEM:
+            self._nova_pagina()
+
+    def texto(self, texto: str, estilo: str = '', tamanho: float = 10, altura: float = 6,
+              alinhamento: str = 'L') -> None:
+        """ Escreve uma linha de texto ocupando toda a largura útil da página. """
+
+        self._garantir_espaco(altura)
+        largura_util = LARGURA_PAGINA - 2 * MARGEM
+        dados = ajustar_texto(texto, estilo, tamanho, largura_util - 2 * MARGEM_CELULA)
+        if alinhamento == 'C':
+            x = MARGEM + (largura_util - largura_texto(dados, estilo, tamanho)) / 2
+        else:
+            x = MARGEM + MARGEM_CELULA
+
+        base = _y(self._y + altura / 2 + 0.3 * tamanho / PONTOS_POR_MM)
+        recurso = FONTES[estilo][0]
+        self._partes.append(f"BT /{recurso} {tamanho:g} Tf 1 0 0 1 {x * PONTOS_POR_MM:.2f} {base:.2f} Tm "
+                            f"{_literal(dados)} Tj ET\n")
+        self._y += altura
+
+    def espaco(self, altura: float) -> None:
+        """ Avança verticalmente (sem passar para outra página). """
+
+        self._y = min(self._y + altura, self._limite_y)
+
+    def tabela(self, modelo: ModeloTabela, linhas: Iterable[Sequence], total: int = 0) -> int:
+        """
+        Escreve a tabela consumindo as linhas uma a uma (pode ser um gerador);
+        o cabeçalho é repetido no topo de cada página. Retorna a quantidade de linhas.
+
+        Com 'total' a partir de LIMITE_LINHAS_PARALELO, as páginas completas após
+        a primeira são desenhadas em paralelo (ver _desenhar_em_paralelo).
+        """
+
+        self._garantir_espaco(modelo.altura_cabecalho + modelo.altura_linha)
+        self._partes.append(modelo.cabecalho(self._y))
+        self._y += modelo.altura_cabecalho
+
+        paralelo = total >= LIMITE_LINHAS_PARALELO and self._processos > 1
+        quantidade = 0
+        linhas = iter(linhas)
+        while True:
+            valores = next(linhas, None)
+            if valores is None:
+                break
+
+            if self._y + modelo.altura_linha > self._limite_y:
+                self._nova_pagina()
+                if paralelo:
+                    paralelo = False
+                    feitas, restantes = self._desenhar_em_paralelo(modelo, chain([valores], linhas), total,
+                                                                   quantidade)
+                    quantidade += feitas
+                    linhas = iter(restantes)
+                    valores = next(linhas)
+                elif self._progresso:
+                    self._progresso(quantidade, total)
+                self._partes.append(modelo.cabecalho(self._y))
+                self._y += modelo.altura_cabecalho
+
+            self._partes.append(modelo.linha(valores, self._y))
+            self._y += modelo.altura_linha
+            quantidade += 1
+
+        if self._progresso:
+            self._progresso(quantidade, total or quantidade)
+        return quantidade
+
+    def _desenhar_em_paralelo(self, modelo: ModeloTabela, linhas: Iterator[Sequence], total: int,
+                              anteriores: int = 0) -> Tuple[int, List[Sequence]]:
+        """
+        Divide as linhas em blocos de páginas completas, desenha os blocos em
+        processos auxiliares e grava as páginas na ordem. Poucos blocos ficam em
+        andamento ao mesmo tempo, para a memória não crescer com o relatório.
+
+        As linhas da última página (ao menos uma) não são enviadas: voltam para
+        serem desenhadas aqui, na página que recebe o rodapé. Retorna (linhas
+        gravadas, linhas restantes). O progresso informado soma as 'anteriores'
+        (linhas já gravadas nas páginas antes desta chamada).
+
+        Os processos são iniciados com 'spawn': o relatório pode ser gerado a
+        partir de um processo com outras threads (interface, pacote de
+        relatórios), e um 'fork' copiaria travas presas por elas.
+        """
+
+        tamanho_bloco = modelo.linhas_por_pagina * PAGINAS_POR_TAREFA
+        parametros = modelo.parametros()
+        feitas = 0
+        pendentes = deque()
+
+        with ProcessPoolExecutor(self._processos, mp_context=multiprocessing.get_context('spawn')) as executor:
+            bloco = list(islice(linhas, tamanho_bloco))
+            while True:
+                proximo = list(islice(linhas, tamanho_bloco))
+                restantes = []
+                if not proximo:
+                    completas = (len(bloco) - 1) // modelo.linhas_por_pagina * modelo.linhas_por_pagina
+                    bloco, restantes = bloco[:completas], bloco[completas:]
+                if bloco:
+                    pendentes.append((len(bloco), executor.submit(desenhar_paginas, parametros, bloco)))
+
+                # Grava os blocos prontos, na ordem, mantendo poucos em andamento
+                while pendentes and (not proximo or len(pendentes) > 2 * self._processos):
+                    quantidade, futuro = pendentes.popleft()
+                    for pagina in futuro.result():
+                        self._escritor.adicionar_pagina_comprimida(pagina)
+                    feitas += quantidade
+                    if self._progresso:
+                        self._progresso(anteriores + feitas, total)
+
+                if not proximo:
+                    return feitas, restantes
+                bloco = proximo
+
+    def fechar(self) -> None:
+        """ Grava a última página e finaliza o arquivo. """
+
+        self._nova_pagina()
+        self._escritor.fechar()
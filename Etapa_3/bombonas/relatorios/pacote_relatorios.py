@@ -0,0 +1,186 @@
+"""
+Geração de vários relatórios de uma vez num único pacote (zip ou pasta)
+"""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import List, Sequence, Tuple
+
+# Relatórios disponíveis: (entidade, formato) -> nome do arquivo no pacote
+ARQUIVOS_PACOTE = {
+    ('bombonas', 'csv'): 'relatorio_bombonas.csv',
+    ('bombonas', 'pdf'): 'relatorio_bombonas.pdf',
+    ('responsaveis', 'csv'): 'relatorio_responsaveis.csv',
+    ('responsaveis', 'pdf'): 'relatorio_responsaveis.pdf',
+}
+
+# Relatórios gerados quando nenhum é escolhido
+PACOTE_PADRAO = (('bombonas', 'csv'), ('bombonas', 'pdf'), ('responsaveis', 'pdf'))
+
+# Intervalo (segundos) entre as leituras do andamento enviado pelos processos
+INTERVALO_ANDAMENTO = 0.2
+
+
+def gerar_relatorio_pacote(classe, bombona_dao, item: tuple, arquivo: str, dados: dict, fila) -> str:
+    """
+    Gera um relatório do pacote num processo auxiliar, com um controller novo
+    da classe informada (sobre o mesmo DAO de bombonas). 'dados' traz os
+    argumentos já consultados pelo pacote; o andamento é enviado pela fila
+    como (item, linhas feitas, total). Retorna o arquivo gerado.
+    """
+
+    controller = classe(bombona_dao)
+    controller.gerar_relatorio(arquivo=arquivo, formato=item[1],
+                               progresso=lambda feitas, total: fila.put((item, feitas, total)), **dados)
+    return arquivo
+
+
+class PacoteRelatorios:
+    """
+    Gera vários relatórios completos de uma vez: os dados são consultados uma
+    única vez e enviados aos processos que geram cada arquivo; os arquivos
+    prontos vão para um zip ou uma pasta.
+
+    Cada relatório roda num processo próprio (iniciado com 'spawn', como no
+    motor de PDF), então o tempo total se aproxima do relatório mais demorado,
+    não da soma de todos. O andamento volta pelos processos numa fila de um
+    multiprocessing.Manager e é lido por gerar() enquanto espera.
+
+    gerar() pode rodar numa thread separada: progresso(), concluido e erro
+    podem ser consultados pela tela enquanto isso (sem tocar no Tkinter a
+    partir da geração).
+    """
+
+    def __init__(self, bombona_controller, responsavel_controller):
+        """ Cria o pacote usando os controllers informados. """
+
+        self._bombona_controller = bombona_controller
+        self._responsavel_controller = responsavel_controller
+        self._trava = threading.Lock()
+        self._andamento = {}  # (entidade, formato) -> (linhas feitas, total)
+
+        self.concluido = False
+        self.erro = None
+        self.destino = None
+
+    def progresso(self) -> Tuple[int, int]:
+        """ Andamento somado de todos os relatórios: (linhas gravadas, total de linhas). """
+
+        with self._trava:
+            feitas = sum(f for f, _ in self._andamento.values())
+            total = sum(t for _, t in self._andamento.values())
+        return feitas, total
+
+    def _registrar_andamento(self, item: tuple, feitas: int, total: int) -> None:
+        """ Atualiza o andamento de um relatório. """
+
+        with self._trava:
+            self._andamento[item] = (feitas, total)
+
+    def _receber_andamento(self, fila) -> None:
+        """ Registra o andamento que os processos já enviaram pela fila. """
+
+        while True:
+            try:
+                item, feitas, total = fila.get_nowait()
+            except queue.Empty:
+                return
+            self._registrar_andamento(item, feitas, total)
+
+    def _concluir_andamento(self, item: tuple) -> None:
+        """ Marca um relatório como feito (o CSV não informa andamento). """
+
+        with self._trava:
+            _, total = self._andamento[item]
+            self._andamento[item] = (total, total)
+
+    def gerar(self, destino: str, itens: Sequence[Tuple[str, str]] = PACOTE_PADRAO,
+              processos: int = None) -> str:
+        """
+        Gera os relatórios (pares (entidade, formato)) e os grava em 'destino':
+        um arquivo .zip ou, para qualquer outro caminho, uma pasta.
+        'processos' limita os relatórios gerados ao mesmo tempo (padrão: todos).
+        Retorna o destino; em caso de erro, ele também fica em self.erro.
+        """
+
+        pasta_temp = None
+        try:
+            itens = list(dict.fromkeys(itens))
+            for item in itens:
+                if item not in ARQUIVOS_PACOTE:
+                    raise ValueError(f"Relatório não suportado no pacote: {item}")
+
+            # Consulta os dados uma única vez
+            bombonas = self._bombona_controller.listar_bombonas()
+            responsaveis = self._responsavel_controller.listar_responsaveis()
+            contagem = Counter(b.get_responsavel().get_cpf() for b in bombonas if b.get_responsavel())
+
+            for entidade, formato in itens:
+                total = len(bombonas) if entidade == 'bombonas' else len(responsaveis)
+                self._registrar_andamento((entidade, formato), 0, total)
+
+            pasta_temp = tempfile.mkdtemp(prefix="pacote_relatorios_")
+            contexto = multiprocessing.get_context('spawn')
+            prontos = []
+
+            with contexto.Manager() as gerente, \
+                    ProcessPoolExecutor(processos or len(itens) or 1, mp_context=contexto) as executor:
+                fila = gerente.Queue()
+                futuros = {}
+                for item in itens:
+                    if item[0] == 'bombonas':
+                        controller = self._bombona_controller
+                        dados = {'bombonas_filtradas': bombonas}
+                    else:
+                        controller = self._responsavel_controller
+                        dados = {'responsaveis': responsaveis, 'contagem_bombonas': contagem}
+                    arquivo = os.path.join(pasta_temp, ARQUIVOS_PACOTE[item])
+                    futuro = executor.submit(gerar_relatorio_pacote, type(controller), controller._bombona_dao,
+                                             item, arquivo, dados, fila)
+                    futuros[futuro] = item
+
+                pendentes = set(futuros)
+                while pendentes:
+                    concluidos, pendentes = wait(pendentes, timeout=INTERVALO_ANDAMENTO)
+                    self._receber_andamento(fila)
+                    for futuro in concluidos:
+                        prontos.append((futuros[futuro], futuro.result()))
+                        self._concluir_andamento(futuros[futuro])
+
+            self._empacotar(destino, prontos)
+            self.destino = destino
+            return destino
+
+        except Exception as e:
+            print(f"Erro ao gerar pacote de relatórios: {e}")
+            self.erro = e
+            raise
+        finally:
+            if pasta_temp:
+                shutil.rmtree(pasta_temp, ignore_errors=True)
+            self.concluido = True
+
+    @staticmethod
+    def _empacotar(destino: str, prontos: List[Tuple[tuple, str]]) -> None:
+        """ Grava os arquivos gerados no zip ou na pasta de destino, em ordem de nome. """
+
+        prontos = sorted(prontos, key=lambda pronto: ARQUIVOS_PACOTE[pronto[0]])
+
+        if destino.lower().endswith('.zip'):
+            with zipfile.ZipFile(destino, 'w') as pacote:
+                for item, arquivo in prontos:
+                    # PDFs já são comprimidos; CSVs comprimem bem
+                    compressao = zipfile.ZIP_STORED if item[1] == 'pdf' else zipfile.ZIP_DEFLATED
+                    pacote.write(arquivo, ARQUIVOS_PACOTE[item], compress_type=compressao)
+            return
+
+        os.makedirs(destino, exist_ok=True)
+        for item, arquivo in prontos:
+            shutil.move(arquivo, os.path.join(destino, ARQUIVOS_PACOTE[item]))
@@ -0,0 +1,287 @@
+"""
+Relatório HTML estático paginado, com índice de busca em JSON (para pastas compartilhadas)
+"""
+
+import hashlib
+import html
+import json
+import os
+from itertools import islice
+from typing import Dict, Iterable, List, Sequence
+
+# Linhas por página do relatório
+LINHAS_POR_PAGINA = 500
+
+# Versão do layout das páginas (incrementar ao mudar o HTML gerado: todas as páginas são regravadas)
+VERSAO_HTML = 1
+
+# Arquivos gravados na pasta das páginas
+ARQUIVO_INDICE = 'indice.json'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+_ESTILO = (
+    'body{font-family:Arial,sans-serif;margin:20px;color:#222}'
+    'table{border-collapse:collapse;width:100%}'
+    'th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}'
+    'th{background:#eee}tr:nth-child(even){background:#fafafa}'
+    'nav{margin:10px 0}nav a{margin-right:12px}'
+    'label{margin-right:12px}.oculta{display:none}'
+)
+
+# Filtro das linhas da página: lê os filtros do endereço (#coluna=valor&q=texto)
+_SCRIPT_PAGINA = """
+(function () {
+  var filtros = {}, texto = '';
+  location.hash.substring(1).split('&').forEach(function (par) {
+    if (!par) return;
+    var partes = par.split('=');
+    var nome = decodeURIComponent(partes[0]), valor = decodeURIComponent(partes[1] || '');
+    if (nome === 'q') texto = valor.toLowerCase(); else filtros[nome] = valor;
+  });
+  var titulos = Array.prototype.map.call(document.querySelectorAll('thead th'), function (th) { return th.textContent; });
+  Array.prototype.forEach.call(document.querySelectorAll('tbody tr'), function (tr) {
+    var celulas = tr.children, visivel = true;
+    for (var i = 0; i < titulos.length; i++) {
+      if (titulos[i] in filtros && celulas[i].textContent !== filtros[titulos[i]]) visivel = false;
+    }
+    if (texto && tr.textContent.toLowerCase().indexOf(texto) < 0) visivel = false;
+    if (!visivel) tr.className = 'oculta';
+  });
+})();
+"""
+
+# Filtro das páginas no índice: cruza os valores escolhidos com o índice embutido
+_SCRIPT_INDICE = """
+(function () {
+  var indice = JSON.parse(document.getElementById('indice').textContent);
+  var seletores = document.querySelectorAll('select[data-coluna]');
+  var busca = document.getElementById('busca');
+  function atualizar() {
+    var paginas = null, filtros = [];
+    Array.prototype.forEach.call(seletores, function (sel) {
+      if (!sel.value) return;
+      var coluna = sel.getAttribute('data-coluna');
+      var lista = indice.termos[coluna][sel.value] || [];
+      filtros.push(encodeURIComponent(coluna) + '=' + encodeURIComponent(sel.value));
+      paginas = paginas === null ? lista : paginas.filter(function (p) { return lista.indexOf(p) >= 0; });
+    });
+    if (busca.value) filtros.push('q=' + encodeURIComponent(busca.value));
+    var sufixo = filtros.length ? '#' + filtros.join('&') : '';
+    var visiveis = 0;
+    indice.paginas.forEach(function (pagina, i) {
+      var item = document.getElementById('pagina-' + (i + 1));
+      var mostrar = paginas === null || paginas.indexOf(i + 1) >= 0;
+      item.className = mostrar ? '' : 'oculta';
+      item.firstChild.href = pagina.arquivo + sufixo;
+      if (mostrar) visiveis++;
+    });
+    document.getElementById('resultado').textContent = visiveis + ' página(s)';
+  }
+  Array.prototype.forEach.call(seletores, function (sel) { sel.onchange = atualizar; });
+  busca.oninput = atualizar;
+  atualizar();
+})();
+"""
+
+
+class PublicadorHTML:
+    """
+    Publica um relatório como HTML estático: um arquivo de índice e uma pasta
+    com as páginas (N linhas cada), o índice de busca (indice.json, também
+    embutido no índice) e o manifesto com o hash do conteúdo de cada página.
+
+    Ao publicar de novo na mesma pasta, páginas cujo conteúdo não mudou não
+    são montadas nem regravadas; só o índice, as páginas alteradas e as que
+    sobraram (removidas) são tocadas. O hash de uma página cobre suas linhas,
+    sua posição, a existência da página seguinte e o nome do índice.
+
+    O índice de busca guarda, para cada valor das colunas indexadas
+    (ex.: tipo de resíduo, setor), as páginas em que ele aparece: a filtragem
+    é feita no navegador, sem servidor, inclusive abrindo os arquivos direto
+    da pasta compartilhada.
+    """
+
+    def __init__(self, arquivo: str, titulo: str, colunas: Sequence[str], colunas_indice: Sequence[str] = (),
+                 linhas_por_pagina: int = LINHAS_POR_PAGINA, informacoes: Sequence[str] = ()):
+        """
+        'arquivo' é o índice (ex.: relatorio.html); as páginas vão para a pasta
+        'relatorio_arquivos' ao lado dele. 'informacoes' são linhas de texto
+        mostradas no índice (data, filtros aplicados).
+        """
+
+        if linhas_por_pagina < 1:
+            raise ValueError("A página deve ter pelo menos uma linha")
+
+        self.arquivo = arquivo
+        self.titulo = titulo
+        self.colunas = list(colunas)
+        self.colunas_indice = [self.colunas.index(coluna) for coluna in colunas_indice]
+        self.linhas_por_pagina = linhas_por_pagina
+        self.informacoes = list(informacoes)
+
+        nome = os.path.splitext(os.path.basename(arquivo))[0]
+        self.nome_pasta = f"{nome}_arquivos"
+        self.pasta = os.path.join(os.path.dirname(arquivo), self.nome_pasta)
+
+        self.paginas_gravadas = 0
+        self.paginas_reaproveitadas = 0
+        self.paginas_removidas = 0
+
+    def _ler_manifesto(self) -> Dict[str, str]:
+        """ Hash do conteúdo de cada página publicada antes (vazio se não houver ou for de outra versão). """
+
+        try:
+            with open(os.path.join(self.pasta, ARQUIVO_MANIFESTO), encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifesto.get('versao') != VERSAO_HTML or manifesto.get('colunas') != self.colunas:
+            return {}
+        return manifesto.get('paginas', {})
+
+    @staticmethod
+    def _gravar(caminho: str, conteudo: str) -> None:
+        """ Grava o arquivo de uma vez (quem estiver lendo a pasta nunca vê um arquivo pela metade). """
+
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def _nome_pagina(numero: int) -> str:
+        """ Nome do arquivo da página. """
+
+        return f"pagina_{numero:05d}.html"
+
+    def _hash_pagina(self, numero: int, linhas: List[Sequence], tem_proxima: bool) -> str:
+        """ Hash do conteúdo da página (calculado sem montar o HTML). """
+
+        descricao = repr((VERSAO_HTML, os.path.basename(self.arquivo), self.titulo, self.colunas, numero, tem_proxima, linhas))
+        return hashlib.blake2b(descricao.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _html_pagina(self, numero: int, linhas: List[Sequence], tem_proxima: bool) -> str:
+        """ HTML de uma página de linhas. """
+
+        escapar = html.escape
+        navegacao = [f'<a href="../{escapar(os.path.basename(self.arquivo))}">Índice</a>']
+        if numero > 1:
+            navegacao.append(f'<a href="{self._nome_pagina(numero - 1)}">&lsaquo; Anterior</a>')
+        navegacao.append(f'<span>Página {numero}</span>')
+        if tem_proxima:
+            navegacao.append(f'<a href="{self._nome_pagina(numero + 1)}">Próxima &rsaquo;</a>')
+        navegacao = f'<nav>{"".join(navegacao)}</nav>'
+
+        cabecalho = ''.join(f'<th>{escapar(coluna)}</th>' for coluna in self.colunas)
+        corpo = ''.join(
+            '<tr>' + ''.join(f'<td>{escapar("" if valor is None else str(valor))}</td>' for valor in linha) + '</tr>\n'
+            for linha in linhas
+        )
+        return (
+            '<!DOCTYPE html>\n<html lang="pt-BR"><head><meta charset="utf-8">'
+            f'<title>{escapar(self.titulo)} - Página {numero}</title><style>{_ESTILO}</style></head>\n'
+            f'<body><h1>{escapar(self.titulo)}</h1>{navegacao}\n'
+            f'<table><thead><tr>{cabecalho}</tr></thead><tbody>\n{corpo}</tbody></table>\n'
+            f'{navegacao}<script>{_SCRIPT_PAGINA}</script></body></html>\n'
+        )
+
+    def _html_indice(self, indice: dict, total_linhas: int) -> str:
+        """ HTML do índice: informações, filtros, lista de páginas e o índice de busca embutido. """
+
+        escapar = html.escape
+        informacoes = ''.join(f'<p>{escapar(texto)}</p>' for texto in self.informacoes)
+
+        seletores = []
+        for coluna, valores in indice['termos'].items():
+            opcoes = ''.join(f'<option value="{escapar(valor)}">{escapar(valor)}</option>' for valor in valores)
+            seletores.append(f'<label>{escapar(coluna)}: <select data-coluna="{escapar(coluna)}">'
+                             f'<option value="">Todos</option>{opcoes}</select></label>')
+
+        paginas = ''.join(
+            f'<li id="pagina-{i}"><a href="{escapar(pagina["arquivo"])}">Página {i}</a> '
+            f'({pagina["linhas"]} linhas: {escapar(str(pagina["primeira"]))} a {escapar(str(pagina["ultima"]))})</li>\n'
+            for i, pagina in enumerate(indice['paginas'], start=1)
+        )
+
+        # '</' dentro do JSON encerraria o <script>
+        indice_json = json.dumps(indice, ensure_ascii=False).replace('</', '<\\/')
+        return (
+            '<!DOCTYPE html>\n<html lang="pt-BR"><head><meta charset="utf-8">'
+            f'<title>{escapar(self.titulo)}</title><style>{_ESTILO}</style></head>\n'
+            f'<body><h1>{escapar(self.titulo)}</h1>{informacoes}'
+            f'<p>Total de linhas: {total_linhas}</p>\n'
+            f'<div>{"".join(seletores)}<label>Buscar: <input id="busca" type="search"></label>'
+            '<span id="resultado"></span></div>\n'
+            f'<ul>\n{paginas}</ul>\n'
+            f'<script type="application/json" id="indice">{indice_json}</script>\n'
+            f'<script>{_SCRIPT_INDICE}</script></body></html>\n'
+        )
+
+    def publicar(self, linhas: Iterable[Sequence], progresso=None, total: int = 0) -> str:
+        """
+        Publica as linhas (pode ser um gerador; uma página de cada vez fica em
+        memória). Retorna o caminho do índice.
+        'progresso', se informado, é chamado com (linhas publicadas, total) a cada página.
+        """
+
+        os.makedirs(self.pasta, exist_ok=True)
+        manifesto_anterior = self._ler_manifesto()
+        manifesto = {}
+        termos = {self.colunas[i]: {} for i in self.colunas_indice}  # Coluna -> valor -> páginas
+        paginas = []
+        publicadas = 0
+
+        linhas = iter(linhas)
+        pagina = list(islice(linhas, self.linhas_por_pagina))
+        numero = 0
+        while pagina:
+            numero += 1
+            proxima = list(islice(linhas, self.linhas_por_pagina))
+            nome = self._nome_pagina(numero)
+            caminho = os.path.join(self.pasta, nome)
+
+            hash_pagina = self._hash_pagina(numero, pagina, bool(proxima))
+            if manifesto_anterior.get(nome) == hash_pagina and os.path.exists(caminho):
+                self.paginas_reaproveitadas += 1
+            else:
+                self._gravar(caminho, self._html_pagina(numero, pagina, bool(proxima)))
+                self.paginas_gravadas += 1
+            manifesto[nome] = hash_pagina
+
+            for i in self.colunas_indice:
+                valores = termos[self.colunas[i]]
+                for valor in {linha[i] for linha in pagina if linha[i] not in (None, '')}:
+                    valores.setdefault(str(valor), []).append(numero)
+            paginas.append({
+                'arquivo': f"{self.nome_pasta}/{nome}",
+                'linhas': len(pagina),
+                'primeira': pagina[0][0],
+                'ultima': pagina[-1][0]
+            })
+
+            publicadas += len(pagina)
+            if progresso:
+                progresso(publicadas, total)
+            pagina = proxima
+
+        # Páginas que sobraram da publicação anterior
+        for nome in manifesto_anterior:
+            if nome not in manifesto:
+                try:
+                    os.remove(os.path.join(self.pasta, nome))
+                    self.paginas_removidas += 1
+                except OSError:
+                    pass
+
+        indice = {
+            'colunas': self.colunas,
+            'paginas': paginas,
+            'termos': {coluna: dict(sorted(valores.items())) for coluna, valores in termos.items()}
+        }
+        self._gravar(os.path.join(self.pasta, ARQUIVO_INDICE), json.dumps(indice, ensure_ascii=False))
+        self._gravar(self.arquivo, self._html_indice(indice, publicadas))
+        # O manifesto vai por último: se algo falhar antes, a próxima publicação regrava o que for preciso
+        self._gravar(os.path.join(self.pasta, ARQUIVO_MANIFESTO), json.dumps(
+            {'versao': VERSAO_HTML, 'colunas': self.colunas, 'paginas': manifesto}, ensure_ascii=False
+        ))
+        return self.arquivo
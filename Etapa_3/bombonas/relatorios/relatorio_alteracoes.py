@@ -0,0 +1,79 @@
+"""
+Relatório das alterações (inclusões, atualizações e remoções) de um período
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import List
+
+from dao.registro_alteracoes import ATUALIZACAO, INCLUSAO, REMOCAO, Entrada
+from relatorios.escritor_csv import EscritorCSV
+from relatorios.motor_pdf import ModeloTabela, MotorPDF
+
+# Formatos do relatório de alterações
+FORMATOS_ALTERACOES = ("csv", "pdf")
+
+# Nome das operações no relatório
+NOMES_OPERACOES = {INCLUSAO: 'Inclusão', ATUALIZACAO: 'Atualização', REMOCAO: 'Remoção'}
+
+# Entidade -> (título, colunas dos registros na ordem gravada pelo DAO: (título, largura em mm, alinhamento))
+ENTIDADES = {
+    'bombonas': ('BOMBONAS', [
+        ('Código', 25, 'C'),
+        ('Volume (L)', 22, 'C'),
+        ('Tipo Resíduo', 35, 'C'),
+        ('CPF Responsável', 38, 'C'),
+    ]),
+    'responsaveis': ('RESPONSÁVEIS', [
+        ('CPF', 30, 'C'),
+        ('Nome', 42, 'L'),
+        ('Telefone', 28, 'C'),
+        ('Setor', 30, 'L'),
+    ]),
+}
+
+# Colunas comuns a todas as entidades
+COLUNAS_ALTERACAO = [('Data/Hora', 35, 'C'), ('Operação', 25, 'C')]
+
+
+def _linhas(alteracoes: List[Entrada], quantidade_campos: int):
+    """ Valores das linhas: data e hora, operação e campos do registro (na remoção sem registro, só a chave). """
+
+    for entrada in alteracoes:
+        registro = entrada.registro if entrada.registro is not None else (entrada.chave,)
+        campos = ['' if valor is None else str(valor) for valor in registro[:quantidade_campos]]
+        campos.extend([''] * (quantidade_campos - len(campos)))
+        yield (entrada.momento.strftime("%d/%m/%Y %H:%M:%S"), NOMES_OPERACOES.get(entrada.operacao, entrada.operacao),
+               *campos)
+
+
+def gerar_relatorio_alteracoes(entidade: str, alteracoes: List[Entrada], arquivo: str, formato: str,
+                               desde: datetime, ate: datetime = None, progresso=None) -> str:
+    """ Grava o relatório das alterações (resumidas por chave) de uma entidade em CSV ou PDF. """
+
+    titulo, colunas = ENTIDADES[entidade]
+    periodo = f"Alterações desde {desde.strftime('%d/%m/%Y %H:%M')}"
+    if ate:
+        periodo += f" até {ate.strftime('%d/%m/%Y %H:%M')}"
+    contagem = Counter(entrada.operacao for entrada in alteracoes)
+    totais = ", ".join(f"{nome}: {contagem.get(operacao, 0)}" for operacao, nome in NOMES_OPERACOES.items())
+
+    if formato == "csv":
+        with EscritorCSV(arquivo) as escritor:
+            escritor.escrever_linha([f'# {periodo}'])
+            escritor.escrever_linha([f'# {totais}'])
+            escritor.escrever_linha([])
+            escritor.escrever_linha([titulo for titulo, _, _ in COLUNAS_ALTERACAO + colunas])
+            escritor.escrever_linhas(_linhas(alteracoes, len(colunas)))
+        return arquivo
+
+    with MotorPDF(arquivo, progresso) as pdf:
+        pdf.texto(f"RELATÓRIO DE ALTERAÇÕES - {titulo}", 'B', 16, 10, 'C')
+        pdf.espaco(5)
+        pdf.texto(periodo, 'B', 12, 8)
+        pdf.texto(totais, '', 10, 6)
+        pdf.espaco(5)
+        pdf.tabela(ModeloTabela(COLUNAS_ALTERACAO + colunas), _linhas(alteracoes, len(colunas)), len(alteracoes))
+        pdf.espaco(10)
+        pdf.texto(f"Relatório gerado em {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}", 'I', 8, 6)
+    return arquivo
@@ -0,0 +1,106 @@
+"""
+Configuração dos testes automatizados (pytest)
+
+Os DAOs gravam em caminhos relativos ('data/...'); cada teste roda numa pasta
+temporária própria, de modo que os arquivos reais do sistema nunca são tocados.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.cache_consultas import cache_compartilhado  # noqa: E402
+
+
+def gerar_cpf(numero: int) -> str:
+    """ CPF válido (com dígitos verificadores) gerado a partir de um número de até 9 dígitos. """
+
+    base = f"{numero:09d}"
+    if base == base[0] * 9:
+        base = base[:8] + str((int(base[0]) + 1) % 10)
+    for tamanho in (9, 10):
+        soma = sum(int(base[i]) * (tamanho + 1 - i) for i in range(tamanho))
+        resto = soma % 11
+        base += str(11 - resto if resto >= 2 else 0)
+    return base
+
+
+@pytest.fixture
+def pasta_dados(tmp_path, monkeypatch):
+    """ Executa o teste numa pasta temporária (com 'data/' vazia) e com o cache de consultas limpo. """
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    cache_compartilhado.limpar()
+    yield tmp_path
+    cache_compartilhado.limpar()
+
+
+@pytest.fixture
+def cadastro(pasta_dados):
+    """
+    Cadastro pequeno: três responsáveis de setores diferentes e seis bombonas.
+    Retorna um dicionário com os CPFs ('ana', 'bruno', 'carla') e os controllers.
+    """
+
+    from controllers.bombona_controller import BombonaController
+    from controllers.responsavel_controller import ResponsavelController
+
+    responsavel_controller = ResponsavelController()
+    cpfs = {'ana': gerar_cpf(111222333), 'bruno': gerar_cpf(222333444), 'carla': gerar_cpf(333444555)}
+    responsavel_controller.cadastrar_responsavel(cpfs['ana'], "Ana Costa", "35999990001", "FÍSICA")
+    responsavel_controller.cadastrar_responsavel(cpfs['bruno'], "Bruno Lima", "35999990002", "QUÍMICA")
+    responsavel_controller.cadastrar_responsavel(cpfs['carla'], "Carla Souza", "35999990003", "BIOLOGIA")
+
+    bombona_controller = BombonaController()
+    for codigo, volume, tipo, dono in [
+        ("FIS-001", 50, "QUÍMICO", 'ana'),
+        ("FIS-002", 100, "QUÍMICO", 'ana'),
+        ("FIS-003", 20, "BIOLÓGICO", 'ana'),
+        ("QUI-001", 200, "QUÍMICO", 'bruno'),
+        ("QUI-002", 35.5, "QUÍMICO", 'bruno'),
+        ("BIO-001", 10, "BIOLÓGICO", 'carla'),
+    ]:
+        bombona_controller.cadastrar_bombona(codigo, volume, tipo, cpfs[dono])
+
+    return {
+        'cpfs': cpfs,
+        'bombonas': bombona_controller,
+        'responsaveis': responsavel_controller,
+    }
+
+
+def ler_paginas_pdf(caminho) -> list:
+    """
+    Confere a tabela de posições (xref) de um PDF gerado pelo motor de relatórios
+    e retorna o conteúdo descomprimido de cada página, na ordem da árvore de páginas.
+    """
+
+    import re
+    import zlib
+
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read()
+    assert dados.startswith(b"%PDF-") and dados.endswith(b"%%EOF\n")
+
+    inicio_xref = int(re.search(rb"startxref\n(\d+)\n", dados).group(1))
+    assert dados[inicio_xref:].startswith(b"xref\n")
+    total = int(re.match(rb"xref\n0 (\d+)\n", dados[inicio_xref:]).group(1))
+    entradas = dados[inicio_xref:].split(b"\n")[3:3 + total - 1]
+    objetos = {}
+    for numero, entrada in enumerate(entradas, 1):
+        posicao = int(entrada[:10])
+        assert dados[posicao:].startswith(b"%d 0 obj\n" % numero)
+        objetos[numero] = dados[posicao:dados.index(b"\nendobj\n", posicao)]
+
+    paginas = []
+    filhos = re.search(rb"/Kids \[([^\]]*)\]", objetos[2]).group(1)
+    for numero in map(int, re.findall(rb"(\d+) 0 R", filhos)):
+        conteudo = int(re.search(rb"/Contents (\d+) 0 R", objetos[numero]).group(1))
+        stream = objetos[conteudo].split(b"stream\n", 1)[1].rsplit(b"\nendstream", 1)[0]
+        paginas.append(zlib.decompress(stream))
+    return paginas
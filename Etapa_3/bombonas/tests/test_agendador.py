@@ -0,0 +1,166 @@
+"""
+Testes do agendador de relatórios (agenda no formato do cron e execução das tarefas)
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import relatorios.agendador as agendador
+from relatorios.agendador import Agenda, Agendador, carregar_configuracao
+
+
+def _minutos(agenda: Agenda, inicio: datetime, quantidade: int) -> list:
+    """ Minutos em que a agenda corresponde, testando minuto a minuto. """
+
+    return [inicio + timedelta(minutes=n) for n in range(quantidade)
+            if agenda.corresponde(inicio + timedelta(minutes=n))]
+
+
+@pytest.mark.parametrize("expressao, campo, esperado", [
+    ("0,15,45 * * * *", 'minutos', {0, 15, 45}),
+    ("0 9-11,14 * * *", 'horas', {9, 10, 11, 14}),
+    ("*/20 * * * *", 'minutos', {0, 20, 40}),
+    ("0-30/10 * * * *", 'minutos', {0, 10, 20, 30}),
+    ("5/25 * * * *", 'minutos', {5, 30, 55}),
+    ("0 0 * */6 *", 'meses', {1, 7}),
+    ("0 0 * * 5-7", 'dias_semana', {0, 5, 6}),
+    ("@weekly", 'dias_semana', {0}),
+])
+def test_campos(expressao, campo, esperado):
+    assert getattr(Agenda(expressao), campo) == esperado
+
+
+@pytest.mark.parametrize("expressao", ["* * * *", "60 * * * *", "* * 0 * *", "* * * * 8", "*/0 * * * *",
+                                       "5-1 * * * *", "a * * * *"])
+def test_agenda_invalida(expressao):
+    with pytest.raises(ValueError):
+        Agenda(expressao)
+
+
+def test_domingo_como_7():
+    # 19/10/2025 foi um domingo
+    assert Agenda("0 8 * * 7").corresponde(datetime(2025, 10, 19, 8, 0))
+    assert not Agenda("0 8 * * 7").corresponde(datetime(2025, 10, 20, 8, 0))
+
+
+def test_dia_do_mes_ou_dia_da_semana():
+    # Dia 13 ou sexta-feira: em outubro/2025, sextas 3, 10, 17, 24, 31 e o dia 13 (segunda)
+    agenda = Agenda("0 0 13 * 5")
+    dias = [m.day for m in _minutos(agenda, datetime(2025, 10, 1), 31 * 24 * 60)]
+    assert dias == [3, 10, 13, 17, 24, 31]
+
+
+def test_dia_com_asterisco_e_passo_nao_restringe():
+    # '*/2' no dia do mês começa com '*': vale o E entre os dois campos (segundas em dias ímpares)
+    agenda = Agenda("0 0 */2 * 1")
+    dias = [m.day for m in _minutos(agenda, datetime(2025, 10, 1), 31 * 24 * 60)]
+    assert dias == [13, 27]
+
+    # Com o dia da semana '*/1', só o dia do mês restringe
+    assert [m.day for m in _minutos(Agenda("0 0 1,15 * */1"), datetime(2025, 10, 1), 31 * 24 * 60)] == [1, 15]
+
+
+@pytest.mark.parametrize("expressao, depois", [
+    ("*/15 * * * *", datetime(2025, 10, 19, 10, 7, 30)),
+    ("30 2 * * 1-5", datetime(2025, 10, 17, 3, 0)),
+    ("0 0 13 * 5", datetime(2025, 10, 4, 12, 0)),
+    ("0 12 * 2 *", datetime(2025, 10, 1)),
+    ("@monthly", datetime(2025, 12, 31, 23, 59)),
+])
+def test_proxima_igual_a_busca_minuto_a_minuto(expressao, depois):
+    agenda = Agenda(expressao)
+    proxima = agenda.proxima(depois)
+
+    momento = depois.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while not agenda.corresponde(momento):
+        momento += timedelta(minutes=1)
+    assert proxima == momento
+
+
+def test_proxima_sem_ocorrencia():
+    assert Agenda("0 0 29 2 *").proxima(datetime(2025, 3, 1)) == datetime(2028, 2, 29)
+    assert Agenda("0 0 31 2 *").proxima(datetime(2025, 1, 1)) is None
+
+
+def _configurar(pasta, tarefas: list) -> str:
+    caminho = os.path.join(pasta, "agendamentos.json")
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'processos': 1, 'tarefas': tarefas}, arquivo)
+    return caminho
+
+
+def test_configuracao_invalida(tmp_path):
+    tarefa = {'nome': "r", 'relatorio': "responsaveis", 'arquivo': "r.csv", 'agenda': "@daily"}
+
+    assert len(carregar_configuracao(_configurar(tmp_path, [tarefa]))[0]) == 1
+    for alteracao, mensagem in [({'formato': "docx"}, "formato"), ({'agenda': "* *"}, "5 campos"),
+                                ({'filtros': {'setor': "FÍSICA"}}, "só se aplicam"), ({'arquivo': ""}, "arquivo")]:
+        with pytest.raises(ValueError, match=mensagem):
+            carregar_configuracao(_configurar(tmp_path, [dict(tarefa, **alteracao)]))
+
+
+def test_tarefa_ignorada_sem_alteracao_nos_dados(cadastro, tmp_path):
+    configuracao = _configurar(tmp_path, [{
+        'nome': "quimicas", 'relatorio': "bombonas", 'formato': "csv", 'agenda': "@daily",
+        'arquivo': str(tmp_path / "saida" / "quimicas.csv"), 'filtros': {'tipo_residuo': "QUÍMICO"}
+    }])
+    agenda = Agendador(configuracao, str(tmp_path / "estado.json"), cadastro['bombonas'], cadastro['responsaveis'])
+    tarefa = agenda.tarefas[0]
+
+    assert agenda.executar_tarefa(tarefa)['linhas'] == 4
+    assert agenda.executar_tarefa(tarefa)['situacao'] == 'ignorada'
+    assert agenda.executar_tarefa(tarefa, forcar=True)['situacao'] == 'gerada'
+
+    # O estado gravado vale para um novo agendador
+    outro = Agendador(configuracao, str(tmp_path / "estado.json"), cadastro['bombonas'], cadastro['responsaveis'])
+    assert outro.executar_tarefa(outro.tarefas[0])['situacao'] == 'ignorada'
+
+    # Arquivo removido ou dados alterados: gera de novo
+    os.remove(tarefa.arquivo)
+    assert agenda.executar_tarefa(tarefa)['situacao'] == 'gerada'
+    cadastro['bombonas'].cadastrar_bombona("QUI-003", 40, "QUÍMICO", cadastro['cpfs']['bruno'])
+    resultado = agenda.executar_tarefa(tarefa)
+    assert (resultado['situacao'], resultado['linhas']) == ('gerada', 5)
+
+
+class _Relogio:
+    """ Relógio simulado: datetime.now() e Event.wait avançam o mesmo tempo. """
+
+    def __init__(self, inicio: datetime, fim: datetime):
+        self.agora = inicio
+        self.fim = fim
+        self.esperas = []
+
+    def wait(self, segundos: float) -> bool:
+        self.esperas.append(segundos)
+        self.agora += timedelta(seconds=segundos)
+        return self.agora >= self.fim
+
+
+def test_laco_dorme_ate_a_proxima_execucao(tmp_path, monkeypatch):
+    relogio = _Relogio(datetime(2025, 10, 19, 10, 7, 20), datetime(2025, 10, 19, 11, 5))
+
+    class Datetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return relogio.agora
+
+    monkeypatch.setattr(agendador, 'datetime', Datetime)
+    configuracao = _configurar(tmp_path, [
+        {'nome': "meia_hora", 'relatorio': "responsaveis", 'arquivo': "r.csv", 'agenda': "*/30 * * * *"},
+        {'nome': "diaria", 'relatorio': "responsaveis", 'arquivo': "d.csv", 'agenda': "0 2 * * *"},
+    ])
+    agenda = Agendador(configuracao, str(tmp_path / "estado.json"), object(), object())
+    execucoes = []
+    monkeypatch.setattr(agenda, 'executar_pendentes', lambda momento, executor: execucoes.append(momento))
+
+    assert agenda.proxima_execucao(datetime(2025, 10, 19, 1, 45)) == datetime(2025, 10, 19, 2, 0)
+    agenda.executar(relogio)
+
+    assert execucoes == [datetime(2025, 10, 19, 10, 30), datetime(2025, 10, 19, 11, 0)]
+    # Sem tarefa no minuto seguinte, acorda só para verificar a configuração
+    assert max(relogio.esperas) == agendador.INTERVALO_CONFIGURACAO
+    assert len(relogio.esperas) < 70
@@ -0,0 +1,107 @@
+"""
+Testes do alocador de códigos livres e da sua atualização incremental no controller
+"""
+
+import gc
+
+import pytest
+
+from controllers.bombona_controller import BombonaController
+from dao import eventos
+from dao.bombona_dao import BombonaDAO
+from factory.alocador_codigos import CODIGOS_POR_PREFIXO, AlocadorCodigos
+
+
+def test_proximos_livres_pula_os_usados():
+    alocador = AlocadorCodigos(["FIS-000", "FIS-001", "FIS-003"])
+
+    assert alocador.proximo_livre("fis") == "FIS-002"
+    assert alocador.proximos_livres("FIS", 3) == ["FIS-002", "FIS-004", "FIS-005"]
+    assert alocador.proximo_livre("FIS") == "FIS-006"
+
+    alocador.liberar("FIS-001")
+    assert alocador.proximo_livre("FIS") == "FIS-001"
+    assert alocador.proximo_livre("QUI") == "QUI-000"
+
+
+def test_prefixo_cheio_e_prefixo_invalido():
+    alocador = AlocadorCodigos(f"ABC-{n:03d}" for n in range(CODIGOS_POR_PREFIXO - 1))
+
+    assert alocador.proximo_livre("ABC") == "ABC-999"
+    with pytest.raises(ValueError, match="Não há 2"):
+        alocador.proximos_livres("ABC", 2)
+    with pytest.raises(ValueError, match="3 letras"):
+        alocador.proximo_livre("AB1")
+
+
+def test_codigos_fora_do_formato_sao_ignorados():
+    alocador = AlocadorCodigos(["FIS-000", "FIS-1", "fis-001", "FIS-0001", "FISICA", "", "FIS-00a"])
+
+    assert alocador.proximos_livres("FIS", 2, reservar=False) == ["FIS-001", "FIS-002"]
+    alocador.liberar("FIS-x")
+
+
+def test_linha_com_codigo_invalido_no_arquivo(cadastro):
+    controller, cpfs = cadastro['bombonas'], cadastro['cpfs']
+    # Linha gravada à mão (ou por uma versão antiga do DAO)
+    with open("data/bombonas.csv", 'a', encoding='utf-8') as arquivo:
+        arquivo.write(f"BOMBONA-A,1.0,QUÍMICO,{cpfs['ana']}\n")
+
+    assert controller.sugerir_codigo("FIS") == "FIS-000"
+    assert controller.cadastrar_bombonas_em_lote("FIS", 2, 10, "QUÍMICO", cpfs['ana']) == ["FIS-000", "FIS-004"]
+
+
+def _contar_montagens(monkeypatch) -> list:
+    montagens = []
+    original = BombonaDAO.listar_codigos
+
+    def contar(self):
+        montagens.append(1)
+        return original(self)
+
+    monkeypatch.setattr(BombonaDAO, 'listar_codigos', contar)
+    return montagens
+
+
+def test_gravacoes_do_processo_nao_remontam_o_alocador(cadastro, monkeypatch):
+    controller, cpfs = cadastro['bombonas'], cadastro['cpfs']
+    montagens = _contar_montagens(monkeypatch)
+
+    assert controller.sugerir_codigo("FIS") == "FIS-000"
+    assert controller.cadastrar_bombonas_em_lote("FIS", 2, 10, "QUÍMICO", cpfs['ana']) == ["FIS-000", "FIS-004"]
+    controller.remover_bombona("FIS-002")
+    assert controller.sugerir_codigos("FIS", 2) == ["FIS-002", "FIS-005"]
+
+    # Gravação de outro controller do mesmo processo (outra tela) também é aplicada
+    BombonaController().cadastrar_bombona("FIS-002", 5, "QUÍMICO", cpfs['carla'])
+    assert controller.sugerir_codigo("FIS") == "FIS-005"
+
+    assert len(montagens) == 1
+
+
+def test_alteracao_por_outro_processo_remonta(cadastro, monkeypatch):
+    controller = cadastro['bombonas']
+    assert controller.sugerir_codigo("FIS") == "FIS-000"
+    montagens = _contar_montagens(monkeypatch)
+
+    # Escrita direta no CSV, sem passar por um DAO deste processo
+    with open("data/bombonas.csv", 'a', encoding='utf-8') as arquivo:
+        arquivo.write(f"FIS-000,1.0,QUÍMICO,{cadastro['cpfs']['ana']}\n")
+
+    assert controller.sugerir_codigo("FIS") == "FIS-004"
+    assert len(montagens) == 1
+
+
+def test_controller_descartado_sai_dos_inscritos(pasta_dados):
+    # Descarta antes as inscrições de controllers de outros testes
+    gc.collect()
+    eventos.publicar(eventos.BOMBONAS, (0, 0), (1, 1))
+    inscritos = len(eventos._inscritos)
+    controller = BombonaController()
+    assert len(eventos._inscritos) == inscritos + 1
+
+    del controller
+    gc.collect()
+    eventos.publicar(eventos.BOMBONAS, (0, 0), (1, 1))
+
+    assert len(eventos._inscritos) == inscritos
@@ -0,0 +1,111 @@
+"""
+Testes do DAO de bombonas em registros de tamanho fixo e da escolha do armazenamento
+"""
+
+import os
+
+import pytest
+
+from controllers.bombona_controller import BombonaController
+from dao.bombona_dao import BombonaDAO
+from dao.bombona_dao_registro_fixo import TAM_REGISTRO, BombonaDAORegistroFixo, compactar, importar_csv
+from dao.selecao_dao import VARIAVEL_ARMAZENAMENTO, criar_bombona_dao
+
+
+def _registros(dao) -> dict:
+    return {b.get_codigo(): (b.get_volume(), b.get_tipo_residuo(), b.get_responsavel().get_cpf())
+            for b in dao.listar_todas()}
+
+
+@pytest.fixture
+def dao_fixo(cadastro):
+    """ DAO de registros fixos com as bombonas do cadastro importadas do CSV. """
+
+    importar_csv("data/bombonas.csv", "data/bombonas.dat")
+    return BombonaDAORegistroFixo("data/bombonas.dat")
+
+
+def test_importa_o_csv(cadastro, dao_fixo):
+    assert _registros(dao_fixo) == _registros(BombonaDAO())
+    assert os.path.getsize(dao_fixo.arquivo) == 6 * TAM_REGISTRO
+
+
+def test_atualiza_no_proprio_registro(cadastro, dao_fixo):
+    cpfs = cadastro['cpfs']
+    bombona = dao_fixo.buscar_por_codigo("FIS-002")
+    bombona.set_volume(12.5)
+    dao_fixo.atualizar(bombona)
+    dao_fixo.atualizar_em_lote(["QUI-001", "BIO-001"], tipo_residuo="BIOLÓGICO")
+
+    assert os.path.getsize(dao_fixo.arquivo) == 6 * TAM_REGISTRO
+    registros = _registros(BombonaDAORegistroFixo(dao_fixo.arquivo))
+    assert registros["FIS-002"] == (12.5, "QUÍMICO", cpfs['ana'])
+    assert registros["QUI-001"] == (200.0, "BIOLÓGICO", cpfs['bruno'])
+    assert registros["BIO-001"][1] == "BIOLÓGICO"
+
+
+def test_remove_reaproveita_e_compacta(cadastro, dao_fixo):
+    controller = BombonaController(dao_fixo)
+    controller.remover_bombonas_em_lote(["FIS-001", "QUI-002"])
+
+    assert dao_fixo.listar_codigos() == ["BIO-001", "FIS-002", "FIS-003", "QUI-001"]
+    assert os.path.getsize(dao_fixo.arquivo) == 6 * TAM_REGISTRO
+
+    # O cadastro seguinte ocupa um registro livre em vez de crescer o arquivo
+    controller.cadastrar_bombona("ZZZ-001", 5, "QUÍMICO", cadastro['cpfs']['carla'])
+    assert os.path.getsize(dao_fixo.arquivo) == 6 * TAM_REGISTRO
+
+    antes = _registros(dao_fixo)
+    assert compactar(dao_fixo.arquivo) == 5
+    assert os.path.getsize(dao_fixo.arquivo) == 5 * TAM_REGISTRO
+    assert _registros(BombonaDAORegistroFixo(dao_fixo.arquivo)) == antes
+
+
+def test_alteracao_por_outro_processo(cadastro, dao_fixo):
+    outro = BombonaDAORegistroFixo(dao_fixo.arquivo)
+    outro.remover_em_lote(["FIS-003"])
+
+    assert not dao_fixo.existe_codigo("FIS-003")
+    assert dao_fixo.buscar_intervalo("FIS-001", "FIS-999")[-1].get_codigo() == "FIS-002"
+
+
+def test_remover_lista_com_codigo_repetido(cadastro, dao_fixo):
+    assert dao_fixo.remover_em_lote(["FIS-001", "QUI-002", "FIS-001"]) == ["FIS-001", "QUI-002"]
+
+    assert dao_fixo.listar_codigos() == ["BIO-001", "FIS-002", "FIS-003", "QUI-001"]
+    assert dao_fixo.versao_dados() == dao_fixo._assinatura
+    # Cada registro liberado é reaproveitado uma única vez
+    assert sorted(dao_fixo._livres) == sorted(set(dao_fixo._livres))
+    assert _registros(BombonaDAORegistroFixo(dao_fixo.arquivo)) == _registros(dao_fixo)
+
+
+def test_codigo_repetido(cadastro, dao_fixo):
+    bombona = dao_fixo.buscar_por_codigo("FIS-001")
+
+    with pytest.raises(ValueError, match="Já existe"):
+        dao_fixo.salvar(bombona)
+
+
+def test_armazenamento_padrao_e_csv(pasta_dados, monkeypatch):
+    monkeypatch.delenv(VARIAVEL_ARMAZENAMENTO, raising=False)
+
+    assert isinstance(criar_bombona_dao(), BombonaDAO)
+
+
+def test_controller_usa_o_armazenamento_configurado(cadastro, monkeypatch):
+    importar_csv("data/bombonas.csv", "data/bombonas.dat")
+    monkeypatch.setenv(VARIAVEL_ARMAZENAMENTO, "registro_fixo")
+
+    controller = BombonaController()
+    assert isinstance(controller._bombona_dao, BombonaDAORegistroFixo)
+
+    controller.remover_bombona("FIS-001")
+    assert not BombonaDAORegistroFixo().existe_codigo("FIS-001")
+    assert BombonaDAO().existe_codigo("FIS-001")
+
+
+def test_armazenamento_invalido(pasta_dados, monkeypatch):
+    monkeypatch.setenv(VARIAVEL_ARMAZENAMENTO, "sqlite")
+
+    with pytest.raises(ValueError, match="inválido"):
+        BombonaController()
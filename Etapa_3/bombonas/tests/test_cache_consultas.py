@@ -0,0 +1,129 @@
+"""
+Testes do cache de consultas dos controllers
+"""
+
+import os
+
+import pytest
+
+from controllers.cache_consultas import CacheConsultas, cache_compartilhado
+from dao.eventos import Alteracao
+
+
+class Contador:
+    """ Função de cálculo que conta quantas vezes foi chamada. """
+
+    def __init__(self, resultado):
+        self.resultado = resultado
+        self.chamadas = 0
+
+    def __call__(self):
+        self.chamadas += 1
+        return self.resultado
+
+
+def test_reaproveita_enquanto_as_versoes_nao_mudam():
+    cache = CacheConsultas()
+    calcular = Contador([1, 2])
+
+    assert cache.consultar('a', calcular, {'bombonas': (1,)}) == [1, 2]
+    assert cache.consultar('a', calcular, {'bombonas': (1,)}) == [1, 2]
+    assert calcular.chamadas == 1
+
+    cache.consultar('a', calcular, {'bombonas': (2,)})
+    assert calcular.chamadas == 2
+    assert cache.metricas()['acertos'] == 1 and cache.metricas()['falhas'] == 2
+
+
+def test_listas_sao_devolvidas_como_copia():
+    cache = CacheConsultas()
+
+    cache.consultar('a', Contador([1, 2])).append(3)
+    assert cache.consultar('a', Contador(None)) == [1, 2]
+
+
+def test_objetos_devolvidos_nao_alteram_o_cache(cadastro):
+    controller = cadastro['bombonas']
+    cache_compartilhado.limpar()
+    antes = controller.metricas_cache()
+
+    primeira = controller.listar_bombonas()
+    bombona = next(b for b in primeira if b.get_codigo() == "FIS-001")
+    bombona.set_volume(999)
+    bombona.get_responsavel().set_nome("Outro Nome")
+
+    segunda = controller.listar_bombonas()
+    assert controller.metricas_cache()['acertos'] == antes['acertos'] + 1
+    guardada = next(b for b in segunda if b.get_codigo() == "FIS-001")
+    assert guardada is not bombona
+    assert guardada.get_volume() == 50
+    assert guardada.get_responsavel().get_nome() == "Ana Costa"
+
+
+def test_gravacao_invalida_apenas_a_entidade_alterada():
+    cache = CacheConsultas()
+    bombonas, responsaveis = Contador(1), Contador(2)
+    cache.consultar('b', bombonas, {'bombonas': (1,)})
+    cache.consultar('r', responsaveis, {'responsaveis': (1,)})
+
+    cache.registrar_alteracao(Alteracao('bombonas', (), (), ('FIS-001',), (1,), (2,)))
+    cache.consultar('b', bombonas, {'bombonas': (1,)})
+    cache.consultar('r', responsaveis, {'responsaveis': (1,)})
+
+    assert (bombonas.chamadas, responsaveis.chamadas) == (2, 1)
+    assert cache.metricas()['invalidacoes'] == 1
+
+
+def test_descarta_os_menos_usados():
+    cache = CacheConsultas(tamanho_maximo=2)
+    contadores = {chave: Contador(chave) for chave in 'abc'}
+
+    cache.consultar('a', contadores['a'])
+    cache.consultar('b', contadores['b'])
+    cache.consultar('a', contadores['a'])
+    cache.consultar('c', contadores['c'])
+    cache.consultar('a', contadores['a'])
+    cache.consultar('b', contadores['b'])
+
+    assert [contadores[c].chamadas for c in 'abc'] == [1, 2, 1]
+    assert cache.metricas()['descartes'] == 2
+    assert cache.metricas()['itens'] == 2
+
+
+def test_erros_nao_sao_guardados():
+    cache = CacheConsultas()
+
+    def falhar():
+        raise ValueError("falha")
+
+    with pytest.raises(ValueError):
+        cache.consultar('a', falhar)
+    assert cache.consultar('a', Contador(5)) == 5
+
+
+def test_controller_usa_o_cache_e_acompanha_as_gravacoes(cadastro):
+    controller = cadastro['bombonas']
+    cache_compartilhado.limpar()
+    antes = controller.metricas_cache()
+
+    controller.listar_bombonas()
+    controller.listar_bombonas()
+    assert controller.metricas_cache()['acertos'] == antes['acertos'] + 1
+
+    controller.remover_bombona("FIS-001")
+    assert "FIS-001" not in [b.get_codigo() for b in controller.listar_bombonas()]
+
+
+def test_controller_percebe_alteracoes_feitas_por_fora(cadastro):
+    controller = cadastro['bombonas']
+    assert len(controller.listar_bombonas()) == 6
+
+    # Outro processo reescreve o arquivo (tamanho e data de modificação mudam)
+    caminho = "data/bombonas.csv"
+    with open(caminho, encoding='utf-8') as arquivo:
+        linhas = arquivo.readlines()
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.writelines(linhas[:-1])
+    os.utime(caminho, ns=(os.stat(caminho).st_atime_ns, os.stat(caminho).st_mtime_ns + 5 * 10 ** 9))
+
+    assert len(controller.listar_bombonas()) == 5
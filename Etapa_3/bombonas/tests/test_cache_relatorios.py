@@ -0,0 +1,87 @@
+"""
+Testes do cache dos arquivos de relatório
+"""
+
+import os
+
+import pytest
+
+from controllers.bombona_controller import BombonaController
+from relatorios.cache_relatorios import CacheRelatorios
+
+
+def test_chave_muda_com_formato_filtros_e_versoes():
+    chave = CacheRelatorios.chave('bombonas', 'csv', (('setor', 'FÍSICA'),), (1, 2))
+
+    assert chave == CacheRelatorios.chave('bombonas', 'CSV', (('setor', 'FÍSICA'),), (1, 2))
+    assert chave != CacheRelatorios.chave('bombonas', 'pdf', (('setor', 'FÍSICA'),), (1, 2))
+    assert chave != CacheRelatorios.chave('bombonas', 'csv', (('setor', 'QUÍMICA'),), (1, 2))
+    assert chave != CacheRelatorios.chave('bombonas', 'csv', (('setor', 'FÍSICA'),), (1, 3))
+    assert chave != CacheRelatorios.chave('responsaveis', 'csv', (('setor', 'FÍSICA'),), (1, 2))
+
+
+def test_guarda_e_copia_para_o_destino(tmp_path):
+    cache = CacheRelatorios(str(tmp_path / "cache"))
+    gerado = tmp_path / "gerado.csv"
+    gerado.write_text("conteudo")
+
+    assert cache.obter("k", "csv", str(tmp_path / "destino.csv")) is None
+    cache.guardar("k", "csv", str(gerado))
+    assert cache.obter("k", "csv", str(tmp_path / "destino.csv")) == str(tmp_path / "destino.csv")
+    assert (tmp_path / "destino.csv").read_text() == "conteudo"
+
+    cache.limpar()
+    assert cache.obter("k", "csv", str(tmp_path / "outro.csv")) is None
+
+
+def test_apaga_os_usados_ha_mais_tempo(tmp_path):
+    cache = CacheRelatorios(str(tmp_path / "cache"), tamanho_maximo_bytes=35)
+    gerado = tmp_path / "gerado.csv"
+    gerado.write_bytes(b"x" * 10)
+
+    for numero, chave in enumerate("abc"):
+        cache.guardar(chave, "csv", str(gerado))
+        os.utime(cache._caminho(chave, "csv"), ns=(numero * 10 ** 9, numero * 10 ** 9))
+    # 'a' foi usado por último; ao guardar 'd' (40 bytes no total) some o mais antigo, 'b'
+    cache.obter("a", "csv", str(tmp_path / "usado.csv"))
+    cache.guardar("d", "csv", str(gerado))
+
+    assert sorted(os.listdir(tmp_path / "cache")) == ["a.csv", "c.csv", "d.csv"]
+
+
+@pytest.fixture
+def sem_gerar_csv(monkeypatch):
+    """ Faz a geração do CSV falhar (um acerto no cache não chega a gerar o arquivo). """
+
+    def falhar(*_args, **_kwargs):
+        raise AssertionError("o relatório não deveria ser gerado de novo")
+
+    monkeypatch.setattr(BombonaController, '_gerar_csv', falhar)
+
+
+def test_controller_reaproveita_ate_os_dados_mudarem(cadastro, tmp_path, request):
+    controller = cadastro['bombonas']
+    primeiro = controller.gerar_relatorio(arquivo=str(tmp_path / "r1.csv"), filtros={'setor': "FÍSICA"})
+    conteudo = open(primeiro, encoding='utf-8').read()
+
+    request.getfixturevalue('sem_gerar_csv')
+    segundo = controller.gerar_relatorio(arquivo=str(tmp_path / "r2.csv"), filtros={'setor': "FÍSICA"})
+    assert open(segundo, encoding='utf-8').read() == conteudo
+
+    # Outros filtros ou dados alterados: o relatório é gerado de novo
+    with pytest.raises(AssertionError):
+        controller.gerar_relatorio(arquivo=str(tmp_path / "r3.csv"), filtros={'setor': "QUÍMICA"})
+    controller.remover_bombona("FIS-001")
+    with pytest.raises(AssertionError):
+        controller.gerar_relatorio(arquivo=str(tmp_path / "r4.csv"), filtros={'setor': "FÍSICA"})
+
+
+def test_lista_informada_nao_usa_o_cache(cadastro, tmp_path):
+    controller = cadastro['bombonas']
+    bombonas = controller.listar_bombonas()[:2]
+
+    controller.gerar_relatorio(arquivo=str(tmp_path / "todas.csv"))
+    parcial = controller.gerar_relatorio(bombonas, arquivo=str(tmp_path / "parcial.csv"))
+
+    with open(parcial, encoding='utf-8') as arquivo:
+        assert sum(1 for linha in arquivo if linha.startswith(("FIS-", "QUI-", "BIO-"))) == 2
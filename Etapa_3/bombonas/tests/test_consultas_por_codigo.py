@@ -0,0 +1,83 @@
+"""
+Testes das consultas de bombonas por prefixo e por intervalo de códigos
+"""
+
+import pytest
+
+from controllers.bombona_controller import BombonaController
+from dao.bombona_dao import BombonaDAO
+from dao.bombona_dao_registro_fixo import BombonaDAORegistroFixo, importar_csv
+
+
+@pytest.fixture(params=['csv', 'registro_fixo'])
+def controller(request, cadastro):
+    """ Controller do cadastro com cada um dos DAOs de bombonas. """
+
+    if request.param == 'csv':
+        return cadastro['bombonas']
+    importar_csv("data/bombonas.csv", "data/bombonas.dat")
+    return BombonaController(BombonaDAORegistroFixo("data/bombonas.dat"))
+
+
+def _codigos(bombonas) -> list:
+    return [b.get_codigo() for b in bombonas]
+
+
+@pytest.mark.parametrize('prefixo, esperados', [
+    ("FIS", ["FIS-001", "FIS-002", "FIS-003"]),
+    ("fis-00", ["FIS-001", "FIS-002", "FIS-003"]),
+    ("fis002", ["FIS-002"]),
+    ("fis2", []),
+    ("Q", ["QUI-001", "QUI-002"]),
+    ("XYZ", []),
+])
+def test_busca_por_prefixo(controller, prefixo, esperados):
+    assert _codigos(controller.buscar_bombonas_por_prefixo(prefixo)) == esperados
+
+
+def test_prefixo_vazio_lista_todas(controller):
+    assert len(controller.buscar_bombonas_por_prefixo("  ")) == 6
+
+
+def test_busca_por_intervalo(controller, cadastro):
+    bombonas = controller.buscar_bombonas_por_intervalo("fis002", "QUI-001")
+
+    assert _codigos(bombonas) == ["FIS-002", "FIS-003", "QUI-001"]
+    assert bombonas[-1].get_responsavel().get_cpf() == cadastro['cpfs']['bruno']
+    assert _codigos(controller.buscar_bombonas_por_intervalo("QUI-001", "FIS-002")) == _codigos(bombonas)
+    assert controller.buscar_bombonas_por_intervalo("ABC-000", "ABC-999") == []
+
+
+def test_intervalo_com_codigo_invalido(controller):
+    assert controller.buscar_bombonas_por_intervalo("FIS", "QUI-001") == []
+
+
+def test_busca_por_codigo(controller, cadastro):
+    bombona = controller.buscar_bombona("qui002")
+
+    assert bombona.get_codigo() == "QUI-002"
+    assert bombona.get_volume() == 35.5
+    assert bombona.get_responsavel().get_cpf() == cadastro['cpfs']['bruno']
+    assert controller.buscar_bombona("ABC-000") is None
+    assert controller.buscar_bombona("FIS") is None
+
+
+def test_consultas_nao_carregam_o_arquivo_inteiro(cadastro, monkeypatch):
+    def falhar(self):
+        raise AssertionError("a consulta não deveria carregar todas as bombonas")
+
+    monkeypatch.setattr(BombonaDAO, '_carregar_bombonas', falhar)
+    monkeypatch.setattr(BombonaDAO, '_ler_registros', falhar)
+
+    controller = cadastro['bombonas']
+    assert _codigos(controller.buscar_bombonas_por_prefixo("QUI")) == ["QUI-001", "QUI-002"]
+    assert _codigos(controller.buscar_bombonas_por_intervalo("BIO-001", "FIS-001")) == ["BIO-001", "FIS-001"]
+    assert controller.buscar_bombona("FIS-003").get_codigo() == "FIS-003"
+
+
+def test_consultas_acompanham_as_gravacoes(cadastro):
+    controller = cadastro['bombonas']
+    controller.remover_bombona("FIS-002")
+    controller.cadastrar_bombona("FIS-010", 5, "QUÍMICO", cadastro['cpfs']['ana'])
+
+    assert _codigos(controller.buscar_bombonas_por_prefixo("FIS")) == ["FIS-001", "FIS-003", "FIS-010"]
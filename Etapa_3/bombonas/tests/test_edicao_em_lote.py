@@ -0,0 +1,78 @@
+"""
+Testes da edição e da exclusão de bombonas em lote
+"""
+
+import pytest
+
+from factory.bombona_factory import BombonaFactory
+
+
+def _por_codigo(controller) -> dict:
+    return {b.get_codigo(): b for b in controller.listar_bombonas()}
+
+
+def test_validacoes_publicas_da_factory():
+    assert BombonaFactory.validar_e_formatar_codigo(" fis001 ") == "FIS-001"
+    assert BombonaFactory.validar_volume("12.345") == 12.35
+    assert BombonaFactory.validar_e_formatar_tipo_residuo("químico") == "QUÍMICO"
+
+    with pytest.raises(ValueError):
+        BombonaFactory.validar_e_formatar_codigo("FI-0001")
+    with pytest.raises(ValueError):
+        BombonaFactory.validar_volume(0)
+    with pytest.raises(ValueError):
+        BombonaFactory.validar_e_formatar_tipo_residuo("RADIOATIVO")
+
+
+def test_edita_so_os_campos_informados(cadastro):
+    controller = cadastro['bombonas']
+
+    assert controller.editar_bombonas_em_lote(['fis001', 'FIS-002'], novo_volume=75) == 2
+
+    bombonas = _por_codigo(controller)
+    assert bombonas['FIS-001'].get_volume() == bombonas['FIS-002'].get_volume() == 75
+    assert bombonas['FIS-001'].get_tipo_residuo() == "QUÍMICO"
+    assert bombonas['FIS-003'].get_volume() == 20
+
+
+def test_edita_tipo_e_responsavel(cadastro):
+    controller, cpfs = cadastro['bombonas'], cadastro['cpfs']
+
+    controller.editar_bombonas_em_lote(['FIS-001', 'QUI-001'], novo_tipo_residuo="biológico",
+                                       cpf_responsavel=cpfs['carla'])
+
+    bombonas = _por_codigo(controller)
+    for codigo in ('FIS-001', 'QUI-001'):
+        assert bombonas[codigo].get_tipo_residuo() == "BIOLÓGICO"
+        assert bombonas[codigo].get_responsavel().get_cpf() == cpfs['carla']
+
+
+def test_edicao_sem_campos_ou_com_codigo_inexistente(cadastro):
+    controller = cadastro['bombonas']
+    antes = {c: b.get_volume() for c, b in _por_codigo(controller).items()}
+
+    with pytest.raises(ValueError, match="ao menos um campo"):
+        controller.editar_bombonas_em_lote(['FIS-001'])
+    with pytest.raises(ValueError, match="não encontradas"):
+        controller.editar_bombonas_em_lote(['FIS-001', 'ZZZ-999'], novo_volume=1)
+    with pytest.raises(ValueError, match="Volume"):
+        controller.editar_bombonas_em_lote(['FIS-001'], novo_volume=-5)
+
+    assert {c: b.get_volume() for c, b in _por_codigo(controller).items()} == antes
+
+
+def test_remove_em_lote(cadastro):
+    controller = cadastro['bombonas']
+
+    assert controller.remover_bombonas_em_lote(['fis-001', 'QUI002']) == 2
+
+    assert sorted(_por_codigo(controller)) == ['BIO-001', 'FIS-002', 'FIS-003', 'QUI-001']
+
+
+def test_remocao_com_codigo_inexistente_nao_remove_nada(cadastro):
+    controller = cadastro['bombonas']
+
+    with pytest.raises(ValueError, match="não encontradas"):
+        controller.remover_bombonas_em_lote(['FIS-001', 'ZZZ-999'])
+
+    assert len(controller.listar_bombonas()) == 6
@@ -0,0 +1,70 @@
+"""
+Testes do escritor de relatórios CSV (lotes e compressão)
+"""
+
+import csv
+import gzip
+
+import pytest
+
+import relatorios.escritor_csv as escritor_csv
+from relatorios.escritor_csv import EscritorCSV, compressao_do_arquivo
+
+LINHAS = [("FIS-001", 50.0, "QUÍMICO", "Ana, a \"primeira\""), ("QUI-002", 35.5, "BIOLÓGICO", "N/A")]
+
+
+def test_compressao_pela_extensao():
+    assert compressao_do_arquivo("relatorio.csv") is None
+    assert compressao_do_arquivo("relatorio.CSV.GZ") == 'gzip'
+    assert compressao_do_arquivo("relatorio.csv.zst") == 'zstd'
+    assert compressao_do_arquivo(None) is None
+
+
+@pytest.mark.parametrize("nome", ["relatorio.csv", "relatorio.csv.gz"])
+def test_grava_em_lotes_o_mesmo_conteudo_do_csv_writer(tmp_path, nome):
+    arquivo = tmp_path / nome
+    with EscritorCSV(str(arquivo)) as escritor:
+        escritor.escrever_linha(['Código', 'Volume'])
+        assert escritor.escrever_linhas(iter(LINHAS * 5), tamanho_lote=3) == 10
+        assert escritor.linhas_gravadas == 10
+
+    esperado = tmp_path / "esperado.csv"
+    with open(esperado, 'w', newline='', encoding='utf-8') as saida:
+        writer = csv.writer(saida)
+        writer.writerow(['Código', 'Volume'])
+        writer.writerows(LINHAS * 5)
+
+    abrir = gzip.open if nome.endswith('.gz') else open
+    with abrir(arquivo, 'rb') as gravado:
+        assert gravado.read() == esperado.read_bytes()
+
+
+def test_fechar_duas_vezes(tmp_path):
+    escritor = EscritorCSV(str(tmp_path / "r.csv.gz"))
+    escritor.escrever_linha(['a'])
+    escritor.fechar()
+    escritor.fechar()
+
+    with gzip.open(tmp_path / "r.csv.gz", 'rt', encoding='utf-8', newline='') as arquivo:
+        assert arquivo.read() == "a\r\n"
+
+
+def test_compressao_invalida_ou_indisponivel(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="gzip"):
+        EscritorCSV(str(tmp_path / "r.csv"), compressao='bz2')
+
+    monkeypatch.setattr(escritor_csv, 'zstandard', None)
+    with pytest.raises(ImportError, match="zstandard"):
+        EscritorCSV(str(tmp_path / "r.csv.zst"))
+
+
+def test_relatorio_do_controller_compactado(cadastro, tmp_path):
+    controller = cadastro['bombonas']
+    simples = controller.gerar_relatorio(arquivo=str(tmp_path / "bombonas.csv"), filtros_ativos=["Setor: todos"])
+    compactado = controller.gerar_relatorio(arquivo=str(tmp_path / "bombonas.csv.gz"), filtros_ativos=["Setor: todos"])
+
+    with open(simples, 'rb') as a, gzip.open(compactado, 'rb') as b:
+        conteudo = a.read()
+        assert conteudo == b.read()
+    assert "# Filtros aplicados: Setor: todos".encode('utf-8') in conteudo
+    assert conteudo.count(b"\r\n") == 3 + 1 + 6
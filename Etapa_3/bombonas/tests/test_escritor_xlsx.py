@@ -0,0 +1,145 @@
+"""
+Testes do escritor XLSX em fluxo e dos relatórios XLSX dos controllers
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import relatorios.escritor_xlsx as escritor_xlsx
+from dao.bombona_dao_registro_fixo import BombonaDAORegistroFixo, importar_csv
+from relatorios.escritor_xlsx import EscritorXLSX
+
+NS = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def ler_planilhas(arquivo) -> dict:
+    """ Nome da planilha -> linhas (listas de valores; números como float). """
+
+    with zipfile.ZipFile(arquivo) as pasta:
+        assert pasta.testzip() is None
+        nomes = [p.get('name') for p in ET.fromstring(pasta.read('xl/workbook.xml')).iter(f"{{{NS['x']}}}sheet")]
+        planilhas = {}
+        for numero, nome in enumerate(nomes, 1):
+            linhas = []
+            for linha in ET.fromstring(pasta.read(f'xl/worksheets/sheet{numero}.xml')).iter(f"{{{NS['x']}}}row"):
+                valores = []
+                for celula in linha.findall('x:c', NS):
+                    if celula.get('t') == 'inlineStr':
+                        valores.append(celula.find('x:is/x:t', NS).text)
+                    else:
+                        valores.append(float(celula.find('x:v', NS).text))
+                linhas.append(valores)
+            planilhas[nome] = linhas
+    return planilhas
+
+
+def test_planilhas_com_nomes_validos_e_textos_escapados(tmp_path):
+    arquivo = tmp_path / "pasta.xlsx"
+    with EscritorXLSX(str(arquivo)) as pasta:
+        pasta.nova_planilha('Dados: [1/2]', [('Nome', 20), ('Valor', 10)])
+        assert pasta.escrever_linhas([("<a & b>", 1.5), ("x\x01y", 2), ("", None)]) == 3
+        pasta.nova_planilha('dados: [1/2]', cabecalho=False)
+        pasta.escrever_linha(["Total", 3], negrito=True)
+
+    planilhas = ler_planilhas(arquivo)
+    assert list(planilhas) == ['Dados_ _1_2_', 'dados_ _1_2_ (2)']
+    assert planilhas['Dados_ _1_2_'] == [['Nome', 'Valor'], ["<a & b>", 1.5], ["xy", 2.0], []]
+    assert planilhas['dados_ _1_2_ (2)'] == [['Total', 3.0]]
+
+
+def test_continua_em_planilha_nova_ao_atingir_o_limite(tmp_path, monkeypatch):
+    monkeypatch.setattr(escritor_xlsx, 'LIMITE_LINHAS_PLANILHA', 4)
+    arquivo = tmp_path / "pasta.xlsx"
+    progresso = []
+
+    with EscritorXLSX(str(arquivo)) as pasta:
+        pasta.nova_planilha('Bombonas', [('Código', 12)])
+        gravadas = pasta.escrever_linhas(((f"FIS-{n:03d}",) for n in range(7)),
+                                         lambda feitas, total: progresso.append(feitas), 7, tamanho_lote=2)
+
+    planilhas = ler_planilhas(arquivo)
+    assert gravadas == 7
+    assert list(planilhas) == ['Bombonas', 'Bombonas (2)', 'Bombonas (3)']
+    assert [len(linhas) for linhas in planilhas.values()] == [4, 4, 2]
+    assert all(linhas[0] == ['Código'] for linhas in planilhas.values())
+    assert progresso[-1] == 7
+
+
+def test_escrever_sem_planilha_aberta(tmp_path):
+    with EscritorXLSX(str(tmp_path / "pasta.xlsx")) as pasta:
+        with pytest.raises(ValueError, match="nova_planilha"):
+            pasta.escrever_linha(["a"])
+
+    assert list(ler_planilhas(tmp_path / "pasta.xlsx")) == ['Planilha']
+
+
+@pytest.mark.parametrize("registro_fixo", [False, True])
+def test_iterar_registros(cadastro, registro_fixo):
+    dao = cadastro['bombonas']._bombona_dao
+    if registro_fixo:
+        importar_csv(dao.arquivo_csv, "data/bombonas.dat")
+        dao = BombonaDAORegistroFixo("data/bombonas.dat")
+
+    registros = list(dao.iterar_registros())
+
+    assert len(registros) == 6
+    assert ("QUI-002", 35.5, "QUÍMICO", cadastro['cpfs']['bruno']) in registros
+    assert sorted(registros) == sorted(
+        (b.get_codigo(), b.get_volume(), b.get_tipo_residuo(), b.get_responsavel().get_cpf())
+        for b in dao.listar_todas()
+    )
+
+
+def test_relatorio_de_bombonas_le_os_registros_do_dao(cadastro, tmp_path, monkeypatch):
+    controller = cadastro['bombonas']
+
+    def nao_usar(*args, **kwargs):
+        raise AssertionError("o XLSX não deve montar a lista de bombonas")
+
+    monkeypatch.setattr(controller, 'listar_bombonas', nao_usar)
+    monkeypatch.setattr(controller, 'filtrar_bombonas', nao_usar)
+    monkeypatch.setattr(controller._bombona_dao, 'listar_todas', nao_usar)
+    progresso = []
+
+    arquivo = controller.gerar_relatorio(
+        arquivo=str(tmp_path / "bombonas.xlsx"), formato="xlsx",
+        filtros={'setor': "FÍSICA", 'volume_min': 20, 'volume_max': 50}, filtros_ativos=["Setor: FÍSICA"],
+        progresso=lambda feitas, total: progresso.append((feitas, total))
+    )
+
+    planilhas = ler_planilhas(arquivo)
+    assert list(planilhas) == ['Bombonas', 'Responsáveis', 'Resumo']
+    assert sorted(linha[0] for linha in planilhas['Bombonas'][1:]) == ["FIS-001", "FIS-003"]
+    assert planilhas['Responsáveis'][1:] == [["Ana Costa", cadastro['cpfs']['ana'], "35999990001", "FÍSICA", 2.0]]
+
+    resumo = planilhas['Resumo']
+    assert ["Filtro: Setor: FÍSICA"] in resumo
+    assert ["BIOLÓGICO", 1.0, 20.0] in resumo and ["QUÍMICO", 1.0, 50.0] in resumo
+    assert ["Total de bombonas", 2.0, 70.0] in resumo
+    assert progresso[-1] == (6, 6)
+
+
+def test_relatorio_de_bombonas_da_lista_informada(cadastro, tmp_path):
+    controller = cadastro['bombonas']
+    bombonas = controller.buscar_bombonas_por_intervalo("QUI-001", "QUI-002")
+
+    planilhas = ler_planilhas(controller.gerar_relatorio(bombonas, str(tmp_path / "b.xlsx"), formato="xlsx"))
+
+    assert [linha[0] for linha in planilhas['Bombonas'][1:]] == ["QUI-001", "QUI-002"]
+    assert ["Total de bombonas", 2.0, 235.5] in planilhas['Resumo']
+
+
+def test_relatorio_de_responsaveis_usa_a_lista_informada(cadastro, tmp_path):
+    controller = cadastro['responsaveis']
+    responsaveis = [controller.buscar_responsavel(cadastro['cpfs'][nome]) for nome in ('bruno', 'carla')]
+
+    arquivo = controller.gerar_relatorio(responsaveis, str(tmp_path / "r.xlsx"), "xlsx")
+
+    planilhas = ler_planilhas(arquivo)
+    assert list(planilhas) == ['Responsáveis', 'Resumo']
+    assert [linha[0] for linha in planilhas['Responsáveis'][1:]] == ["Bruno Lima", "Carla Souza"]
+    assert planilhas['Responsáveis'][1][4] == 2.0
+    assert ["BIOLOGIA", 1.0, 1.0] in planilhas['Resumo']
+    assert ["Total", 2.0, 3.0] in planilhas['Resumo']
@@ -0,0 +1,115 @@
+"""
+Testes das etiquetas das bombonas (Code128 e disposição na folha A4)
+"""
+
+import re
+
+import pytest
+
+import controllers.bombona_controller as bombona_controller
+from conftest import ler_paginas_pdf
+from relatorios.etiquetas import (ALTURA_ETIQUETA, ETIQUETAS_POR_PAGINA, LARGURA_ETIQUETA, MARGEM_ESQUERDA_FOLHA,
+                                  MARGEM_ETIQUETA, MARGEM_SUPERIOR_FOLHA, FolhaEtiquetas, ModeloEtiqueta, code128)
+from relatorios.motor_pdf import ALTURA_PAGINA, LARGURA_PAGINA, PONTOS_POR_MM
+
+# "FIS-001" em Code128 B (conferido com a biblioteca python-barcode): 1 = barra, 0 = espaço
+MODULOS_FIS_001 = (
+    "1101001000010001100010110001000101101110100010011011100100111011001001110110010011100110100100110001100011101011"
+)
+
+
+def _modulos(larguras: list) -> str:
+    return ''.join(('1' if posicao % 2 == 0 else '0') * largura for posicao, largura in enumerate(larguras))
+
+
+def test_code128_vetor_conhecido():
+    larguras = code128("FIS-001")
+
+    assert _modulos(larguras) == MODULOS_FIS_001
+    assert len(MODULOS_FIS_001) == 112
+
+
+def test_code128_digito_verificador():
+    # (104 + 1*38 + 2*41 + 3*51 + 4*13 + 5*16 + 6*16 + 7*17) % 103 = 3 -> "121223"
+    larguras = code128("FIS-001")
+    assert larguras[6 * 8:6 * 9] == [1, 2, 1, 2, 2, 3]
+
+    # Início B, 3 caracteres, verificação e parada (13 módulos)
+    larguras = code128("ABC")
+    assert len(larguras) == 6 * 5 + 7
+    assert all(sum(larguras[i:i + 6]) == 11 for i in range(0, 6 * 5, 6))
+    assert _modulos(larguras).endswith("1100011101011")
+
+
+def test_code128_caractere_invalido():
+    with pytest.raises(ValueError, match="'Ç'"):
+        code128("AÇO-001")
+
+
+def _etiquetas(quantidade: int) -> list:
+    return [(f"FIS-{n:03d}", "QUÍMICO", "50 L", "Ana Costa - FÍSICA") for n in range(quantidade)]
+
+
+def test_folha_cabe_na_pagina_a4():
+    assert MARGEM_ESQUERDA_FOLHA >= 0 and MARGEM_SUPERIOR_FOLHA >= 0
+    assert MARGEM_ESQUERDA_FOLHA * 2 + 3 * LARGURA_ETIQUETA == pytest.approx(LARGURA_PAGINA)
+    assert MARGEM_SUPERIOR_FOLHA * 2 + 8 * ALTURA_ETIQUETA == pytest.approx(ALTURA_PAGINA)
+
+
+def test_disposicao_das_etiquetas_na_pagina(tmp_path):
+    progresso = []
+    with FolhaEtiquetas(str(tmp_path / "etiquetas.pdf"), lambda feitas, total: progresso.append(feitas),
+                        processos=1) as folha:
+        assert folha.escrever_etiquetas(iter(_etiquetas(ETIQUETAS_POR_PAGINA + 1)), ETIQUETAS_POR_PAGINA + 1) == 25
+
+    paginas = ler_paginas_pdf(tmp_path / "etiquetas.pdf")
+    assert len(paginas) == 2
+    assert progresso == [24, 25]
+
+    # Posição do código de cada etiqueta: 3 colunas de 70 mm e 8 linhas de 37 mm, por linha da folha
+    posicoes = [(float(x), float(y)) for x, y in re.findall(rb"/F2 16 Tf 1 0 0 1 ([\d.]+) ([\d.]+) Tm", paginas[0])]
+    assert len(posicoes) == 24
+    for numero, (x, y) in enumerate(posicoes):
+        linha, coluna = divmod(numero, 3)
+        x_mm = MARGEM_ESQUERDA_FOLHA + coluna * LARGURA_ETIQUETA + MARGEM_ETIQUETA
+        y_mm = MARGEM_SUPERIOR_FOLHA + linha * ALTURA_ETIQUETA + 10
+        assert x == pytest.approx(x_mm * PONTOS_POR_MM, abs=0.01)
+        assert y == pytest.approx((ALTURA_PAGINA - y_mm) * PONTOS_POR_MM, abs=0.01)
+    assert paginas[1].count(b"/F2 16 Tf") == 1
+
+
+def test_codigo_de_barras_dentro_da_etiqueta():
+    barras = ModeloEtiqueta()._barras("FIS-001")
+
+    retangulos = [tuple(map(float, r)) for r in re.findall(r"([\d.]+) 0 ([\d.]+) [\d.]+ re", barras)]
+    # Barras do Code128: 3 por símbolo e 4 na parada
+    assert len(retangulos) == 3 * 9 + 4
+    inicio = retangulos[0][0]
+    fim = retangulos[-1][0] + retangulos[-1][1]
+    assert inicio >= MARGEM_ETIQUETA * PONTOS_POR_MM
+    assert fim <= (LARGURA_ETIQUETA - MARGEM_ETIQUETA) * PONTOS_POR_MM
+    # Centralizado na largura útil
+    assert inicio - MARGEM_ETIQUETA * PONTOS_POR_MM == pytest.approx(
+        (LARGURA_ETIQUETA - MARGEM_ETIQUETA) * PONTOS_POR_MM - fim, abs=0.01)
+
+
+@pytest.mark.parametrize("avulsos", [50, 1])
+def test_etiquetas_por_codigo_usam_o_indice(cadastro, tmp_path, monkeypatch, avulsos):
+    monkeypatch.setattr(bombona_controller, 'MAX_CODIGOS_AVULSOS', avulsos)
+    controller = cadastro['bombonas']
+
+    def nao_usar(*args, **kwargs):
+        raise AssertionError("as etiquetas por código não devem listar todas as bombonas")
+
+    monkeypatch.setattr(controller, 'listar_bombonas', nao_usar)
+    monkeypatch.setattr(controller._bombona_dao, 'listar_todas', nao_usar)
+
+    arquivo = controller.gerar_etiquetas(["qui-002", "FIS-001", "BIO-001", "FIS-003"], arquivo=str(tmp_path / "e.pdf"))
+
+    conteudo = ler_paginas_pdf(arquivo)[0]
+    assert re.findall(rb"/F2 16 Tf 1 0 0 1 [\d.]+ [\d.]+ Tm \((\w+-\d+)\)", conteudo) == [
+        b"QUI-002", b"FIS-001", b"BIO-001", b"FIS-003"
+    ]
+
+    with pytest.raises(ValueError, match="FIS-009"):
+        controller.gerar_etiquetas(["FIS-001", "FIS-009"], arquivo=str(tmp_path / "e.pdf"))
@@ -0,0 +1,77 @@
+"""
+Testes da exportação colunar (Parquet e Arrow IPC)
+"""
+
+import pytest
+
+import relatorios.exportador_colunar as exportador_colunar
+from relatorios.exportador_colunar import ExportadorColunar, formato_do_arquivo
+
+COLUNAS = [('codigo', 'texto'), ('volume', 'decimal'), ('tipo', 'categoria'), ('setor', 'categoria')]
+LINHAS = [
+    ("FIS-001", 50.0, "QUÍMICO", "FÍSICA"),
+    ("FIS-002", 20.0, "BIOLÓGICO", None),
+    ("QUI-001", 35.5, "QUÍMICO", "QUÍMICA"),
+    ("BIO-001", 10.0, "PERFUROCORTANTE", "BIOLOGIA"),
+]
+
+
+def _ler(arquivo: str, formato: str):
+    pyarrow = pytest.importorskip('pyarrow')
+    if formato == 'parquet':
+        import pyarrow.parquet
+        return pyarrow.parquet.read_table(arquivo)
+    import pyarrow.ipc
+    with pyarrow.ipc.open_file(arquivo) as leitor:
+        return leitor.read_all()
+
+
+def test_formato_pela_extensao():
+    assert formato_do_arquivo("dados.PARQUET") == 'parquet'
+    assert formato_do_arquivo("dados.arrow") == 'arrow'
+    assert formato_do_arquivo("dados.csv") is None
+
+
+def test_sem_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(exportador_colunar, 'pyarrow', None)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        ExportadorColunar(str(tmp_path / "dados.parquet"), COLUNAS)
+
+
+@pytest.mark.parametrize("formato", ['parquet', 'arrow'])
+def test_grava_em_lotes_com_dicionarios_crescentes(tmp_path, formato):
+    pytest.importorskip('pyarrow')
+    arquivo = str(tmp_path / f"dados.{formato}")
+    progresso = []
+
+    # Lotes de 2 linhas: o segundo lote traz um tipo novo (delta do dicionário)
+    with ExportadorColunar(arquivo, COLUNAS, tamanho_lote=2) as exportador:
+        assert exportador.escrever_linhas(iter(LINHAS), lambda feitas, total: progresso.append(feitas), 4) == 4
+
+    tabela = _ler(arquivo, formato)
+    assert tabela.column_names == ['codigo', 'volume', 'tipo', 'setor']
+    assert tabela.to_pylist()[1] == {'codigo': "FIS-002", 'volume': 20.0, 'tipo': "BIOLÓGICO", 'setor': None}
+    assert [linha['tipo'] for linha in tabela.to_pylist()] == [linha[2] for linha in LINHAS]
+    assert str(tabela.schema.field('tipo').type).startswith('dictionary')
+    assert progresso == [2, 4]
+
+
+def test_formato_e_tipo_invalidos(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    with pytest.raises(ValueError, match="parquet"):
+        ExportadorColunar(str(tmp_path / "dados.csv"), COLUNAS)
+    with pytest.raises(ValueError, match="Tipos de coluna"):
+        ExportadorColunar(str(tmp_path / "dados.arrow"), [('data', 'data')])
+
+
+@pytest.mark.parametrize("formato", ['parquet', 'arrow'])
+def test_relatorio_do_controller(cadastro, tmp_path, formato):
+    pytest.importorskip('pyarrow')
+
+    arquivo = cadastro['bombonas'].gerar_relatorio(arquivo=str(tmp_path / f"bombonas.{formato}"), formato=formato)
+
+    linhas = _ler(arquivo, formato).to_pylist()
+    assert len(linhas) == 6
+    assert {linha['codigo'] for linha in linhas} >= {"FIS-001", "QUI-002", "BIO-001"}
@@ -0,0 +1,116 @@
+"""
+Testes do índice da busca incremental (prefixos, máscaras e atualizações)
+"""
+
+import random
+
+import pytest
+
+import dao.indice_busca as indice_busca
+from dao.indice_busca import IndiceBusca, extrair_termos
+
+TIPOS = ("QUÍMICO", "BIOLÓGICO")
+NOMES = ("Ana Costa", "Bruno Souza", "Carla Dias", "João Fábio")
+
+
+def _campos(numero: int, rng: random.Random) -> tuple:
+    codigo = f"{rng.choice('FQB')}{rng.choice('AIU')}{rng.choice('SOX')}-{numero % 1000:03d}"
+    return (codigo, rng.choice(TIPOS), rng.choice(NOMES), str(rng.randrange(10 ** 10, 10 ** 11)))
+
+
+def _referencia(registros: dict, consulta: str) -> list:
+    """ Busca por força bruta: todas as palavras devem ser prefixo de algum termo. """
+
+    palavras = extrair_termos(consulta)
+    resultado = []
+    for chave, campos in registros.items():
+        termos = [termo for campo in campos for termo in extrair_termos(campo)]
+        if all(any(termo.startswith(palavra) for termo in termos) for palavra in palavras):
+            resultado.append(chave)
+    return resultado
+
+
+CONSULTAS = ("", "f", "fa", "fis0", "q", "1", "12", "ana", "jo", "joao f", "quimico b", "b c", "xyz", "qui 9")
+
+
+@pytest.fixture(params=[False, True], ids=["sem_mascaras", "com_mascaras"])
+def mascaras(request, monkeypatch):
+    """ Executa o teste sem máscaras e com máscaras para todos os prefixos curtos. """
+
+    if request.param:
+        monkeypatch.setattr(indice_busca, 'MIN_TERMOS_MASCARA', 1)
+        monkeypatch.setattr(indice_busca, 'FRACAO_REGISTROS_MASCARA', 10 ** 9)
+    else:
+        monkeypatch.setattr(indice_busca, 'TAM_MAXIMO_PREFIXO_MASCARA', 0)
+    return request.param
+
+
+def test_extrair_termos_descarta_pontuacao_e_acentos():
+    assert extrair_termos("FIS-001  João") == ["fis001", "joao"]
+    assert extrair_termos("123.456.789-00") == ["12345678900"]
+
+
+def test_busca_por_prefixos_na_ordem_da_listagem(mascaras):
+    indice = IndiceBusca([
+        ("FIS-002", ("FIS-002", "QUÍMICO", "Ana Costa")),
+        ("BIO-001", ("BIO-001", "BIOLÓGICO", "Bruno Souza")),
+        ("FIS-001", ("FIS-001", "BIOLÓGICO", "Ana Souza")),
+    ])
+
+    assert bool(indice._mascaras) == mascaras
+    assert indice.buscar("") == ["FIS-002", "BIO-001", "FIS-001"]
+    assert indice.buscar("f") == ["FIS-002", "FIS-001"]
+    assert indice.buscar("souza BIO") == ["BIO-001", "FIS-001"]
+    assert indice.buscar("fis-001") == ["FIS-001"]
+    assert indice.buscar("quimico souza") == []
+
+
+def test_atualizacoes_equivalem_a_forca_bruta(mascaras):
+    rng = random.Random(34)
+    registros = {numero: _campos(numero, rng) for numero in range(300)}
+    indice = IndiceBusca(registros.items())
+
+    for passo in range(600):
+        operacao = rng.random()
+        chave = rng.randrange(400)
+        if operacao < 0.4:
+            registros[chave] = _campos(chave, rng)
+            indice.atualizar(chave, registros[chave])
+        elif operacao < 0.7:
+            registros.pop(chave, None)
+            indice.remover(chave)
+        else:
+            # Inclusão (ou reinclusão) vai para o final da listagem
+            registros.pop(chave, None)
+            registros[chave] = _campos(chave, rng)
+            indice.adicionar(chave, registros[chave])
+
+        if passo % 50 == 0:
+            for consulta in CONSULTAS:
+                assert indice.buscar(consulta) == _referencia(registros, consulta), consulta
+
+    assert len(indice) == len(registros)
+    for consulta in CONSULTAS:
+        assert indice.buscar(consulta) == _referencia(registros, consulta), consulta
+
+
+def test_compacta_posicoes_apos_muitas_remocoes(mascaras):
+    rng = random.Random(7)
+    registros = {numero: _campos(numero, rng) for numero in range(3000)}
+    indice = IndiceBusca(registros.items())
+
+    for chave in range(0, 3000, 3):
+        indice.atualizar(chave, registros[chave])
+    for chave in list(registros)[:2700]:
+        del registros[chave]
+        indice.remover(chave)
+
+    # As posições vagas foram descartadas e a ordem da listagem se manteve
+    assert len(indice._chaves_por_posicao) < 3000
+    for consulta in CONSULTAS:
+        assert indice.buscar(consulta) == _referencia(registros, consulta), consulta
+
+    indice.adicionar(5000, ("FAX-999", "QUÍMICO", "Zeca", "99999999999"))
+    registros[5000] = ("FAX-999", "QUÍMICO", "Zeca", "99999999999")
+    assert indice.buscar("fax")[-1] == 5000
+    assert indice.buscar("f") == _referencia(registros, "f")
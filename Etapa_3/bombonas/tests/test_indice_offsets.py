@@ -0,0 +1,123 @@
+"""
+Testes do índice chave -> posição dos arquivos CSV e dos seus arquivos auxiliares
+"""
+
+import os
+
+import pytest
+
+from dao import indice_offsets
+from dao.indice_offsets import IndiceOffsets, verificacao_conteudo
+
+LINHAS = [("QUI-001", "200.0"), ("FIS-002", "100.0"), ("FIS-001", "50.0"), ("BIO-001", "10.0")]
+
+
+def _gravar(arquivo: str, linhas) -> None:
+    with open(arquivo, 'w', encoding='utf-8', newline='') as saida:
+        saida.write("codigo,volume\n")
+        saida.writelines(f"{codigo},{volume}\n" for codigo, volume in linhas)
+
+
+def _regravar_mantendo_stat(arquivo: str, linhas) -> None:
+    """ Troca o conteúdo do CSV sem mudar tamanho nem mtime (ex.: cópia restaurada com 'cp -p'). """
+
+    info = os.stat(arquivo)
+    _gravar(arquivo, linhas)
+    assert os.path.getsize(arquivo) == info.st_size
+    os.utime(arquivo, ns=(info.st_atime_ns, info.st_mtime_ns))
+
+
+@pytest.fixture
+def arquivo_csv(tmp_path):
+    arquivo = str(tmp_path / "bombonas.csv")
+    _gravar(arquivo, LINHAS)
+    return arquivo
+
+
+def _proibir_reconstrucao(monkeypatch) -> None:
+    def falhar(self, assinatura):
+        raise AssertionError("o índice não deveria ser reconstruído")
+
+    monkeypatch.setattr(IndiceOffsets, '_reconstruir', falhar)
+
+
+def test_buscas(arquivo_csv):
+    indice = IndiceOffsets(arquivo_csv)
+
+    assert indice.chaves() == ["BIO-001", "FIS-001", "FIS-002", "QUI-001"]
+    assert indice.buscar("FIS-002") == ["FIS-002", "100.0"]
+    assert indice.buscar("FIS-003") is None
+    assert [linha[0] for linha in indice.buscar_prefixo("FIS")] == ["FIS-001", "FIS-002"]
+    assert [linha[0] for linha in indice.buscar_intervalo("B", "FIS-001")] == ["BIO-001", "FIS-001"]
+    assert [linha[0] for linha in indice.buscar_prefixo("", limite=2)] == ["BIO-001", "FIS-001"]
+
+
+def test_reaproveita_o_arquivo_de_indice(arquivo_csv, monkeypatch):
+    IndiceOffsets(arquivo_csv).chaves()
+
+    _proibir_reconstrucao(monkeypatch)
+    assert IndiceOffsets(arquivo_csv).buscar("QUI-001") == ["QUI-001", "200.0"]
+
+
+def test_conteudo_trocado_com_mesmo_stat_reconstroi(arquivo_csv):
+    IndiceOffsets(arquivo_csv).chaves()
+
+    # Mesmo tamanho e mtime, mas as linhas mudaram de posição e de chave
+    _regravar_mantendo_stat(arquivo_csv, [("BIO-001", "10.0"), ("FIS-001", "50.0"),
+                                          ("FIS-002", "100.0"), ("ZZZ-001", "200.0")])
+
+    indice = IndiceOffsets(arquivo_csv)
+    assert indice.chaves() == ["BIO-001", "FIS-001", "FIS-002", "ZZZ-001"]
+    assert indice.buscar("FIS-001") == ["FIS-001", "50.0"]
+
+
+def test_escrita_do_proprio_processo_com_mesmo_stat(arquivo_csv):
+    indice = IndiceOffsets(arquivo_csv)
+    assert indice.buscar("FIS-001") == ["FIS-001", "50.0"]
+
+    # Regravação no mesmo tique do mtime: só registrar_escrita avisa o índice
+    assinatura = indice.assinatura()
+    _regravar_mantendo_stat(arquivo_csv, [("FIS-001", "50.0"), ("QUI-001", "200.0"),
+                                          ("BIO-001", "10.0"), ("FIS-002", "100.0")])
+    indice.registrar_escrita(assinatura)
+
+    assert indice.buscar("FIS-001") == ["FIS-001", "50.0"]
+    assert indice.buscar("BIO-001") == ["BIO-001", "10.0"]
+
+
+def test_indice_corrompido_reconstroi(arquivo_csv):
+    indice = IndiceOffsets(arquivo_csv)
+    indice.chaves()
+    with open(indice.arquivo_indice, 'wb') as saida:
+        saida.write(b"lixo")
+
+    assert IndiceOffsets(arquivo_csv).buscar("BIO-001") == ["BIO-001", "10.0"]
+
+
+def test_verificacao_amostra_arquivos_grandes(arquivo_csv, monkeypatch):
+    monkeypatch.setattr(indice_offsets, 'TAM_BLOCO_VERIFICACAO', 16)
+    linhas = [(f"AAA-{i:03d}", "1.0") for i in range(200)]
+    _gravar(arquivo_csv, linhas)
+    original = verificacao_conteudo(arquivo_csv)
+
+    # Mudança no fim do arquivo (sempre amostrado) altera a verificação
+    _regravar_mantendo_stat(arquivo_csv, linhas[:-1] + [("AAA-999", "1.0")])
+    assert verificacao_conteudo(arquivo_csv) != original
+
+
+def test_filtro_de_bloom(arquivo_csv, monkeypatch):
+    IndiceOffsets(arquivo_csv).contem("FIS-001")
+
+    # Filtro válido em disco: a negativa é respondida sem montar o índice
+    _proibir_reconstrucao(monkeypatch)
+    monkeypatch.setattr(IndiceOffsets, '_carregar_arquivo_indice', lambda self, assinatura: False)
+    assert not IndiceOffsets(arquivo_csv).contem("ZZZ-999")
+
+
+def test_filtro_com_conteudo_trocado_e_refeito(arquivo_csv):
+    assert not IndiceOffsets(arquivo_csv).contem("ZZZ-001")
+
+    _regravar_mantendo_stat(arquivo_csv, [("BIO-001", "10.0"), ("FIS-001", "50.0"),
+                                          ("FIS-002", "100.0"), ("ZZZ-001", "200.0")])
+
+    assert IndiceOffsets(arquivo_csv).contem("ZZZ-001")
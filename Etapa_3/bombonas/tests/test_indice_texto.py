@@ -0,0 +1,163 @@
+"""
+Testes da busca global (índice de texto completo, diário e controller)
+"""
+
+import gc
+
+import pytest
+
+from dao import eventos
+from dao.eventos import Alteracao
+from dao.indice_texto import IndiceTexto, chave_documento, termos_registro
+
+
+def _indice(arquivo=None) -> IndiceTexto:
+    indice = IndiceTexto(arquivo)
+    indice.reconstruir({'bombonas': (1,)}, [
+        ("b:FIS-001", ("FIS-001", 50.0, "QUÍMICO", "11122233344")),
+        ("b:FIS-010", ("FIS-010", 20.0, "BIOLÓGICO", "11122233344")),
+        ("b:QUI-001", ("QUI-001", 35.5, "QUÍMICO", "55566677788")),
+        ("r:55566677788", ("55566677788", "Bruno Lima", "35998765432", "QUÍMICA")),
+    ])
+    return indice
+
+
+def _chaves(indice, consulta):
+    return [chave for chave, _ in indice.buscar(consulta)]
+
+
+def test_termos_do_registro():
+    assert termos_registro(("FIS-001", 50.0, "Químico")) == {"fis001", "50", "quimico"}
+    assert termos_registro(("QUI-002", 35.5, "")) == {"qui002", "355"}
+
+
+def test_igual_vale_mais_que_prefixo_e_trecho():
+    indice = _indice()
+
+    assert _chaves(indice, "fis001")[0] == "b:FIS-001"
+    assert set(_chaves(indice, "fis0")) == {"b:FIS-001", "b:FIS-010"}
+    # Trecho no meio do telefone, digitado com pontuação
+    assert _chaves(indice, "9876-54") == ["r:55566677788"]
+    # Trechos curtos demais não são procurados no meio dos termos
+    assert _chaves(indice, "is") == []
+
+    pontos = dict(indice.buscar("quimic"))
+    assert pontos["b:FIS-001"] == pontos["b:QUI-001"] > 0
+
+
+def test_todas_as_palavras_sao_exigidas():
+    indice = _indice()
+
+    assert _chaves(indice, "quimico 111") == ["b:FIS-001"]
+    assert _chaves(indice, "quimico inexistente") == []
+    assert _chaves(indice, "  ") == []
+    assert len(indice.buscar("fis", limite=1)) == 1
+
+
+def test_adicionar_e_remover_mantem_os_termos():
+    indice = _indice()
+
+    indice.adicionar("b:FIS-001", ("FIS-001", 75.0, "BIOLÓGICO", "99999999999"))
+    assert _chaves(indice, "75") == ["b:FIS-001"]
+    assert "b:FIS-001" not in _chaves(indice, "111")
+
+    indice.remover("b:FIS-010")
+    indice.remover("b:FIS-010")
+    assert _chaves(indice, "111") == []
+    assert _chaves(indice, "biologico") == ["b:FIS-001"]
+    assert len(indice) == 3
+
+
+def test_aplica_somente_a_alteracao_seguinte():
+    indice = _indice()
+    alteracao = Alteracao('bombonas', (("BIO-001", 10.0, "BIOLÓGICO", ""),), (), ("FIS-010",), (1,), (2,))
+
+    assert not indice.aplicar(alteracao._replace(versao_anterior=(0,)))
+    assert indice.aplicar(alteracao)
+    assert indice.versoes['bombonas'] == (2,)
+    assert _chaves(indice, "bio001") == [chave_documento('bombonas', "BIO-001")]
+    assert indice.registro(chave_documento('bombonas', "FIS-010")) is None
+
+
+def test_grava_carrega_e_reaplica_o_diario(tmp_path):
+    arquivo = str(tmp_path / "busca.idx")
+    indice = _indice(arquivo)
+    indice.salvar()
+
+    indice.registrar_alteracao(Alteracao('bombonas', (("BIO-001", 10.0, "BIOLÓGICO", ""),), (), (), (1,), (2,)))
+    # Alteração que não continua a versão: fica no diário, mas é ignorada na carga
+    indice.registrar_alteracao(Alteracao('bombonas', (("BIO-002", 1.0, "QUÍMICO", ""),), (), (), (7,), (8,)))
+
+    carregado = IndiceTexto(arquivo)
+    assert carregado.carregar()
+    assert carregado.versoes == {'bombonas': (2,)}
+    assert _chaves(carregado, "bio001") == ["bombonas:BIO-001"]
+    assert _chaves(carregado, "bio002") == []
+    assert _chaves(carregado, "9876") == ["r:55566677788"]
+
+    assert not IndiceTexto(str(tmp_path / "outro.idx")).carregar()
+
+
+def test_diario_longo_regrava_o_indice(tmp_path, monkeypatch):
+    import dao.indice_texto as indice_texto
+    monkeypatch.setattr(indice_texto, 'MAX_ENTRADAS_DIARIO', 3)
+    arquivo = tmp_path / "busca.idx"
+    indice = _indice(str(arquivo))
+    indice.salvar()
+
+    for versao in range(1, 4):
+        registro = (f"BIO-00{versao}", 1.0, "QUÍMICO", "")
+        indice.registrar_alteracao(Alteracao('bombonas', (registro,), (), (), (versao,), (versao + 1,)))
+
+    assert not (tmp_path / "busca.idx.log").exists()
+    carregado = IndiceTexto(str(arquivo))
+    assert carregado.carregar() and carregado.versoes == {'bombonas': (4,)}
+
+
+@pytest.fixture
+def busca(cadastro):
+    from controllers.busca_controller import BuscaController
+
+    return BuscaController()
+
+
+def test_controller_busca_em_todos_os_campos(cadastro, busca):
+    resultados = busca.buscar("99990002")
+    assert [r.get_nome() for r in resultados] == ["Bruno Lima"]
+
+    bombonas = busca.buscar("qui002")
+    assert [b.get_codigo() for b in bombonas] == ["QUI-002"]
+    assert bombonas[0].get_volume() == 35.5
+    assert bombonas[0].get_responsavel().get_cpf() == cadastro['cpfs']['bruno']
+
+
+def test_controller_acompanha_as_gravacoes_sem_reconstruir(cadastro, busca, monkeypatch):
+    busca.buscar("fis")
+
+    def falhar(*_):
+        raise AssertionError("o índice não deveria ser reconstruído")
+
+    monkeypatch.setattr(busca, '_reconstruir_indice', falhar)
+    cadastro['bombonas'].cadastrar_bombona("BIO-002", 5, "BIOLÓGICO", cadastro['cpfs']['carla'])
+    cadastro['bombonas'].remover_bombona("FIS-001")
+
+    assert [b.get_codigo() for b in busca.buscar("bio002")] == ["BIO-002"]
+    assert busca.buscar("fis001") == []
+
+
+def test_controller_descartado_sai_dos_inscritos(cadastro, tmp_path):
+    from controllers.busca_controller import BuscaController
+
+    gc.collect()
+    eventos.publicar(eventos.BOMBONAS, (0, 0), (1, 1))
+    inscritos = len(eventos._inscritos)
+    controller = BuscaController(arquivo_indice=str(tmp_path / "busca.idx"))
+    controller.buscar("fis")
+    assert len(eventos._inscritos) == inscritos + 1
+
+    del controller
+    gc.collect()
+    cadastro['bombonas'].cadastrar_bombona("BIO-002", 5, "BIOLÓGICO", cadastro['cpfs']['carla'])
+
+    assert len(eventos._inscritos) == inscritos
+    assert not (tmp_path / "busca.idx.log").exists()
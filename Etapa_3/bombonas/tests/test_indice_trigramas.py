@@ -0,0 +1,63 @@
+"""
+Testes da busca aproximada de responsáveis pelo nome (trigramas)
+"""
+
+from conftest import gerar_cpf
+from dao.indice_trigramas import IndiceTrigramas, extrair_trigramas
+
+
+def test_trigramas_sem_acentos_e_com_inicio_de_palavra():
+    assert extrair_trigramas("João") == {'  j', ' jo', 'joa', 'oao', 'ao '}
+    assert extrair_trigramas("JOAO") == extrair_trigramas("joão")
+    assert extrair_trigramas("  ") == frozenset()
+
+
+def test_ordena_por_similaridade_e_tolera_erros():
+    indice = IndiceTrigramas([
+        (1, "João da Silva Pereira"),
+        (2, "Joana Silveira"),
+        (3, "Maria Souza"),
+        (4, "João Silva"),
+    ])
+
+    chaves = [chave for chave, _ in indice.buscar("joao silva")]
+    # Empate na fração da consulta: o nome de tamanho mais próximo vem primeiro
+    assert chaves[:2] == [4, 1]
+    assert 3 not in chaves
+
+    assert indice.buscar("joao silvz")[0][0] == 4
+    assert indice.buscar("maira souza")[0][0] == 3
+    assert indice.buscar("") == []
+
+
+def test_limite_e_similaridade_minima():
+    indice = IndiceTrigramas((numero, f"Ana Costa {numero}") for numero in range(30))
+
+    assert len(indice.buscar("ana costa", limite=5)) == 5
+    assert all(similaridade == 1.0 for _, similaridade in indice.buscar("ana costa"))
+    assert indice.buscar("bruno", similaridade_minima=0.5) == []
+
+
+def test_adicionar_substitui_e_remover_descarta():
+    indice = IndiceTrigramas([(1, "Ana Costa")])
+
+    indice.adicionar(1, "Bruno Lima")
+    assert indice.buscar("ana costa") == []
+    assert indice.buscar("bruno")[0][0] == 1
+
+    indice.remover(1)
+    indice.remover(1)
+    assert len(indice) == 0
+    assert indice.buscar("bruno") == []
+
+
+def test_controller_remonta_o_indice_quando_os_dados_mudam(cadastro):
+    controller = cadastro['responsaveis']
+
+    assert [r.get_cpf() for r in controller.buscar_responsaveis_por_nome("carla sousa")] == [cadastro['cpfs']['carla']]
+
+    cpf = gerar_cpf(444555666)
+    controller.cadastrar_responsavel(cpf, "Cárla Mendes", "35999990004", "FÍSICA")
+
+    encontrados = [r.get_cpf() for r in controller.buscar_responsaveis_por_nome("carla mendes")]
+    assert encontrados[0] == cpf
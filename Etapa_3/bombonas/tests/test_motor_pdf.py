@@ -0,0 +1,85 @@
+"""
+Testes do motor de PDF em fluxo (texto, tabelas e arquivo gerado)
+"""
+
+import math
+
+import pytest
+
+from conftest import ler_paginas_pdf
+from relatorios.motor_pdf import LARGURAS, ModeloTabela, MotorPDF, ajustar_texto, codificar, largura_texto
+
+COLUNAS = [("Código", 30, 'C'), ("Nome", 60, 'L'), ("Volume", 30, 'R')]
+
+
+def test_codificar_mantem_acentos_do_portugues():
+    assert codificar("Químico à Pressão") == "Químico à Pressão".encode('cp1252')
+    assert codificar("linha\nquebrada") == b"linha quebrada"
+    # Fora do WinAnsi: perde o acento ou vira '?'
+    assert codificar("Ŝ漢") == b"S?"
+
+
+def test_ajustar_texto_corta_com_reticencias():
+    curto = ajustar_texto("FIS-001", '', 9, 30)
+    assert curto == b"FIS-001"
+
+    longo = ajustar_texto("Nome muito comprido " * 5, '', 9, 30)
+    assert longo.endswith(b"...")
+    assert largura_texto(longo, '', 9) <= 30
+    assert set(LARGURAS) >= {'', 'B', 'I'}
+
+
+def test_tabela_repete_o_cabecalho_e_grava_todas_as_paginas(tmp_path):
+    modelo = ModeloTabela(COLUNAS)
+    quantidade = modelo.linhas_por_pagina * 2 + 5
+    progresso = []
+    arquivo = str(tmp_path / "tabela.pdf")
+
+    with MotorPDF(arquivo, lambda feitas, total: progresso.append((feitas, total)), processos=1) as pdf:
+        pdf.texto("RELATÓRIO", 'B', 16, 10, 'C')
+        linhas = ((f"FIS-{n:03d}", f"Responsável {n}", f"{n}.0") for n in range(quantidade))
+        assert pdf.tabela(modelo, linhas, quantidade) == quantidade
+        pdf.texto("Rodapé", 'I', 8, 6)
+
+    paginas = ler_paginas_pdf(arquivo)
+    # O título ocupa parte da primeira página: as 5 linhas a mais e as deslocadas vão para a terceira
+    assert len(paginas) == math.ceil(quantidade / modelo.linhas_por_pagina) == 3
+    assert all(b"(C\xf3digo)" in pagina for pagina in paginas)
+
+    conteudo = b"".join(paginas)
+    assert all(b"(FIS-%03d)" % n in conteudo for n in range(quantidade))
+    assert "(Responsável 0)".encode('cp1252') in paginas[0]
+    assert b"(Rodap\xe9)" in paginas[-1]
+    assert progresso[-1] == (quantidade, quantidade)
+    assert [feitas for feitas, _ in progresso] == sorted(feitas for feitas, _ in progresso)
+
+
+def test_textos_com_parenteses_sao_escapados(tmp_path):
+    arquivo = str(tmp_path / "escape.pdf")
+    with MotorPDF(arquivo, processos=1) as pdf:
+        pdf.tabela(ModeloTabela(COLUNAS), [("A(1)", "barra \\", 1)])
+
+    assert b"(A\\(1\\))" in ler_paginas_pdf(arquivo)[0]
+
+
+def test_erro_durante_a_geracao_nao_finaliza_o_arquivo(tmp_path):
+    arquivo = tmp_path / "erro.pdf"
+
+    def linhas():
+        yield ("FIS-001", "Ana", 1)
+        raise RuntimeError("falha na leitura")
+
+    with pytest.raises(RuntimeError):
+        with MotorPDF(str(arquivo), processos=1) as pdf:
+            pdf.tabela(ModeloTabela(COLUNAS), linhas())
+
+    assert not arquivo.read_bytes().endswith(b"%%EOF\n")
+
+
+def test_relatorio_pdf_do_controller(cadastro, tmp_path):
+    arquivo = cadastro['bombonas'].gerar_relatorio(arquivo=str(tmp_path / "bombonas.pdf"), formato="pdf")
+
+    conteudo = b"".join(ler_paginas_pdf(arquivo))
+    assert "RELATÓRIO COMPLETO DE BOMBONAS".encode('cp1252') in conteudo
+    assert b"(Total de bombonas: 6)" in conteudo
+    assert b"(QUI-002)" in conteudo
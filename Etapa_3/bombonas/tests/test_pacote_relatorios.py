@@ -0,0 +1,89 @@
+"""
+Testes do pacote com vários relatórios (zip ou pasta)
+"""
+
+import os
+import time
+import zipfile
+
+import pytest
+
+from controllers.bombona_controller import BombonaController
+from relatorios.pacote_relatorios import ARQUIVOS_PACOTE, PACOTE_PADRAO, PacoteRelatorios
+
+
+def test_gera_zip_com_os_relatorios_escolhidos(cadastro, tmp_path):
+    pacote = PacoteRelatorios(cadastro['bombonas'], cadastro['responsaveis'])
+    destino = str(tmp_path / "pacote.zip")
+
+    assert pacote.gerar(destino) == destino
+
+    with zipfile.ZipFile(destino) as arquivo:
+        nomes = arquivo.namelist()
+        assert nomes == sorted(['relatorio_bombonas.csv', 'relatorio_bombonas.pdf', 'relatorio_responsaveis.pdf'])
+        assert arquivo.getinfo('relatorio_bombonas.pdf').compress_type == zipfile.ZIP_STORED
+        assert arquivo.getinfo('relatorio_bombonas.csv').compress_type == zipfile.ZIP_DEFLATED
+        assert b"QUI-002" in arquivo.read('relatorio_bombonas.csv')
+        assert arquivo.read('relatorio_bombonas.pdf').startswith(b"%PDF-")
+
+    assert pacote.concluido and pacote.erro is None
+    assert pacote.progresso() == (6 + 6 + 3, 6 + 6 + 3)
+
+
+def test_gera_pasta_e_consulta_os_dados_uma_vez(cadastro, tmp_path, monkeypatch):
+    consultas = []
+    original = BombonaController.listar_bombonas
+    monkeypatch.setattr(BombonaController, 'listar_bombonas', lambda self: consultas.append(1) or original(self))
+
+    destino = tmp_path / "pacote"
+    PacoteRelatorios(cadastro['bombonas'], cadastro['responsaveis']).gerar(str(destino), list(ARQUIVOS_PACOTE),
+                                                                         processos=2)
+
+    assert sorted(os.listdir(destino)) == sorted(ARQUIVOS_PACOTE.values())
+    assert len(consultas) == 1
+    with open(destino / "relatorio_responsaveis.csv", encoding='utf-8') as arquivo:
+        assert "Ana Costa" in arquivo.read()
+
+
+def test_relatorio_nao_suportado(cadastro, tmp_path):
+    pacote = PacoteRelatorios(cadastro['bombonas'], cadastro['responsaveis'])
+
+    with pytest.raises(ValueError, match="não suportado"):
+        pacote.gerar(str(tmp_path / "pacote.zip"), [('bombonas', 'docx')])
+
+    assert pacote.concluido
+    assert isinstance(pacote.erro, ValueError)
+    assert not (tmp_path / "pacote.zip").exists()
+
+
+class ControllerLento:
+    """ Controller falso: cada relatório demora e grava o processo que o gerou. """
+
+    def __init__(self, bombona_dao=None):
+        self._bombona_dao = bombona_dao
+
+    def listar_bombonas(self):
+        return []
+
+    def listar_responsaveis(self):
+        return []
+
+    def gerar_relatorio(self, arquivo, formato, progresso, **dados):
+        progresso(1, 2)
+        time.sleep(0.5)
+        with open(arquivo, 'w', encoding='utf-8') as saida:
+            saida.write(str(os.getpid()))
+        return arquivo
+
+
+def test_cada_relatorio_em_um_processo(tmp_path):
+    destino = tmp_path / "pacote"
+    pacote = PacoteRelatorios(ControllerLento(), ControllerLento())
+
+    pacote.gerar(str(destino), PACOTE_PADRAO)
+
+    processos = {(destino / nome).read_text(encoding='utf-8') for nome in os.listdir(destino)}
+    assert len(processos) == len(PACOTE_PADRAO)
+    assert str(os.getpid()) not in processos
+    # O total (2 linhas por relatório) só é conhecido pelo andamento enviado pelos processos
+    assert pacote.progresso() == (2 * len(PACOTE_PADRAO), 2 * len(PACOTE_PADRAO))
@@ -0,0 +1,61 @@
+"""
+Testes do desenho das páginas de tabelas grandes em processos paralelos
+"""
+
+from itertools import accumulate
+
+import pytest
+
+import relatorios.motor_pdf as motor_pdf
+from conftest import ler_paginas_pdf
+from relatorios.motor_pdf import ModeloTabela, MotorPDF, desenhar_paginas
+
+COLUNAS = [("Código", 30, 'C'), ("Tipo", 40, 'L'), ("Volume", 30, 'R')]
+
+
+def _gerar(arquivo: str, quantidade: int, processos: int) -> list:
+    progresso = []
+    with MotorPDF(arquivo, lambda feitas, total: progresso.append(feitas), processos=processos) as pdf:
+        pdf.texto("RELATÓRIO", 'B', 16, 10, 'C')
+        linhas = ((f"FIS-{n:03d}", "QUÍMICO" if n % 2 else "BIOLÓGICO", f"{n}.0") for n in range(quantidade))
+        assert pdf.tabela(ModeloTabela(COLUNAS), linhas, quantidade) == quantidade
+        pdf.texto("Rodapé", 'I', 8, 6)
+    return progresso
+
+
+@pytest.mark.parametrize("sobra", [0, 1, 7])
+def test_paralelo_gera_as_mesmas_paginas(tmp_path, monkeypatch, sobra):
+    monkeypatch.setattr(motor_pdf, 'LIMITE_LINHAS_PARALELO', 10)
+    monkeypatch.setattr(motor_pdf, 'PAGINAS_POR_TAREFA', 2)
+    # Várias tarefas completas e uma última página com 'sobra' linhas a mais
+    quantidade = ModeloTabela(COLUNAS).linhas_por_pagina * 7 + sobra
+
+    _gerar(str(tmp_path / "sequencial.pdf"), quantidade, processos=1)
+
+    chamadas = []
+    original = MotorPDF._desenhar_em_paralelo
+
+    def contar(self, *args):
+        chamadas.append(args)
+        return original(self, *args)
+
+    monkeypatch.setattr(MotorPDF, '_desenhar_em_paralelo', contar)
+    progresso = _gerar(str(tmp_path / "paralelo.pdf"), quantidade, processos=2)
+    assert len(chamadas) == 1
+
+    assert ler_paginas_pdf(tmp_path / "paralelo.pdf") == ler_paginas_pdf(tmp_path / "sequencial.pdf")
+    assert progresso[-1] == quantidade
+    assert progresso == sorted(progresso)
+    # O progresso conta também as linhas da primeira página (gravada antes dos processos)
+    linhas_por_pagina = [pagina.count(b"(FIS-") for pagina in ler_paginas_pdf(tmp_path / "paralelo.pdf")]
+    assert sum(linhas_por_pagina) == quantidade
+    assert set(progresso) <= set(accumulate(linhas_por_pagina))
+
+
+def test_desenhar_paginas_divide_em_paginas_completas():
+    modelo = ModeloTabela(COLUNAS)
+    linhas = [(f"FIS-{n:03d}", "QUÍMICO", n) for n in range(modelo.linhas_por_pagina * 2)]
+
+    paginas = desenhar_paginas(modelo.parametros(), linhas)
+
+    assert len(paginas) == 2
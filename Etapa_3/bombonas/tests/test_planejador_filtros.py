@@ -0,0 +1,98 @@
+"""
+Testes do planejador de filtros combinados
+"""
+
+import itertools
+import random
+
+from dao.planejador_filtros import PlanejadorFiltros
+from models.bombona import Bombona
+from models.responsavel import Responsavel
+
+SETORES = ("FÍSICA", "QUÍMICA", "BIOLOGIA")
+TIPOS = ("QUÍMICO", "BIOLÓGICO")
+
+
+def _bombonas(quantidade: int = 500):
+    rng = random.Random(38)
+    responsaveis = [Responsavel(f"{n:011d}", f"R{n}", "", SETORES[n % 3]) for n in range(20)]
+    return [
+        Bombona(f"FIS-{n:03d}", rng.choice((5, 10, 20, 50, 100, 200)), rng.choice(TIPOS),
+                rng.choice(responsaveis))
+        for n in range(quantidade)
+    ]
+
+
+def _forca_bruta(bombonas, setor=None, cpf=None, tipo_residuo=None, volume_min=None, volume_max=None):
+    return [
+        b for b in bombonas
+        if (setor is None or b.get_responsavel().get_setor() == setor)
+        and (cpf is None or b.get_responsavel().get_cpf() == cpf)
+        and (tipo_residuo is None or b.get_tipo_residuo() == tipo_residuo)
+        and (volume_min is None or b.get_volume() >= volume_min)
+        and (volume_max is None or b.get_volume() <= volume_max)
+    ]
+
+
+def test_resultado_igual_ao_da_varredura_simples():
+    bombonas = _bombonas()
+    planejador = PlanejadorFiltros(bombonas)
+
+    for setor, cpf, tipo, faixa in itertools.product(
+        (None, "QUÍMICA", "OUTRO"), (None, f"{4:011d}"), (None, "BIOLÓGICO"),
+        ((None, None), (10, 50), (None, 5), (300, None), (50, 10))
+    ):
+        filtros = dict(setor=setor, cpf=cpf, tipo_residuo=tipo, volume_min=faixa[0], volume_max=faixa[1])
+        assert planejador.filtrar(**filtros) == _forca_bruta(bombonas, **filtros), filtros
+
+
+def test_parte_do_filtro_mais_seletivo():
+    planejador = PlanejadorFiltros(_bombonas())
+
+    plano = planejador.planejar(setor="QUÍMICA", cpf=f"{4:011d}", tipo_residuo="QUÍMICO")
+    assert plano[0].operacao == 'indice'
+    assert plano[0].predicado.descricao == f"cpf = {4:011d}"
+    assert [passo.operacao for passo in plano[1:]] == ['verificacao', 'verificacao']
+    assert sum(passo.custo for passo in plano) < planejador.total()
+
+    assert planejador.planejar(volume_min=300)[0].estimativa == 0
+
+
+def test_filtros_amplos_viram_varredura():
+    planejador = PlanejadorFiltros(_bombonas())
+
+    assert [p.operacao for p in planejador.planejar()] == ['varredura']
+    # Mais da metade das bombonas pelo tipo, todas verificadas de novo: custa mais que a varredura
+    plano = planejador.planejar(tipo_residuo="BIOLÓGICO", volume_min=5)
+    assert {passo.operacao for passo in plano} == {'varredura'}
+
+    texto = planejador.explicar(tipo_residuo="BIOLÓGICO", volume_min=5)
+    assert "varredura de 500 bombonas" in texto
+
+
+def test_estatisticas_e_explicacao():
+    planejador = PlanejadorFiltros(_bombonas())
+
+    assert sum(planejador.estatisticas('setor').values()) == 500
+    assert set(planejador.estatisticas('tipo_residuo')) == set(TIPOS)
+
+    texto = planejador.explicar(cpf=f"{4:011d}", tipo_residuo="QUÍMICO")
+    assert texto.splitlines()[1].startswith(f"  1. índice cpf = {4:011d}")
+    assert "custo total" in texto
+
+
+def test_controller_filtra_e_acompanha_as_alteracoes(cadastro):
+    controller, cpfs = cadastro['bombonas'], cadastro['cpfs']
+
+    assert [b.get_codigo() for b in controller.filtrar_bombonas(setor="FÍSICA", tipo_residuo="QUÍMICO")] == [
+        'FIS-001', 'FIS-002']
+    assert [b.get_codigo() for b in controller.filtrar_bombonas(volume_min=35.5, volume_max=100)] == [
+        'FIS-001', 'FIS-002', 'QUI-002']
+    assert controller.filtrar_bombonas(cpf=cpfs['carla'], tipo_residuo="QUÍMICO") == []
+    assert "Plano de filtragem (6 bombonas)" in controller.explicar_filtros(setor="FÍSICA")
+
+    controller.cadastrar_bombona("FIS-004", 60, "QUÍMICO", cpfs['ana'])
+    controller.transferir_bombonas(cpfs['bruno'], cpfs['ana'], ['QUI-002'])
+
+    assert [b.get_codigo() for b in controller.filtrar_bombonas(setor="FÍSICA", tipo_residuo="QUÍMICO")] == [
+        'FIS-001', 'FIS-002', 'QUI-002', 'FIS-004']
@@ -0,0 +1,113 @@
+"""
+Testes do relatório HTML paginado (páginas, índice de busca e republicação)
+"""
+
+import json
+import os
+
+import pytest
+
+from relatorios.publicador_html import ARQUIVO_INDICE, ARQUIVO_MANIFESTO, PublicadorHTML
+
+COLUNAS = ['Código', 'Tipo', 'Setor']
+
+
+def _linhas(quantidade: int, tipo_alterado: int = None) -> list:
+    return [
+        (f"FIS-{n:03d}", "PERFUROCORTANTE" if n == tipo_alterado else ("QUÍMICO" if n % 2 else "BIOLÓGICO"),
+         "FÍSICA" if n < 5 else None)
+        for n in range(quantidade)
+    ]
+
+
+def _publicar(tmp_path, linhas: list) -> PublicadorHTML:
+    publicador = PublicadorHTML(str(tmp_path / "relatorio.html"), "Relatório <teste>", COLUNAS,
+                                ['Tipo', 'Setor'], linhas_por_pagina=3, informacoes=["Filtro: todos"])
+    publicador.publicar(iter(linhas), total=len(linhas))
+    return publicador
+
+
+def _indice(tmp_path, nome: str = "relatorio") -> dict:
+    with open(tmp_path / f"{nome}_arquivos" / ARQUIVO_INDICE, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def test_paginas_e_indice_de_busca(tmp_path):
+    progresso = []
+    publicador = PublicadorHTML(str(tmp_path / "relatorio.html"), "Relatório <teste>", COLUNAS,
+                                ['Tipo', 'Setor'], linhas_por_pagina=3)
+    publicador.publicar(iter(_linhas(7)), lambda feitas, total: progresso.append((feitas, total)), 7)
+
+    assert sorted(os.listdir(tmp_path / "relatorio_arquivos")) == [
+        ARQUIVO_INDICE, ARQUIVO_MANIFESTO, "pagina_00001.html", "pagina_00002.html", "pagina_00003.html"
+    ]
+    assert progresso == [(3, 7), (6, 7), (7, 7)]
+
+    indice = _indice(tmp_path)
+    assert [(p['linhas'], p['primeira'], p['ultima']) for p in indice['paginas']] == [
+        (3, "FIS-000", "FIS-002"), (3, "FIS-003", "FIS-005"), (1, "FIS-006", "FIS-006")
+    ]
+    assert indice['termos']['Tipo'] == {"BIOLÓGICO": [1, 2, 3], "QUÍMICO": [1, 2]}
+    # Valores vazios não entram no índice
+    assert indice['termos']['Setor'] == {"FÍSICA": [1, 2]}
+
+    primeira = (tmp_path / "relatorio_arquivos" / "pagina_00001.html").read_text(encoding='utf-8')
+    ultima = (tmp_path / "relatorio_arquivos" / "pagina_00003.html").read_text(encoding='utf-8')
+    assert "Relatório &lt;teste&gt;" in primeira
+    assert "pagina_00002.html" in primeira and "Anterior" not in primeira
+    assert "pagina_00002.html" in ultima and "Próxima" not in ultima
+
+
+def test_republicar_so_grava_as_paginas_alteradas(tmp_path):
+    primeira = _publicar(tmp_path, _linhas(9))
+    assert (primeira.paginas_gravadas, primeira.paginas_reaproveitadas) == (3, 0)
+
+    igual = _publicar(tmp_path, _linhas(9))
+    assert (igual.paginas_gravadas, igual.paginas_reaproveitadas) == (0, 3)
+
+    # Só a linha 4 (página 2) muda
+    alterada = _publicar(tmp_path, _linhas(9, tipo_alterado=4))
+    assert (alterada.paginas_gravadas, alterada.paginas_reaproveitadas) == (1, 2)
+    assert "PERFUROCORTANTE" in (tmp_path / "relatorio_arquivos" / "pagina_00002.html").read_text(encoding='utf-8')
+
+
+def test_republicar_com_menos_linhas_remove_as_paginas_que_sobraram(tmp_path):
+    _publicar(tmp_path, _linhas(9))
+
+    menor = _publicar(tmp_path, _linhas(4))
+
+    # A página 1 continua igual; a 2 muda (deixa de ter próxima) e a 3 é removida
+    assert (menor.paginas_gravadas, menor.paginas_reaproveitadas, menor.paginas_removidas) == (1, 1, 1)
+    assert not (tmp_path / "relatorio_arquivos" / "pagina_00003.html").exists()
+    assert len(_indice(tmp_path)['paginas']) == 2
+
+
+def test_manifesto_invalido_regrava_tudo(tmp_path):
+    _publicar(tmp_path, _linhas(6))
+    (tmp_path / "relatorio_arquivos" / ARQUIVO_MANIFESTO).write_text("{corrompido", encoding='utf-8')
+
+    assert _publicar(tmp_path, _linhas(6)).paginas_gravadas == 2
+
+
+def test_indice_html_embute_o_indice_sem_fechar_o_script(tmp_path):
+    linhas = [("</script>", "QUÍMICO", "FÍSICA")]
+    _publicar(tmp_path, linhas)
+
+    html_indice = (tmp_path / "relatorio.html").read_text(encoding='utf-8')
+    embutido = html_indice.split('id="indice">', 1)[1].split('</script>', 1)[0]
+    assert json.loads(embutido.replace('<\\/', '</')) == _indice(tmp_path)
+    assert "Filtro: todos" in html_indice and "Total de linhas: 1" in html_indice
+
+
+def test_pagina_sem_linhas(tmp_path):
+    with pytest.raises(ValueError, match="pelo menos uma linha"):
+        PublicadorHTML(str(tmp_path / "relatorio.html"), "Relatório", COLUNAS, linhas_por_pagina=0)
+
+
+def test_relatorio_html_do_controller(cadastro, tmp_path):
+    arquivo = cadastro['bombonas'].gerar_relatorio(arquivo=str(tmp_path / "bombonas.html"), formato="html")
+
+    indice = _indice(tmp_path, "bombonas")
+    assert arquivo == str(tmp_path / "bombonas.html")
+    assert sum(pagina['linhas'] for pagina in indice['paginas']) == 6
+    assert indice['termos']['Setor'] == {"BIOLOGIA": [1], "FÍSICA": [1], "QUÍMICA": [1]}
@@ -0,0 +1,139 @@
+"""
+Testes do registro de alterações (leitura por período e efeito líquido por chave)
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from dao import eventos
+from dao.registro_alteracoes import (ATUALIZACAO, FORMATO_MOMENTO, INCLUSAO, REMOCAO, RegistroAlteracoes)
+
+INICIO = datetime(2025, 10, 1, 8, 0)
+
+
+def _gravar(caminho, linhas: list) -> RegistroAlteracoes:
+    """ Grava (minutos após INICIO, entidade, operação, chave, registro) no formato do registro. """
+
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for minutos, entidade, operacao, chave, registro in linhas:
+            momento = (INICIO + timedelta(minutes=minutos)).strftime(FORMATO_MOMENTO)
+            arquivo.write(f"{momento}\t{json.dumps([entidade, operacao, chave, registro], ensure_ascii=False)}\n")
+    return RegistroAlteracoes(str(caminho))
+
+
+def _bombona(codigo: str, volume: float) -> list:
+    return [codigo, volume, "QUÍMICO", "11122233396"]
+
+
+@pytest.fixture
+def registro(tmp_path):
+    return _gravar(tmp_path / "alteracoes.log", [
+        (0, 'bombonas', INCLUSAO, "ANT-001", _bombona("ANT-001", 10)),     # antes do período
+        (0, 'bombonas', INCLUSAO, "ANT-002", _bombona("ANT-002", 20)),
+        (0, 'bombonas', INCLUSAO, "ANT-003", _bombona("ANT-003", 30)),
+        (10, 'bombonas', INCLUSAO, "TMP-001", _bombona("TMP-001", 5)),     # incluída e removida
+        (11, 'bombonas', INCLUSAO, "NOV-001", _bombona("NOV-001", 50)),    # incluída e alterada
+        (12, 'bombonas', ATUALIZACAO, "ANT-001", _bombona("ANT-001", 15)),
+        (13, 'responsaveis', ATUALIZACAO, "11122233396", ["11122233396", "Ana Costa", "35999990001", "FÍSICA"]),
+        (14, 'bombonas', ATUALIZACAO, "NOV-001", _bombona("NOV-001", 55)),
+        (15, 'bombonas', REMOCAO, "TMP-001", None),
+        (16, 'bombonas', ATUALIZACAO, "ANT-002", _bombona("ANT-002", 25)),  # alterada e removida
+        (17, 'bombonas', REMOCAO, "ANT-002", None),
+        (18, 'bombonas', REMOCAO, "ANT-003", None),                          # removida e incluída de novo
+        (19, 'bombonas', INCLUSAO, "ANT-003", _bombona("ANT-003", 35)),
+        (30, 'bombonas', ATUALIZACAO, "ANT-001", _bombona("ANT-001", 99)),  # depois do período
+    ])
+
+
+def test_resumir_efeito_liquido(registro):
+    resumo = registro.resumir('bombonas', INICIO + timedelta(minutes=5), INICIO + timedelta(minutes=30))
+
+    assert [(e.chave, e.operacao, e.registro) for e in resumo] == [
+        ("ANT-001", ATUALIZACAO, tuple(_bombona("ANT-001", 15))),
+        ("NOV-001", INCLUSAO, tuple(_bombona("NOV-001", 55))),
+        # Removida: mantém o último registro conhecido no período
+        ("ANT-002", REMOCAO, tuple(_bombona("ANT-002", 25))),
+        # Existia antes e continua existindo: é uma atualização
+        ("ANT-003", ATUALIZACAO, tuple(_bombona("ANT-003", 35))),
+    ]
+    # Ordenado pelo momento da última alteração de cada chave
+    assert [e.momento.minute for e in resumo] == [12, 14, 17, 19]
+    assert all(e.entidade == 'bombonas' for e in resumo)
+
+
+def test_resumir_remocao_sem_registro_e_inclusao_removida_reincluida(tmp_path):
+    registro = _gravar(tmp_path / "alteracoes.log", [
+        (1, 'bombonas', REMOCAO, "ANT-001", None),
+        (2, 'bombonas', INCLUSAO, "NOV-001", _bombona("NOV-001", 1)),
+        (3, 'bombonas', REMOCAO, "NOV-001", None),
+        (4, 'bombonas', INCLUSAO, "NOV-001", _bombona("NOV-001", 2)),
+    ])
+
+    resumo = registro.resumir('bombonas', INICIO)
+
+    assert [(e.chave, e.operacao, e.registro) for e in resumo] == [
+        ("ANT-001", REMOCAO, None),
+        ("NOV-001", INCLUSAO, tuple(_bombona("NOV-001", 2))),
+    ]
+
+
+def test_periodo_inclui_desde_e_exclui_ate(registro):
+    entradas = list(registro.entradas(INICIO + timedelta(minutes=12), INICIO + timedelta(minutes=15)))
+
+    assert [(e.momento.minute, e.chave) for e in entradas] == [(12, "ANT-001"), (13, "11122233396"), (14, "NOV-001")]
+    assert [e.chave for e in registro.resumir('responsaveis', INICIO)] == ["11122233396"]
+    assert registro.resumir('bombonas', INICIO + timedelta(minutes=31)) == []
+
+
+def test_busca_binaria_em_registro_grande(tmp_path):
+    linhas = [(n, 'bombonas', ATUALIZACAO, f"B{n:05d}", _bombona(f"B{n:05d}", n)) for n in range(5000)]
+    registro = _gravar(tmp_path / "alteracoes.log", linhas)
+
+    for desde in (0, 1, 2500, 4999, 5000):
+        entradas = list(registro.entradas(INICIO + timedelta(minutes=desde)))
+        assert [e.chave for e in entradas] == [f"B{n:05d}" for n in range(desde, 5000)]
+
+
+def test_linha_incompleta_e_arquivo_inexistente(tmp_path):
+    registro = _gravar(tmp_path / "alteracoes.log", [(1, 'bombonas', INCLUSAO, "NOV-001", _bombona("NOV-001", 1))])
+    with open(registro.arquivo, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(f"{(INICIO + timedelta(minutes=2)).strftime(FORMATO_MOMENTO)}\t[\"bombonas\", \"inclu")
+
+    assert [e.chave for e in registro.resumir('bombonas', INICIO)] == ["NOV-001"]
+    assert list(RegistroAlteracoes(str(tmp_path / "nao_existe.log")).entradas()) == []
+
+
+def test_registra_alteracoes_publicadas(tmp_path):
+    registro = RegistroAlteracoes(str(tmp_path / "pasta" / "alteracoes.log"))
+    inicio = datetime.now()
+    registro.registrar_alteracao(eventos.Alteracao(
+        'bombonas', (tuple(_bombona("NOV-001", 1)),), (tuple(_bombona("ANT-001", 2)),), ("ANT-002",), (), ()
+    ))
+    registro.registrar_alteracao(eventos.Alteracao('bombonas', (), (), (), (), ()))
+
+    entradas = list(registro.entradas(inicio))
+    assert [(e.operacao, e.chave) for e in entradas] == [
+        (INCLUSAO, "NOV-001"), (ATUALIZACAO, "ANT-001"), (REMOCAO, "ANT-002")
+    ]
+    assert len({e.momento for e in entradas}) == 1
+
+
+def test_relatorio_de_alteracoes_do_controller(cadastro, tmp_path):
+    controller = cadastro['bombonas']
+    desde = datetime.now()
+    controller.cadastrar_bombona("QUI-003", 40, "QUÍMICO", cadastro['cpfs']['bruno'])
+    controller.cadastrar_bombona("QUI-004", 60, "QUÍMICO", cadastro['cpfs']['bruno'])
+    controller.remover_bombona("QUI-004")
+    controller.remover_bombona("BIO-001")
+
+    arquivo = controller.gerar_relatorio(arquivo=str(tmp_path / "alteracoes.csv"), desde=desde)
+
+    with open(arquivo, encoding='utf-8') as f:
+        conteudo = f.read()
+    assert "QUI-003" in conteudo and "BIO-001" in conteudo
+    assert "QUI-004" not in conteudo
+
+    with pytest.raises(ValueError, match="'csv' ou 'pdf'"):
+        controller.gerar_relatorio(arquivo=str(tmp_path / "alteracoes.xlsx"), formato="xlsx", desde=desde)
@@ -0,0 +1,77 @@
+"""
+Testes das sugestões do campo de escolha de responsável
+"""
+
+import tkinter as tk
+
+import pytest
+
+import views.seletor_responsavel as seletor_responsavel
+from models.responsavel import Responsavel
+from views.seletor_responsavel import SeletorResponsavel
+
+
+@pytest.fixture
+def raiz():
+    """ Janela Tk oculta (o teste é pulado quando não há display). """
+
+    try:
+        janela = tk.Tk()
+    except tk.TclError:
+        pytest.skip("sem display para o Tk")
+    janela.withdraw()
+    yield janela
+    janela.destroy()
+
+
+@pytest.fixture(autouse=True)
+def recentes_vazios(monkeypatch):
+    monkeypatch.setattr(SeletorResponsavel, '_recentes', type(SeletorResponsavel._recentes)())
+
+
+def test_sugere_por_prefixo_de_cpf_ou_por_nome(cadastro):
+    controller, cpfs = cadastro['responsaveis'], cadastro['cpfs']
+
+    assert [r.get_cpf() for r in controller.sugerir_responsaveis(cpfs['bruno'][:3])] == [cpfs['bruno']]
+    cpf_formatado = f"{cpfs['ana'][:3]}.{cpfs['ana'][3:6]}.{cpfs['ana'][6:9]}-{cpfs['ana'][9:]}"
+    assert [r.get_nome() for r in controller.sugerir_responsaveis(cpf_formatado)] == ["Ana Costa"]
+    assert controller.sugerir_responsaveis("999") == []
+
+    assert [r.get_cpf() for r in controller.sugerir_responsaveis("  brunu lima ")][0] == cpfs['bruno']
+    assert len(controller.sugerir_responsaveis("a", limite=1)) <= 1
+
+
+def test_possui_responsaveis(cadastro):
+    assert cadastro['responsaveis'].possui_responsaveis()
+
+
+def test_possui_responsaveis_sem_cadastro(pasta_dados):
+    from controllers.responsavel_controller import ResponsavelController
+
+    assert not ResponsavelController().possui_responsaveis()
+
+
+def test_recentes_sem_repeticao_e_limitados(monkeypatch):
+    monkeypatch.setattr(seletor_responsavel, 'MAX_RECENTES', 3)
+    responsaveis = [Responsavel(cpf=f"{n:011d}", nome=f"R{n}", telefone="", setor="") for n in range(5)]
+
+    for responsavel in responsaveis + [responsaveis[3]]:
+        SeletorResponsavel._registrar_recente(responsavel)
+
+    assert list(SeletorResponsavel._recentes) == [f"{n:011d}" for n in (2, 4, 3)]
+
+
+def test_campo_busca_e_exclui_cpfs(raiz, cadastro):
+    cpfs = cadastro['cpfs']
+    campo = SeletorResponsavel(raiz, cadastro['responsaveis'], cpfs_excluidos=[cpfs['ana']])
+
+    campo.var_texto.set("a")
+    campo._buscar()
+    assert all(r.get_cpf() != cpfs['ana'] for r in campo._opcoes.values())
+
+    campo.var_texto.set("carla")
+    campo._buscar()
+    campo.var_texto.set(campo['values'][0])
+    campo._ao_selecionar()
+    assert campo.get_cpf() == cpfs['carla']
+    assert list(SeletorResponsavel._recentes) == [cpfs['carla']]
@@ -0,0 +1,109 @@
+"""
+Testes do snapshot binário dos arquivos CSV
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from dao import snapshot_binario
+from dao.snapshot_binario import SnapshotBinario
+
+REGISTROS = [("FIS-001", 50.0, "QUÍMICO", "11122233396"), ("FIS-002", 100.0, "QUÍMICO", "11122233396")]
+
+
+@pytest.fixture
+def arquivo_csv(tmp_path):
+    arquivo = tmp_path / "bombonas.csv"
+    arquivo.write_text("codigo,volume\nFIS-001,50.0\nFIS-002,100.0\n", encoding='utf-8')
+    return str(arquivo)
+
+
+def _recuar_mtime(arquivo: str, segundos: int = 3_600) -> None:
+    instante = time.time_ns() - segundos * 10**9
+    os.utime(arquivo, ns=(instante, instante))
+
+
+def _reescrever_mantendo_stat(arquivo: str, conteudo: str) -> None:
+    """ Troca o conteúdo do CSV sem mudar tamanho nem mtime. """
+
+    info = os.stat(arquivo)
+    with open(arquivo, 'w', encoding='utf-8') as saida:
+        saida.write(conteudo)
+    assert os.path.getsize(arquivo) == info.st_size
+    os.utime(arquivo, ns=(info.st_atime_ns, info.st_mtime_ns))
+
+
+def _proibir_hash(monkeypatch) -> None:
+    def falhar(*args, **kwargs):
+        raise AssertionError("o CSV não deveria ser lido para o hash")
+
+    monkeypatch.setattr(hashlib, 'blake2b', falhar)
+
+
+def test_carrega_o_que_foi_salvo(arquivo_csv):
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    assert snapshot.carregar() == REGISTROS
+
+
+def test_sem_snapshot_ou_sem_csv(arquivo_csv):
+    snapshot = SnapshotBinario(arquivo_csv)
+    assert snapshot.carregar() is None
+
+    snapshot.salvar(REGISTROS)
+    os.remove(arquivo_csv)
+    assert snapshot.carregar() is None
+
+
+def test_tamanho_diferente_invalida(arquivo_csv):
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    with open(arquivo_csv, 'a', encoding='utf-8') as saida:
+        saida.write("FIS-003,20.0\n")
+
+    assert snapshot.carregar() is None
+
+
+def test_mtime_recente_confere_o_hash(arquivo_csv):
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    # Nova escrita logo após o snapshot, com o mesmo tamanho e o mesmo mtime
+    _reescrever_mantendo_stat(arquivo_csv, "codigo,volume\nFIS-001,50.0\nFIS-002,999.0\n")
+
+    assert snapshot.carregar() is None
+
+
+def test_mtime_antigo_dispensa_o_hash(arquivo_csv, monkeypatch):
+    _recuar_mtime(arquivo_csv)
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    _proibir_hash(monkeypatch)
+    assert snapshot.carregar() == REGISTROS
+
+
+def test_snapshot_ambiguo_e_confirmado_apos_a_margem(arquivo_csv, monkeypatch):
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    # Passada a margem, a carga confere o hash uma vez e regrava o snapshot
+    agora = time.time_ns() + snapshot_binario.MARGEM_MTIME_NS
+    monkeypatch.setattr(time, 'time_ns', lambda: agora)
+    assert snapshot.carregar() == REGISTROS
+
+    _proibir_hash(monkeypatch)
+    assert snapshot.carregar() == REGISTROS
+
+
+def test_versao_diferente_invalida(arquivo_csv, monkeypatch):
+    snapshot = SnapshotBinario(arquivo_csv)
+    snapshot.salvar(REGISTROS)
+
+    monkeypatch.setattr(snapshot_binario, 'VERSAO_FORMATO', snapshot_binario.VERSAO_FORMATO + 1)
+    assert snapshot.carregar() is None
@@ -0,0 +1,71 @@
+"""
+Testes da transferência de bombonas entre responsáveis
+"""
+
+import pytest
+
+from dao.bombona_dao import BombonaDAO
+
+
+def _cpfs_por_codigo(controller) -> dict:
+    return {b.get_codigo(): b.get_responsavel().get_cpf() for b in controller.listar_bombonas()}
+
+
+def test_transfere_bombonas_selecionadas(cadastro):
+    cpfs, controller = cadastro['cpfs'], cadastro['bombonas']
+
+    quantidade = controller.transferir_bombonas(cpfs['ana'], cpfs['bruno'], ['fis001', 'FIS-003'])
+
+    assert quantidade == 2
+    donos = _cpfs_por_codigo(controller)
+    assert donos['FIS-001'] == donos['FIS-003'] == cpfs['bruno']
+    assert donos['FIS-002'] == cpfs['ana']
+
+
+def test_transfere_todas_sem_codigos(cadastro):
+    cpfs, controller = cadastro['cpfs'], cadastro['bombonas']
+
+    assert controller.transferir_bombonas(cpfs['ana'], cpfs['carla']) == 3
+
+    donos = _cpfs_por_codigo(controller)
+    assert [c for c, cpf in donos.items() if cpf == cpfs['ana']] == []
+    assert sorted(c for c, cpf in donos.items() if cpf == cpfs['carla']) == ['BIO-001', 'FIS-001', 'FIS-002',
+                                                                             'FIS-003']
+
+
+def test_grava_uma_unica_vez(cadastro, monkeypatch):
+    cpfs, controller = cadastro['cpfs'], cadastro['bombonas']
+    gravacoes = []
+    original = BombonaDAO._salvar_bombonas
+
+    def contar(self, *args, **kwargs):
+        gravacoes.append(kwargs.get('atualizadas'))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(BombonaDAO, '_salvar_bombonas', contar)
+    controller.transferir_bombonas(cpfs['ana'], cpfs['bruno'])
+
+    assert len(gravacoes) == 1
+    assert len(gravacoes[0]) == 3
+
+
+def test_codigo_de_outro_responsavel_nao_altera_nada(cadastro):
+    cpfs, controller = cadastro['cpfs'], cadastro['bombonas']
+    antes = _cpfs_por_codigo(controller)
+
+    with pytest.raises(ValueError, match="não pertencem"):
+        controller.transferir_bombonas(cpfs['ana'], cpfs['bruno'], ['FIS-001', 'QUI-001'])
+
+    assert _cpfs_por_codigo(controller) == antes
+
+
+def test_origem_igual_ao_destino(cadastro):
+    cpfs = cadastro['cpfs']
+
+    with pytest.raises(ValueError, match="diferentes"):
+        cadastro['bombonas'].transferir_bombonas(cpfs['ana'], cpfs['ana'])
+
+
+def test_destino_inexistente(cadastro):
+    with pytest.raises(ValueError, match="não encontrado"):
+        cadastro['bombonas'].transferir_bombonas(cadastro['cpfs']['ana'], "52998224725")
@@ -0,0 +1,159 @@
+"""
+Campo de escolha de responsável com busca enquanto o usuário digita
+"""
+
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+# Espera após a última tecla antes de buscar responsáveis (ms)
+ATRASO_BUSCA_MS = 200
+
+# Quantidade máxima de responsáveis sugeridos por busca
+LIMITE_SUGESTOES = 15
+
+# Quantidade de responsáveis escolhidos recentemente que ficam guardados
+MAX_RECENTES = 10
+
+
+class SeletorResponsavel(ttk.Combobox):
+    """
+    Combobox de responsáveis que não carrega a lista completa: as opções são
+    buscadas no controller (índice de nomes ou prefixo do CPF) conforme o
+    usuário digita, limitadas a poucas sugestões.
+
+    Com o campo vazio, a lista mostra os responsáveis escolhidos recentemente
+    (guardados para todas as telas enquanto o sistema estiver aberto).
+    """
+
+    # Escolhas recentes (CPF -> Responsavel), da mais antiga para a mais nova
+    _recentes = OrderedDict()
+
+    def __init__(self, parent, responsavel_controller, limite: int = LIMITE_SUGESTOES,
+                 cpfs_excluidos=(), **kwargs):
+        """ Cria o campo. CPFs excluídos nunca aparecem entre as sugestões. """
+
+        self.var_texto = kwargs.pop('textvariable', None) or tk.StringVar()
+        super().__init__(parent, textvariable=self.var_texto,
+                         postcommand=self._ao_abrir_lista, **kwargs)
+
+        self._controller = responsavel_controller
+        self._limite = limite
+        self._cpfs_excluidos = set(cpfs_excluidos)
+        self._opcoes = {}
+        self._selecionado = None
+        self._busca_agendada = None
+
+        self.bind('<KeyRelease>', self._agendar_busca)
+        self.bind('<<ComboboxSelected>>', self._ao_selecionar)
+
+    @staticmethod
+    def _rotulo(responsavel) -> str:
+        """ Texto exibido para um responsável: "João da Silva - CPF: 12345678910". """
+
+        return f"{responsavel.get_nome()} - CPF: {responsavel.get_cpf()}"
+
+    def _exibir_opcoes(self, responsaveis) -> None:
+        """ Substitui as opções da lista pelos responsáveis informados. """
+
+        self._opcoes = {}
+        for resp in responsaveis:
+            if len(self._opcoes) == self._limite:
+                break
+            if resp.get_cpf() not in self._cpfs_excluidos:
+                self._opcoes[self._rotulo(resp)] = resp
+        self['values'] = list(self._opcoes)
+
+    def _exibir_recentes(self) -> None:
+        """ Mostra os responsáveis escolhidos recentemente, do mais novo ao mais antigo. """
+
+        self._exibir_opcoes(reversed(list(self._recentes.values())))
+
+    def _ao_abrir_lista(self) -> None:
+        """ Ao abrir a lista com o campo vazio, oferece as escolhas recentes. """
+
+        if not self.var_texto.get().strip():
+            self._exibir_recentes()
+
+    def _agendar_busca(self, evento) -> None:
+        """ Agenda a busca para depois de uma pausa na digitação. """
+
+        # Teclas de navegação não alteram o texto digitado
+        if evento.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.after(ATRASO_BUSCA_MS, self._buscar)
+
+    def _buscar(self) -> None:
+        """ Busca no controller os responsáveis que correspondem ao texto digitado. """
+
+        self._busca_agendada = None
+        texto = self.var_texto.get().strip()
+
+        # Opção já escolhida: mantém a lista atual
+        if texto in self._opcoes:
+            return
+
+        if not texto:
+            self._exibir_recentes()
+            return
+
+        # Pede alguns a mais para não ficar com menos sugestões após os excluídos
+        limite = self._limite + len(self._cpfs_excluidos)
+        self._exibir_opcoes(self._controller.sugerir_responsaveis(texto, limite))
+
+    def _ao_selecionar(self, _evento=None) -> None:
+        """ Registra a opção escolhida na lista. """
+
+        responsavel = self._opcoes.get(self.var_texto.get())
+        if responsavel is not None:
+            self._registrar_recente(responsavel)
+            self.definir_responsavel(responsavel)
+
+    @classmethod
+    def _registrar_recente(cls, responsavel) -> None:
+        """ Guarda o responsável como a escolha mais recente. """
+
+        cls._recentes.pop(responsavel.get_cpf(), None)
+        cls._recentes[responsavel.get_cpf()] = responsavel
+        while len(cls._recentes) > MAX_RECENTES:
+            cls._recentes.popitem(last=False)
+
+    def definir_responsavel(self, responsavel) -> None:
+        """ Preenche o campo com o responsável informado (ou limpa o campo se for None). """
+
+        self._selecionado = responsavel
+        if responsavel is None:
+            self.var_texto.set("")
+            return
+
+        self._opcoes.setdefault(self._rotulo(responsavel), responsavel)
+        self.var_texto.set(self._rotulo(responsavel))
+
+    def get_responsavel(self):
+        """ Retorna o responsável escolhido, ou None se o texto não corresponder a uma opção. """
+
+        texto = self.var_texto.get()
+        if self._selecionado is not None and texto == self._rotulo(self._selecionado):
+            return self._selecionado
+
+        # Texto digitado igual a uma das sugestões (sem escolher na lista)
+        responsavel = self._opcoes.get(texto)
+        if responsavel is not None:
+            self._registrar_recente(responsavel)
+            self.definir_responsavel(responsavel)
+        return responsavel
+
+    def get_cpf(self):
+        """ Retorna o CPF do responsável escolhido, ou None. """
+
+        responsavel = self.get_responsavel()
+        return responsavel.get_cpf() if responsavel else None
+
+    def limpar(self) -> None:
+        """ Limpa o campo e volta a oferecer as escolhas recentes. """
+
+        self.definir_responsavel(None)
+        self._exibir_recentes()
@@ -4,6 +4,7 @@ Tela de cadastro de bombona - Versão Simplificada
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from views.seletor_responsavel import SeletorResponsavel
 
 class TelaCadastroBombona:
     """
@@ -26,10 +27,7 @@ class TelaCadastroBombona:
         self.var_codigo = tk.StringVar()
         self.var_volume = tk.StringVar()
         self.var_tipo_residuo = tk.StringVar()
-        self.var_responsavel = tk.StringVar()
-        
-        # Lista de responsáveis
-        self.responsaveis_dict = {}
+        self.var_quantidade = tk.StringVar(value="1")
     
     def exibir_formulario(self):
         """ Exibe a tela de cadastro. """
@@ -37,14 +35,14 @@ class TelaCadastroBombona:
         # Cria nova janela
         self.janela = tk.Toplevel(self.parent)
         self.janela.title("Cadastro de Bombona")
-        self.janela.geometry("450x400")
+        self.janela.geometry("450x460")
         self.janela.resizable(False, False)
         
         # Centraliza a janela
         self._centralizar_janela()
         
-        # Carrega responsáveis
-        if not self._carregar_responsaveis():
+        # Verifica se há responsáveis (a lista é buscada conforme o usuário digita)
+        if not self._verificar_responsaveis():
             return
         
         # Cria o formulário
@@ -57,27 +55,14 @@ class TelaCadastroBombona:
         """ Centraliza a janela na tela. """
         self.janela.update_idletasks()
         x = (self.janela.winfo_screenwidth() // 2) - (450 // 2)
-        y = (self.janela.winfo_screenheight() // 2) - (400 // 2)
-        self.janela.geometry(f"450x400+{x}+{y}")
+        y = (self.janela.winfo_screenheight() // 2) - (460 // 2)
+        self.janela.geometry(f"450x460+{x}+{y}")
     
-    def _carregar_responsaveis(self):
-        """ Carrega a lista de responsáveis. """
+    def _verificar_responsaveis(self):
+        """ Verifica se há pelo menos um responsável cadastrado. """
         
         try:
-            responsaveis = self.responsavel_controller.listar_responsaveis()
-            
-            self.responsaveis_opcoes = []
-            self.responsaveis_dict = {}
-            
-            for resp in responsaveis:
-                opcao = f"{resp.get_nome()} - CPF: {resp.get_cpf()}"
-                       # "João da Silva - CPF: 12345678910"
-                self.responsaveis_opcoes.append(opcao)
-                self.responsaveis_dict[opcao] = resp.get_cpf()
-                       # "João da Silva - CPF: 12345678910": "12345678910",
-                       # ...
-            
-            if not self.responsaveis_opcoes:
+            if not self.responsavel_controller.possui_responsaveis():
                 messagebox.showwarning(
                     "Aviso",
                     "Não há responsáveis cadastrados!\n"
@@ -113,12 +98,33 @@ class TelaCadastroBombona:
         
         # Campo Código
         ttk.Label(main_frame, text="Código *:").pack(anchor=tk.W)
+        codigo_frame = ttk.Frame(main_frame)
+        codigo_frame.pack(anchor=tk.W, pady=(0, 10))
+        
         self.entry_codigo = ttk.Entry(
-            main_frame, 
+            codigo_frame, 
             textvariable=self.var_codigo, 
             width=30
         )
-        self.entry_codigo.pack(anchor=tk.W, pady=(0, 10))
+        self.entry_codigo.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Botão Sugerir código (próximo código livre do prefixo digitado)
+        ttk.Button(
+            codigo_frame,
+            text="Sugerir código",
+            command=self._sugerir_codigo
+        ).pack(side=tk.LEFT)
+        
+        # Campo Quantidade (mais de uma: cadastro em lote com códigos sequenciais livres)
+        ttk.Label(main_frame, text="Quantidade:").pack(anchor=tk.W)
+        self.spin_quantidade = ttk.Spinbox(
+            main_frame,
+            from_=1,
+            to=1000,
+            textvariable=self.var_quantidade,
+            width=8
+        )
+        self.spin_quantidade.pack(anchor=tk.W, pady=(0, 10))
         
         # Campo Volume
         ttk.Label(main_frame, text="Volume (Litros) *:").pack(anchor=tk.W)
@@ -148,13 +154,11 @@ class TelaCadastroBombona:
         )
         self.combo_tipo_residuo.pack(anchor=tk.W, pady=(0, 10))
         
-        # Campo Responsável
-        ttk.Label(main_frame, text="Responsável *:").pack(anchor=tk.W)
-        self.combo_responsavel = ttk.Combobox(
+        # Campo Responsável (digite parte do nome, com ou sem acentos, ou do CPF)
+        ttk.Label(main_frame, text="Responsável * (digite nome ou CPF):").pack(anchor=tk.W)
+        self.combo_responsavel = SeletorResponsavel(
             main_frame,
-            textvariable=self.var_responsavel,
-            values=self.responsaveis_opcoes,
-            state="readonly",
+            self.responsavel_controller,
             width=35
         )
         self.combo_responsavel.pack(anchor=tk.W, pady=(0, 20))
@@ -225,12 +229,21 @@ class TelaCadastroBombona:
             self.entry_volume.focus()
             return False
         
+        try:
+            quantidade = int(self.var_quantidade.get().strip() or "1")
+            if quantidade < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Erro", "Quantidade deve ser um número inteiro maior que zero!")
+            self.spin_quantidade.focus()
+            return False
+
         if not self.var_tipo_residuo.get().strip():
             messagebox.showerror("Erro", "Tipo de resíduo é obrigatório!")
             self.combo_tipo_residuo.focus()
             return False
         
-        if not self.var_responsavel.get().strip():
+        if not self.combo_responsavel.get().strip():
             messagebox.showerror("Erro", "Responsável é obrigatório!")
             self.combo_responsavel.focus()
             return False
@@ -248,8 +261,7 @@ class TelaCadastroBombona:
             self.btn_cadastrar.config(state='disabled')
             
             # Obtém o CPF do responsável selecionado
-            responsavel_selecionado = self.var_responsavel.get()
-            cpf_responsavel = self.responsaveis_dict.get(responsavel_selecionado)
+            cpf_responsavel = self.combo_responsavel.get_cpf()
             
             if not cpf_responsavel:
                 messagebox.showerror("Erro", "Responsável selecionado é inválido!")
@@ -258,7 +270,12 @@ class TelaCadastroBombona:
             
             # Converte volume
             volume = float(self.var_volume.get().replace(',', '.'))
-            
+
+            quantidade = int(self.var_quantidade.get().strip() or "1")
+            if quantidade > 1:
+                self._cadastrar_bombonas_em_lote(quantidade, volume, cpf_responsavel)
+                return
+
             # Chama o controller para cadastrar
             sucesso = self.bombona_controller.cadastrar_bombona(
                 self.var_codigo.get().strip(),
@@ -301,12 +318,48 @@ class TelaCadastroBombona:
                 # Widget foi destruído - não faz nada
                 pass
     
+    def _cadastrar_bombonas_em_lote(self, quantidade, volume, cpf_responsavel):
+        """ Cadastra várias bombonas com os próximos códigos livres do prefixo digitado. """
+
+        prefixo = self.var_codigo.get().strip()[:3]
+        codigos = self.bombona_controller.cadastrar_bombonas_em_lote(
+            prefixo,
+            quantidade,
+            volume,
+            self.var_tipo_residuo.get().strip(),
+            cpf_responsavel
+        )
+
+        messagebox.showinfo(
+            "Sucesso",
+            f"{len(codigos)} bombonas cadastradas com sucesso!\n"
+            f"Códigos: {codigos[0]} a {codigos[-1]}"
+        )
+        self._limpar_formulario()
+
+    def _sugerir_codigo(self):
+        """ Preenche o código com o próximo código livre do prefixo digitado (3 letras). """
+
+        prefixo = self.var_codigo.get().strip()[:3]
+        if len(prefixo) != 3 or not prefixo.isalpha():
+            messagebox.showwarning("Aviso", "Digite as 3 letras do prefixo para sugerir um código.")
+            self.entry_codigo.focus()
+            return
+
+        try:
+            self.var_codigo.set(self.bombona_controller.sugerir_codigo(prefixo))
+            self.entry_volume.focus()
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao sugerir código:\n{str(e)}")
+            self.janela.focus()
+
     def _limpar_formulario(self):
         """ Limpa todos os campos do formulário. """
         self.var_codigo.set("")
         self.var_volume.set("")
         self.var_tipo_residuo.set("")
-        self.var_responsavel.set("")
+        self.combo_responsavel.limpar()
+        self.var_quantidade.set("1")
         
         # Foca no primeiro campo
         self.entry_codigo.focus()
@@ -3,7 +3,11 @@ Tela de listagem de bombonas - Versão Simplificada
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from views.seletor_responsavel import SeletorResponsavel
+
+# Espera após a última tecla antes de filtrar a listagem (ms)
+ATRASO_BUSCA_MS = 150
 
 
 class TelaListagemBombonas:
@@ -16,6 +20,12 @@ class TelaListagemBombonas:
         self.parent = parent
         self.janela = None
         self.tree = None
+        self.var_prefixo = tk.StringVar()
+        self.var_busca = tk.StringVar()
+        
+        # Códigos de todas as linhas inseridas na tabela (inclusive as ocultas pela busca)
+        self._linhas = {}
+        self._busca_agendada = None
         
         # Cria seus controllers
         from controllers.bombona_controller import BombonaController
@@ -64,13 +74,43 @@ class TelaListagemBombonas:
         )
         titulo.pack(pady=(0, 10))
         
+        # Filtro por prefixo do código (ex.: FIS, FIS-1) ou intervalo (ex.: FIS-100:FIS-199)
+        filtro_frame = ttk.Frame(main_frame)
+        filtro_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(filtro_frame, text="Código (prefixo ou intervalo):").pack(side=tk.LEFT, padx=(0, 5))
+        entry_prefixo = ttk.Entry(filtro_frame, textvariable=self.var_prefixo, width=25)
+        entry_prefixo.pack(side=tk.LEFT, padx=(0, 5))
+        entry_prefixo.bind('<Return>', lambda _: self._carregar_bombonas())
+        
+        ttk.Button(
+            filtro_frame,
+            text="Filtrar",
+            command=self._carregar_bombonas,
+            width=10
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Button(
+            filtro_frame,
+            text="Limpar",
+            command=self._limpar_filtro,
+            width=10
+        ).pack(side=tk.LEFT)
+        
+        # Busca incremental por código, tipo, responsável, CPF ou setor
+        entry_busca = ttk.Entry(filtro_frame, textvariable=self.var_busca, width=25)
+        entry_busca.pack(side=tk.RIGHT)
+        ttk.Label(filtro_frame, text="Buscar:").pack(side=tk.RIGHT, padx=(0, 5))
+        self.var_busca.trace_add('write', lambda *_: self._agendar_busca())
+        
         # Frame da tabela
         table_frame = ttk.Frame(main_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
         # Criação da Treeview
         colunas = ('Código', 'Volume', 'Tipo Resíduo', 'Responsável', 'CPF')
-        self.tree = ttk.Treeview(table_frame, columns=colunas, show='headings', height=15)
+        self.tree = ttk.Treeview(table_frame, columns=colunas, show='headings', height=15,
+                                 selectmode='extended')
         
         # Configuração das colunas
         self.tree.heading('Código', text='Código')
@@ -109,6 +149,13 @@ class TelaListagemBombonas:
             width=15
         ).pack(side=tk.LEFT, padx=(0, 5))
         
+        ttk.Button(
+            button_frame,
+            text="Editar em Lote",
+            command=self._editar_bombonas_em_lote,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
         ttk.Button(
             button_frame,
             text="Excluir",
@@ -116,6 +163,20 @@ class TelaListagemBombonas:
             width=15
         ).pack(side=tk.LEFT, padx=(0, 5))
         
+        ttk.Button(
+            button_frame,
+            text="Transferir",
+            command=self._transferir_bombonas,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Button(
+            button_frame,
+            text="Etiquetas",
+            command=self._gerar_etiquetas,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
         # Botão da direita
         ttk.Button(
             button_frame,
@@ -131,12 +192,22 @@ class TelaListagemBombonas:
         """ Carrega a lista de bombonas. """
         
         try:
-            # Limpa a tabela
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            # Limpa a tabela (inclusive as linhas ocultas pela busca)
+            if self._linhas:
+                self.tree.delete(*self._linhas)
+            self._linhas = {}
             
-            # Busca as bombonas
-            bombonas = self.bombona_controller.listar_bombonas()
+            # Busca as bombonas (apenas as do filtro de código, se houver)
+            filtro = self.var_prefixo.get().strip()
+            if ':' in filtro:
+                codigo_inicial, codigo_final = filtro.split(':', 1)
+                bombonas = self.bombona_controller.buscar_bombonas_por_intervalo(
+                    codigo_inicial, codigo_final
+                )
+            elif filtro:
+                bombonas = self.bombona_controller.buscar_bombonas_por_prefixo(filtro)
+            else:
+                bombonas = self.bombona_controller.listar_bombonas()
             
             # Popula a tabela
             for bombona in bombonas:
@@ -149,19 +220,47 @@ class TelaListagemBombonas:
                     nome_resp = "N/A"
                     cpf_resp = "N/A"
                 
-                # Insere na tabela
-                self.tree.insert('', tk.END, values=(
+                # Insere na tabela (o código identifica a linha)
+                self.tree.insert('', tk.END, iid=bombona.get_codigo(), values=(
                     bombona.get_codigo(),
                     f"{bombona.get_volume():.1f}",
                     bombona.get_tipo_residuo(),
                     nome_resp,
                     cpf_resp
                 ))
+                self._linhas[bombona.get_codigo()] = None
+            
+            # Indexa as bombonas exibidas e reaplica a busca digitada
+            self.bombona_controller.indexar_busca(bombonas)
+            if self.var_busca.get().strip():
+                self._aplicar_busca()
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar bombonas:\n{str(e)}")
             self.janela.focus()
     
+    def _agendar_busca(self):
+        """ Agenda a busca para depois de uma pausa na digitação (debounce). """
+        
+        if self._busca_agendada is not None:
+            self.janela.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.janela.after(ATRASO_BUSCA_MS, self._aplicar_busca)
+    
+    def _aplicar_busca(self):
+        """ Exibe apenas as linhas que correspondem ao texto digitado. """
+        
+        self._busca_agendada = None
+        codigos = self.bombona_controller.buscar_incremental(self.var_busca.get())
+        
+        # Substitui as linhas visíveis em uma única operação (as demais ficam ocultas)
+        self.tree.set_children('', *codigos)
+    
+    def _limpar_filtro(self):
+        """ Remove o filtro de código e recarrega todas as bombonas. """
+        
+        self.var_prefixo.set("")
+        self._carregar_bombonas()
+    
     def _obter_bombona_selecionada(self):
         """ Obtém a bombona selecionada na tabela. """
         
@@ -171,23 +270,34 @@ class TelaListagemBombonas:
             self.janela.focus()
             return None
         
-        # Pega os valores da linha selecionada
-        item = self.tree.item(selecao[0])
-        valores = item['values']
-        
-        if not valores:
-            return None
-        
-        # O código está na primeira coluna
-        codigo = valores[0]
-        
-        # Busca a bombona completa
-        bombonas = self.bombona_controller.listar_bombonas()
-        for bombona in bombonas:
-            if bombona.get_codigo() == codigo:
-                return bombona
+        # O identificador da linha é o próprio código da bombona
+        return self.bombona_controller.buscar_bombona(selecao[0])
+    
+    def _atualizar_linhas(self, codigos, volume=None, tipo_residuo=None, responsavel=None):
+        """
+        Atualiza apenas as colunas alteradas das linhas informadas, sem recarregar
+        a lista (o índice da busca já foi atualizado pelo controller).
+        """
+        
+        for codigo in codigos:
+            if codigo not in self._linhas:
+                continue  # Fora do filtro de código atual
+            if volume is not None:
+                self.tree.set(codigo, 'Volume', f"{round(volume, 2):.1f}")
+            if tipo_residuo is not None:
+                self.tree.set(codigo, 'Tipo Resíduo', tipo_residuo.upper())
+            if responsavel is not None:
+                self.tree.set(codigo, 'Responsável', responsavel.get_nome())
+                self.tree.set(codigo, 'CPF', responsavel.get_cpf())
+    
+    def _remover_linhas(self, codigos):
+        """ Remove da tabela apenas as linhas das bombonas excluídas. """
         
-        return None
+        exibidas = [codigo for codigo in codigos if codigo in self._linhas]
+        if exibidas:
+            self.tree.delete(*exibidas)
+        for codigo in exibidas:
+            del self._linhas[codigo]
         
     def _editar_bombona(self):
         """ Edita a bombona selecionada. """
@@ -229,7 +339,6 @@ class TelaListagemBombonas:
         # Variáveis dos campos
         var_volume = tk.StringVar(value=str(bombona.get_volume()))
         var_tipo_residuo = tk.StringVar(value=bombona.get_tipo_residuo())
-        var_responsavel = tk.StringVar()
         
         # Campo Código (apenas informativo)
         ttk.Label(main_frame, text="Código da Bombona:", font=('Arial', 10, 'bold')).pack(anchor=tk.W)
@@ -267,48 +376,14 @@ class TelaListagemBombonas:
         )
         combo_tipo_residuo.pack(anchor=tk.W, pady=(0, 10))
         
-        # Campo Responsável
-        ttk.Label(main_frame, text="Responsável *:").pack(anchor=tk.W)
-        
-        # Carrega responsáveis
-        try:
-            responsaveis = self.responsavel_controller.listar_responsaveis()
-            
-            responsaveis_opcoes = []
-            responsaveis_dict = {}
-            responsavel_atual = None
-            
-            for resp in responsaveis:
-                opcao = f"{resp.get_nome()} - CPF: {resp.get_cpf()}"
-                responsaveis_opcoes.append(opcao)
-                responsaveis_dict[opcao] = resp.get_cpf()
-                
-                # Verifica se é o responsável atual
-                if bombona.get_responsavel() and resp.get_cpf() == bombona.get_responsavel().get_cpf():
-                    responsavel_atual = opcao
-            
-            # Se não encontrou responsável atual, adiciona opção "Responsável Atual"
-            if not responsavel_atual and bombona.get_responsavel():
-                resp_atual = bombona.get_responsavel()
-                responsavel_atual = f"{resp_atual.get_nome()} - CPF: {resp_atual.get_cpf()}"
-                responsaveis_opcoes.insert(0, responsavel_atual)
-                responsaveis_dict[responsavel_atual] = resp_atual.get_cpf()
-            
-            var_responsavel.set(responsavel_atual if responsavel_atual else "")
-            
-        except Exception as e:
-            responsaveis_opcoes = []
-            responsaveis_dict = {}
-            messagebox.showerror("Erro", f"Erro ao carregar responsáveis: {e}")
-            self.janela.focus()
-        
-        combo_responsavel = ttk.Combobox(
+        # Campo Responsável (busca pelo nome ou CPF conforme o usuário digita)
+        ttk.Label(main_frame, text="Responsável * (digite nome ou CPF):").pack(anchor=tk.W)
+        combo_responsavel = SeletorResponsavel(
             main_frame,
-            textvariable=var_responsavel,
-            values=responsaveis_opcoes,
-            state="readonly",
+            self.responsavel_controller,
             width=35
         )
+        combo_responsavel.definir_responsavel(bombona.get_responsavel())
         combo_responsavel.pack(anchor=tk.W, pady=(0, 20))
         
         # Observação sobre campos obrigatórios
@@ -346,15 +421,14 @@ class TelaListagemBombonas:
                 combo_tipo_residuo.focus()
                 return
             
-            if not var_responsavel.get().strip():
+            if not combo_responsavel.get().strip():
                 messagebox.showerror("Erro", "Responsável é obrigatório!")
                 combo_responsavel.focus()
                 return
             
             try:
                 # Obtém o CPF do responsável selecionado
-                responsavel_selecionado = var_responsavel.get()
-                cpf_responsavel = responsaveis_dict.get(responsavel_selecionado)
+                cpf_responsavel = combo_responsavel.get_cpf()
                 
                 if not cpf_responsavel:
                     messagebox.showerror("Erro", "Responsável selecionado é inválido!")
@@ -370,10 +444,13 @@ class TelaListagemBombonas:
                 )
                 
                 if sucesso:
+                    # Atualização incremental: altera apenas a linha editada
+                    self._atualizar_linhas(
+                        [bombona.get_codigo()], volume, var_tipo_residuo.get().strip(),
+                        combo_responsavel.get_responsavel()
+                    )
                     messagebox.showinfo("Sucesso", "Bombona editada com sucesso!")
                     janela_edicao.destroy()
-                    # Recarrega a lista
-                    self._carregar_bombonas()
                     self.janela.focus()
 
                 
@@ -386,7 +463,7 @@ class TelaListagemBombonas:
         def limpar_campos():
             var_volume.set("")
             var_tipo_residuo.set("")
-            var_responsavel.set("")
+            combo_responsavel.limpar()
             entry_volume.focus()
         
         # Botão Salvar
@@ -424,7 +501,12 @@ class TelaListagemBombonas:
         janela_edicao.bind('<Escape>', lambda _: janela_edicao.destroy())
     
     def _excluir_bombona(self):
-        """ Exclui a bombona selecionada. """
+        """ Exclui a(s) bombona(s) selecionada(s). """
+        
+        # Seleção múltipla: uma única confirmação e uma única escrita
+        if len(self.tree.selection()) > 1:
+            self._excluir_bombonas_em_lote()
+            return
         
         bombona = self._obter_bombona_selecionada()
         if not bombona:
@@ -449,13 +531,390 @@ class TelaListagemBombonas:
             sucesso = self.bombona_controller.remover_bombona(bombona.get_codigo())
             
             if sucesso:
+                # Atualização incremental: remove apenas a linha excluída
+                self._remover_linhas([bombona.get_codigo()])
                 messagebox.showinfo("Sucesso", "Bombona excluída com sucesso!")
-                # Recarrega a lista
-                self._carregar_bombonas()
                 self.janela.focus()
 
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao excluir bombona:\n{str(e)}")
             self.janela.focus()
-
+    
+    def _obter_codigos_selecionados(self):
+        """ Obtém os códigos de todas as bombonas selecionadas na tabela. """
+        
+        selecao = self.tree.selection()
+        if not selecao:
+            messagebox.showwarning("Aviso", "Selecione ao menos uma bombona na lista.")
+            self.janela.focus()
+            return []
+        
+        # O código da bombona é o identificador da linha
+        return list(selecao)
+    
+    def _excluir_bombonas_em_lote(self):
+        """ Exclui todas as bombonas selecionadas com uma única confirmação. """
+        
+        codigos = self._obter_codigos_selecionados()
+        if not codigos:
+            return
+        
+        resposta = messagebox.askyesno(
+            "Confirmar Exclusão",
+            f"Tem certeza que deseja excluir {len(codigos)} bombona(s)?\n\n"
+            f"Esta ação não pode ser desfeita!"
+        )
+        
+        if not resposta:
+            self.janela.focus()
+            return
+        
+        try:
+            quantidade = self.bombona_controller.remover_bombonas_em_lote(codigos)
+            
+            # Atualização incremental: remove apenas as linhas excluídas
+            self._remover_linhas(codigos)
+            
+            messagebox.showinfo("Sucesso", f"{quantidade} bombona(s) excluída(s) com sucesso!")
+            self.janela.focus()
+            
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao excluir bombonas:\n{str(e)}")
+            self.janela.focus()
+    
+    def _editar_bombonas_em_lote(self):
+        """ Aplica a mesma alteração a todas as bombonas selecionadas. """
+        
+        codigos = self._obter_codigos_selecionados()
+        if not codigos:
+            return
+        
+        # Cria nova janela
+        janela_lote = tk.Toplevel(self.janela)
+        janela_lote.title("Editar Bombonas em Lote")
+        janela_lote.geometry("450x400")
+        janela_lote.resizable(False, False)
+        
+        # Centraliza a janela
+        janela_lote.update_idletasks()
+        x = (janela_lote.winfo_screenwidth() // 2) - (450 // 2)
+        y = (janela_lote.winfo_screenheight() // 2) - (400 // 2)
+        janela_lote.geometry(f"450x400+{x}+{y}")
+        
+        # Frame principal
+        main_frame = ttk.Frame(janela_lote, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Título
+        titulo = ttk.Label(
+            main_frame, 
+            text="Editar Bombonas em Lote", 
+            font=('Arial', 14, 'bold')
+        )
+        titulo.pack(pady=(0, 20))
+        
+        ttk.Label(
+            main_frame, 
+            text=f"{len(codigos)} bombona(s) selecionada(s)",
+            font=('Arial', 10),
+            foreground="blue"
+        ).pack(anchor=tk.W, pady=(0, 15))
+        
+        # Variáveis dos campos (vazio = manter valor atual)
+        var_volume = tk.StringVar()
+        var_tipo_residuo = tk.StringVar()
+        
+        # Campo Volume
+        ttk.Label(main_frame, text="Novo Volume (Litros):").pack(anchor=tk.W)
+        entry_volume = ttk.Entry(
+            main_frame, 
+            textvariable=var_volume, 
+            width=20
+        )
+        entry_volume.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Campo Tipo de Resíduo
+        ttk.Label(main_frame, text="Novo Tipo de Resíduo:").pack(anchor=tk.W)
+        try:
+            tipos_residuo = self.bombona_controller.get_tipos_residuos_validos()
+        except:
+            tipos_residuo = ["QUÍMICO", "BIOLÓGICO"]
+        
+        ttk.Combobox(
+            main_frame,
+            textvariable=var_tipo_residuo,
+            values=[""] + tipos_residuo,
+            state="readonly",
+            width=27
+        ).pack(anchor=tk.W, pady=(0, 10))
+        
+        # Campo Responsável (busca pelo nome ou CPF conforme o usuário digita)
+        ttk.Label(main_frame, text="Novo Responsável (digite nome ou CPF):").pack(anchor=tk.W)
+        combo_responsavel = SeletorResponsavel(
+            main_frame,
+            self.responsavel_controller,
+            width=35
+        )
+        combo_responsavel.pack(anchor=tk.W, pady=(0, 20))
+        
+        # Observação sobre campos em branco
+        ttk.Label(
+            main_frame, 
+            text="Campos em branco mantêm o valor atual",
+            foreground="red"
+        ).pack(anchor=tk.W, pady=(0, 20))
+        
+        # Frame dos botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(anchor=tk.W)
+        
+        # Função para aplicar as alterações
+        def aplicar_edicao():
+            volume = None
+            if var_volume.get().strip():
+                try:
+                    volume = float(var_volume.get().replace(',', '.'))
+                except ValueError:
+                    messagebox.showerror("Erro", "Volume deve ser um número válido!")
+                    entry_volume.focus()
+                    return
+            
+            tipo_residuo = var_tipo_residuo.get().strip() or None
+            responsavel = combo_responsavel.get_responsavel()
+            if responsavel is None and combo_responsavel.get().strip():
+                messagebox.showerror("Erro", "Responsável selecionado é inválido!")
+                combo_responsavel.focus()
+                return
+            
+            if volume is None and tipo_residuo is None and responsavel is None:
+                messagebox.showerror("Erro", "Informe ao menos um campo para alterar!")
+                entry_volume.focus()
+                return
+            
+            resposta = messagebox.askyesno(
+                "Confirmar Edição",
+                f"Aplicar a alteração a {len(codigos)} bombona(s)?"
+            )
+            if not resposta:
+                janela_lote.focus()
+                return
+            
+            try:
+                quantidade = self.bombona_controller.editar_bombonas_em_lote(
+                    codigos,
+                    volume,
+                    tipo_residuo,
+                    responsavel.get_cpf() if responsavel else None
+                )
+                
+                # Atualização incremental: altera apenas as linhas editadas
+                self._atualizar_linhas(codigos, volume, tipo_residuo, responsavel)
+                
+                messagebox.showinfo("Sucesso", f"{quantidade} bombona(s) editada(s) com sucesso!")
+                janela_lote.destroy()
+                self.janela.focus()
+                
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao editar bombonas:\n{str(e)}")
+                self.janela.focus()
+        
+        # Botão Aplicar
+        ttk.Button(
+            button_frame,
+            text="Aplicar",
+            command=aplicar_edicao,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Botão Cancelar
+        ttk.Button(
+            button_frame,
+            text="Cancelar",
+            command=janela_lote.destroy,
+            width=15
+        ).pack(side=tk.LEFT)
+        
+        entry_volume.focus()
+        
+        janela_lote.bind('<Return>', lambda _: aplicar_edicao())
+        janela_lote.bind('<Escape>', lambda _: janela_lote.destroy())
+    
+    def _gerar_etiquetas(self):
+        """ Gera o PDF das etiquetas das bombonas selecionadas (ou de todas as visíveis na lista). """
+        
+        # Sem seleção, usa as linhas exibidas (já filtradas pelo código e pela busca)
+        codigos = list(self.tree.selection() or self.tree.get_children())
+        if not codigos:
+            messagebox.showwarning("Aviso", "Nenhuma bombona na lista.")
+            self.janela.focus()
+            return
+        
+        arquivo = filedialog.asksaveasfilename(
+            title="Salvar Etiquetas",
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
+        )
+        
+        if not arquivo:
+            return
+        
+        try:
+            arquivo_gerado = self.bombona_controller.gerar_etiquetas(codigos=codigos, arquivo=arquivo)
+            
+            messagebox.showinfo("Sucesso", f"{len(codigos)} etiqueta(s) gerada(s)!\n\nLocal: {arquivo_gerado}")
+            self.janela.focus()
+            
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao gerar etiquetas:\n{str(e)}")
+            self.janela.focus()
+    
+    def _transferir_bombonas(self):
+        """ Transfere as bombonas selecionadas (ou todas do responsável) para outro responsável. """
+        
+        selecao = self.tree.selection()
+        if not selecao:
+            messagebox.showwarning("Aviso", "Selecione ao menos uma bombona na lista.")
+            self.janela.focus()
+            return
+        
+        # Todas as bombonas selecionadas devem ser do mesmo responsável
+        codigos = [self.tree.set(item, 'Código') for item in selecao]
+        cpfs_origem = {self.tree.set(item, 'CPF') for item in selecao}
+        
+        if len(cpfs_origem) != 1 or "N/A" in cpfs_origem:
+            messagebox.showwarning(
+                "Aviso",
+                "Selecione bombonas de um único responsável para transferir."
+            )
+            self.janela.focus()
+            return
+        
+        cpf_origem = cpfs_origem.pop()
+        nome_origem = self.tree.set(selecao[0], 'Responsável')
+        
+        self._abrir_janela_transferencia(cpf_origem, nome_origem, codigos)
+    
+    def _abrir_janela_transferencia(self, cpf_origem, nome_origem, codigos):
+        """ Abre janela para escolher o responsável de destino da transferência. """
+        
+        # Cria nova janela
+        janela_transferencia = tk.Toplevel(self.janela)
+        janela_transferencia.title("Transferir Bombonas")
+        janela_transferencia.geometry("450x320")
+        janela_transferencia.resizable(False, False)
+        
+        # Centraliza a janela
+        janela_transferencia.update_idletasks()
+        x = (janela_transferencia.winfo_screenwidth() // 2) - (450 // 2)
+        y = (janela_transferencia.winfo_screenheight() // 2) - (320 // 2)
+        janela_transferencia.geometry(f"450x320+{x}+{y}")
+        
+        # Frame principal
+        main_frame = ttk.Frame(janela_transferencia, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Título
+        titulo = ttk.Label(
+            main_frame, 
+            text="Transferir Bombonas", 
+            font=('Arial', 14, 'bold')
+        )
+        titulo.pack(pady=(0, 20))
+        
+        # Responsável de origem (apenas informativo)
+        ttk.Label(main_frame, text="Responsável atual:", font=('Arial', 10, 'bold')).pack(anchor=tk.W)
+        ttk.Label(
+            main_frame, 
+            text=f"{nome_origem} - CPF: {cpf_origem}",
+            font=('Arial', 10),
+            foreground="blue"
+        ).pack(anchor=tk.W, pady=(0, 10))
+        
+        # Escopo da transferência
+        var_escopo = tk.StringVar(value="selecionadas")
+        ttk.Radiobutton(
+            main_frame,
+            text=f"Apenas as bombonas selecionadas ({len(codigos)})",
+            variable=var_escopo,
+            value="selecionadas"
+        ).pack(anchor=tk.W)
+        ttk.Radiobutton(
+            main_frame,
+            text="Todas as bombonas deste responsável",
+            variable=var_escopo,
+            value="todas"
+        ).pack(anchor=tk.W, pady=(0, 10))
+        
+        # Responsável de destino (busca pelo nome ou CPF conforme o usuário digita)
+        ttk.Label(main_frame, text="Novo responsável * (digite nome ou CPF):").pack(anchor=tk.W)
+        
+        combo_destino = SeletorResponsavel(
+            main_frame,
+            self.responsavel_controller,
+            cpfs_excluidos=(cpf_origem,),
+            width=35
+        )
+        combo_destino.pack(anchor=tk.W, pady=(0, 20))
+        
+        # Frame dos botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(anchor=tk.W)
+        
+        # Função para confirmar a transferência
+        def confirmar_transferencia():
+            cpf_destino = combo_destino.get_cpf()
+            if not cpf_destino:
+                messagebox.showerror("Erro", "Selecione o novo responsável!")
+                combo_destino.focus()
+                return
+            
+            codigos_transferir = codigos if var_escopo.get() == "selecionadas" else None
+            
+            try:
+                # Linhas afetadas: as selecionadas ou todas as do responsável de origem
+                if codigos_transferir is None:
+                    codigos_alterados = [
+                        b.get_codigo()
+                        for b in self.bombona_controller.buscar_bombonas_por_cpf_responsavel(cpf_origem)
+                    ]
+                else:
+                    codigos_alterados = codigos_transferir
+                
+                quantidade = self.bombona_controller.transferir_bombonas(
+                    cpf_origem,
+                    cpf_destino,
+                    codigos_transferir
+                )
+                
+                # Atualização incremental: altera apenas as linhas transferidas
+                self._atualizar_linhas(codigos_alterados, responsavel=combo_destino.get_responsavel())
+                
+                messagebox.showinfo("Sucesso", f"{quantidade} bombona(s) transferida(s) com sucesso!")
+                janela_transferencia.destroy()
+                self.janela.focus()
+                
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao transferir bombonas:\n{str(e)}")
+                self.janela.focus()
+        
+        # Botão Transferir
+        ttk.Button(
+            button_frame,
+            text="Transferir",
+            command=confirmar_transferencia,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Botão Cancelar
+        ttk.Button(
+            button_frame,
+            text="Cancelar",
+            command=janela_transferencia.destroy,
+            width=15
+        ).pack(side=tk.LEFT)
+        
+        combo_destino.focus()
+        
+        janela_transferencia.bind('<Return>', lambda _: confirmar_transferencia())
+        janela_transferencia.bind('<Escape>', lambda _: janela_transferencia.destroy())
@@ -5,6 +5,9 @@ Tela de listagem de responsáveis - Versão Simplificada
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+# Espera após a última tecla antes de filtrar a listagem (ms)
+ATRASO_BUSCA_MS = 150
+
 
 class TelaListagemResponsaveis:
     """
@@ -18,6 +21,11 @@ class TelaListagemResponsaveis:
         self.parent = parent
         self.janela = None
         self.tree = None
+        self.var_busca = tk.StringVar()
+        
+        # CPFs de todas as linhas inseridas na tabela (inclusive as ocultas pela busca)
+        self._linhas = {}
+        self._busca_agendada = None
         
         # Cria seu controller
         from controllers.responsavel_controller import ResponsavelController
@@ -63,6 +71,14 @@ class TelaListagemResponsaveis:
         )
         titulo.pack(pady=(0, 10))
         
+        # Busca incremental por nome, CPF ou setor
+        busca_frame = ttk.Frame(main_frame)
+        busca_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(busca_frame, text="Buscar:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(busca_frame, textvariable=self.var_busca, width=40).pack(side=tk.LEFT)
+        self.var_busca.trace_add('write', lambda *_: self._agendar_busca())
+        
         # Frame da tabela
         table_frame = ttk.Frame(main_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -128,26 +144,49 @@ class TelaListagemResponsaveis:
         """ Carrega a lista de responsáveis. """
         
         try:
-            # Limpa a tabela
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            # Limpa a tabela (inclusive as linhas ocultas pela busca)
+            if self._linhas:
+                self.tree.delete(*self._linhas)
+            self._linhas = {}
             
             # Busca os responsáveis
             responsaveis = self.responsavel_controller.listar_responsaveis()
             
-            # Popula a tabela
+            # Popula a tabela (o CPF identifica a linha)
             for responsavel in responsaveis:
-                self.tree.insert('', tk.END, values=(
+                self.tree.insert('', tk.END, iid=responsavel.get_cpf(), values=(
                     responsavel.get_nome(),
                     responsavel.get_cpf(),
                     responsavel.get_telefone(),
                     responsavel.get_setor()
                 ))
+                self._linhas[responsavel.get_cpf()] = None
+            
+            # Indexa os responsáveis exibidos e reaplica a busca digitada
+            self.responsavel_controller.indexar_busca(responsaveis)
+            if self.var_busca.get().strip():
+                self._aplicar_busca()
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar responsáveis:\n{str(e)}")
             self.janela.focus()
     
+    def _agendar_busca(self):
+        """ Agenda a busca para depois de uma pausa na digitação (debounce). """
+        
+        if self._busca_agendada is not None:
+            self.janela.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.janela.after(ATRASO_BUSCA_MS, self._aplicar_busca)
+    
+    def _aplicar_busca(self):
+        """ Exibe apenas as linhas que correspondem ao texto digitado. """
+        
+        self._busca_agendada = None
+        cpfs = self.responsavel_controller.buscar_incremental(self.var_busca.get())
+        
+        # Substitui as linhas visíveis em uma única operação (as demais ficam ocultas)
+        self.tree.set_children('', *cpfs)
+    
     def _obter_responsavel_selecionado(self):
         """ Obtém o responsável selecionado na tabela. """
         
@@ -157,15 +196,8 @@ class TelaListagemResponsaveis:
             self.janela.focus()
             return None
         
-        # Pega os valores da linha selecionada
-        item = self.tree.item(selecao[0])
-        valores = item['values']
-        
-        if not valores:
-            return None
-        
-        # O CPF está na segunda coluna
-        cpf = valores[1]
+        # O CPF é o identificador da linha (preserva zeros à esquerda)
+        cpf = selecao[0]
         
         # Busca o responsável completo
         responsavel = self.responsavel_controller.buscar_responsavel(cpf)
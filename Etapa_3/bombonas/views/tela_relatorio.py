@@ -2,9 +2,17 @@
 Tela de relatórios - Versão Simples e Intuitiva
 """
 
+import threading
 import tkinter as tk
+from datetime import datetime, timedelta
 from tkinter import ttk, messagebox, filedialog
 
+# Intervalo de atualização da barra durante a geração do pacote (ms)
+INTERVALO_PROGRESSO_MS = 100
+
+# Período sugerido para o relatório de alterações (dias)
+DIAS_ALTERACOES_PADRAO = 30
+
 
 class TelaRelatorio:
     """
@@ -29,6 +37,15 @@ class TelaRelatorio:
         self.var_filtro_setor = tk.StringVar()
         self.var_filtro_responsavel = tk.StringVar()
         self.var_filtro_tipo_residuo = tk.StringVar()
+        self.var_filtro_volume_min = tk.StringVar()
+        self.var_filtro_volume_max = tk.StringVar()
+        
+        # Relatórios incluídos no pacote: (entidade, formato) -> marcado
+        from relatorios.pacote_relatorios import ARQUIVOS_PACOTE, PACOTE_PADRAO
+        self.vars_pacote = {item: tk.BooleanVar(value=item in PACOTE_PADRAO) for item in ARQUIVOS_PACOTE}
+        self.var_status = tk.StringVar()
+        desde_padrao = datetime.now() - timedelta(days=DIAS_ALTERACOES_PADRAO)
+        self.var_alteracoes_desde = tk.StringVar(value=desde_padrao.strftime("%d/%m/%Y"))
         
         # Dados para filtros
         self.responsaveis_dict = {}
@@ -57,23 +74,15 @@ class TelaRelatorio:
         """ Centraliza a janela na tela. """
         self.janela.update_idletasks()
         x = (self.janela.winfo_screenwidth() // 2) - (475 // 2)
-        y = (self.janela.winfo_screenheight() // 2) - (625 // 2)
-        self.janela.geometry(f"475x625+{x}+{y}")
+        y = (self.janela.winfo_screenheight() // 2) - (915 // 2)
+        self.janela.geometry(f"475x915+{x}+{y}")
     
     def _carregar_dados_filtros(self):
         """ Carrega os dados necessários para os filtros. """
         try:
-            # Carrega responsáveis
-            responsaveis = self.responsavel_controller.listar_responsaveis()
-            self.responsaveis_dict = {}
-            setores = set()
-            
-            for resp in responsaveis:
-                opcao = f"{resp.get_nome()} - {resp.get_cpf()}"
-                self.responsaveis_dict[opcao] = resp.get_cpf()
-                setores.add(resp.get_setor())
-            
-            self.setores_disponiveis = sorted(list(setores))
+            # Carrega responsáveis e setores (guardados no cache dos controllers)
+            self.responsaveis_dict = self.responsavel_controller.listar_opcoes_responsaveis()
+            self.setores_disponiveis = self.responsavel_controller.obter_setores_disponiveis()
             
             # Carrega tipos de resíduo
             try:
@@ -105,6 +114,11 @@ class TelaRelatorio:
         # Seção de relatórios completos
         self._criar_relatorios_completos(main_frame)
         
+        # Progresso da geração (PDF)
+        self.barra_progresso = ttk.Progressbar(main_frame, mode='determinate', maximum=1)
+        self.barra_progresso.pack(fill=tk.X, pady=(15, 0))
+        ttk.Label(main_frame, textvariable=self.var_status, font=('Arial', 9)).pack(anchor=tk.W)
+        
         # Botão fechar
         ttk.Button(main_frame, text="Fechar", command=self.janela.destroy, width=15).pack(pady=(20, 0))
     
@@ -120,7 +134,7 @@ class TelaRelatorio:
         combo_formato = ttk.Combobox(
             formato_frame,
             textvariable=self.var_formato_arquivo,
-            values=["CSV", "PDF"],  # Opções: .csv e .pdf
+            values=["CSV", "PDF", "XLSX", "HTML", "PARQUET", "ARROW"],  # Opções: .csv, .pdf, .xlsx, .html, .parquet e .arrow (Arrow IPC)
             state="readonly",
             width=15
         )
@@ -167,7 +181,15 @@ class TelaRelatorio:
             width=30
         )
         combo_tipo.set("Todos")
-        combo_tipo.pack(anchor=tk.W, pady=(0, 15))
+        combo_tipo.pack(anchor=tk.W, pady=(0, 8))
+        
+        # Filtro por faixa de volume (campos vazios = sem limite)
+        ttk.Label(filtros_frame, text="Volume (L) - mínimo e máximo:").pack(anchor=tk.W)
+        volume_frame = ttk.Frame(filtros_frame)
+        volume_frame.pack(anchor=tk.W, pady=(0, 15))
+        ttk.Entry(volume_frame, textvariable=self.var_filtro_volume_min, width=12).pack(side=tk.LEFT)
+        ttk.Label(volume_frame, text="a").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(volume_frame, textvariable=self.var_filtro_volume_max, width=12).pack(side=tk.LEFT)
         
         # Frame para botões
         botoes_frame = ttk.Frame(filtros_frame)
@@ -198,58 +220,76 @@ class TelaRelatorio:
                   width=20).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(botoes_frame, text="Responsáveis", command=self._baixar_responsaveis_completo, 
                   width=20).pack(side=tk.LEFT)
+        
+        # Pacote: vários relatórios gerados de uma vez num único zip
+        ttk.Separator(completos_frame).pack(fill=tk.X, pady=10)
+        ttk.Label(completos_frame, text="Pacote (vários relatórios num arquivo .zip):", 
+                 font=('Arial', 10)).pack(anchor=tk.W, pady=(0, 5))
+        
+        opcoes_frame = ttk.Frame(completos_frame)
+        opcoes_frame.pack(anchor=tk.W)
+        for i, ((entidade, formato), var) in enumerate(self.vars_pacote.items()):
+            texto = f"{'Bombonas' if entidade == 'bombonas' else 'Responsáveis'} {formato.upper()}"
+            ttk.Checkbutton(opcoes_frame, text=texto, variable=var).grid(row=i // 2, column=i % 2, sticky=tk.W, padx=(0, 15))
+        
+        self.botao_pacote = ttk.Button(completos_frame, text="Gerar Pacote", command=self._gerar_pacote, width=20)
+        self.botao_pacote.pack(pady=(10, 0))
+        
+        # Alterações: só o que foi incluído, alterado ou removido desde a data (CSV ou PDF)
+        ttk.Separator(completos_frame).pack(fill=tk.X, pady=10)
+        desde_frame = ttk.Frame(completos_frame)
+        desde_frame.pack(anchor=tk.W, pady=(0, 5))
+        ttk.Label(desde_frame, text="Alterações desde (dd/mm/aaaa):", 
+                 font=('Arial', 10)).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(desde_frame, textvariable=self.var_alteracoes_desde, width=12).pack(side=tk.LEFT)
+        
+        alteracoes_frame = ttk.Frame(completos_frame)
+        alteracoes_frame.pack()
+        ttk.Button(alteracoes_frame, text="Alterações Bombonas", width=20,
+                  command=lambda: self._baixar_alteracoes('bombonas')).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(alteracoes_frame, text="Alterações Responsáveis", width=20,
+                  command=lambda: self._baixar_alteracoes('responsaveis')).pack(side=tk.LEFT)
     
     def _limpar_filtros(self):
         """ Limpa todos os filtros. """
         self.var_filtro_setor.set("Todos")
         self.var_filtro_responsavel.set("Todos")
         self.var_filtro_tipo_residuo.set("Todos")
+        self.var_filtro_volume_min.set("")
+        self.var_filtro_volume_max.set("")
     
-    def _aplicar_filtros(self, bombonas):
-        """ Aplica os filtros às bombonas usando os métodos do controller. """
+    @staticmethod
+    def _ler_volume(texto):
+        """ Converte o volume digitado (aceita vírgula); vazio = sem limite. """
+        
+        texto = texto.strip().replace(',', '.')
+        if not texto:
+            return None
+        return float(texto)
+    
+    def _obter_filtros(self):
+        """ Lê os filtros da tela no formato do controller (None = filtro não aplicado). """
+        
+        setor = self.var_filtro_setor.get()
+        responsavel = self.var_filtro_responsavel.get()
+        tipo_residuo = self.var_filtro_tipo_residuo.get()
+        
+        return {
+            'setor': setor if setor != "Todos" else None,
+            'cpf': self.responsaveis_dict.get(responsavel) if responsavel != "Todos" else None,
+            'tipo_residuo': tipo_residuo if tipo_residuo != "Todos" else None,
+            'volume_min': self._ler_volume(self.var_filtro_volume_min.get()),
+            'volume_max': self._ler_volume(self.var_filtro_volume_max.get())
+        }
+    
+    def _aplicar_filtros(self):
+        """
+        Busca no controller as bombonas que atendem a todos os filtros.
+        O controller escolhe a ordem de avaliação (índice mais seletivo primeiro).
+        """
         
         try:
-            # Lista de filtros a aplicar
-            filtros = []
-            
-            # Coleta filtros ativos
-            if self.var_filtro_setor.get() != "Todos":
-                filtros.append(('setor', self.var_filtro_setor.get()))
-                
-            if self.var_filtro_responsavel.get() != "Todos":
-                cpf = self.responsaveis_dict.get(self.var_filtro_responsavel.get())
-                if cpf:
-                    filtros.append(('responsavel', cpf))
-                    
-            if self.var_filtro_tipo_residuo.get() != "Todos":
-                filtros.append(('tipo_residuo', self.var_filtro_tipo_residuo.get()))
-            
-            # Se não há filtros, retorna lista original
-            if not filtros:
-                return bombonas
-            
-            # Aplica filtros usando métodos do controller
-            bombonas_resultado = None
-            
-            for tipo_filtro, valor in filtros:
-                if tipo_filtro == 'setor':
-                    bombonas_resultado = self.bombona_controller.filtrar_bombonas_por_setor(valor)
-                elif tipo_filtro == 'responsavel':
-                    if bombonas_resultado is None:
-                        bombonas_resultado = self.bombona_controller.buscar_bombonas_por_cpf_responsavel(valor)
-                    else:
-                        # Aplica sobre resultado anterior
-                        bombonas_resultado = [b for b in bombonas_resultado 
-                                            if b.get_responsavel() and b.get_responsavel().get_cpf() == valor]
-                elif tipo_filtro == 'tipo_residuo':
-                    if bombonas_resultado is None:
-                        bombonas_resultado = self.bombona_controller.filtrar_bombonas_por_tipo_residuo(valor)
-                    else:
-                        # Aplica sobre resultado anterior
-                        bombonas_resultado = [b for b in bombonas_resultado 
-                                            if b.get_tipo_residuo() == valor]
-            
-            return bombonas_resultado or []
+            return self.bombona_controller.filtrar_bombonas(**self._obter_filtros())
             
         except Exception as e:
             print(f"Erro ao aplicar filtros: {e}")
@@ -270,6 +310,15 @@ class TelaRelatorio:
         if self.var_filtro_tipo_residuo.get() != "Todos":
             filtros_ativos.append(f"Tipo: {self.var_filtro_tipo_residuo.get()}")
         
+        volume_min = self.var_filtro_volume_min.get().strip()
+        volume_max = self.var_filtro_volume_max.get().strip()
+        if volume_min and volume_max:
+            filtros_ativos.append(f"Volume: {volume_min} a {volume_max} L")
+        elif volume_min:
+            filtros_ativos.append(f"Volume: a partir de {volume_min} L")
+        elif volume_max:
+            filtros_ativos.append(f"Volume: até {volume_max} L")
+        
         return filtros_ativos
     
     def _baixar_filtrado(self):
@@ -282,9 +331,17 @@ class TelaRelatorio:
                 self.janela.focus()
                 return
             
+            # Valida a faixa de volume
+            try:
+                self._ler_volume(self.var_filtro_volume_min.get())
+                self._ler_volume(self.var_filtro_volume_max.get())
+            except ValueError:
+                messagebox.showerror("Erro", "Volume deve ser um número válido!")
+                self.janela.focus()
+                return
+            
             # Aplica filtros
-            bombonas = self.bombona_controller.listar_bombonas()
-            bombonas_filtradas = self._aplicar_filtros(bombonas)
+            bombonas_filtradas = self._aplicar_filtros()
             
             if not bombonas_filtradas:
                 messagebox.showwarning("Aviso", "Nenhuma bombona encontrada com os filtros aplicados.")
@@ -294,7 +351,7 @@ class TelaRelatorio:
             
             # Gera arquivo
             formato = self.var_formato_arquivo.get().lower()
-            self._gerar_arquivo_bombonas(bombonas_filtradas, filtros_ativos, formato)
+            self._gerar_arquivo_bombonas(filtros_ativos, formato, self._obter_filtros())
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao baixar relatório filtrado:\n{str(e)}")
@@ -311,7 +368,7 @@ class TelaRelatorio:
                 return
             
             formato = self.var_formato_arquivo.get().lower()
-            self._gerar_arquivo_bombonas(bombonas, [], formato)
+            self._gerar_arquivo_bombonas([], formato)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao baixar relatório de bombonas:\n{str(e)}")
@@ -320,31 +377,154 @@ class TelaRelatorio:
     def _baixar_responsaveis_completo(self):
         """ Baixa relatório completo de responsáveis. """
         try:
-            responsaveis = self.responsavel_controller.listar_responsaveis()
-            if not responsaveis:
+            if not self.responsavel_controller.possui_responsaveis():
                 messagebox.showwarning("Aviso", "Nenhum responsável cadastrado.")
                 return
             
             formato = self.var_formato_arquivo.get().lower()
-            self._gerar_arquivo_responsaveis(responsaveis, formato)
+            self._gerar_arquivo_responsaveis(formato)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao baixar relatório de responsáveis:\n{str(e)}")
             self.janela.focus()
 
-    def _gerar_arquivo_bombonas(self, bombonas, filtros_ativos, formato):
-        """ Solicita geração de arquivo ao controller. """
+    def _baixar_alteracoes(self, entidade):
+        """ Baixa o relatório do que mudou desde a data informada. """
+        
+        try:
+            desde = datetime.strptime(self.var_alteracoes_desde.get().strip(), "%d/%m/%Y")
+        except ValueError:
+            messagebox.showwarning("Aviso", "Informe a data no formato dd/mm/aaaa.")
+            self.janela.focus()
+            return
+        
+        formato = self.var_formato_arquivo.get().lower()
+        if formato not in ("csv", "pdf"):
+            messagebox.showwarning("Aviso", "O relatório de alterações é gerado em CSV ou PDF.")
+            self.janela.focus()
+            return
         
         # View só escolhe onde salvar
-        if formato == "csv":
-            filetypes = [("CSV files", "*.csv"), ("PDF files", "*.pdf"), ("All files", "*.*")]
+        arquivo = filedialog.asksaveasfilename(
+            title="Salvar Relatório de Alterações",
+            defaultextension=f".{formato}",
+            filetypes=self._tipos_arquivo(formato)
+        )
+        
+        if not arquivo:
+            return
+        
+        controller = self.bombona_controller if entidade == 'bombonas' else self.responsavel_controller
+        try:
+            arquivo_gerado = controller.gerar_relatorio(
+                arquivo=arquivo,
+                formato=formato,
+                desde=desde,
+                progresso=self._atualizar_progresso
+            )
+            
+            messagebox.showinfo("Sucesso", f"Relatório salvo com sucesso!\n\nLocal: {arquivo_gerado}")
+            self.janela.focus()
+            
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao gerar relatório de alterações:\n{str(e)}")
+            self.janela.focus()
+    
+    def _gerar_pacote(self):
+        """ Gera os relatórios marcados de uma vez, numa thread separada, e acompanha o andamento. """
+        
+        from relatorios.pacote_relatorios import PacoteRelatorios
+        
+        itens = [item for item, var in self.vars_pacote.items() if var.get()]
+        if not itens:
+            messagebox.showwarning("Aviso", "Selecione pelo menos um relatório para o pacote.")
+            self.janela.focus()
+            return
+        
+        arquivo = filedialog.asksaveasfilename(
+            title="Salvar Pacote de Relatórios",
+            defaultextension=".zip",
+            filetypes=[("ZIP files", "*.zip"), ("All files", "*.*")]
+        )
+        
+        if not arquivo:
+            return
+        
+        pacote = PacoteRelatorios(self.bombona_controller, self.responsavel_controller)
+        self.botao_pacote.state(['disabled'])
+        self.var_status.set("Gerando pacote...")
+        threading.Thread(target=self._executar_pacote, args=(pacote, arquivo, itens), daemon=True).start()
+        self._acompanhar_pacote(pacote)
+    
+    @staticmethod
+    def _executar_pacote(pacote, arquivo, itens):
+        """ Executa a geração (fora da thread da interface); o erro fica guardado no pacote. """
+        
+        try:
+            pacote.gerar(arquivo, itens)
+        except Exception:
+            pass
+    
+    def _acompanhar_pacote(self, pacote):
+        """ Atualiza a barra com o andamento do pacote até a geração terminar. """
+        
+        if not self.janela.winfo_exists():
+            return
+        
+        feitas, total = pacote.progresso()
+        self.barra_progresso['maximum'] = max(total, 1)
+        self.barra_progresso['value'] = feitas
+        
+        if not pacote.concluido:
+            self.var_status.set(f"Gerando pacote... {feitas} de {total} linhas")
+            self.janela.after(INTERVALO_PROGRESSO_MS, self._acompanhar_pacote, pacote)
+            return
+        
+        self.botao_pacote.state(['!disabled'])
+        self.var_status.set("")
+        if pacote.erro is not None:
+            messagebox.showerror("Erro", f"Erro ao gerar pacote de relatórios:\n{str(pacote.erro)}")
         else:
-            filetypes = [("PDF files", "*.pdf"), ("CSV files", "*.csv"), ("All files", "*.*")]
+            messagebox.showinfo("Sucesso", f"Pacote salvo com sucesso!\n\nLocal: {pacote.destino}")
+        self.janela.focus()
+    
+    def _atualizar_progresso(self, feitas, total):
+        """ Mostra na barra o andamento da geração (chamado pelo controller durante o PDF). """
         
+        self.barra_progresso['maximum'] = max(total, 1)
+        self.barra_progresso['value'] = feitas
+        self.janela.update_idletasks()
+    
+    @staticmethod
+    def _tipos_arquivo(formato):
+        """ Tipos de arquivo do diálogo de salvar, com o formato escolhido primeiro. """
+        
+        tipos = {
+            "csv": [("CSV files", "*.csv"), ("CSV gzip files", "*.csv.gz")],
+            "pdf": [("PDF files", "*.pdf")],
+            "xlsx": [("Excel files", "*.xlsx")],
+            "html": [("HTML files", "*.html")],
+            "parquet": [("Parquet files", "*.parquet")],
+            "arrow": [("Arrow IPC files", "*.arrow")],
+        }
+        filetypes = list(tipos.get(formato, []))
+        for outro, extensoes in tipos.items():
+            if outro != formato:
+                filetypes.extend(extensoes)
+        filetypes.append(("All files", "*.*"))
+        return filetypes
+    
+    def _gerar_arquivo_bombonas(self, filtros_ativos, formato, filtros=None):
+        """
+        Solicita geração de arquivo ao controller. O controller consulta as
+        bombonas com os filtros (ou todas) e reaproveita relatórios já gerados.
+        """
+        
+        # View só escolhe onde salvar
         arquivo = filedialog.asksaveasfilename(
             title="Salvar Relatório",
             defaultextension=f".{formato}",
-            filetypes=filetypes
+            filetypes=self._tipos_arquivo(formato)
         )
         
         if not arquivo:
@@ -352,10 +532,11 @@ class TelaRelatorio:
         
         try:
             arquivo_gerado = self.bombona_controller.gerar_relatorio(
-                bombonas_filtradas=bombonas,
                 arquivo=arquivo,
                 filtros_ativos=filtros_ativos,
-                formato=formato
+                formato=formato,
+                filtros=filtros,
+                progresso=self._atualizar_progresso
             )
             
             messagebox.showinfo("Sucesso", f"Relatório salvo com sucesso!\n\nLocal: {arquivo_gerado}")
@@ -369,19 +550,17 @@ class TelaRelatorio:
             messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{str(e)}")
             self.janela.focus()
     
-    def _gerar_arquivo_responsaveis(self, responsaveis, formato):
-        """ Solicita geração de arquivo de responsáveis ao controller. """
+    def _gerar_arquivo_responsaveis(self, formato):
+        """
+        Solicita geração de arquivo de responsáveis ao controller. O controller
+        consulta os responsáveis e reaproveita relatórios já gerados.
+        """
         
         # View só escolhe onde salvar
-        if formato == "csv":
-            filetypes = [("CSV files", "*.csv"), ("PDF files", "*.pdf"), ("All files", "*.*")]
-        else:
-            filetypes = [("PDF files", "*.pdf"), ("CSV files", "*.csv"), ("All files", "*.*")]
-        
         arquivo = filedialog.asksaveasfilename(
             title="Salvar Relatório",
             defaultextension=f".{formato}",
-            filetypes=filetypes
+            filetypes=self._tipos_arquivo(formato)
         )
         
         if not arquivo:
@@ -389,9 +568,9 @@ class TelaRelatorio:
         
         try:
             arquivo_gerado = self.responsavel_controller.gerar_relatorio(
-                responsaveis=responsaveis,
                 arquivo=arquivo,
-                formato=formato
+                formato=formato,
+                progresso=self._atualizar_progresso
             )
             
             messagebox.showinfo("Sucesso", f"Relatório salvo com sucesso!\n\nLocal: {arquivo_gerado}")